@@ -13,6 +13,9 @@ Example usage:
     curl http://localhost:8000/health
 """
 
+import asyncio
+import copy
+import functools
 import json
 import os
 import hashlib
@@ -20,47 +23,52 @@ import uuid
 import tempfile
 import shutil
 import logging
-import threading
+from concurrent.futures import ThreadPoolExecutor
 import magic
 import secrets
 import re
 import html
 from pathlib import Path
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional
 import mimetypes
 from datetime import datetime, timezone
 from io import StringIO
 
 from fastapi import FastAPI, Request, Form, File, UploadFile, HTTPException, Depends, Query
-from fastapi.responses import JSONResponse, HTMLResponse, FileResponse, RedirectResponse, Response
+from fastapi.responses import JSONResponse, HTMLResponse, FileResponse, RedirectResponse, Response, StreamingResponse
 from fastapi.staticfiles import StaticFiles
 from fastapi.templating import Jinja2Templates
 from fastapi.middleware.cors import CORSMiddleware
 from starlette.middleware.httpsredirect import HTTPSRedirectMiddleware
 from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.concurrency import run_in_threadpool
 from slowapi import Limiter, _rate_limit_exceeded_handler
 from slowapi.util import get_remote_address
 from slowapi.errors import RateLimitExceeded
 import uvicorn
 import pandas as pd
-import matplotlib
-
-# Configure matplotlib backend for server environment
-matplotlib.use('Agg')
 
 # Import core modules
 from core.models import SpecV1, DecisionResult
-from core.scheduler import start_background_tasks, stop_background_tasks
+from core.scheduler import get_scheduler, start_background_tasks, stop_background_tasks
 from core.normalize import normalize_temperature_data, load_csv_with_metadata, NormalizationError, DataQualityError
+from core.csv_profiles import get_profile_cache
 from core.decide import make_decision, DecisionError
-from core.metrics_powder import RequiredSignalMissingError
-from core.plot import generate_proof_plot, PlotError
-from core.render_pdf import generate_proof_pdf
+from core.errors import RequiredSignalMissingError
 from core.pack import create_evidence_bundle, PackingError
 from core.logging import setup_logging, get_logger, RequestLoggingMiddleware
-from core.cleanup import schedule_cleanup
-from core.validation import create_validation_pack, get_validation_pack_info
+from core.rate_limit import COMPILE_REQUEST_COST, LIGHT_REQUEST_COST, RATE_LIMIT_STORAGE_URI
+from core.validation import ensure_validation_pack, get_validation_pack_info
+from core.downloads import artifact_response, cached_file_sha256, etag_matches, file_sha256, version_token
+from core.build_info import get_build_info
 from core.upsell import enqueue_upsell
+from core.multi_spec import MULTI_SPEC_MAX, MULTI_SPEC_WORKERS, evaluate_specs
+from core.batch import BATCH_MAX_FILES, NDJSON_MEDIA_TYPE, extract_zip_csvs, ndjson_line, stream_job_results
+from core.live import LiveRunError, cancel_close, close_run, finish_close, get_run, open_run
+from core.job_lock import run_job_once
+from core.page_cache import FileParseCache, StaticPageCache, configure_bytecode_cache
+from core.serialization import FastJSONResponse, dumps_canonical, loads
+from core.spec_registry import get_spec_registry
 
 # Import auth modules
 from auth.magic import auth_handler, AuthMiddleware, get_current_user, require_auth, require_qa, require_qa_redirect
@@ -151,29 +159,35 @@ def truncate_title_filter(value: str, max_chars: int = 60) -> str:
 templates.env.filters["truncate_meta"] = truncate_meta_filter
 templates.env.filters["truncate_title"] = truncate_title_filter
 
+# Compiled templates on disk, rendered visitor-independent pages in memory
+configure_bytecode_cache(templates)
+static_pages = StaticPageCache(templates)
+content_files = FileParseCache()
+
 # Storage configuration
 STORAGE_DIR = BASE_DIR / "storage"
 STORAGE_DIR.mkdir(exist_ok=True)
 
-# Thread lock for storage operations
-storage_lock = threading.Lock()
-
 # Initialize structured logging
 setup_logging(level=os.environ.get("LOG_LEVEL", "INFO"), format_type="json")
 logger = get_logger(__name__)
 
-# Rate limiter configuration
-limiter = Limiter(key_func=get_remote_address)
+# Rate limiter configuration: one per-client budget shared by all workers on
+# the host (see core.rate_limit), drawn down by per-route cost weights
+limiter = Limiter(key_func=get_remote_address, storage_uri=RATE_LIMIT_STORAGE_URI)
 
-def get_rate_limit_decorator():
+def get_rate_limit_decorator(cost: int = LIGHT_REQUEST_COST):
     """
     Get rate limit decorator, with option to disable for testing.
     
+    Args:
+        cost: Budget units one request to the route consumes
+    
     Returns:
         Decorator function for rate limiting
         
     Example:
-        @get_rate_limit_decorator()
+        @get_rate_limit_decorator(cost=COMPILE_REQUEST_COST)
         async def my_endpoint():
             pass
     """
@@ -185,13 +199,14 @@ def get_rate_limit_decorator():
         return no_limit_decorator
     else:
         # Return normal rate limit decorator
-        return limiter.limit(f"{RATE_LIMIT_PER_MIN}/minute")
+        return limiter.shared_limit(f"{RATE_LIMIT_BUDGET_PER_MIN}/minute", scope="requests", cost=cost)
 
 # Environment configuration
 # Safer CORS defaults: production domains and local dev
 DEFAULT_CORS_ORIGINS = "https://www.proofkit.net,https://proofkit-prod.fly.dev,http://localhost:8000,http://127.0.0.1:8000"
 CORS_ORIGINS = [o.strip() for o in os.environ.get("CORS_ORIGINS", DEFAULT_CORS_ORIGINS).split(",") if o.strip()]
 RATE_LIMIT_PER_MIN = int(os.environ.get("RATE_LIMIT_PER_MIN", "10"))
+RATE_LIMIT_BUDGET_PER_MIN = RATE_LIMIT_PER_MIN * COMPILE_REQUEST_COST
 # Support both MAX_UPLOAD_SIZE_MB and MAX_UPLOAD_MB
 _max_mb_env = os.environ.get("MAX_UPLOAD_SIZE_MB") or os.environ.get("MAX_UPLOAD_MB") or "10"
 MAX_UPLOAD_SIZE = int(_max_mb_env) * 1024 * 1024
@@ -350,7 +365,7 @@ def create_app() -> FastAPI:
     app = FastAPI(
     title="ProofKit",
     description="Generate inspector-ready proof PDFs from CSV temperature logs",
-    version="0.1.0",
+    version=get_build_info().version,
     docs_url="/api-docs",
     redoc_url="/redoc",
     openapi_tags=tags_metadata
@@ -401,17 +416,6 @@ def create_app() -> FastAPI:
     STORAGE_DIR.mkdir(exist_ok=True)
     logger.info(f"Storage directory initialized: {STORAGE_DIR}")
     
-    # Schedule background cleanup
-    try:
-        retention_days = int(os.environ.get("RETENTION_DAYS", "30"))
-        cleanup_interval = int(os.environ.get("CLEANUP_INTERVAL_HOURS", "24"))
-        if schedule_cleanup(STORAGE_DIR, retention_days, cleanup_interval):
-            logger.info(f"Background cleanup scheduled: {retention_days} days retention, {cleanup_interval}h interval")
-        else:
-            logger.warning("Failed to schedule background cleanup")
-    except Exception as e:
-        logger.error(f"Error scheduling cleanup: {e}")
-    
     return app
 
 
@@ -420,47 +424,9 @@ def get_industry_presets() -> Dict[str, Dict[str, Any]]:
     Load all available industry presets.
     
     Returns:
-        Dict mapping industry names to their preset data
+        Dict mapping industry names to their preset data (shared, read-only)
     """
-    presets = {}
-    
-    # Available preset files
-    preset_files = {
-        "powder": "powder_coat_cure_spec_standard_180c_10min.json",  # Use existing example
-        "powder-coating": "powder_coat_cure_spec_standard_180c_10min.json",  # Same as powder
-        "haccp": "haccp_v1.json",
-        "autoclave": "autoclave_v1.json", 
-        "sterile": "sterile_v1.json",
-        "eto": "sterile_v1.json",  # ETO uses same preset as sterile
-        "concrete": "concrete_v1.json",
-        "coldchain": "coldchain_v1.json"
-    }
-    
-    spec_library_dir = BASE_DIR / "core" / "spec_library"
-    
-    for industry, filename in preset_files.items():
-        try:
-            if industry in ["powder", "powder-coating"]:
-                # Use existing example file
-                preset_path = BASE_DIR / "examples" / filename
-            else:
-                preset_path = spec_library_dir / filename
-                
-            if preset_path.exists():
-                with open(preset_path, 'r') as f:
-                    preset_data = json.load(f)
-                
-                # Ensure powder/powder-coating presets have industry field for v2 compatibility
-                if industry in ["powder", "powder-coating"] and "industry" not in preset_data:
-                    preset_data["industry"] = "powder"
-                    
-                presets[industry] = preset_data
-            else:
-                logger.warning(f"Preset file not found: {preset_path}")
-        except Exception as e:
-            logger.error(f"Failed to load preset {industry}: {e}")
-    
-    return presets
+    return get_spec_registry().presets()
 
 
 def get_default_spec(industry: Optional[str] = None) -> str:
@@ -474,19 +440,20 @@ def get_default_spec(industry: Optional[str] = None) -> str:
         str: Default specification as formatted JSON string
     """
     try:
+        registry = get_spec_registry()
         if industry:
             # Load industry preset
-            presets = get_industry_presets()
-            if industry in presets:
-                return json.dumps(presets[industry], indent=2)
+            preset_json = registry.preset_json(industry)
+            if preset_json is not None:
+                return preset_json
             else:
                 logger.warning(f"Industry preset '{industry}' not found")
         
         # Load default spec from examples
-        spec_path = BASE_DIR / "examples" / "spec_example.json"
-        with open(spec_path, 'r') as f:
-            spec_data = json.load(f)
-        return json.dumps(spec_data, indent=2)
+        default_json = registry.default_spec_json()
+        if default_json is None:
+            raise FileNotFoundError("Default specification not available")
+        return default_json
     except Exception:
         # Fallback default spec
         fallback_spec = {
@@ -549,6 +516,21 @@ def validate_file_upload(file: UploadFile, request: Optional[Request] = None) ->
     
     # Read file to check actual size
     file_content = file.file.read()
+    validate_csv_content(file.filename, file_content)
+    return file_content
+
+
+def validate_csv_content(filename: Optional[str], file_content: bytes) -> None:
+    """
+    Validate CSV content already read from an upload or archive.
+    
+    Args:
+        filename: Name the content was uploaded under
+        file_content: File content
+        
+    Raises:
+        HTTPException: If validation fails
+    """
     # Explicitly reject empty uploads to avoid downstream 400s with vague messages
     if not file_content:
         raise HTTPException(status_code=400, detail="Uploaded file is empty")
@@ -561,12 +543,11 @@ def validate_file_upload(file: UploadFile, request: Optional[Request] = None) ->
         )
     
     # Check filename is provided and sanitized
-    if not file.filename:
+    if not filename:
         raise HTTPException(status_code=400, detail="No filename provided")
     
     # Sanitize filename to prevent path traversal
-    filename = os.path.basename(file.filename)
-    if not filename or filename != file.filename:
+    if os.path.basename(filename) != filename:
         raise HTTPException(status_code=400, detail="Invalid filename format")
         
     if not filename.lower().endswith('.csv'):
@@ -619,7 +600,6 @@ def validate_file_upload(file: UploadFile, request: Optional[Request] = None) ->
         )
     
     logger.info(f"File validation passed: {filename} ({file_size} bytes)")
-    return file_content
 
 
 def generate_job_id(spec_data: Dict[str, Any], csv_content: bytes) -> str:
@@ -761,6 +741,32 @@ def save_file_to_storage(content: bytes, job_dir: Path, filename: str) -> Path:
     return file_path
 
 
+def load_csv_content(csv_content: bytes, spec: Optional[SpecV1] = None) -> pd.DataFrame:
+    """
+    Parse uploaded CSV bytes with metadata extraction.
+    
+    Uses the shared vendor profile cache, so repeat logger layouts skip sniffing.
+    
+    Args:
+        csv_content: CSV file content
+        spec: Specification whose signal columns are the only ones parsed (default: all columns)
+        
+    Returns:
+        Raw DataFrame from load_csv_with_metadata
+    """
+    # Create temporary file for CSV processing
+    with tempfile.NamedTemporaryFile(mode='w+b', delete=False, suffix='.csv') as tmp_file:
+        tmp_file.write(csv_content)
+        tmp_csv_path = tmp_file.name
+    
+    try:
+        df, metadata = load_csv_with_metadata(tmp_csv_path, profile_cache=get_profile_cache(), spec=spec)
+        return df
+    finally:
+        # Clean up temporary file
+        os.unlink(tmp_csv_path)
+
+
 def process_csv_and_spec(csv_content: bytes, spec_data: Dict[str, Any], 
                          job_dir: Path, job_id: str, creator=None,
                          utm_source: str = "", utm_medium: str = "", 
@@ -805,7 +811,7 @@ def process_csv_and_spec(csv_content: bytes, spec_data: Dict[str, Any],
     raw_csv_path = save_file_to_storage(csv_content, job_dir, "raw_data.csv")
     
     # Save specification JSON
-    spec_json_content = json.dumps(spec_data, indent=2).encode('utf-8')
+    spec_json_content = dumps_canonical(spec_data).encode('utf-8')
     spec_json_path = save_file_to_storage(spec_json_content, job_dir, "specification.json")
     
     # Validate and parse specification
@@ -819,31 +825,16 @@ def process_csv_and_spec(csv_content: bytes, spec_data: Dict[str, Any],
     
     # Load and normalize CSV data
     try:
-        # Create temporary file for CSV processing
-        with tempfile.NamedTemporaryFile(mode='w+b', delete=False, suffix='.csv') as tmp_file:
-            tmp_file.write(csv_content)
-            tmp_csv_path = tmp_file.name
-        
-        try:
-            # Load CSV with metadata extraction
-            df, metadata = load_csv_with_metadata(tmp_csv_path)
-            
-            # Normalize temperature data
-            normalized_df = normalize_temperature_data(
-                df,
-                target_step_s=30.0,
-                allowed_gaps_s=spec.data_requirements.allowed_gaps_s,
-                max_sample_period_s=spec.data_requirements.max_sample_period_s,
-                industry=spec.industry
-            )
-            
-            # Save normalized CSV
-            normalized_csv_path = job_dir / "normalized_data.csv"
-            normalized_df.to_csv(normalized_csv_path, index=False)
-            
-        finally:
-            # Clean up temporary file
-            os.unlink(tmp_csv_path)
+        df = load_csv_content(csv_content, spec)
+        
+        # Normalize temperature data
+        normalized_df = normalize_temperature_data(
+            df,
+            target_step_s=30.0,
+            allowed_gaps_s=spec.data_requirements.allowed_gaps_s,
+            max_sample_period_s=spec.data_requirements.max_sample_period_s,
+            industry=spec.industry
+        )
             
     except DataQualityError as e:
         raise HTTPException(
@@ -861,20 +852,85 @@ def process_csv_and_spec(csv_content: bytes, spec_data: Dict[str, Any],
             detail=f"CSV processing failed: {str(e)}"
         )
     
+    return compile_normalized_job(
+        normalized_df, spec_data, spec, job_dir, job_id,
+        raw_csv_path, spec_json_path, creator=creator,
+        utm_source=utm_source, utm_medium=utm_medium,
+        utm_campaign=utm_campaign, utm_term=utm_term,
+        utm_content=utm_content, referrer=referrer
+    )
+
+
+def compile_normalized_job(normalized_df: pd.DataFrame, spec_data: Dict[str, Any],
+                           spec: SpecV1, job_dir: Path, job_id: str,
+                           raw_csv_path: Path, spec_json_path: Path, creator=None,
+                           decision: Optional[DecisionResult] = None,
+                           utm_source: str = "", utm_medium: str = "",
+                           utm_campaign: str = "", utm_term: str = "",
+                           utm_content: str = "", referrer: str = "") -> Dict[str, Any]:
+    """
+    Decide, plot, render and bundle a job whose CSV is already normalized.
+    
+    Args:
+        normalized_df: Normalized DataFrame for the job
+        spec_data: Specification dictionary (already carrying job_id)
+        spec: Parsed specification
+        job_dir: Job storage directory holding raw_data.csv and specification.json
+        job_id: Job identifier
+        raw_csv_path: Path of the saved raw CSV
+        spec_json_path: Path of the saved specification JSON
+        creator: User object if authenticated
+        decision: Decision already made for this spec (default: run make_decision)
+        utm_source: UTM source parameter
+        utm_medium: UTM medium parameter
+        utm_campaign: UTM campaign parameter
+        utm_term: UTM term parameter
+        utm_content: UTM content parameter
+        referrer: Referrer URL
+        
+    Returns:
+        Result dictionary with processing outcomes
+        
+    Raises:
+        HTTPException: If any pipeline stage fails
+    """
+    # Save normalized CSV
+    normalized_csv_path = job_dir / "normalized_data.csv"
+    try:
+        normalized_df.to_csv(normalized_csv_path, index=False)
+    except Exception as e:
+        raise HTTPException(
+            status_code=500,
+            detail=f"CSV processing failed: {str(e)}"
+        )
+    
     # Make decision
     try:
-        decision = make_decision(normalized_df, spec)
-        
         # Shadow runs: Run differential verification if enabled
         require_diff_agreement = os.getenv("REQUIRE_DIFF_AGREEMENT", "0").lower() in ["1", "true", "yes"]
         
+        independent_future = None
         if require_diff_agreement:
-            logger.info(f"Running shadow comparison for job {job_id}")
             from core.shadow_compare import ShadowComparator, ShadowStatus, create_indeterminate_result
+            comparator = ShadowComparator()
+            try:
+                # Independent calculator runs in a worker while the engine runs here
+                independent_future = comparator.submit_independent(normalized_df, spec)
+            except Exception as e:
+                logger.error(f"Failed to start independent calculator: {e}")
+        
+        if decision is None:
+            decision = make_decision(normalized_df, spec)
+        
+        if require_diff_agreement:
+            logger.info(f"Running shadow comparison for job {job_id}")
             
             try:
-                comparator = ShadowComparator()
-                shadow_result = comparator.run_shadow_comparison(normalized_df, spec)
+                shadow_result = comparator.run_shadow_comparison(
+                    normalized_df, spec,
+                    engine_result=decision,
+                    independent_future=independent_future
+                )
                 
                 logger.info(f"Shadow comparison status: {shadow_result.status.value}")
                 
@@ -893,7 +949,7 @@ def process_csv_and_spec(csv_content: bytes, spec_data: Dict[str, Any],
                 # Save shadow comparison results for debugging/audit
                 if shadow_result.status != ShadowStatus.DISABLED:
                     shadow_dict = shadow_result.to_dict()
-                    shadow_json_content = json.dumps(shadow_dict, indent=2, default=str).encode('utf-8')
+                    shadow_json_content = dumps_canonical(shadow_dict, default=str).encode('utf-8')
                     save_file_to_storage(shadow_json_content, job_dir, "shadow_comparison.json")
                     
             except Exception as e:
@@ -925,7 +981,7 @@ def process_csv_and_spec(csv_content: bytes, spec_data: Dict[str, Any],
                 'captured_at': datetime.now(timezone.utc).isoformat()
             }
         
-        decision_json_content = json.dumps(decision_dict, indent=2).encode('utf-8')
+        decision_json_content = dumps_canonical(decision_dict).encode('utf-8')
         decision_json_path = save_file_to_storage(decision_json_content, job_dir, "decision.json")
         
     except RequiredSignalMissingError as e:
@@ -944,6 +1000,10 @@ def process_csv_and_spec(csv_content: bytes, spec_data: Dict[str, Any],
             detail=f"Decision processing failed: {str(e)}"
         )
     
+    # Plotting and PDF stacks load on first use (gunicorn.conf.py pre-warms them)
+    from core.plot import generate_proof_plot, PlotError
+    from core.render_pdf import generate_proof_pdf
+    
     # Generate plot
     try:
         plot_path = job_dir / "plot.png"
@@ -1027,6 +1087,11 @@ def process_csv_and_spec(csv_content: bytes, spec_data: Dict[str, Any],
             "proof_pdf": "proof.pdf",
             "evidence_zip": "evidence.zip"
         },
+        "artifact_hashes": {
+            key: file_sha256(path)
+            for key, path in (("proof_pdf", pdf_path), ("evidence_zip", zip_path))
+            if path.exists()
+        },
         "creator": {
             "email": creator.email if creator else None,
             "role": creator.role if creator else None,  # role is already a string due to use_enum_values
@@ -1047,17 +1112,77 @@ def process_csv_and_spec(csv_content: bytes, spec_data: Dict[str, Any],
     except Exception as e:
         logger.error(f"Failed to enqueue upsell for job {job_id}: {e}")
     
+    # Versioned download URLs can be cached as immutable by browsers and CDNs
+    download_urls = {}
+    for file_type, artifact_key in (("pdf", "proof_pdf"), ("zip", "evidence_zip")):
+        download_urls[file_type] = f"/download/{job_id}/{file_type}"
+        artifact_hash = job_metadata["artifact_hashes"].get(artifact_key)
+        if artifact_hash:
+            download_urls[file_type] += f"?v={version_token(artifact_hash)}"
+    
     # Return results (preserve legacy fields and include status/flags)
+    return {
+        **decision_summary(decision, job_id, spec_data),
+        "urls": {
+            "pdf": download_urls["pdf"],
+            "zip": download_urls["zip"],
+            "verify": f"/verify/{job_id}"
+        },
+        "verification_hash": verification_hash
+    }
+
+
+def resolve_spec_format(spec_data: Any, industry: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Bring a submitted specification into v1 form, as /api/compile/json does.
+    
+    Args:
+        spec_data: Parsed specification (v2 with an industry, or legacy v1)
+        industry: Industry applied to v2 specs that do not name one
+        
+    Returns:
+        v1 specification dictionary
+        
+    Raises:
+        ValueError: If the specification matches neither enabled format
+    """
+    api_v2_enabled = os.getenv("API_V2_ENABLED", "true").lower() == "true"
+    accept_legacy_spec = os.getenv("ACCEPT_LEGACY_SPEC", "true").lower() == "true"
+    
+    if not isinstance(spec_data, dict):
+        raise ValueError("Specification must be a JSON object")
+    if api_v2_enabled and ("industry" in spec_data or industry):
+        from core.industry_router import adapt_spec_v2
+        return adapt_spec_v2(industry or spec_data.get("industry", "powder"), spec_data)
+    if accept_legacy_spec and "spec" in spec_data:
+        return spec_data
+    raise ValueError("Invalid specification format")
+
+
+def decision_summary(decision: DecisionResult, job_id: str, spec_data: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Summarize a decision in the compile API response shape.
+    
+    Args:
+        decision: Decision result
+        job_id: Job identifier
+        spec_data: Specification dictionary (for the industry field)
+        
+    Returns:
+        Dictionary with id, industry, pass/status (plus legacy aliases), metrics,
+        reasons, warnings and flags
+    """
     # Include industry field from specification for decision envelope compatibility
     industry = spec_data.get('industry', 'powder') if isinstance(spec_data, dict) else 'powder'
+    status = getattr(decision, 'status', 'PASS' if decision.pass_ else 'FAIL')
     
     return {
         "id": job_id,
         "industry": industry,
         "pass": decision.pass_,
-        "status": getattr(decision, 'status', 'PASS' if decision.pass_ else 'FAIL'),
+        "status": status,
         # Legacy field mappings for backward compatibility
-        "decision": getattr(decision, 'status', 'PASS' if decision.pass_ else 'FAIL'),
+        "decision": status,
         "pass_": decision.pass_,
         "metrics": {
             "target_temp_C": decision.target_temp_C,
@@ -1069,13 +1194,7 @@ def process_csv_and_spec(csv_content: bytes, spec_data: Dict[str, Any],
         },
         "reasons": decision.reasons,
         "warnings": decision.warnings,
-        "flags": getattr(decision, 'flags', {}),
-        "urls": {
-            "pdf": f"/download/{job_id}/pdf",
-            "zip": f"/download/{job_id}/zip",
-            "verify": f"/verify/{job_id}"
-        },
-        "verification_hash": verification_hash
+        "flags": getattr(decision, 'flags', {})
     }
 
 
@@ -1130,10 +1249,8 @@ async def press_release_page(request: Request) -> HTMLResponse:
     md_path = BASE_DIR / "marketing" / "pr" / "press-release.md"
     if not md_path.exists():
         raise HTTPException(status_code=404, detail="Press release not found")
-    with open(md_path, 'r', encoding='utf-8') as f:
-        md = f.read()
-    html_content = _render_markdown(md)
-    return templates.TemplateResponse("press.html", {"request": request, "content": html_content})
+    html_content = content_files.get(md_path, _render_markdown)
+    return static_pages.render(request, "press.html", {"content": html_content})
 
 
 @app.get("/press/download", tags=["marketing"])
@@ -1162,16 +1279,18 @@ async def health_check() -> JSONResponse:
     Health check endpoint for monitoring and load balancer readiness.
     
     Returns:
-        JSONResponse: Status information including service name and version
+        JSONResponse: Status information including service name, version and commit
         
     Example:
         >>> # GET /health
-        >>> {"status": "healthy", "service": "proofkit", "version": "0.1.0"}
+        >>> {"status": "healthy", "service": "proofkit", "version": "1.0.0", "commit": "abc12345"}
     """
+    build_info = get_build_info()
     health_data: Dict[str, Any] = {
         "status": "healthy",
         "service": "proofkit", 
-        "version": "0.1.0"
+        "version": build_info.version,
+        "commit": build_info.short_commit
     }
     return JSONResponse(content=health_data, status_code=200)
 
@@ -1251,7 +1370,7 @@ async def get_presets() -> JSONResponse:
     """
     try:
         presets = get_industry_presets()
-        return JSONResponse(content=presets)
+        return FastJSONResponse(content=presets)
     except Exception as e:
         logger.error(f"Failed to load presets: {e}")
         return JSONResponse(
@@ -1282,7 +1401,7 @@ async def get_industry_preset(industry: str) -> JSONResponse:
                 content={"error": "Industry preset not found", "industry": industry}
             )
         
-        return JSONResponse(content=presets[industry])
+        return FastJSONResponse(content=presets[industry])
     except Exception as e:
         logger.error(f"Failed to load preset {industry}: {e}")
         return JSONResponse(
@@ -1292,7 +1411,7 @@ async def get_industry_preset(industry: str) -> JSONResponse:
 
 
 @app.post("/api/compile", response_class=HTMLResponse, tags=["compile"])
-@get_rate_limit_decorator()
+@get_rate_limit_decorator(cost=COMPILE_REQUEST_COST)
 async def compile_csv_html(
     request: Request,
     csv_file: UploadFile = File(...),
@@ -1446,14 +1565,15 @@ async def compile_csv_html(
                 ]
             )
         
-        # Thread-safe storage operations
-        with storage_lock:
-            job_dir = create_job_storage_path(job_id)
-            logger.info(f"[{request_id}] Created storage path: {job_dir}")
+        job_dir = create_job_storage_path(job_id)
+        logger.info(f"[{request_id}] Created storage path: {job_dir}")
         
-        # Process through complete pipeline
+        # Process through complete pipeline; identical in-flight submissions share one run
         try:
-            result = process_csv_and_spec(csv_content, spec_data, job_dir, job_id, creator=current_user)
+            result = await run_in_threadpool(
+                run_job_once,
+                job_dir, lambda: process_csv_and_spec(csv_content, spec_data, job_dir, job_id, creator=current_user)
+            )
             
             # Record usage after successful processing
             if current_user:
@@ -1526,7 +1646,7 @@ async def compile_csv_html(
 
 
 @app.post("/api/compile/json", tags=["compile"])
-@get_rate_limit_decorator()
+@get_rate_limit_decorator(cost=COMPILE_REQUEST_COST)
 async def compile_csv_json(
     request: Request,
     csv_file: UploadFile = File(...),
@@ -1651,18 +1771,17 @@ async def compile_csv_json(
                 ]
             )
         
-        # Thread-safe storage operations
-        with storage_lock:
-            job_dir = create_job_storage_path(job_id)
-            logger.info(f"[{request_id}] Created storage path: {job_dir}")
+        job_dir = create_job_storage_path(job_id)
+        logger.info(f"[{request_id}] Created storage path: {job_dir}")
         
-        # Process through complete pipeline
+        # Process through complete pipeline; identical in-flight submissions share one run
         try:
-            result = process_csv_and_spec(csv_content, spec_data, job_dir, job_id, 
-                                         creator=current_user,
-                                         utm_source=utm_source, utm_medium=utm_medium,
-                                         utm_campaign=utm_campaign, utm_term=utm_term,
-                                         utm_content=utm_content, referrer=referrer)
+            result = await run_in_threadpool(run_job_once, job_dir, lambda: process_csv_and_spec(
+                csv_content, spec_data, job_dir, job_id,
+                creator=current_user,
+                utm_source=utm_source, utm_medium=utm_medium,
+                utm_campaign=utm_campaign, utm_term=utm_term,
+                utm_content=utm_content, referrer=referrer))
             logger.info(f"[{request_id}] Processing completed: {'PASS' if result['pass'] else 'FAIL'}")
             # Record usage after successful processing
             try:
@@ -1670,7 +1789,7 @@ async def compile_csv_json(
             except Exception:
                 pass
             
-            return JSONResponse(
+            return FastJSONResponse(
                 status_code=200,
                 content=result
             )
@@ -1729,6 +1848,536 @@ async def compile_csv_json(
         )
 
 
+@app.post("/api/compile/multi", tags=["compile"])
+@get_rate_limit_decorator(cost=COMPILE_REQUEST_COST)
+async def compile_csv_multi(
+    request: Request,
+    csv_file: UploadFile = File(...),
+    specs_json: str = Form(...),
+    certificates: bool = Form(False),
+    industry: Optional[str] = Form(None)
+) -> JSONResponse:
+    """
+    Evaluate one CSV against several specifications in a single request.
+    
+    The CSV is uploaded, parsed and normalized once; each spec is decided
+    against the shared trace. With certificates=true every decided spec is
+    compiled into its own job (PDF, evidence bundle) in parallel. Each spec
+    costs one certificate of quota either way: the whole request is reserved
+    up front and specs that fail are given back.
+    
+    Args:
+        request: FastAPI request object
+        csv_file: Uploaded CSV temperature log file
+        specs_json: JSON array of specifications (v2 or legacy format)
+        certificates: Also generate a certificate job per spec
+        industry: Industry applied to v2 specs that do not name one
+        
+    Returns:
+        JSONResponse: Per-spec results in request order
+        
+    Example:
+        POST /api/compile/multi with specs_json='[{"industry": "powder", ...}, {...}]'
+    """
+    request_id = str(uuid.uuid4())[:8]
+    logger.info(f"[{request_id}] Starting multi-spec compile request from {request.client.host if request.client else 'unknown'}")
+    
+    # Require authentication for API usage
+    current_user = get_current_user(request)
+    if not current_user:
+        return JSONResponse(
+            status_code=401,
+            content={"error": "Authentication required", "message": "Sign in to use the API"}
+        )
+    
+    try:
+        csv_content = validate_file_upload(csv_file, request)
+    except HTTPException as e:
+        return JSONResponse(
+            status_code=e.status_code,
+            content={"error": "Request validation failed", "message": e.detail}
+        )
+    
+    try:
+        specs_list = json.loads(specs_json)
+    except json.JSONDecodeError as e:
+        return JSONResponse(
+            status_code=400,
+            content={"error": "Invalid JSON specification", "message": f"JSON parsing error: {str(e)}"}
+        )
+    
+    if not isinstance(specs_list, list) or not specs_list:
+        return JSONResponse(
+            status_code=400,
+            content={"error": "Invalid specification list", "message": "specs_json must be a non-empty JSON array"}
+        )
+    if len(specs_list) > MULTI_SPEC_MAX:
+        return JSONResponse(
+            status_code=400,
+            content={
+                "error": "Too many specifications",
+                "message": f"{len(specs_list)} specifications submitted, at most {MULTI_SPEC_MAX} allowed"
+            }
+        )
+    
+    # Resolve every spec to v1 form and give it its deterministic job ID
+    results: List[Optional[Dict[str, Any]]] = [None] * len(specs_list)
+    accepted = []  # (position, spec_data, job_id, spec)
+    for position, spec_data in enumerate(specs_list):
+        try:
+            spec_data = resolve_spec_format(spec_data, industry)
+            job_id = generate_job_id(spec_data, csv_content)
+            if not isinstance(spec_data.get('job'), dict):
+                spec_data['job'] = {}
+            spec_data['job']['job_id'] = job_id
+            accepted.append((position, spec_data, job_id, SpecV1(**spec_data)))
+        except Exception as e:
+            results[position] = {"index": position, "status": "ERROR", "error": f"Invalid specification: {str(e)}"}
+    
+    if not accepted:
+        return FastJSONResponse(status_code=200, content={"count": len(results), "passed": 0, "results": results})
+    
+    # Each decided spec costs one certificate, with or without a PDF. Reserve
+    # quota for all of them up front and give back the ones that fail.
+    reserved = False
+    try:
+        from middleware.quota import reserve_compilation_quota
+        reserved, quota_error = reserve_compilation_quota(current_user, len(accepted))
+        if not reserved:
+            return JSONResponse(
+                status_code=402,
+                content={"error": "Monthly quota exceeded", "message": quota_error, "details": {"upgrade_url": "/pricing"}}
+            )
+    except Exception as e:
+        logger.warning(f"[{request_id}] Quota reservation failed: {e}")
+    
+    succeeded = 0
+    try:
+        try:
+            df = load_csv_content(csv_content)
+        except Exception as e:
+            logger.warning(f"[{request_id}] CSV processing failed: {e}")
+            return JSONResponse(
+                status_code=400,
+                content={"error": "Processing failed", "message": f"CSV processing failed: {str(e)}"}
+            )
+        
+        evaluations = evaluate_specs(df, [spec for _, _, _, spec in accepted])
+        
+        def compile_certificate(evaluation, spec_data, job_id):
+            job_dir = create_job_storage_path(job_id)
+            
+            def compile_job():
+                raw_csv_path = save_file_to_storage(csv_content, job_dir, "raw_data.csv")
+                spec_json_path = save_file_to_storage(
+                    dumps_canonical(spec_data).encode('utf-8'), job_dir, "specification.json"
+                )
+                return compile_normalized_job(
+                    evaluation.normalized_df, spec_data, evaluation.spec, job_dir, job_id,
+                    raw_csv_path, spec_json_path, creator=current_user, decision=evaluation.decision
+                )
+            
+            return run_job_once(job_dir, compile_job)
+        
+        jobs = []
+        for (position, spec_data, job_id, _), evaluation in zip(accepted, evaluations):
+            if not evaluation.ok:
+                results[position] = {
+                    "index": position, "id": job_id, "status": "ERROR",
+                    "error": f"{evaluation.error_stage.capitalize()} failed: {evaluation.error}"
+                }
+            elif certificates:
+                jobs.append((position, evaluation, spec_data, job_id))
+            else:
+                results[position] = {"index": position, **decision_summary(evaluation.decision, job_id, spec_data)}
+                succeeded += 1
+        
+        if jobs:
+            with ThreadPoolExecutor(max_workers=MULTI_SPEC_WORKERS, thread_name_prefix="multi-spec") as pool:
+                futures = {
+                    position: asyncio.wrap_future(pool.submit(compile_certificate, evaluation, spec_data, job_id))
+                    for position, evaluation, spec_data, job_id in jobs
+                }
+                for position, future in futures.items():
+                    try:
+                        results[position] = {"index": position, **(await future)}
+                        succeeded += 1
+                    except HTTPException as e:
+                        results[position] = {"index": position, "status": "ERROR", "error": e.detail}
+                    except Exception as e:
+                        logger.error(f"[{request_id}] Certificate for spec {position} failed: {e}")
+                        results[position] = {"index": position, "status": "ERROR", "error": str(e)}
+    finally:
+        if reserved and succeeded < len(accepted):
+            from middleware.quota import release_quota_reservation
+            release_quota_reservation(current_user, len(accepted) - succeeded)
+    
+    passed = sum(1 for result in results if result.get("pass"))
+    logger.info(f"[{request_id}] Multi-spec compile completed: {passed}/{len(results)} passed")
+    return FastJSONResponse(
+        status_code=200,
+        content={"count": len(results), "passed": passed, "results": results}
+    )
+
+
+@app.post("/api/compile/batch", tags=["compile"])
+@get_rate_limit_decorator(cost=COMPILE_REQUEST_COST)
+async def compile_csv_batch(
+    request: Request,
+    files: List[UploadFile] = File(...),
+    spec_json: Optional[str] = Form(None),
+    specs_json: Optional[str] = Form(None),
+    industry: Optional[str] = Form(None)
+):
+    """
+    Compile many CSV files in one request and stream per-job results.
+    
+    Accepts several CSV uploads or a single ZIP archive of CSVs. Every file is
+    compiled with the shared spec_json, or with its own entry in specs_json
+    (an object keyed by filename). Quota for the whole batch is reserved in
+    one step before any work starts; jobs run on the batch worker pool and
+    each result is streamed as an NDJSON line as soon as it finishes. Failed
+    jobs are given back to the quota when the batch completes.
+    
+    Args:
+        request: FastAPI request object
+        files: CSV files, or one ZIP archive containing CSV files
+        spec_json: Specification applied to every file
+        specs_json: JSON object mapping filename to specification
+        industry: Industry applied to v2 specs that do not name one
+        
+    Returns:
+        StreamingResponse of NDJSON lines: one "result" line per file in
+        completion order, then a final "summary" line
+        
+    Example:
+        POST /api/compile/batch with files=@runs.zip and spec_json='{"industry": "powder", ...}'
+    """
+    request_id = str(uuid.uuid4())[:8]
+    logger.info(f"[{request_id}] Starting batch compile request from {request.client.host if request.client else 'unknown'}")
+    
+    # Require authentication for API usage
+    current_user = get_current_user(request)
+    if not current_user:
+        return JSONResponse(
+            status_code=401,
+            content={"error": "Authentication required", "message": "Sign in to use the API"}
+        )
+    
+    try:
+        shared_spec = json.loads(spec_json) if spec_json else None
+        file_specs = json.loads(specs_json) if specs_json else {}
+    except json.JSONDecodeError as e:
+        return JSONResponse(
+            status_code=400,
+            content={"error": "Invalid JSON specification", "message": f"JSON parsing error: {str(e)}"}
+        )
+    if not isinstance(file_specs, dict) or (shared_spec is None and not file_specs):
+        return JSONResponse(
+            status_code=400,
+            content={
+                "error": "Invalid specification",
+                "message": "Provide spec_json, or specs_json as a JSON object keyed by filename"
+            }
+        )
+    
+    # Collect (filename, content, error) for every CSV in the batch
+    uploads = []
+    if len(files) == 1 and (files[0].filename or "").lower().endswith(".zip"):
+        try:
+            members = extract_zip_csvs(files[0].file.read(), BATCH_MAX_FILES, MAX_UPLOAD_SIZE)
+        except ValueError as e:
+            return JSONResponse(
+                status_code=400,
+                content={"error": "Invalid ZIP archive", "message": str(e)}
+            )
+        for filename, content in members:
+            try:
+                validate_csv_content(filename, content)
+                uploads.append((filename, content, None))
+            except HTTPException as e:
+                uploads.append((filename, None, e.detail))
+    else:
+        if len(files) > BATCH_MAX_FILES:
+            return JSONResponse(
+                status_code=400,
+                content={
+                    "error": "Too many files",
+                    "message": f"{len(files)} files submitted, at most {BATCH_MAX_FILES} allowed"
+                }
+            )
+        for upload in files:
+            try:
+                uploads.append((upload.filename, validate_file_upload(upload), None))
+            except HTTPException as e:
+                uploads.append((upload.filename, None, e.detail))
+    
+    # Resolve specs and job IDs; invalid files are reported without running
+    rejected = []  # NDJSON records emitted before any job runs
+    jobs = []  # (index, job callable)
+    filenames = {}
+    job_indices = {}  # job_id -> index of the file that compiles it
+    for index, (filename, csv_content, error) in enumerate(uploads):
+        filenames[index] = filename
+        if error is None:
+            try:
+                spec_data = copy.deepcopy(file_specs.get(filename, shared_spec))
+                if spec_data is None:
+                    raise ValueError(f"No specification for {filename}")
+                spec_data = resolve_spec_format(spec_data, industry)
+            except Exception as e:
+                error = f"Invalid specification: {str(e)}"
+        if error is not None:
+            rejected.append({
+                "type": "result", "index": index, "filename": filename,
+                "status": "ERROR", "error": error, "status_code": 400
+            })
+            continue
+        
+        job_id = generate_job_id(spec_data, csv_content)
+        if job_id in job_indices:
+            # Identical file and spec: compile once rather than racing on one job directory
+            rejected.append({
+                "type": "result", "index": index, "filename": filename,
+                "id": job_id, "status": "DUPLICATE", "duplicate_of": job_indices[job_id]
+            })
+            continue
+        job_indices[job_id] = index
+        jobs.append((index, functools.partial(_compile_job, csv_content, spec_data, job_id, current_user)))
+    
+    # Reserve quota for the whole batch up front
+    reserved = False
+    if jobs:
+        try:
+            from middleware.quota import reserve_compilation_quota
+            reserved, quota_error = reserve_compilation_quota(current_user, len(jobs))
+            if not reserved:
+                return JSONResponse(
+                    status_code=402,
+                    content={"error": "Monthly quota exceeded", "message": quota_error, "details": {"upgrade_url": "/pricing"}}
+                )
+        except Exception as e:
+            logger.warning(f"[{request_id}] Quota reservation failed: {e}")
+    
+    logger.info(f"[{request_id}] Batch accepted: {len(jobs)} jobs, {len(rejected)} not run")
+    
+    async def stream_results():
+        passed = 0
+        failed = 0
+        try:
+            for record in rejected:
+                yield ndjson_line(record)
+            
+            async for index, result, error in stream_job_results(jobs):
+                record = {"type": "result", "index": index, "filename": filenames[index]}
+                if error is None:
+                    passed += 1 if result.get("pass") else 0
+                    record.update(result)
+                else:
+                    failed += 1
+                    if isinstance(error, HTTPException):
+                        record.update(status="ERROR", error=error.detail, status_code=error.status_code)
+                    else:
+                        logger.error(f"[{request_id}] Batch job for {filenames[index]} failed: {error}")
+                        record.update(status="ERROR", error=str(error), status_code=500)
+                yield ndjson_line(record)
+            
+            yield ndjson_line({
+                "type": "summary",
+                "count": len(uploads),
+                "compiled": len(jobs) - failed,
+                "passed": passed,
+                "errors": failed + sum(1 for record in rejected if record["status"] == "ERROR")
+            })
+            logger.info(f"[{request_id}] Batch compile completed: {passed}/{len(jobs)} passed")
+        finally:
+            if reserved and failed:
+                from middleware.quota import release_quota_reservation
+                release_quota_reservation(current_user, failed)
+    
+    return StreamingResponse(stream_results(), media_type=NDJSON_MEDIA_TYPE)
+
+
+def _compile_job(csv_content: bytes, spec_data: Dict[str, Any], job_id: str, creator) -> Dict[str, Any]:
+    """Run one CSV through process_csv_and_spec in its own job directory."""
+    job_dir = create_job_storage_path(job_id)
+    return run_job_once(job_dir, lambda: process_csv_and_spec(csv_content, spec_data, job_dir, job_id, creator=creator))
+
+
+@app.post("/api/live/runs", tags=["live"])
+@get_rate_limit_decorator()
+async def live_open_run(request: Request) -> JSONResponse:
+    """
+    Open a live run that accepts logger readings while a cycle is running.
+    
+    Args:
+        request: FastAPI request with JSON body {"spec": {...}, "industry": optional}
+        
+    Returns:
+        JSONResponse: 201 with the run ID and initial state
+        
+    Example:
+        POST /api/live/runs {"spec": {"industry": "autoclave", ...}}
+    """
+    current_user = get_current_user(request)
+    if not current_user:
+        return JSONResponse(
+            status_code=401,
+            content={"error": "Authentication required", "message": "Sign in to use the API"}
+        )
+    
+    try:
+        body = await request.json()
+        spec_data = resolve_spec_format(body.get("spec"), body.get("industry"))
+        # The job ID is derived from the samples when the run is closed
+        spec = SpecV1(**{**spec_data, "job": {"job_id": "live"}})
+    except Exception as e:
+        return JSONResponse(
+            status_code=400,
+            content={"error": "Invalid specification", "message": str(e)}
+        )
+    
+    run = await run_in_threadpool(open_run, spec, spec_data, current_user.email)
+    return FastJSONResponse(status_code=201, content=run.snapshot())
+
+
+@app.post("/api/live/runs/{run_id}/samples", tags=["live"])
+async def live_append_samples(request: Request, run_id: str) -> JSONResponse:
+    """
+    Append a batch of samples to an open run and return its updated state.
+    
+    Args:
+        request: FastAPI request with JSON body {"samples": [{"timestamp": ..., "temp_1": ...}, ...]}
+        run_id: Live run identifier
+        
+    Returns:
+        JSONResponse: Run state with status IN_PROGRESS, REQUIREMENT_MET or FAILED
+    """
+    current_user = get_current_user(request)
+    if not current_user:
+        return JSONResponse(
+            status_code=401,
+            content={"error": "Authentication required", "message": "Sign in to use the API"}
+        )
+    
+    run = await run_in_threadpool(get_run, run_id, current_user.email)
+    if run is None:
+        return JSONResponse(status_code=404, content={"error": "Live run not found"})
+    
+    try:
+        body = await request.json()
+        samples = body.get("samples") if isinstance(body, dict) else None
+        if not isinstance(samples, list):
+            raise LiveRunError("Body must be a JSON object with a 'samples' array")
+        return FastJSONResponse(status_code=200, content=await run_in_threadpool(run.append, samples))
+    except (LiveRunError, ValueError) as e:
+        return JSONResponse(
+            status_code=400,
+            content={"error": "Invalid samples", "message": str(e)}
+        )
+
+
+@app.get("/api/live/runs/{run_id}", tags=["live"])
+async def live_run_state(request: Request, run_id: str) -> JSONResponse:
+    """
+    Get the current state of an open run.
+    
+    Args:
+        request: FastAPI request object
+        run_id: Live run identifier
+        
+    Returns:
+        JSONResponse: Run state snapshot
+    """
+    current_user = get_current_user(request)
+    if not current_user:
+        return JSONResponse(
+            status_code=401,
+            content={"error": "Authentication required", "message": "Sign in to use the API"}
+        )
+    
+    run = await run_in_threadpool(get_run, run_id, current_user.email)
+    if run is None:
+        return JSONResponse(status_code=404, content={"error": "Live run not found"})
+    return FastJSONResponse(status_code=200, content=run.snapshot())
+
+
+@app.post("/api/live/runs/{run_id}/close", tags=["live"])
+@get_rate_limit_decorator()
+async def live_close_run(request: Request, run_id: str) -> JSONResponse:
+    """
+    Close a run and compile its samples like an uploaded CSV.
+    
+    The stored samples go through process_csv_and_spec, so the job ID, PDF,
+    evidence bundle and verification URL match a normal compile of the same
+    data. The run stops accepting samples while it compiles and reopens if
+    compilation fails; usage is recorded once, by the request that removes it.
+    
+    Args:
+        request: FastAPI request object
+        run_id: Live run identifier
+        
+    Returns:
+        JSONResponse: Compile result as for /api/compile/json, plus the final live state
+    """
+    current_user = get_current_user(request)
+    if not current_user:
+        return JSONResponse(
+            status_code=401,
+            content={"error": "Authentication required", "message": "Sign in to use the API"}
+        )
+    
+    if await run_in_threadpool(get_run, run_id, current_user.email) is None:
+        return JSONResponse(status_code=404, content={"error": "Live run not found"})
+    
+    try:
+        from middleware.quota import check_compilation_quota
+        can_compile, quota_error = check_compilation_quota(current_user)
+        if not can_compile:
+            return JSONResponse(
+                status_code=402,
+                content={"error": "Monthly quota exceeded", "message": quota_error, "details": {"upgrade_url": "/pricing"}}
+            )
+    except Exception as e:
+        logger.warning(f"Quota check failed for live run {run_id}: {e}")
+    
+    try:
+        run = await run_in_threadpool(close_run, run_id, current_user.email)
+    except LiveRunError as e:
+        return JSONResponse(status_code=409, content={"error": "Live run is closing", "message": str(e)})
+    if run is None:
+        return JSONResponse(status_code=404, content={"error": "Live run not found"})
+    
+    try:
+        csv_content = await run_in_threadpool(run.to_csv_bytes)
+        live_state = run.snapshot()
+        spec_data = copy.deepcopy(run.spec_data)
+        job_id = generate_job_id(spec_data, csv_content)
+        result = await run_in_threadpool(_compile_job, csv_content, spec_data, job_id, current_user)
+    except LiveRunError as e:
+        await run_in_threadpool(cancel_close, run_id)
+        return JSONResponse(status_code=400, content={"error": "Processing failed", "message": str(e)})
+    except HTTPException as e:
+        await run_in_threadpool(cancel_close, run_id)
+        return JSONResponse(
+            status_code=e.status_code,
+            content={"error": "Processing failed", "message": e.detail, "details": {"status_code": e.status_code}}
+        )
+    except Exception as e:
+        logger.error(f"Live run {run_id} compile failed: {e}")
+        await run_in_threadpool(cancel_close, run_id)
+        return JSONResponse(status_code=500, content={"error": "Processing failed", "message": str(e)})
+    
+    if await run_in_threadpool(finish_close, run_id):
+        try:
+            from middleware.quota import record_usage
+            record_usage(current_user, 'certificate_compiled')
+        except Exception:
+            pass
+    
+    return FastJSONResponse(status_code=200, content={**result, "live": live_state})
+
+
 @app.get("/verify/{bundle_id}", response_class=HTMLResponse, tags=["verify"])
 async def verify_bundle(request: Request, bundle_id: str) -> HTMLResponse:
     """
@@ -1869,7 +2518,7 @@ async def verify_bundle(request: Request, bundle_id: str) -> HTMLResponse:
             "manifest_message": "Manifest found and valid" if verification_result["manifest_found"] else "Manifest issues",
             "root_hash": verification_result.get("root_hash", "unknown"),
             "timestamp": datetime.now(timezone.utc).isoformat(),
-            "version": "0.1.0",
+            "version": get_build_info().version,
             "decision": decision_data,
             "file_hashes": [
                 {"filename": "raw_data.csv", "valid": True, "hash": "verified"},
@@ -1918,17 +2567,20 @@ async def download_file(
     bundle_id: str, 
     file_type: str, 
     request: Request
-) -> FileResponse:
+) -> Response:
     """
     Download files from an evidence bundle.
     
+    Supports If-None-Match (304) and single byte ranges (206). Versioned URLs
+    (?v=<content hash prefix>) are served as immutable.
+    
     Args:
         bundle_id: Unique identifier for the evidence bundle
         file_type: Type of file to download ('pdf' or 'zip')
-        request: FastAPI request object for logging
+        request: FastAPI request object for logging and conditional headers
         
     Returns:
-        FileResponse: The requested file for download
+        Response: The requested file (or byte range) for download
         
     Raises:
         HTTPException: If bundle or file not found
@@ -1963,10 +2615,12 @@ async def download_file(
         # Determine file path and name
         if file_type == 'pdf':
             file_path = job_dir / "proof.pdf"
+            artifact_key = "proof_pdf"
             filename = f"proofkit_certificate_{bundle_id}.pdf"
             media_type = "application/pdf"
         elif file_type == 'zip':
             file_path = job_dir / "evidence.zip"
+            artifact_key = "evidence_zip"
             filename = f"proofkit_evidence_{bundle_id}.zip"
             media_type = "application/zip"
         
@@ -1979,17 +2633,17 @@ async def download_file(
             logger.error(f"[{request_id}] Security violation: path traversal attempt")
             raise HTTPException(status_code=403, detail="Access denied")
         
+        # Content hash recorded when the artifact was written; hash once for older jobs
+        content_hash = get_artifact_hash(job_dir, artifact_key) or cached_file_sha256(file_path)
+        
         logger.info(f"[{request_id}] Serving file: {file_path} ({file_path.stat().st_size} bytes)")
         
-        return FileResponse(
-            path=str(file_path),
+        return artifact_response(
+            request,
+            file_path,
+            content_hash,
             filename=filename,
-            media_type=media_type,
-            headers={
-                "Cache-Control": "no-cache, no-store, must-revalidate",
-                "Pragma": "no-cache",
-                "Expires": "0"
-            }
+            media_type=media_type
         )
         
     except HTTPException:
@@ -2066,10 +2720,7 @@ async def industry_page(request: Request, industry: str) -> HTMLResponse:
     if industry not in valid_industries:
         raise HTTPException(status_code=404, detail="Industry not found")
     
-    return templates.TemplateResponse(
-        valid_industries[industry],
-        {"request": request}
-    )
+    return static_pages.render(request, valid_industries[industry])
 
 
 # Targeted redirects to eliminate legacy 500s from bad URLs seen in the wild
@@ -2180,7 +2831,7 @@ async def powder_coat_page(request: Request) -> HTMLResponse:
         Browser GET /powder-coat returns powder coating form with 180°C cure preset
     """
     presets = get_industry_presets()
-    powder_preset_json = json.dumps(presets.get("powder", {}), indent=2) if "powder" in presets else get_default_spec("powder")
+    powder_preset_json = get_default_spec("powder")
     
     return templates.TemplateResponse(
         "industry/powder.html",
@@ -2206,7 +2857,7 @@ async def haccp_page(request: Request) -> HTMLResponse:
         Browser GET /haccp returns HACCP form with cooling validation preset
     """
     presets = get_industry_presets()
-    haccp_preset_json = json.dumps(presets.get("haccp", {}), indent=2) if "haccp" in presets else get_default_spec("haccp")
+    haccp_preset_json = get_default_spec("haccp")
     
     return templates.TemplateResponse(
         "industry/haccp.html",
@@ -2232,7 +2883,7 @@ async def autoclave_page(request: Request) -> HTMLResponse:
         Browser GET /autoclave returns autoclave form with 121°C sterilization preset
     """
     presets = get_industry_presets()
-    autoclave_preset_json = json.dumps(presets.get("autoclave", {}), indent=2) if "autoclave" in presets else get_default_spec("autoclave")
+    autoclave_preset_json = get_default_spec("autoclave")
     
     return templates.TemplateResponse(
         "industry/autoclave.html",
@@ -2258,7 +2909,7 @@ async def sterile_page(request: Request) -> HTMLResponse:
         Browser GET /sterile returns sterile form with cleanroom validation preset
     """
     presets = get_industry_presets()
-    sterile_preset_json = json.dumps(presets.get("sterile", {}), indent=2) if "sterile" in presets else get_default_spec("sterile")
+    sterile_preset_json = get_default_spec("sterile")
     
     return templates.TemplateResponse(
         "industries/sterile.html",
@@ -2284,7 +2935,7 @@ async def concrete_page(request: Request) -> HTMLResponse:
         Browser GET /concrete returns concrete form with curing validation preset
     """
     presets = get_industry_presets()
-    concrete_preset_json = json.dumps(presets.get("concrete", {}), indent=2) if "concrete" in presets else get_default_spec("concrete")
+    concrete_preset_json = get_default_spec("concrete")
     
     return templates.TemplateResponse(
         "industry/concrete.html",
@@ -2310,7 +2961,7 @@ async def cold_chain_page(request: Request) -> HTMLResponse:
         Browser GET /cold-chain returns cold chain form with 2-8°C storage preset
     """
     presets = get_industry_presets()
-    coldchain_preset_json = json.dumps(presets.get("coldchain", {}), indent=2) if "coldchain" in presets else get_default_spec("coldchain")
+    coldchain_preset_json = get_default_spec("coldchain")
     
     return templates.TemplateResponse(
         "industry/coldchain.html",
@@ -2335,10 +2986,7 @@ async def trust_page(request: Request) -> HTMLResponse:
     Example:
         Browser GET /trust returns trust page with cryptographic verification details
     """
-    return templates.TemplateResponse(
-        "trust.html",
-        {"request": request}
-    )
+    return static_pages.render(request, "trust.html")
 
 
 @app.get("/pricing", response_class=HTMLResponse, tags=["compile"])
@@ -2367,6 +3015,107 @@ async def pricing_page(request: Request) -> HTMLResponse:
     )
 
 
+# Blog content parsing (memoized per file by content_files)
+def _parse_blog_summary(content: str) -> Dict[str, str]:
+    """Extract the title and excerpt shown on the blog index."""
+    lines = content.split('\n')
+    title = lines[0].replace('# ', '') if lines else ""
+    
+    # Extract excerpt from content (first paragraph after title)
+    excerpt = ""
+    for line in lines[1:]:
+        if line.strip() and not line.startswith('*'):
+            excerpt = line.strip()[:200] + "..."
+            break
+    
+    return {'title': title, 'excerpt': excerpt}
+
+
+def _parse_blog_post(content: str) -> Dict[str, str]:
+    """Extract the title and excerpt of a blog post and render its body."""
+    # Simple markdown parsing - extract title and content
+    lines = content.split('\n')
+    title = lines[0].replace('# ', '') if lines else ""
+    
+    # Compute excerpt: first non-empty paragraph after title
+    excerpt = ""
+    for line in lines[1:]:
+        stripped_line = line.strip()
+        if stripped_line and not stripped_line.startswith('*') and not stripped_line.startswith('#'):
+            excerpt = stripped_line[:200] + "..."
+            break
+    
+    return {'title': title, 'excerpt': excerpt, 'content': _blog_markdown_to_html(content)}
+
+
+def _blog_markdown_to_html(md_text: str) -> str:
+    """Convert markdown to HTML with proper escaping for Jinja2 safety"""
+    lines = md_text.split('\n')
+    html_lines = []
+    in_list = False
+
+    for line in lines:
+        stripped = line.strip()
+
+        # Handle headers
+        if stripped.startswith('### '):
+            if in_list:
+                html_lines.append('</ul>')
+                in_list = False
+            content = html.escape(stripped[4:])
+            html_lines.append(f'<h3 style="color: #1a1a1a; font-size: 1.25rem; font-weight: 600; margin: 2rem 0 1rem 0;">{content}</h3>')
+        elif stripped.startswith('## '):
+            if in_list:
+                html_lines.append('</ul>')
+                in_list = False
+            content = html.escape(stripped[3:])
+            html_lines.append(f'<h2 style="color: #1a1a1a; font-size: 1.5rem; font-weight: 600; margin: 2rem 0 1rem 0;">{content}</h2>')
+        elif stripped.startswith('# '):
+            if in_list:
+                html_lines.append('</ul>')
+                in_list = False
+            # Skip the title as it's handled separately
+            continue
+
+        # Handle bullet points
+        elif stripped.startswith('- '):
+            if not in_list:
+                html_lines.append('<ul style="margin-bottom: 1.5rem; padding-left: 1.5rem;">')
+                in_list = True
+            content = html.escape(stripped[2:])
+            # Handle bold text in bullet points
+            content = re.sub(r'\*\*(.*?)\*\*', r'<strong>\1</strong>', content)
+            html_lines.append(f'<li style="margin-bottom: 0.5rem;">{content}</li>')
+
+        # Handle empty lines
+        elif stripped == '':
+            if in_list:
+                html_lines.append('</ul>')
+                in_list = False
+            html_lines.append('')
+
+        # Handle regular paragraphs
+        else:
+            if in_list:
+                html_lines.append('</ul>')
+                in_list = False
+
+            if stripped:
+                # Escape HTML to prevent Jinja2 conflicts
+                content = html.escape(stripped)
+                # Handle bold text
+                content = re.sub(r'\*\*(.*?)\*\*', r'<strong>\1</strong>', content)
+                # Handle links
+                content = re.sub(r'\[(.*?)\]\((.*?)\)', r'<a href="\2" style="color: #667eea; text-decoration: none;">\1</a>', content)
+                html_lines.append(f'<p style="margin-bottom: 1.5rem;">{content}</p>')
+
+    # Close any open list
+    if in_list:
+        html_lines.append('</ul>')
+
+    return '\n'.join(html_lines)
+
+
 # Blog routes
 @app.get("/blog", response_class=HTMLResponse, tags=["blog"])
 async def blog_index(request: Request) -> HTMLResponse:
@@ -2382,33 +3131,18 @@ async def blog_index(request: Request) -> HTMLResponse:
     
     if blog_dir.exists():
         for blog_file in blog_dir.glob("*.md"):
-            # Read first few lines to get title and metadata
             try:
-                with open(blog_file, 'r', encoding='utf-8') as f:
-                    content = f.read()
-                    lines = content.split('\n')
-                    title = lines[0].replace('# ', '') if lines else blog_file.stem
-                    
-                    # Extract excerpt from content (first paragraph after title)
-                    excerpt = ""
-                    for line in lines[1:]:
-                        if line.strip() and not line.startswith('*'):
-                            excerpt = line.strip()[:200] + "..."
-                            break
-                    
-                    blog_posts.append({
-                        'slug': blog_file.stem,
-                        'title': title,
-                        'excerpt': excerpt,
-                        'filename': blog_file.name
-                    })
+                summary = content_files.get(blog_file, _parse_blog_summary)
+                blog_posts.append({
+                    'slug': blog_file.stem,
+                    'title': summary['title'] or blog_file.stem,
+                    'excerpt': summary['excerpt'],
+                    'filename': blog_file.name
+                })
             except Exception as e:
                 logging.warning(f"Could not parse blog file {blog_file}: {e}")
     
-    return templates.TemplateResponse(
-        "blog/index.html",
-        {"request": request, "blog_posts": blog_posts}
-    )
+    return static_pages.render(request, "blog/index.html", {"blog_posts": blog_posts})
 
 
 @app.get("/blog/{slug}", response_class=HTMLResponse, tags=["blog"])
@@ -2428,99 +3162,16 @@ async def blog_post(request: Request, slug: str) -> HTMLResponse:
         raise HTTPException(status_code=404, detail="Blog post not found")
     
     try:
-        with open(blog_file, 'r', encoding='utf-8') as f:
-            content = f.read()
-            
-        # Simple markdown parsing - extract title and content
-        lines = content.split('\n')
-        title = lines[0].replace('# ', '') if lines else slug.replace('-', ' ').title()
-        
-        # Compute excerpt: first non-empty paragraph after title
-        excerpt = ""
-        for line in lines[1:]:
-            stripped_line = line.strip()
-            if stripped_line and not stripped_line.startswith('*') and not stripped_line.startswith('#'):
-                excerpt = stripped_line[:200] + "..."
-                break
-        
-        # Proper markdown to HTML conversion with Jinja2 safety
-        def markdown_to_html(md_text):
-            """Convert markdown to HTML with proper escaping for Jinja2 safety"""
-            lines = md_text.split('\n')
-            html_lines = []
-            in_list = False
-            
-            for line in lines:
-                stripped = line.strip()
-                
-                # Handle headers
-                if stripped.startswith('### '):
-                    if in_list:
-                        html_lines.append('</ul>')
-                        in_list = False
-                    content = html.escape(stripped[4:])
-                    html_lines.append(f'<h3 style="color: #1a1a1a; font-size: 1.25rem; font-weight: 600; margin: 2rem 0 1rem 0;">{content}</h3>')
-                elif stripped.startswith('## '):
-                    if in_list:
-                        html_lines.append('</ul>')
-                        in_list = False
-                    content = html.escape(stripped[3:])
-                    html_lines.append(f'<h2 style="color: #1a1a1a; font-size: 1.5rem; font-weight: 600; margin: 2rem 0 1rem 0;">{content}</h2>')
-                elif stripped.startswith('# '):
-                    if in_list:
-                        html_lines.append('</ul>')
-                        in_list = False
-                    # Skip the title as it's handled separately
-                    continue
-                    
-                # Handle bullet points
-                elif stripped.startswith('- '):
-                    if not in_list:
-                        html_lines.append('<ul style="margin-bottom: 1.5rem; padding-left: 1.5rem;">')
-                        in_list = True
-                    content = html.escape(stripped[2:])
-                    # Handle bold text in bullet points
-                    content = re.sub(r'\*\*(.*?)\*\*', r'<strong>\1</strong>', content)
-                    html_lines.append(f'<li style="margin-bottom: 0.5rem;">{content}</li>')
-                    
-                # Handle empty lines
-                elif stripped == '':
-                    if in_list:
-                        html_lines.append('</ul>')
-                        in_list = False
-                    html_lines.append('')
-                    
-                # Handle regular paragraphs
-                else:
-                    if in_list:
-                        html_lines.append('</ul>')
-                        in_list = False
-                    
-                    if stripped:
-                        # Escape HTML to prevent Jinja2 conflicts
-                        content = html.escape(stripped)
-                        # Handle bold text
-                        content = re.sub(r'\*\*(.*?)\*\*', r'<strong>\1</strong>', content)
-                        # Handle links
-                        content = re.sub(r'\[(.*?)\]\((.*?)\)', r'<a href="\2" style="color: #667eea; text-decoration: none;">\1</a>', content)
-                        html_lines.append(f'<p style="margin-bottom: 1.5rem;">{content}</p>')
-            
-            # Close any open list
-            if in_list:
-                html_lines.append('</ul>')
-            
-            return '\n'.join(html_lines)
+        post = content_files.get(blog_file, _parse_blog_post)
         
-        html_content = markdown_to_html(content)
-        
-        return templates.TemplateResponse(
+        return static_pages.render(
+            request,
             "blog/post.html",
             {
-                "request": request, 
-                "title": title,
-                "content": html_content,
+                "title": post['title'] or slug.replace('-', ' ').title(),
+                "content": post['content'],
                 "slug": slug,
-                "excerpt": excerpt,
+                "excerpt": post['excerpt'],
                 "date": "Recently Published",  # Add default date
                 "reading_time": 5  # Add default reading time
             }
@@ -2539,10 +3190,7 @@ async def docs_page(request: Request) -> HTMLResponse:
     Returns:
         HTMLResponse: Documentation page
     """
-    return templates.TemplateResponse(
-        "docs.html",
-        {"request": request}
-    )
+    return static_pages.render(request, "docs.html")
 
 
 @app.get("/sitemap.xml", tags=["seo"])
@@ -3077,7 +3725,7 @@ async def approve_job(request: Request, job_id: str) -> JSONResponse:
         
         # Save updated metadata
         with open(meta_path, 'w') as f:
-            json.dump(job_meta, f, indent=2)
+            f.write(dumps_canonical(job_meta))
         
         # Regenerate PDF without "DRAFT" watermark
         try:
@@ -3126,6 +3774,12 @@ async def approve_job(request: Request, job_id: str) -> JSONResponse:
                     user_plan=creator_plan
                 )
                 
+                # The approved PDF replaces the draft; record its new content hash
+                if pdf_path.exists():
+                    job_meta.setdefault("artifact_hashes", {})["proof_pdf"] = file_sha256(pdf_path)
+                with open(meta_path, 'w') as f:
+                    f.write(dumps_canonical(job_meta))
+                
                 logger.info(f"Job {job_id} approved by {user.email} and PDF regenerated")
             else:
                 logger.warning(f"Missing files for PDF regeneration in job {job_id}")
@@ -3134,6 +3788,12 @@ async def approve_job(request: Request, job_id: str) -> JSONResponse:
             logger.error(f"Failed to regenerate PDF for approved job {job_id}: {e}")
             # Don't fail the approval if PDF regeneration fails
         
+        # Pre-render the validation pack for the new approval state
+        try:
+            await run_in_threadpool(ensure_validation_pack, job_id, job_meta, job_dir)
+        except Exception as e:
+            logger.error(f"Failed to pre-render validation pack for approved job {job_id}: {e}")
+        
         return JSONResponse({
             "message": f"Job {job_id} approved successfully",
             "approved_by": user.email,
@@ -3147,6 +3807,25 @@ async def approve_job(request: Request, job_id: str) -> JSONResponse:
         raise HTTPException(status_code=500, detail="Failed to approve job")
 
 
+def get_artifact_hash(job_dir: Path, artifact_key: str) -> Optional[str]:
+    """
+    Get the recorded SHA-256 of a job artifact from its metadata.
+    
+    Args:
+        job_dir: Job directory path
+        artifact_key: Key in metadata "artifact_hashes" (e.g. 'proof_pdf')
+        
+    Returns:
+        Hex digest, or None if the job predates recorded hashes
+    """
+    meta_path = job_dir / "meta.json"
+    try:
+        with open(meta_path, 'r') as f:
+            return json.load(f).get("artifact_hashes", {}).get(artifact_key)
+    except (OSError, ValueError):
+        return None
+
+
 def save_job_metadata(job_dir: Path, job_id: str, metadata: Dict[str, Any]) -> None:
     """
     Save job metadata to storage.
@@ -3162,7 +3841,7 @@ def save_job_metadata(job_dir: Path, job_id: str, metadata: Dict[str, Any]) -> N
     metadata["approved"] = False  # Default to not approved
     
     with open(meta_path, 'w') as f:
-        json.dump(metadata, f, indent=2)
+        f.write(dumps_canonical(metadata))
 
 
 @app.get("/upgrade-required", response_class=HTMLResponse, tags=["auth"])
@@ -3259,7 +3938,7 @@ async def dashboard_page(request: Request, page: int = Query(1, ge=1)) -> HTMLRe
                     jobs_checked += 1
                     try:
                         with open(meta_path, "r") as f:
-                            meta = json.load(f)
+                            meta = loads(f.read())
                         creator = meta.get("creator", {})
                         
                         # Handle both dict and None creator
@@ -3275,7 +3954,7 @@ async def dashboard_page(request: Request, page: int = Query(1, ge=1)) -> HTMLRe
                             pass_fail = False
                             if decision_path.exists():
                                 with open(decision_path, "r") as f:
-                                    decision = json.load(f)
+                                    decision = loads(f.read())
                                     pass_fail = decision.get("pass", False)
                             
                             recent_jobs.append({
@@ -3478,16 +4157,14 @@ async def get_validation_pack(job_id: str, request: Request) -> JSONResponse:
         with open(meta_path, 'r') as f:
             job_meta = json.load(f)
         
-        # Generate validation pack
-        validation_pack_path = job_dir / "validation_pack.zip"
-        
-        if not validation_pack_path.exists():
-            success = create_validation_pack(job_id, job_meta, validation_pack_path)
-            if not success:
-                raise HTTPException(status_code=500, detail="Failed to create validation pack")
+        # Reuse the stored pack unless the approval state changed
+        pack = await run_in_threadpool(ensure_validation_pack, job_id, job_meta, job_dir)
+        if pack is None:
+            raise HTTPException(status_code=500, detail="Failed to create validation pack")
         
         # Get validation pack info
         pack_info = get_validation_pack_info(job_id, job_meta)
+        pack_info["sha256"] = pack.sha256
         
         # Return download URL and info
         return JSONResponse({
@@ -3524,25 +4201,29 @@ async def download_validation_pack(
         # Load job metadata
         job_dir = create_job_storage_path(job_id)
         meta_path = job_dir / "meta.json"
-        validation_pack_path = job_dir / "validation_pack.zip"
         
         if not meta_path.exists():
             raise HTTPException(status_code=404, detail="Job not found")
         
-        # Generate validation pack if it doesn't exist
-        if not validation_pack_path.exists():
-            with open(meta_path, 'r') as f:
-                job_meta = json.load(f)
-            
-            success = create_validation_pack(job_id, job_meta, validation_pack_path)
-            if not success:
-                raise HTTPException(status_code=500, detail="Failed to create validation pack")
+        with open(meta_path, 'r') as f:
+            job_meta = json.load(f)
+        
+        # Serve the stored pack; regenerate only if the approval state changed
+        pack = await run_in_threadpool(ensure_validation_pack, job_id, job_meta, job_dir)
+        if pack is None:
+            raise HTTPException(status_code=500, detail="Failed to create validation pack")
+        
+        # Private and revalidated: content changes when the job is approved
+        cache_headers = {"ETag": pack.etag, "Cache-Control": "private, no-cache"}
+        if etag_matches(request.headers.get("if-none-match"), pack.etag):
+            return Response(status_code=304, headers=cache_headers)
         
         # Return the ZIP file
         return FileResponse(
-            path=validation_pack_path,
+            path=pack.path,
             filename=f"validation_pack_{job_id}.zip",
-            media_type="application/zip"
+            media_type="application/zip",
+            headers=cache_headers
         )
         
     except HTTPException:
@@ -3684,7 +4365,7 @@ async def debug_compile_page(request: Request) -> HTMLResponse:
 
 
 @app.post("/debug/compile", response_class=HTMLResponse, tags=["debug"])
-@get_rate_limit_decorator()
+@get_rate_limit_decorator(cost=COMPILE_REQUEST_COST)
 async def debug_compile_process(
     request: Request,
     csv_file: UploadFile = File(...),
@@ -3885,11 +4566,67 @@ async def campaign_page(request: Request) -> HTMLResponse:
         )
 
 
+@app.get("/api/scheduler", tags=["ops"])
+async def scheduler_status(request: Request) -> JSONResponse:
+    """
+    Report the background scheduler's leader and per-task run statistics (QA only).
+    
+    Args:
+        request: FastAPI request object
+        
+    Returns:
+        JSONResponse: Leader pid and, per task, runs, failures, last duration and next run
+    """
+    current_user = get_current_user(request)
+    if not current_user or current_user.role != UserRole.QA:
+        return JSONResponse(
+            status_code=403,
+            content={"error": "Forbidden", "message": "QA role required"}
+        )
+    
+    return JSONResponse(content=get_scheduler().get_status())
+
+
+@app.post("/api/scheduler/tasks/{task_name}/run", tags=["ops"])
+async def scheduler_run_task(request: Request, task_name: str) -> JSONResponse:
+    """
+    Run a scheduled task now, in the background (QA only).
+    
+    Args:
+        request: FastAPI request object
+        task_name: Task name, e.g. "cleanup", "backup", "upsell" or "tsa_retry"
+        
+    Returns:
+        JSONResponse: 202 if started, 409 if the task is already running
+    """
+    current_user = get_current_user(request)
+    if not current_user or current_user.role != UserRole.QA:
+        return JSONResponse(
+            status_code=403,
+            content={"error": "Forbidden", "message": "QA role required"}
+        )
+    
+    try:
+        started = get_scheduler().run_now(task_name)
+    except KeyError:
+        return JSONResponse(status_code=404, content={"error": "Unknown task", "task": task_name})
+    if not started:
+        return JSONResponse(status_code=409, content={"error": "Task already running", "task": task_name})
+    
+    logger.info(f"Scheduled task {task_name} triggered by {current_user.email}")
+    return JSONResponse(status_code=202, content={"task": task_name, "status": "started"})
+
+
 # Event handlers for background tasks
 @app.on_event("startup")
 async def startup_event():
     """Start background scheduler on application startup."""
     logger.info("Starting ProofKit application")
+    
+    # Threads are started per worker, never at import: with gunicorn's
+    # preload_app the module is imported once in the master and forked,
+    # and threads do not survive a fork. Only the worker holding the
+    # scheduler's host-wide leader lock runs cleanup and the queues.
     start_background_tasks()
     logger.info("Background tasks started")
 
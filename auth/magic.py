@@ -27,6 +27,8 @@ from fastapi.responses import JSONResponse, RedirectResponse
 from starlette.middleware.base import BaseHTTPMiddleware
 from starlette.responses import Response
 
+from core.sqlite_store import connect, immediate_transaction
+from core.ttl_cache import TTLCache
 from .models import User, UserRole, MagicLinkRequest, MagicLinkResponse, AuthToken
 
 logger = logging.getLogger(__name__)
@@ -37,10 +39,15 @@ JWT_ALGORITHM = "HS256"
 JWT_EXPIRY_HOURS = 24
 MAGIC_LINK_EXPIRY_MINUTES = 15
 
+# Verified JWT payloads are memoized per token until they expire
+JWT_CACHE_TTL_S = float(os.environ.get("JWT_CACHE_TTL_S", "300"))
+JWT_CACHE_MAX_ENTRIES = int(os.environ.get("JWT_CACHE_MAX_ENTRIES", "4096"))
+
 # Email configuration - moved to function level to ensure runtime evaluation
 
-# Storage for magic links (in production, use Redis or database)
-MAGIC_LINKS: Dict[str, Dict[str, Any]] = {}
+# Magic links live in an indexed SQLite table inside storage_dir; expired
+# rows are purged whenever a new link is stored
+MAGIC_LINK_DB_NAME = "magic_links.db"
 
 
 class MagicLinkAuth:
@@ -49,6 +56,7 @@ class MagicLinkAuth:
     def __init__(self):
         self.storage_dir = Path("storage/auth")
         self.storage_dir.mkdir(exist_ok=True)
+        self._verified_tokens = TTLCache(JWT_CACHE_TTL_S, JWT_CACHE_MAX_ENTRIES)
     
     def generate_magic_link(self, email: str, role: UserRole = UserRole.OPERATOR, return_url: Optional[str] = None) -> str:
         """Generate a magic link for authentication."""
@@ -74,8 +82,6 @@ class MagicLinkAuth:
             if is_safe:
                 link_data["return_url"] = return_url
         
-        MAGIC_LINKS[token] = link_data
-        
         # Save to persistent storage
         self._save_magic_link(token, link_data)
         
@@ -83,29 +89,26 @@ class MagicLinkAuth:
         return token
     
     def validate_magic_link(self, token: str) -> Optional[Dict[str, Any]]:
-        """Validate a magic link token."""
-        if token not in MAGIC_LINKS:
-            # Try to load from persistent storage
-            stored_data = self._load_magic_link(token)
-            if not stored_data:
-                return None
-            MAGIC_LINKS[token] = stored_data
-        
-        link_data = MAGIC_LINKS[token]
-        
-        # Check if already used
-        if link_data.get("used", False):
-            return None
-        
-        # Check expiration
-        expires_at = datetime.fromisoformat(link_data["expires_at"])
-        if datetime.now(timezone.utc) > expires_at:
+        """Validate a magic link token, consuming it exactly once across workers."""
+        try:
+            conn = self._connect_links()
+        except Exception as e:
+            logger.error(f"Failed to open magic link store: {e}")
             return None
+        try:
+            with immediate_transaction(conn):
+                row = conn.execute(
+                    "SELECT data, used, expires_at FROM magic_links WHERE token = ?", (token,)
+                ).fetchone()
+                # Unknown, already used or expired
+                if row is None or row["used"] or row["expires_at"] <= datetime.now(timezone.utc).timestamp():
+                    return None
+                conn.execute("UPDATE magic_links SET used = 1 WHERE token = ?", (token,))
+        finally:
+            conn.close()
         
-        # Mark as used
+        link_data = json.loads(row["data"])
         link_data["used"] = True
-        self._save_magic_link(token, link_data)
-        
         return link_data
     
     def create_jwt_token(self, email: str, role: UserRole) -> str:
@@ -120,10 +123,14 @@ class MagicLinkAuth:
         return jwt.encode(payload, JWT_SECRET, algorithm=JWT_ALGORITHM)
     
     def verify_jwt_token(self, token: str) -> Optional[Dict[str, Any]]:
-        """Verify and decode a JWT token."""
+        """Verify and decode a JWT token, reusing the result for repeat requests."""
+        payload = self._verified_tokens.get(token)
+        if payload is not None:
+            return dict(payload)
         try:
             payload = jwt.decode(token, JWT_SECRET, algorithms=[JWT_ALGORITHM])
-            return payload
+            self._verified_tokens.put(token, payload, expires_at=payload.get("exp"))
+            return dict(payload)
         except jwt.ExpiredSignatureError:
             logger.warning("JWT token expired")
             return None
@@ -388,22 +395,69 @@ class MagicLinkAuth:
             logger.error(f"Failed to get dev link for {email}: {e}")
             return None
     
+    def _connect_links(self):
+        """
+        Open the magic link store, creating the schema on first use.
+        
+        Legacy one-file-per-token JSON entries left in storage_dir by earlier
+        releases are imported into the table and removed.
+        """
+        conn = connect(self.storage_dir / MAGIC_LINK_DB_NAME)
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS magic_links (
+                token TEXT PRIMARY KEY,
+                data TEXT NOT NULL,
+                expires_at REAL NOT NULL,
+                used INTEGER NOT NULL DEFAULT 0
+            )
+        """)
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_magic_links_expires ON magic_links (expires_at)")
+        
+        for link_file in self.storage_dir.glob("*.json"):
+            if link_file.name == "dev_links.json":
+                continue
+            try:
+                with open(link_file, 'r') as f:
+                    self._upsert_magic_link(conn, link_file.stem, json.load(f))
+                link_file.unlink()
+            except Exception as e:
+                logger.warning(f"Dropping unreadable legacy magic link file {link_file.name}: {e}")
+                link_file.unlink(missing_ok=True)
+        
+        return conn
+    
+    @staticmethod
+    def _upsert_magic_link(conn, token: str, data: Dict[str, Any]) -> None:
+        """Insert or replace one magic link row."""
+        conn.execute(
+            "INSERT OR REPLACE INTO magic_links (token, data, expires_at, used) VALUES (?, ?, ?, ?)",
+            (token, json.dumps(data), datetime.fromisoformat(data["expires_at"]).timestamp(),
+             int(bool(data.get("used", False))))
+        )
+    
     def _save_magic_link(self, token: str, data: Dict[str, Any]) -> None:
-        """Save magic link data to persistent storage."""
+        """Save magic link data to persistent storage and purge expired links."""
         try:
-            file_path = self.storage_dir / f"{token}.json"
-            with open(file_path, 'w') as f:
-                json.dump(data, f)
+            conn = self._connect_links()
+            try:
+                self._upsert_magic_link(conn, token, data)
+                conn.execute("DELETE FROM magic_links WHERE expires_at <= ?",
+                             (datetime.now(timezone.utc).timestamp(),))
+            finally:
+                conn.close()
         except Exception as e:
             logger.error(f"Failed to save magic link {token}: {e}")
     
     def _load_magic_link(self, token: str) -> Optional[Dict[str, Any]]:
         """Load magic link data from persistent storage."""
         try:
-            file_path = self.storage_dir / f"{token}.json"
-            if file_path.exists():
-                with open(file_path, 'r') as f:
-                    return json.load(f)
+            conn = self._connect_links()
+            try:
+                row = conn.execute("SELECT data FROM magic_links WHERE token = ?", (token,)).fetchone()
+            finally:
+                conn.close()
+            if row:
+                return json.loads(row["data"])
         except Exception as e:
             logger.error(f"Failed to load magic link {token}: {e}")
         return None
@@ -430,9 +484,8 @@ class AuthMiddleware(BaseHTTPMiddleware):
             if payload:
                 # Get user's current plan from quota system
                 try:
-                    from middleware.quota import load_user_quota_data
-                    quota_data = load_user_quota_data(payload["sub"])
-                    user_plan = quota_data.get('plan', 'free')
+                    from middleware.quota import get_user_plan
+                    user_plan = get_user_plan(payload["sub"])
                 except Exception:
                     user_plan = 'free'  # Default to free plan if lookup fails
                 
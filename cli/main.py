@@ -7,7 +7,7 @@ Provides granular control over the proof generation pipeline.
 
 import typer
 from pathlib import Path
-from typing import Optional
+from typing import List, Optional
 import sys
 import logging
 import json
@@ -267,6 +267,74 @@ def extract(
         raise typer.Exit(1)
 
 
+@app.command()
+def evaluate(
+    csv_path: Path = typer.Option(..., "--csv", help="Path to raw CSV data file"),
+    spec_paths: List[Path] = typer.Option(..., "--spec", help="Specification JSON file (repeat for each spec)"),
+    output: Optional[Path] = typer.Option(None, "--output", "-o", help="Save per-spec decisions as JSON"),
+    certificates_dir: Optional[Path] = typer.Option(None, "--certificates", help="Render a proof PDF per spec into this directory"),
+    workers: Optional[int] = typer.Option(None, "--workers", help="Parallel certificate renderers (default: MULTI_SPEC_WORKERS)")
+) -> None:
+    """
+    Evaluate one CSV against several specifications in a single pass.
+    
+    The CSV is parsed and normalized once; every spec is decided against the
+    shared trace. Optionally renders one proof certificate per spec in parallel.
+    """
+    try:
+        sys.path.insert(0, str(Path(__file__).parent.parent))
+        from core.models import SpecV1
+        from core.normalize import load_csv_with_metadata
+        from core.multi_spec import evaluate_specs, render_certificates
+        
+        missing = [str(path) for path in [csv_path, *spec_paths] if not path.exists()]
+        if missing:
+            typer.echo(f"Missing required files: {', '.join(missing)}", err=True)
+            raise typer.Exit(1)
+        
+        specs = []
+        for spec_path in spec_paths:
+            with open(spec_path, 'r') as f:
+                specs.append(SpecV1(**json.load(f)))
+        
+        df, _ = load_csv_with_metadata(str(csv_path))
+        typer.echo(f"Evaluating {len(specs)} specifications against {csv_path} ({len(df)} samples)")
+        
+        evaluations = evaluate_specs(df, specs)
+        
+        certificates = {}
+        if certificates_dir is not None:
+            certificates = render_certificates(evaluations, certificates_dir, max_workers=workers)
+        
+        results = []
+        for evaluation, spec_path in zip(evaluations, spec_paths):
+            result = {"spec": str(spec_path), "status": evaluation.status}
+            if evaluation.ok:
+                result["decision"] = evaluation.decision.model_dump(by_alias=True)
+                if evaluation.index in certificates:
+                    result["certificate"] = str(certificates[evaluation.index])
+                typer.echo(f"  {evaluation.status:13} {spec_path.name}")
+            else:
+                result["error"] = evaluation.error
+                typer.echo(f"  {'ERROR':13} {spec_path.name}: {evaluation.error}")
+            results.append(result)
+        
+        if output:
+            with open(output, 'w') as f:
+                json.dump(results, f, indent=2, default=str)
+            typer.echo(f"Results saved to: {output}")
+        
+        if any(not evaluation.ok for evaluation in evaluations):
+            raise typer.Exit(1)
+    
+    except typer.Exit:
+        raise
+    except Exception as e:
+        typer.echo(f"Failed to evaluate specifications: {e}", err=True)
+        logger.exception("Multi-spec evaluation failed")
+        raise typer.Exit(1)
+
+
 @app.command()
 def presets(
     list_all: bool = typer.Option(False, "--list", "-l", help="List all available industry presets"),
@@ -0,0 +1,124 @@
+"""
+Batch compilation helpers for ProofKit.
+
+Supports the batch compile endpoint: unpacking CSVs from an uploaded ZIP,
+running compile jobs on a shared worker pool and streaming their results back
+as NDJSON in completion order.
+
+Example usage:
+    from core.batch import extract_zip_csvs, stream_job_results
+
+    files = extract_zip_csvs(zip_bytes, max_files=50, max_file_size=10 * 1024 * 1024)
+    jobs = [(index, functools.partial(compile_one, name, content))
+            for index, (name, content) in enumerate(files)]
+    async for index, result, error in stream_job_results(jobs):
+        ...
+"""
+
+import asyncio
+import io
+import logging
+import os
+import threading
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import PurePosixPath
+from typing import Any, AsyncIterator, Callable, List, Optional, Tuple
+
+from core.serialization import dumps_fast
+
+logger = logging.getLogger(__name__)
+
+# Limits and worker pool size for batch compiles
+BATCH_MAX_FILES = int(os.environ.get('BATCH_MAX_FILES', '50'))
+BATCH_WORKERS = int(os.environ.get('BATCH_WORKERS', '4'))
+
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+
+_executor: Optional[ThreadPoolExecutor] = None
+_executor_lock = threading.Lock()
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    """Return the process-wide batch worker pool, creating it on first use."""
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=BATCH_WORKERS, thread_name_prefix="batch")
+        return _executor
+
+
+def extract_zip_csvs(zip_bytes: bytes, max_files: int, max_file_size: int) -> List[Tuple[str, bytes]]:
+    """
+    Read the CSV members of an uploaded ZIP archive.
+
+    Directories, macOS resource forks and non-CSV members are skipped. Member
+    sizes are checked against the header before anything is decompressed.
+
+    Args:
+        zip_bytes: ZIP archive content
+        max_files: Maximum number of CSV members
+        max_file_size: Maximum uncompressed size per member in bytes
+
+    Returns:
+        List of (filename, content) in archive order, filenames without directories
+
+    Raises:
+        ValueError: If the archive is invalid or exceeds the limits
+    """
+    try:
+        archive = zipfile.ZipFile(io.BytesIO(zip_bytes))
+    except zipfile.BadZipFile as e:
+        raise ValueError(f"Invalid ZIP archive: {e}")
+
+    with archive:
+        members = []
+        for info in archive.infolist():
+            path = PurePosixPath(info.filename)
+            if info.is_dir() or '__MACOSX' in path.parts or path.name.startswith('.'):
+                continue
+            if path.suffix.lower() != '.csv':
+                continue
+            if info.file_size > max_file_size:
+                raise ValueError(
+                    f"{path.name} ({info.file_size / 1024 / 1024:.1f}MB) exceeds "
+                    f"{max_file_size / 1024 / 1024}MB limit"
+                )
+            members.append((path.name, info))
+
+        if not members:
+            raise ValueError("ZIP archive contains no CSV files")
+        if len(members) > max_files:
+            raise ValueError(f"ZIP archive contains {len(members)} CSV files, at most {max_files} allowed")
+
+        return [(name, archive.read(info)) for name, info in members]
+
+
+def ndjson_line(record: Any) -> bytes:
+    """Encode one NDJSON record."""
+    return dumps_fast(record, default=str) + b"\n"
+
+
+async def stream_job_results(
+    jobs: List[Tuple[int, Callable[[], Any]]]
+) -> AsyncIterator[Tuple[int, Any, Optional[BaseException]]]:
+    """
+    Run jobs on the batch worker pool and yield them as they finish.
+
+    Args:
+        jobs: (index, zero-argument callable) pairs
+
+    Yields:
+        (index, result, error) in completion order; error is None on success
+    """
+    loop = asyncio.get_running_loop()
+    executor = _get_executor()
+
+    async def run(index: int, job: Callable[[], Any]):
+        try:
+            return index, await loop.run_in_executor(executor, job), None
+        except Exception as e:
+            return index, None, e
+
+    for next_done in asyncio.as_completed([run(index, job) for index, job in jobs]):
+        yield await next_done
@@ -0,0 +1,188 @@
+"""
+Build information for ProofKit releases.
+
+Resolves the software version and commit hash once per process and exposes them
+to validation packs, PDF footers and the /health endpoint.
+
+Resolution order (first match wins, per field):
+1. Baked build-info file (BUILD_INFO_PATH, default: <repo>/build_info.json),
+   written at image build time with `python -m core.build_info --write`
+2. Environment: PROOFKIT_VERSION, GIT_COMMIT / SOURCE_COMMIT
+3. pyproject.toml for the version, `git rev-parse HEAD` for the commit
+   (git is only invoked when a .git directory and a git binary exist)
+
+Example usage:
+    from core.build_info import get_build_info
+
+    info = get_build_info()
+    print(info.version, info.short_commit)
+"""
+
+import argparse
+import json
+import logging
+import os
+import shutil
+import subprocess
+import tomllib
+from dataclasses import asdict, dataclass
+from datetime import datetime, timezone
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+DEFAULT_BUILD_INFO_PATH = PROJECT_ROOT / "build_info.json"
+PYPROJECT_PATH = PROJECT_ROOT / "pyproject.toml"
+
+DEFAULT_VERSION = "0.1.0"
+UNKNOWN_COMMIT = "unknown"
+SHORT_COMMIT_LENGTH = 8
+
+
+@dataclass(frozen=True)
+class BuildInfo:
+    """Resolved build metadata for the running process."""
+    version: str
+    commit: str
+    built_at: Optional[str] = None
+    source: str = "default"
+
+    @property
+    def short_commit(self) -> str:
+        """Commit hash truncated for display (or 'unknown')."""
+        if self.commit == UNKNOWN_COMMIT:
+            return self.commit
+        return self.commit[:SHORT_COMMIT_LENGTH]
+
+    def to_dict(self) -> Dict[str, Any]:
+        data = asdict(self)
+        data["short_commit"] = self.short_commit
+        return data
+
+
+def _build_info_path() -> Path:
+    return Path(os.environ.get("BUILD_INFO_PATH", DEFAULT_BUILD_INFO_PATH))
+
+
+def _read_build_info_file(path: Path) -> Dict[str, Any]:
+    """Read the baked build-info file, returning {} if absent or unreadable."""
+    if not path.is_file():
+        return {}
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        return data if isinstance(data, dict) else {}
+    except (OSError, ValueError) as e:
+        logger.warning(f"Could not read build info file {path}: {e}")
+        return {}
+
+
+def _read_pyproject_version(path: Optional[Path] = None) -> Optional[str]:
+    """Read [project].version from pyproject.toml."""
+    path = path or PYPROJECT_PATH
+    if not path.is_file():
+        return None
+    try:
+        with open(path, "rb") as f:
+            return tomllib.load(f).get("project", {}).get("version")
+    except (OSError, tomllib.TOMLDecodeError) as e:
+        logger.warning(f"Could not get software version from {path}: {e}")
+        return None
+
+
+def _read_git_commit(repo_root: Path = PROJECT_ROOT) -> Optional[str]:
+    """Run `git rev-parse HEAD` only when a checkout and a git binary exist."""
+    if not (repo_root / ".git").exists() or shutil.which("git") is None:
+        return None
+    try:
+        result = subprocess.run(
+            ["git", "rev-parse", "HEAD"],
+            capture_output=True,
+            text=True,
+            cwd=repo_root,
+            timeout=5
+        )
+        if result.returncode == 0:
+            return result.stdout.strip() or None
+    except (OSError, subprocess.SubprocessError) as e:
+        logger.warning(f"Could not get git commit hash: {e}")
+    return None
+
+
+def resolve_build_info() -> BuildInfo:
+    """
+    Resolve build information from file, environment and repository.
+
+    Uncached; use get_build_info() in application code.
+    """
+    baked = _read_build_info_file(_build_info_path())
+
+    version = baked.get("version") or os.environ.get("PROOFKIT_VERSION")
+    commit = baked.get("commit") or os.environ.get("GIT_COMMIT") or os.environ.get("SOURCE_COMMIT")
+    if commit == UNKNOWN_COMMIT:
+        commit = None
+    source = "file" if baked else ("env" if version or commit else "repo")
+
+    if not version:
+        version = _read_pyproject_version() or DEFAULT_VERSION
+    if not commit:
+        commit = _read_git_commit() or UNKNOWN_COMMIT
+
+    return BuildInfo(
+        version=version,
+        commit=commit,
+        built_at=baked.get("built_at"),
+        source=source
+    )
+
+
+@lru_cache(maxsize=1)
+def get_build_info() -> BuildInfo:
+    """Return process-wide build information, resolved on first call."""
+    info = resolve_build_info()
+    logger.info(f"Build info: version={info.version} commit={info.short_commit} source={info.source}")
+    return info
+
+
+def reset_build_info_cache() -> None:
+    """Forget cached build information (for tests and hot reload)."""
+    get_build_info.cache_clear()
+
+
+def write_build_info(path: Optional[Path] = None) -> BuildInfo:
+    """
+    Bake the currently resolvable build information into a file.
+
+    Args:
+        path: Output path (defaults to BUILD_INFO_PATH / <repo>/build_info.json)
+
+    Returns:
+        The BuildInfo that was written
+    """
+    path = Path(path) if path else _build_info_path()
+    resolved = resolve_build_info()
+    info = BuildInfo(
+        version=resolved.version,
+        commit=resolved.commit,
+        built_at=datetime.now(timezone.utc).isoformat(),
+        source="file"
+    )
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({"version": info.version, "commit": info.commit, "built_at": info.built_at}, f, indent=2)
+    return info
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Show or bake ProofKit build information")
+    parser.add_argument("--write", nargs="?", const="", metavar="PATH",
+                        help="Write build info file (default: BUILD_INFO_PATH or build_info.json)")
+    args = parser.parse_args()
+
+    if args.write is not None:
+        written = write_build_info(Path(args.write) if args.write else None)
+        print(json.dumps(written.to_dict(), indent=2))
+    else:
+        print(json.dumps(get_build_info().to_dict(), indent=2))
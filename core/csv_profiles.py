@@ -0,0 +1,159 @@
+"""
+Learned vendor CSV profiles for ProofKit.
+
+Most uploads come from a handful of logger models whose exports share the same
+header and comment layout. The first time a layout is parsed, the resolved
+parse settings (encoding, delimiter, decimal handling, column mapping, column
+dtypes, timestamp column and format) are stored as a profile keyed on a
+fingerprint of the header. Later uploads with the same fingerprint skip
+encoding/delimiter sniffing and timestamp format inference.
+
+Profiles are kept in memory and persisted as one JSON file per fingerprint, so
+every worker process sharing the storage directory benefits from them.
+
+Example usage:
+    from core.csv_profiles import get_profile_cache, header_fingerprint
+
+    cache = get_profile_cache()
+    fingerprint = header_fingerprint("upload.csv")
+    profile = cache.get(fingerprint)
+    if profile is None:
+        ...  # sniff, parse, then cache.put(fingerprint, learned_profile)
+"""
+
+import hashlib
+import json
+import logging
+import os
+import re
+import tempfile
+import threading
+from pathlib import Path
+from typing import Any, Dict, Optional, Union
+
+logger = logging.getLogger(__name__)
+
+# Where learned profiles are persisted, and how many are kept in memory per process
+CSV_PROFILE_DIR = Path(os.environ.get('CSV_PROFILE_DIR', 'storage/csv_profiles'))
+CSV_PROFILE_MAX_ENTRIES = int(os.environ.get('CSV_PROFILE_MAX_ENTRIES', '256'))
+
+# Bytes read from the start of a file to locate comment and header lines
+FINGERPRINT_READ_BYTES = 16384
+
+PROFILE_VERSION = 1
+
+_COMMENT_KEY = re.compile(rb'#\s*([^:]+):')
+
+_cache: Optional['CsvProfileCache'] = None
+_cache_lock = threading.Lock()
+
+
+def header_fingerprint(csv_path: Union[str, Path]) -> Optional[str]:
+    """
+    Fingerprint a CSV's layout from its comment keys and header line.
+
+    Comment values (serial numbers, run dates) vary between exports of the
+    same logger, so only their keys take part. The raw bytes are hashed
+    before decoding, so a byte order mark or different encoding of the
+    same header yields a different fingerprint.
+
+    Args:
+        csv_path: Path to the CSV file
+
+    Returns:
+        Hex digest, or None if no header line was found in the first bytes
+    """
+    with open(csv_path, 'rb') as f:
+        head = f.read(FINGERPRINT_READ_BYTES)
+
+    digest = hashlib.sha256(f"v{PROFILE_VERSION}".encode())
+    lines = head.split(b'\n')
+    if len(head) == FINGERPRINT_READ_BYTES:
+        lines = lines[:-1]  # Last line may be cut off
+    for raw_line in lines:
+        line = raw_line.strip()
+        if not line:
+            continue
+        if line.startswith(b'#'):
+            match = _COMMENT_KEY.match(line)
+            if match:
+                digest.update(b'#' + match.group(1).strip() + b'\n')
+            continue
+        digest.update(line)
+        return digest.hexdigest()
+    return None
+
+
+class CsvProfileCache:
+    """In-memory profile cache backed by one JSON file per fingerprint."""
+
+    def __init__(self, directory: Union[str, Path], max_entries: int = CSV_PROFILE_MAX_ENTRIES):
+        self.directory = Path(directory)
+        self.max_entries = max_entries
+        self._profiles: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+
+    def _path(self, fingerprint: str) -> Path:
+        return self.directory / f"{fingerprint}.json"
+
+    def _remember(self, fingerprint: str, profile: Dict[str, Any]) -> None:
+        with self._lock:
+            self._profiles.pop(fingerprint, None)
+            self._profiles[fingerprint] = profile
+            while len(self._profiles) > self.max_entries:
+                self._profiles.pop(next(iter(self._profiles)))
+
+    def get(self, fingerprint: Optional[str]) -> Optional[Dict[str, Any]]:
+        """Return the profile for a fingerprint, loading it from disk if another worker learned it."""
+        if not fingerprint:
+            return None
+        with self._lock:
+            profile = self._profiles.get(fingerprint)
+        if profile is not None:
+            return profile
+
+        try:
+            with open(self._path(fingerprint), 'r') as f:
+                profile = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if profile.get('version') != PROFILE_VERSION:
+            return None
+        self._remember(fingerprint, profile)
+        return profile
+
+    def put(self, fingerprint: Optional[str], profile: Dict[str, Any]) -> None:
+        """Store a learned profile in memory and persist it atomically."""
+        if not fingerprint:
+            return
+        profile = {**profile, 'version': PROFILE_VERSION}
+        self._remember(fingerprint, profile)
+
+        try:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            fd, temp_name = tempfile.mkstemp(prefix=f".{fingerprint[:16]}.", suffix=".tmp", dir=self.directory)
+            with os.fdopen(fd, 'w') as f:
+                json.dump(profile, f, indent=2)
+            os.replace(temp_name, self._path(fingerprint))
+        except OSError as e:
+            logger.warning(f"Could not persist CSV profile {fingerprint[:12]}: {e}")
+
+    def invalidate(self, fingerprint: Optional[str]) -> None:
+        """Drop a profile that no longer parses its files."""
+        if not fingerprint:
+            return
+        with self._lock:
+            self._profiles.pop(fingerprint, None)
+        try:
+            self._path(fingerprint).unlink()
+        except OSError:
+            pass
+
+
+def get_profile_cache() -> CsvProfileCache:
+    """Return the process-wide profile cache, creating it on first use."""
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = CsvProfileCache(CSV_PROFILE_DIR)
+        return _cache
@@ -26,42 +26,30 @@ from datetime import datetime, timezone
 import logging
 
 from core.models import SpecV1, DecisionResult, SensorMode
-from core.temperature_utils import detect_temperature_columns, DecisionError, calculate_continuous_hold_time
+from core.temperature_utils import detect_temperature_columns, DecisionError, calculate_continuous_hold_time  # noqa: F401  # re-exported
 from core.normalize import DataQualityError
-from core.sensor_utils import combine_sensor_readings
+from core.sensor_utils import combine_sensor_readings  # noqa: F401  # re-exported
+from core.trace import get_trace
 from core.errors import RequiredSignalMissingError
+from core.industry_router import select_engine
 
 logger = logging.getLogger(__name__)
 
 
-# Industry-specific metric engine imports
-try:
-    from core.metrics_powder import validate_powder_coating_cure
-    from core.metrics_haccp import validate_haccp_cooling
-    from core.metrics_autoclave import validate_autoclave_sterilization
-    from core.metrics_sterile import validate_eto_sterilization
-    from core.metrics_concrete import validate_concrete_curing
-    from core.metrics_coldchain import validate_coldchain_storage
-except ImportError as e:
-    logger.warning(f"Failed to import industry-specific metrics engines: {e}")
-    # Set to None so we can check for availability
-    validate_powder_coating_cure = None
-    validate_haccp_cooling = None
-    validate_autoclave_sterilization = None
-    validate_eto_sterilization = None
-    validate_concrete_curing = None
-    validate_coldchain_storage = None
-
-
-# Industry-specific metrics engine dispatch table
+def _lazy_engine(industry: str) -> Callable[[pd.DataFrame, SpecV1], DecisionResult]:
+    """Engine for industry that imports its metrics module on first call via the industry router."""
+    def engine(normalized_df: pd.DataFrame, spec: SpecV1) -> DecisionResult:
+        return select_engine(industry)(normalized_df, spec)
+    engine.__name__ = f"{industry.replace('-', '_')}_engine"
+    return engine
+
+
+# Industry-specific metrics engine dispatch table. Engines resolve through
+# core.industry_router.ENGINES when first used, so importing this module does
+# not load the metrics modules.
 INDUSTRY_METRICS: Dict[str, Optional[Callable[[pd.DataFrame, SpecV1], DecisionResult]]] = {
-    "powder": validate_powder_coating_cure,
-    "powder-coating": validate_powder_coating_cure,  # Alternative form - same engine
-    "haccp": validate_haccp_cooling,
-    "autoclave": validate_autoclave_sterilization,
-    "sterile": validate_eto_sterilization,
-    "concrete": validate_concrete_curing,
-    "coldchain": validate_coldchain_storage,
+    industry: _lazy_engine(industry)
+    for industry in ("powder", "powder-coating", "haccp", "autoclave", "sterile", "concrete", "coldchain")
 }
 
 
@@ -90,18 +78,13 @@ def validate_preconditions(df: pd.DataFrame, spec: SpecV1) -> Tuple[bool, List[s
         return False, issues
     
     # Check for required columns
-    timestamp_col = None
-    for col in df.columns:
-        if 'time' in col.lower() or pd.api.types.is_datetime64_any_dtype(df[col]):
-            timestamp_col = col
-            break
-    
-    if timestamp_col is None:
+    trace = get_trace(df)
+    if trace.timestamp_column is None:
         issues.append("No timestamp column found")
         return False, issues
     
     # Check for temperature columns
-    temp_columns = detect_temperature_columns(df)
+    temp_columns = list(trace.roles['temperature'])
     if not temp_columns:
         issues.append("No temperature columns found")
         return False, issues
@@ -474,12 +457,9 @@ def make_decision(normalized_df: pd.DataFrame, spec: SpecV1) -> DecisionResult:
                 warnings=warnings
             )
         
-        # Detect timestamp column
-        timestamp_col = None
-        for col in normalized_df.columns:
-            if 'time' in col.lower() or pd.api.types.is_datetime64_any_dtype(normalized_df[col]):
-                timestamp_col = col
-                break
+        # Timestamp column and sensor roles are resolved once per normalized trace
+        trace = get_trace(normalized_df)
+        timestamp_col = trace.timestamp_column
         
         if timestamp_col is None:
             raise DecisionError("No timestamp column found in normalized data")
@@ -489,7 +469,7 @@ def make_decision(normalized_df: pd.DataFrame, spec: SpecV1) -> DecisionResult:
             normalized_df[timestamp_col] = pd.to_datetime(normalized_df[timestamp_col])
         
         # Detect temperature columns
-        temp_columns = detect_temperature_columns(normalized_df)
+        temp_columns = list(trace.roles['temperature'])
         if not temp_columns:
             raise DecisionError("No temperature columns found in normalized data")
         
@@ -528,8 +508,8 @@ def make_decision(normalized_df: pd.DataFrame, spec: SpecV1) -> DecisionResult:
         require_at_least = sensor_selection.require_at_least if sensor_selection else None
         
         try:
-            combined_pmt = combine_sensor_readings(
-                normalized_df, temp_columns, sensor_mode, require_at_least, conservative_threshold_C
+            combined_pmt = trace.combined(
+                temp_columns, sensor_mode, require_at_least, conservative_threshold_C
             )
         except DecisionError as e:
             reasons.append(f"Sensor combination failed: {str(e)}")
@@ -0,0 +1,240 @@
+"""
+Conditional, range-capable file responses for stored artifacts.
+
+Serves proof PDFs and evidence bundles with strong ETags, If-None-Match (304),
+single-range requests (206/416) with If-Range, and long-lived caching when the
+client asked for a specific content version. The body is handed to the server
+with the ASGI zero-copy extension (sendfile) when the server advertises it and
+is otherwise streamed in fixed-size chunks, so memory use does not grow with
+the artifact size.
+
+Example usage:
+    from core.downloads import artifact_response, file_sha256
+
+    etag_hash = file_sha256(pdf_path)
+    return artifact_response(request, pdf_path, etag_hash,
+                             filename="proof.pdf", media_type="application/pdf")
+"""
+
+import hashlib
+import os
+import re
+from email.utils import formatdate
+from functools import lru_cache
+from pathlib import Path
+from typing import Mapping, Optional, Tuple, Union
+from urllib.parse import quote
+
+import anyio
+from starlette.requests import Request
+from starlette.responses import Response
+from starlette.types import Receive, Scope, Send
+
+# Versioned URLs (?v=<hash prefix>) point at one exact artifact and never change
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+# Unversioned URLs may be rewritten (approval, re-compile): cache but revalidate
+REVALIDATE_CACHE_CONTROL = "public, no-cache"
+VERSION_PARAM_LENGTH = 16
+
+ZEROCOPY_EXTENSION = "http.response.zerocopy"
+STREAM_CHUNK_SIZE = 256 * 1024
+HASH_CHUNK_SIZE = 1024 * 1024
+
+_RANGE_RE = re.compile(r"^bytes=(\d*)-(\d*)$")
+
+
+def file_sha256(path: Union[str, Path]) -> str:
+    """Hash a file in chunks and return the SHA-256 hex digest."""
+    hasher = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b""):
+            hasher.update(chunk)
+    return hasher.hexdigest()
+
+
+@lru_cache(maxsize=1024)
+def _stat_keyed_sha256(path: str, mtime_ns: int, size: int) -> str:
+    return file_sha256(path)
+
+
+def cached_file_sha256(path: Union[str, Path]) -> str:
+    """Hash a file once per (path, mtime, size) for artifacts without a recorded hash."""
+    stat_result = os.stat(path)
+    return _stat_keyed_sha256(str(path), stat_result.st_mtime_ns, stat_result.st_size)
+
+
+def version_token(sha256: str) -> str:
+    """Short content version used in download URLs (?v=...)."""
+    return sha256[:VERSION_PARAM_LENGTH]
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """
+    Check an If-None-Match header against an entity tag (weak comparison).
+
+    Args:
+        if_none_match: Raw If-None-Match header value (may be None)
+        etag: Quoted entity tag of the current representation
+
+    Returns:
+        True if the client's cached copy is current and 304 can be returned
+    """
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    candidates = [tag.strip() for tag in if_none_match.split(",")]
+    return any(tag.removeprefix("W/") == etag.removeprefix("W/") for tag in candidates)
+
+
+def parse_range(range_header: Optional[str], size: int) -> Optional[Tuple[int, int]]:
+    """
+    Parse a single-range Range header.
+
+    Args:
+        range_header: Raw Range header value (may be None)
+        size: Size of the file in bytes
+
+    Returns:
+        (start, end) inclusive byte offsets, or None to serve the whole file
+        (no header, unsupported unit, malformed or multi-range request)
+
+    Raises:
+        ValueError: If the range is well-formed but not satisfiable
+    """
+    if not range_header:
+        return None
+    match = _RANGE_RE.match(range_header.strip())
+    if not match:
+        return None
+
+    first, last = match.groups()
+    if not first and not last:
+        return None
+
+    if not first:
+        # Suffix range: the final N bytes
+        suffix = int(last)
+        if suffix == 0 or size == 0:
+            raise ValueError("Unsatisfiable suffix range")
+        return max(size - suffix, 0), size - 1
+
+    start = int(first)
+    end = int(last) if last else size - 1
+    if start >= size:
+        raise ValueError("Range starts beyond end of file")
+    if end < start:
+        return None
+    return start, min(end, size - 1)
+
+
+class ArtifactFileResponse(Response):
+    """Send a byte range of a file with sendfile when available."""
+
+    def __init__(self, path: Union[str, Path], offset: int, length: int,
+                 status_code: int = 200, headers: Optional[Mapping[str, str]] = None,
+                 media_type: Optional[str] = None) -> None:
+        self.path = Path(path)
+        self.offset = offset
+        self.length = length
+        self.status_code = status_code
+        self.media_type = media_type
+        self.background = None
+        self.init_headers(headers)
+        self.headers["content-length"] = str(length)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        await send({
+            "type": "http.response.start",
+            "status": self.status_code,
+            "headers": self.raw_headers
+        })
+
+        if scope.get("method") == "HEAD" or self.length == 0:
+            await send({"type": "http.response.body", "body": b"", "more_body": False})
+            return
+
+        if ZEROCOPY_EXTENSION in scope.get("extensions", {}):
+            with open(self.path, 'rb') as f:
+                await send({
+                    "type": ZEROCOPY_EXTENSION,
+                    "file": f,
+                    "offset": self.offset,
+                    "count": self.length,
+                    "more_body": False
+                })
+            return
+
+        async with await anyio.open_file(self.path, 'rb') as f:
+            await f.seek(self.offset)
+            remaining = self.length
+            while remaining > 0:
+                chunk = await f.read(min(STREAM_CHUNK_SIZE, remaining))
+                if not chunk:
+                    break
+                remaining -= len(chunk)
+                await send({
+                    "type": "http.response.body",
+                    "body": chunk,
+                    "more_body": remaining > 0
+                })
+        if remaining > 0:
+            # File shrank underneath us; close the body so the client sees a short read
+            await send({"type": "http.response.body", "body": b"", "more_body": False})
+
+
+def artifact_response(request: Request, path: Union[str, Path], sha256: str,
+                      filename: str, media_type: str) -> Response:
+    """
+    Build the response for a stored artifact download.
+
+    Args:
+        request: Incoming request (conditional and Range headers, ?v= version)
+        path: Artifact file path
+        sha256: SHA-256 of the artifact contents (strong ETag)
+        filename: Download filename for Content-Disposition
+        media_type: Response content type
+
+    Returns:
+        304, 206, 416 or 200 response
+    """
+    path = Path(path)
+    stat_result = os.stat(path)
+    size = stat_result.st_size
+    etag = f'"{sha256}"'
+
+    versioned = request.query_params.get("v") == version_token(sha256)
+    headers = {
+        "ETag": etag,
+        "Cache-Control": IMMUTABLE_CACHE_CONTROL if versioned else REVALIDATE_CACHE_CONTROL,
+        "Accept-Ranges": "bytes",
+        "Last-Modified": formatdate(stat_result.st_mtime, usegmt=True)
+    }
+
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers=headers)
+
+    quoted_filename = quote(filename)
+    if quoted_filename != filename:
+        headers["Content-Disposition"] = f"attachment; filename*=utf-8''{quoted_filename}"
+    else:
+        headers["Content-Disposition"] = f'attachment; filename="{filename}"'
+
+    # If-Range: only honour Range when the client's copy is still this version
+    range_header = request.headers.get("range")
+    if_range = request.headers.get("if-range")
+    if if_range is not None and if_range.strip() != etag:
+        range_header = None
+
+    try:
+        byte_range = parse_range(range_header, size)
+    except ValueError:
+        return Response(status_code=416, headers={**headers, "Content-Range": f"bytes */{size}"})
+
+    if byte_range is None:
+        return ArtifactFileResponse(path, 0, size, headers=headers, media_type=media_type)
+
+    start, end = byte_range
+    headers["Content-Range"] = f"bytes {start}-{end}/{size}"
+    return ArtifactFileResponse(path, start, end - start + 1, status_code=206,
+                                headers=headers, media_type=media_type)
@@ -1,7 +1,10 @@
 """
 Email sending utilities for transactional and marketing sequences.
 
-Currently supports Postmark via HTTPS API.
+Currently supports Postmark via HTTPS API. Requests go through one pooled
+keep-alive session per process when `requests` is installed (stdlib urllib
+otherwise), and queued sequences send up to POSTMARK_BATCH_LIMIT messages per
+call through the batch endpoint.
 """
 
 from __future__ import annotations
@@ -9,16 +12,49 @@ from __future__ import annotations
 import json
 import os
 import ssl
-from typing import Optional, Tuple
+import threading
+from typing import Any, Dict, List, Optional, Tuple
 from urllib import request as urlrequest
 
 from core.logging import get_logger
 
+try:
+    import requests
+    from requests.adapters import HTTPAdapter
+except ImportError:  # pragma: no cover - stdlib fallback
+    requests = None
+
 logger = get_logger(__name__)
 
+POSTMARK_EMAIL_URL = "https://api.postmarkapp.com/email"
+POSTMARK_BATCH_URL = "https://api.postmarkapp.com/email/batch"
+# Postmark accepts at most 500 messages per batch call
+POSTMARK_BATCH_LIMIT = 500
+
+_session = None
+_session_lock = threading.Lock()
+
 
-def _post_json(url: str, headers: dict, payload: dict, timeout: int = 15) -> Tuple[int, str]:
+def _get_session():
+    """Return the process-wide pooled HTTP session, creating it on first use."""
+    global _session
+    with _session_lock:
+        if _session is None:
+            _session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=1, pool_maxsize=4)
+            _session.mount("https://", adapter)
+        return _session
+
+
+def _post_json(url: str, headers: dict, payload: Any, timeout: int = 15) -> Tuple[int, str]:
     data = json.dumps(payload).encode("utf-8")
+    if requests is not None:
+        try:
+            resp = _get_session().post(url, data=data, headers=headers, timeout=timeout)
+            return resp.status_code, resp.text
+        except Exception as e:
+            return 0, str(e)
+
     req = urlrequest.Request(url, data=data, headers=headers, method="POST")
     context = ssl.create_default_context()
     try:
@@ -29,33 +65,28 @@ def _post_json(url: str, headers: dict, payload: dict, timeout: int = 15) -> Tup
         return 0, str(e)
 
 
-def send_postmark_email(
-    to_email: str,
-    subject: str,
-    html_body: str,
-    text_body: Optional[str] = None,
-    from_email: Optional[str] = None,
-) -> bool:
-    """Send an email via Postmark API using only stdlib.
-
-    Reads token from POSTMARK_API_TOKEN or POSTMARK_TOKEN.
-    Default From is "John <john@proofkit.net>" unless overridden.
-    """
+def _postmark_headers() -> Optional[Dict[str, str]]:
+    """API headers, or None if POSTMARK_API_TOKEN / POSTMARK_TOKEN is not set."""
     token = os.getenv("POSTMARK_API_TOKEN") or os.getenv("POSTMARK_TOKEN")
     if not token:
         logger.error("POSTMARK_API_TOKEN not configured")
-        return False
-
-    from_addr = from_email or os.getenv("EMAIL_FROM", "John <john@proofkit.net>")
-
-    url = "https://api.postmarkapp.com/email"
-    headers = {
+        return None
+    return {
         "Content-Type": "application/json",
         "Accept": "application/json",
         "X-Postmark-Server-Token": token,
     }
-    payload = {
-        "From": from_addr,
+
+
+def _postmark_message(
+    to_email: str,
+    subject: str,
+    html_body: str,
+    text_body: Optional[str] = None,
+    from_email: Optional[str] = None,
+) -> Dict[str, Any]:
+    return {
+        "From": from_email or os.getenv("EMAIL_FROM", "John <john@proofkit.net>"),
         "To": to_email,
         "Subject": subject,
         "HtmlBody": html_body,
@@ -64,10 +95,64 @@ def send_postmark_email(
         "TrackOpens": True,
     }
 
-    status, body = _post_json(url, headers, payload)
+
+def send_postmark_email(
+    to_email: str,
+    subject: str,
+    html_body: str,
+    text_body: Optional[str] = None,
+    from_email: Optional[str] = None,
+) -> bool:
+    """Send an email via Postmark API.
+
+    Reads token from POSTMARK_API_TOKEN or POSTMARK_TOKEN.
+    Default From is "John <john@proofkit.net>" unless overridden.
+    """
+    headers = _postmark_headers()
+    if headers is None:
+        return False
+
+    payload = _postmark_message(to_email, subject, html_body, text_body, from_email)
+    status, body = _post_json(POSTMARK_EMAIL_URL, headers, payload)
     if status == 200:
         logger.info(f"Postmark email sent to {to_email}: {subject}")
         return True
     logger.error(f"Postmark email failed ({status}): {body}")
     return False
 
+
+def send_postmark_batch(messages: List[Dict[str, Any]]) -> List[bool]:
+    """Send several emails with as few Postmark API calls as possible.
+
+    Args:
+        messages: Keyword arguments for send_postmark_email, one dict per email
+
+    Returns:
+        Per-message success flags, in the order given
+    """
+    if not messages:
+        return []
+    headers = _postmark_headers()
+    if headers is None:
+        return [False] * len(messages)
+
+    results: List[bool] = []
+    for start in range(0, len(messages), POSTMARK_BATCH_LIMIT):
+        chunk = messages[start:start + POSTMARK_BATCH_LIMIT]
+        status, body = _post_json(POSTMARK_BATCH_URL, headers, [_postmark_message(**m) for m in chunk])
+        try:
+            responses = json.loads(body) if status == 200 else None
+        except ValueError:
+            responses = None
+        if not isinstance(responses, list) or len(responses) != len(chunk):
+            logger.error(f"Postmark batch failed ({status}): {body}")
+            results.extend([False] * len(chunk))
+            continue
+
+        for message, response in zip(chunk, responses):
+            sent = isinstance(response, dict) and response.get("ErrorCode") == 0
+            if not sent:
+                logger.error(f"Postmark batch email to {message['to_email']} failed: {response}")
+            results.append(sent)
+        logger.info(f"Postmark batch sent {sum(results[start:])}/{len(chunk)} emails")
+    return results
@@ -1,33 +1,30 @@
 """Industry routing and specification adaptation."""
 
-from typing import Dict, Any, Callable, Optional
-from core.decide import make_decision
-from core.metrics_powder import validate_powder_coating_cure
-from core.metrics_autoclave import validate_autoclave_sterilization
-from core.metrics_coldchain import validate_coldchain_storage
-from core.metrics_haccp import validate_haccp_cooling
-from core.metrics_concrete import validate_concrete_curing
-from core.metrics_sterile import validate_sterile_environment
+import importlib
+from typing import Dict, Any, Callable, Optional, Tuple
+
+# Engines are imported on first use so that loading the router (and app.py)
+# does not pull in every metrics module and its numerical dependencies.
+ENGINES: Dict[str, Tuple[str, str]] = {
+    "powder": ("core.metrics_powder", "validate_powder_coating_cure"),
+    "powder-coating": ("core.metrics_powder", "validate_powder_coating_cure"),  # Alias for powder
+    "autoclave": ("core.metrics_autoclave", "validate_autoclave_sterilization"),
+    "coldchain": ("core.metrics_coldchain", "validate_coldchain_storage"),
+    "cold-chain": ("core.metrics_coldchain", "validate_coldchain_storage"),
+    "haccp": ("core.metrics_haccp", "validate_haccp_cooling"),
+    "concrete": ("core.metrics_concrete", "validate_concrete_curing"),
+    "sterile": ("core.metrics_sterile", "validate_sterile_environment"),
+    "eto": ("core.metrics_sterile", "validate_sterile_environment"),
+}
 
 def select_engine(industry: str) -> Callable:
     """Select appropriate analysis engine for industry."""
-    engines = {
-        "powder": validate_powder_coating_cure,
-        "powder-coating": validate_powder_coating_cure,  # Alias for powder
-        "autoclave": validate_autoclave_sterilization,
-        "coldchain": validate_coldchain_storage,
-        "cold-chain": validate_coldchain_storage,
-        "haccp": validate_haccp_cooling,
-        "concrete": validate_concrete_curing,
-        "sterile": validate_sterile_environment,
-        "eto": validate_sterile_environment,
-    }
-    
     industry_lower = industry.lower().strip()
-    if industry_lower not in engines:
-        raise ValueError(f"Unknown industry: {industry}. Valid: {list(engines.keys())}")
+    if industry_lower not in ENGINES:
+        raise ValueError(f"Unknown industry: {industry}. Valid: {list(ENGINES.keys())}")
     
-    return engines[industry_lower]
+    module_name, func_name = ENGINES[industry_lower]
+    return getattr(importlib.import_module(module_name), func_name)
 
 def adapt_spec_v2(industry: str, spec_dict: Dict[str, Any]) -> Dict[str, Any]:
     """
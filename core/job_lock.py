@@ -0,0 +1,156 @@
+"""
+Per-job locking for ProofKit job directories.
+
+Job IDs are derived from the spec and CSV content, so two identical
+submissions map to the same job directory. run_job_once() lets exactly one
+of them run the pipeline: it takes an exclusive lock file inside the job
+directory, which coordinates threads and gunicorn workers alike. A duplicate
+that arrives while the first is in flight waits on the lock and then reuses
+the result the first one stored, instead of recomputing and overwriting its
+files. Unrelated jobs never wait on each other. Waiting blocks the calling
+thread, so async handlers must call run_job_once() through a threadpool.
+
+Example usage:
+    from core.job_lock import run_job_once
+
+    result = run_job_once(job_dir, lambda: process_csv_and_spec(csv, spec, job_dir, job_id))
+
+    # From an async handler
+    result = await run_in_threadpool(run_job_once, job_dir, compute)
+"""
+
+import logging
+import os
+import tempfile
+import threading
+import time
+from contextlib import ExitStack, contextmanager
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, Optional
+try:
+    import fcntl  # Unix-based file locking
+except ImportError:  # pragma: no cover - Windows fallback
+    fcntl = None
+
+from core.serialization import dumps_fast, loads
+
+logger = logging.getLogger(__name__)
+
+# How long a duplicate submission waits for the in-flight one before
+# computing on its own
+JOB_LOCK_TIMEOUT_S = float(os.environ.get('JOB_LOCK_TIMEOUT_S', '300'))
+JOB_LOCK_POLL_S = 0.05
+
+LOCK_FILENAME = '.job.lock'
+RESULT_FILENAME = '.result.json'
+
+# Fallback for platforms without fcntl (single process only)
+_thread_locks: Dict[str, threading.Lock] = {}
+_thread_locks_guard = threading.Lock()
+
+
+@contextmanager
+def job_lock(job_dir: Path, timeout_s: float = JOB_LOCK_TIMEOUT_S,
+             lock_name: str = LOCK_FILENAME) -> Iterator[bool]:
+    """
+    Hold the exclusive lock for one job directory.
+
+    Args:
+        job_dir: Existing job directory
+        timeout_s: Seconds to wait for another holder before giving up
+        lock_name: Lock file in job_dir; other names lock independently of
+            the pipeline lock
+
+    Yields:
+        True if another submission held the lock when we arrived
+
+    Raises:
+        TimeoutError: If the lock is still held after timeout_s
+    """
+    if fcntl is None:
+        with _thread_locks_guard:
+            lock = _thread_locks.setdefault(str(job_dir / lock_name), threading.Lock())
+        waited = not lock.acquire(blocking=False)
+        if waited and not lock.acquire(timeout=timeout_s):
+            raise TimeoutError(f"Job {job_dir.name} is still locked after {timeout_s}s")
+        try:
+            yield waited
+        finally:
+            lock.release()
+        return
+
+    with open(job_dir / lock_name, 'w') as lf:
+        waited = False
+        deadline = time.monotonic() + timeout_s
+        while True:
+            try:
+                fcntl.flock(lf, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                break
+            except BlockingIOError:
+                waited = True
+                if time.monotonic() >= deadline:
+                    raise TimeoutError(f"Job {job_dir.name} is still locked after {timeout_s}s")
+                time.sleep(JOB_LOCK_POLL_S)
+        try:
+            yield waited
+        finally:
+            fcntl.flock(lf, fcntl.LOCK_UN)
+
+
+def _load_result(job_dir: Path, since: float) -> Optional[Dict[str, Any]]:
+    """Return the stored result if it was written after `since` (Unix time)."""
+    result_path = job_dir / RESULT_FILENAME
+    try:
+        if result_path.stat().st_mtime < since:
+            return None
+        with open(result_path, 'r') as f:
+            return loads(f.read())
+    except (OSError, ValueError):
+        return None
+
+
+def _store_result(job_dir: Path, result: Dict[str, Any]) -> None:
+    """Persist a result atomically so waiting duplicates can reuse it."""
+    try:
+        payload = dumps_fast(result)
+    except (TypeError, ValueError):
+        return  # Not JSON-serializable; duplicates will recompute
+    try:
+        fd, temp_name = tempfile.mkstemp(prefix='.result.', suffix='.tmp', dir=job_dir)
+        with os.fdopen(fd, 'wb') as f:
+            f.write(payload)
+        os.replace(temp_name, job_dir / RESULT_FILENAME)
+    except OSError as e:
+        logger.warning(f"Could not store result for job {job_dir.name}: {e}")
+
+
+def run_job_once(job_dir: Path, compute: Callable[[], Dict[str, Any]],
+                 timeout_s: float = JOB_LOCK_TIMEOUT_S) -> Dict[str, Any]:
+    """
+    Run a job's pipeline unless an identical submission just produced its result.
+
+    Args:
+        job_dir: Job storage directory (created if missing)
+        compute: Runs the pipeline and returns its result dictionary
+        timeout_s: Seconds to wait for an in-flight duplicate
+
+    Returns:
+        Result of compute(), or the in-flight duplicate's result
+    """
+    job_dir.mkdir(parents=True, exist_ok=True)
+    arrived = time.time()
+    with ExitStack() as stack:
+        try:
+            waited = stack.enter_context(job_lock(job_dir, timeout_s))
+        except TimeoutError as e:
+            logger.warning(f"{e}; computing without the lock")
+            return compute()
+
+        if waited:
+            result = _load_result(job_dir, since=arrived)
+            if result is not None:
+                logger.info(f"Reusing result of in-flight duplicate for job {job_dir.name}")
+                return result
+        result = compute()
+        _store_result(job_dir, result)
+        return result
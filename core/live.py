@@ -0,0 +1,844 @@
+"""
+Live run ingestion for ProofKit.
+
+Loggers can push readings while a cure, sterilization or cooling cycle is still
+running. Each open run keeps the raw samples (append-only) plus online state for
+its industry engine, so every appended batch updates the state in O(batch):
+
+- hold runs: the hysteresis state machine, current and longest run above the
+  industry engine's threshold and cumulative time above it (powder, sterile,
+  concrete, autoclave)
+- cumulative Fo lethality (autoclave)
+- the running excursion tracker (coldchain)
+- HACCP phase crossing times for 70°F and 41°F (haccp)
+
+The live status only says whether the requirement is already met or can no
+longer be met. Closing a run rebuilds the CSV from the stored samples and sends
+it through the normal compile pipeline, which makes the authoritative decision.
+close_run() marks the run as closing and snapshots its samples in one
+transaction; from then on appends and further closes are rejected until
+finish_close() removes the run or cancel_close() reopens it.
+
+Open runs live in a SQLite database under LIVE_STORAGE_DIR, so any gunicorn
+worker can serve any request for a run and runs survive worker restarts. An
+append reloads the run's state, applies the batch and stores the new state
+and the raw batch in one IMMEDIATE transaction. Runs expire after
+LIVE_RUN_TTL_S of inactivity.
+
+Example usage:
+    from core.live import open_run, get_run, close_run
+
+    run = open_run(spec, spec_data, owner='user@example.com')
+    snapshot = run.append([{"timestamp": "2024-01-01T10:00:00Z", "temp_1": 25.0}, ...])
+    print(snapshot['status'])
+
+    run = close_run(run.run_id, owner='user@example.com')
+    csv_content = run.to_csv_bytes()
+    finish_close(run.run_id)
+"""
+
+import json
+import logging
+import os
+import sqlite3
+import time
+import uuid
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from core.models import SensorMode, SpecV1
+from core.sqlite_store import connect, immediate_transaction
+from core.temperature_utils import DecisionError
+from core.trace import TraceFrame, find_timestamp_column
+
+logger = logging.getLogger(__name__)
+
+LIVE_STORAGE_DIR = Path(os.environ.get('LIVE_STORAGE_DIR', Path(__file__).resolve().parent.parent / 'storage' / 'live'))
+LIVE_DB_NAME = "live_runs.db"
+
+# Idle expiry and size limits for open runs
+LIVE_RUN_TTL_S = int(os.environ.get('LIVE_RUN_TTL_S', str(6 * 3600)))
+LIVE_MAX_SAMPLES = int(os.environ.get('LIVE_MAX_SAMPLES', '200000'))
+
+STATUS_IN_PROGRESS = "IN_PROGRESS"
+STATUS_REQUIREMENT_MET = "REQUIREMENT_MET"
+STATUS_FAILED = "FAILED"
+
+# Engine constants mirrored from the core.metrics_* industry engines
+POWDER_HYSTERESIS_C = 2.0
+CONCRETE_MIN_C = 16.0
+CONCRETE_HYSTERESIS_C = 0.5
+STERILE_MIN_C = 50.0
+STERILE_HYSTERESIS_C = 1.0
+AUTOCLAVE_HYSTERESIS_C = 0.3
+AUTOCLAVE_MIN_FO = 12.0
+HACCP_PHASE_1_LIMIT_S = 2 * 3600
+HACCP_PHASE_2_LIMIT_S = 6 * 3600
+COLDCHAIN_MIN_C = 2.0
+COLDCHAIN_MAX_C = 8.0
+COLDCHAIN_ALARM_S = 30 * 60
+
+
+class LiveRunError(Exception):
+    """Raised when samples cannot be appended to a live run."""
+    pass
+
+
+def fahrenheit_to_celsius(temp_f: float) -> float:
+    """Convert Fahrenheit to Celsius."""
+    return (temp_f - 32.0) * 5.0 / 9.0
+
+
+def hysteresis_state(temps: np.ndarray, threshold_C: float, hysteresis_C: float,
+                     initial: bool = False) -> np.ndarray:
+    """
+    Vectorized hysteresis state machine.
+
+    A sample at or above threshold_C switches the state on, a sample below
+    threshold_C - hysteresis_C switches it off and anything in between (or NaN)
+    keeps the previous state, as in calculate_continuous_hold_time.
+
+    Args:
+        temps: Temperatures for the batch
+        threshold_C: Switch-on threshold
+        hysteresis_C: Hysteresis band below the threshold
+        initial: State carried over from the previous batch
+
+    Returns:
+        Boolean array with the state after each sample
+    """
+    decided = np.full(len(temps), -1, dtype=np.int8)
+    decided[temps >= threshold_C] = 1
+    decided[temps < threshold_C - hysteresis_C] = 0
+
+    last_decided = np.where(decided >= 0, np.arange(len(temps)), -1)
+    np.maximum.accumulate(last_decided, out=last_decided)
+    return np.where(last_decided >= 0, decided[np.maximum(last_decided, 0)] == 1, initial)
+
+
+class OnlineTracker:
+    """Base for online trackers; their state round-trips through plain JSON."""
+
+    # Attributes holding nested trackers, by tracker class
+    NESTED: Dict[str, type] = {}
+
+    def dump(self) -> Dict[str, Any]:
+        return {key: value.dump() if isinstance(value, OnlineTracker) else value
+                for key, value in vars(self).items()}
+
+    @classmethod
+    def load(cls, data: Dict[str, Any]) -> 'OnlineTracker':
+        tracker = cls.__new__(cls)
+        for key, value in data.items():
+            setattr(tracker, key, cls.NESTED[key].load(value) if key in cls.NESTED else value)
+        return tracker
+
+
+class RunTracker(OnlineTracker):
+    """Online tracker for runs of consecutive True samples."""
+
+    def __init__(self):
+        self.active = False
+        self.run_start_s: Optional[float] = None
+        self.last_true_s: Optional[float] = None
+        self.first_true_s: Optional[float] = None
+        self.longest_s = 0.0
+        self.closed_total_s = 0.0
+        self.runs = 0
+
+    def update(self, times_s: np.ndarray, mask: np.ndarray) -> np.ndarray:
+        """
+        Feed one batch.
+
+        Args:
+            times_s: Sample times in seconds since the run started
+            mask: Boolean state per sample
+
+        Returns:
+            Durations of the runs closed by this batch
+        """
+        previous = np.concatenate(([self.active], mask[:-1]))
+        following = np.concatenate((mask[1:], [False]))
+        starts = times_s[mask & ~previous]
+        ends = times_s[mask & ~following]
+        self.runs += len(starts)
+        # A run left open by the previous batch either continues or ended at its last sample
+        ended_at_boundary = np.array([self.current_s]) if self.active and not mask[0] else np.empty(0)
+        if self.active and mask[0]:
+            starts = np.concatenate(([self.run_start_s], starts))
+
+        durations = ends - starts
+        if len(durations):
+            self.longest_s = max(self.longest_s, float(durations.max()))
+        if self.first_true_s is None and mask.any():
+            self.first_true_s = float(times_s[np.argmax(mask)])
+
+        self.active = bool(mask[-1])
+        if self.active:
+            self.run_start_s = float(starts[-1])
+            self.last_true_s = float(times_s[-1])
+            closed = durations[:-1]
+        else:
+            self.run_start_s = None
+            closed = durations
+        closed = np.concatenate((ended_at_boundary, closed))
+        self.closed_total_s += float(closed.sum())
+        return closed
+
+    @property
+    def current_s(self) -> float:
+        """Duration of the open run, 0 if the state is off."""
+        if not self.active:
+            return 0.0
+        return self.last_true_s - self.run_start_s
+
+    @property
+    def total_s(self) -> float:
+        """Summed duration of all runs, including the open one."""
+        return self.closed_total_s + self.current_s
+
+
+class HoldTracker(OnlineTracker):
+    """Hysteresis hold tracking above a threshold."""
+
+    NESTED = {'runs': RunTracker}
+
+    def __init__(self, threshold_C: float, hysteresis_C: float):
+        self.threshold_C = threshold_C
+        self.hysteresis_C = hysteresis_C
+        self.runs = RunTracker()
+
+    def update(self, times_s: np.ndarray, temps: np.ndarray, above: Optional[np.ndarray] = None) -> None:
+        """Feed one batch; `above` overrides the state machine for boolean sensor modes."""
+        if above is None:
+            above = hysteresis_state(temps, self.threshold_C, self.hysteresis_C, self.runs.active)
+        self.runs.update(times_s, above)
+
+    def state(self) -> Dict[str, Any]:
+        return {
+            'threshold_C': self.threshold_C,
+            'hysteresis_C': self.hysteresis_C,
+            'above_threshold': self.runs.active,
+            'current_hold_s': self.runs.current_s,
+            'longest_hold_s': self.runs.longest_s,
+            'cumulative_hold_s': self.runs.total_s,
+            'threshold_reached_s': self.runs.first_true_s,
+        }
+
+
+class FoTracker(OnlineTracker):
+    """Cumulative Fo lethality by trapezoidal integration, as in calculate_fo_value."""
+
+    def __init__(self, z_value: float = 10.0, reference_temp_c: float = 121.1):
+        self.z_value = z_value
+        self.reference_temp_c = reference_temp_c
+        self.fo_value = 0.0
+        self._last_time_s: Optional[float] = None
+        self._last_rate: Optional[float] = None
+
+    def update(self, times_s: np.ndarray, temps: np.ndarray) -> None:
+        rates = 10 ** ((temps - self.reference_temp_c) / self.z_value)
+        if self._last_time_s is not None:
+            times_s = np.concatenate(([self._last_time_s], times_s))
+            rates = np.concatenate(([self._last_rate], rates))
+        if len(times_s) > 1:
+            self.fo_value += float(np.nansum((rates[1:] + rates[:-1]) / 2.0 * np.diff(times_s)) / 60.0)
+        self._last_time_s = float(times_s[-1])
+        self._last_rate = float(rates[-1])
+
+    def state(self) -> Dict[str, Any]:
+        return {'fo_value': self.fo_value}
+
+
+class ExcursionTracker(OnlineTracker):
+    """Running cold chain excursion tracking, as in identify_temperature_excursions."""
+
+    NESTED = {'runs': RunTracker}
+
+    def __init__(self, min_temp_c: float = COLDCHAIN_MIN_C, max_temp_c: float = COLDCHAIN_MAX_C,
+                 alarm_threshold_s: float = COLDCHAIN_ALARM_S):
+        self.min_temp_c = min_temp_c
+        self.max_temp_c = max_temp_c
+        self.alarm_threshold_s = alarm_threshold_s
+        self.runs = RunTracker()
+        self.samples = 0
+        self.samples_in_range = 0
+        self.closed_alarm_events = 0
+
+    def update(self, times_s: np.ndarray, temps: np.ndarray) -> None:
+        outside = (temps < self.min_temp_c) | (temps > self.max_temp_c)
+        self.samples += len(temps)
+        self.samples_in_range += int((~outside).sum())
+        closed = self.runs.update(times_s, outside)
+        self.closed_alarm_events += int((closed >= self.alarm_threshold_s).sum())
+
+    @property
+    def in_alarm(self) -> bool:
+        return self.runs.active and self.runs.current_s >= self.alarm_threshold_s
+
+    def state(self) -> Dict[str, Any]:
+        return {
+            'compliance_pct': 100.0 * self.samples_in_range / self.samples if self.samples else None,
+            'in_excursion': self.runs.active,
+            'in_alarm': self.in_alarm,
+            'excursion_events': self.runs.runs,
+            'alarm_events': self.closed_alarm_events + int(self.in_alarm),
+            'current_excursion_s': self.runs.current_s,
+            'max_excursion_duration_s': self.runs.longest_s,
+            'total_excursion_time_s': self.runs.total_s,
+        }
+
+
+class PhaseTracker(OnlineTracker):
+    """HACCP cooling phase crossing times, as in validate_haccp_cooling_phases."""
+
+    TARGETS = {
+        'time_to_70f_s': fahrenheit_to_celsius(70.0),
+        'time_to_41f_s': fahrenheit_to_celsius(41.0),
+    }
+
+    def __init__(self):
+        self.start_temp_C: Optional[float] = None
+        self.crossings: Dict[str, Optional[float]] = {key: None for key in self.TARGETS}
+        self.heating_detected = False
+        self._last_time_s: Optional[float] = None
+        self._last_temp: Optional[float] = None
+
+    def update(self, times_s: np.ndarray, temps: np.ndarray) -> None:
+        if self.start_temp_C is None:
+            self.start_temp_C = float(temps[0])
+        if self._last_time_s is not None:
+            times_s = np.concatenate(([self._last_time_s], times_s))
+            temps = np.concatenate(([self._last_temp], temps))
+
+        if len(temps) > 1:
+            if np.nanmax(np.diff(temps), initial=-np.inf) > 2.0:
+                self.heating_detected = True
+            current, following = temps[:-1], temps[1:]
+            for key, target in self.TARGETS.items():
+                if self.crossings[key] is not None:
+                    continue
+                crossed = np.flatnonzero((current >= target) & (target >= following))
+                if len(crossed):
+                    i = crossed[0]
+                    t0, t1, temp0, temp1 = times_s[i], times_s[i + 1], current[i], following[i]
+                    fraction = 0.0 if abs(temp0 - temp1) < 1e-10 else (target - temp0) / (temp1 - temp0)
+                    self.crossings[key] = float(t0 + (t1 - t0) * fraction)
+
+        self._last_time_s = float(times_s[-1])
+        self._last_temp = float(temps[-1])
+
+    def state(self) -> Dict[str, Any]:
+        return {
+            'start_temp_C': self.start_temp_C,
+            'heating_detected': self.heating_detected,
+            'phase_1_time_limit_s': HACCP_PHASE_1_LIMIT_S,
+            'phase_2_time_limit_s': HACCP_PHASE_2_LIMIT_S,
+            **self.crossings,
+        }
+
+
+class LiveRun:
+    """
+    One open run: raw samples plus the online state of its industry engine.
+
+    Instances are loaded from the run database by get_run() and close_run();
+    append() writes the new state back.
+
+    Attributes:
+        run_id: Run identifier
+        spec: Validated specification
+        spec_data: Specification dictionary used when the run is compiled
+        owner: Email of the user who opened the run
+    """
+
+    def __init__(self, run_id: str, spec: SpecV1, spec_data: Dict[str, Any], owner: str):
+        self.run_id = run_id
+        self.spec = spec
+        self.spec_data = spec_data
+        self.owner = owner
+        self.industry = (spec.industry or "powder").lower()
+        self.updated_at = time.time()
+
+        self.columns: Optional[List[str]] = None
+        self.timestamp_column: Optional[str] = None
+        self.temp_columns: List[str] = []
+        self.sample_count = 0
+        self.batch_count = 0
+        # Raw batches read when the run was closed
+        self._closed_batches: Optional[List[List[Dict[str, Any]]]] = None
+        self._start_ns: Optional[int] = None
+        self._last_ns: Optional[int] = None
+        self._failures: List[str] = []
+
+        selection = spec.sensor_selection
+        self.sensor_mode = selection.mode if selection else SensorMode.MIN_OF_SET
+        self.require_at_least = selection.require_at_least if selection else None
+
+        self.hold: Optional[HoldTracker] = None
+        self.fo: Optional[FoTracker] = None
+        self.excursions: Optional[ExcursionTracker] = None
+        self.phases: Optional[PhaseTracker] = None
+        if self.industry == "haccp":
+            self.phases = PhaseTracker()
+        elif self.industry == "coldchain":
+            self.excursions = ExcursionTracker()
+        elif self.industry == "autoclave":
+            band = spec.spec.temp_band_C
+            if band and band.min is not None:
+                min_temp_C = band.min
+            else:
+                min_temp_C = spec.spec.target_temp_C - spec.spec.sensor_uncertainty_C
+            self.hold = HoldTracker(min_temp_C, AUTOCLAVE_HYSTERESIS_C)
+            self.fo = FoTracker()
+        elif self.industry == "concrete":
+            self.hold = HoldTracker(CONCRETE_MIN_C, CONCRETE_HYSTERESIS_C)
+        elif self.industry == "sterile":
+            self.hold = HoldTracker(STERILE_MIN_C, STERILE_HYSTERESIS_C)
+        else:
+            self.hold = HoldTracker(spec.spec.target_temp_C + spec.spec.sensor_uncertainty_C, POWDER_HYSTERESIS_C)
+
+    @classmethod
+    def _from_row(cls, row: sqlite3.Row) -> 'LiveRun':
+        """Rebuild a run from its live_runs row."""
+        state = json.loads(row['state'])
+        run = cls(row['run_id'], SpecV1(**state['spec']), state['spec_data'], row['owner'])
+        run._restore(row)
+        return run
+
+    def _restore(self, row: sqlite3.Row) -> None:
+        """Reset the mutable state to what the live_runs row holds."""
+        state = json.loads(row['state'])
+        self.columns = state['columns']
+        self.timestamp_column = state['timestamp_column']
+        self.temp_columns = state['temp_columns']
+        self.sample_count = state['sample_count']
+        self._start_ns = state['start_ns']
+        self._last_ns = state['last_ns']
+        self._failures = state['failures']
+        for name, data in state['trackers'].items():
+            setattr(self, name, type(getattr(self, name)).load(data))
+        self.batch_count = row['batches']
+        self.updated_at = row['updated_at']
+
+    def _dump_state(self) -> str:
+        return json.dumps({
+            'spec': self.spec.model_dump(mode='json', by_alias=True, exclude_none=True),
+            'spec_data': self.spec_data,
+            'columns': self.columns,
+            'timestamp_column': self.timestamp_column,
+            'temp_columns': self.temp_columns,
+            'sample_count': self.sample_count,
+            'start_ns': self._start_ns,
+            'last_ns': self._last_ns,
+            'failures': self._failures,
+            'trackers': {
+                name: tracker.dump() for name, tracker in (
+                    ('hold', self.hold), ('fo', self.fo), ('excursions', self.excursions), ('phases', self.phases)
+                ) if tracker is not None
+            },
+        })
+
+    def append(self, records: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        Append a batch of samples and update the online state.
+
+        Args:
+            records: Samples as dicts with a timestamp and sensor columns (°C);
+                every batch must use the columns of the first one and continue
+                strictly after the last appended timestamp
+
+        Returns:
+            State snapshot after the batch
+
+        Raises:
+            LiveRunError: If the run was closed, is being closed or expired, or
+                the batch is empty, malformed or out of order
+        """
+        conn = _connect_runs()
+        try:
+            with immediate_transaction(conn):
+                # Another worker may have appended since this run was loaded
+                row = _load_row(conn, self.run_id)
+                if row is None:
+                    raise LiveRunError("Live run is closed or expired")
+                if row['closing']:
+                    raise LiveRunError("Live run is being closed")
+                self._restore(row)
+                try:
+                    snapshot = self._append(records)
+                except Exception:
+                    self._restore(row)
+                    raise
+                conn.execute(
+                    "INSERT INTO live_batches (run_id, seq, records) VALUES (?, ?, ?)",
+                    (self.run_id, self.batch_count, json.dumps(records))
+                )
+                self.batch_count += 1
+                conn.execute(
+                    "UPDATE live_runs SET state = ?, batches = ?, updated_at = ? WHERE run_id = ?",
+                    (self._dump_state(), self.batch_count, self.updated_at, self.run_id)
+                )
+                return snapshot
+        finally:
+            conn.close()
+
+    def _append(self, records: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Validate a batch and update the online state in memory."""
+        batch = pd.DataFrame.from_records(records)
+        if batch.empty:
+            raise LiveRunError("No samples in batch")
+        if self.sample_count + len(batch) > LIVE_MAX_SAMPLES:
+            raise LiveRunError(f"Run exceeds {LIVE_MAX_SAMPLES} samples")
+
+        if self.columns is None:
+            self._bind_columns(batch)
+        elif set(batch.columns) != set(self.columns):
+            raise LiveRunError(f"Batch columns {list(batch.columns)} do not match run columns {self.columns}")
+        else:
+            batch = batch[self.columns]
+
+        try:
+            timestamps_ns = pd.DatetimeIndex(pd.to_datetime(batch[self.timestamp_column], utc=True)).asi8
+        except (ValueError, TypeError) as e:
+            raise LiveRunError(f"Invalid timestamps: {e}")
+        if (np.diff(timestamps_ns) <= 0).any() or (self._last_ns is not None and timestamps_ns[0] <= self._last_ns):
+            raise LiveRunError("Samples must be appended in strictly increasing timestamp order")
+
+        sensors = batch[self.temp_columns].apply(pd.to_numeric, errors='coerce')
+        sensors.insert(0, self.timestamp_column, pd.to_datetime(batch[self.timestamp_column], utc=True))
+        if self._start_ns is None:
+            self._start_ns = int(timestamps_ns[0])
+        self._update_trackers((timestamps_ns - self._start_ns) / 1e9, sensors)
+
+        self.sample_count += len(batch)
+        self._last_ns = int(timestamps_ns[-1])
+        self.updated_at = time.time()
+        return self._snapshot()
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Current state snapshot."""
+        return self._snapshot()
+
+    def to_csv_bytes(self) -> bytes:
+        """Rebuild the uploaded-CSV equivalent of every appended sample."""
+        batches = self._closed_batches
+        if batches is None:
+            conn = _connect_runs()
+            try:
+                batches = _load_batches(conn, self.run_id)
+            finally:
+                conn.close()
+        if not batches:
+            raise LiveRunError("Run has no samples")
+        frames = [pd.DataFrame.from_records(records)[self.columns] for records in batches]
+        return pd.concat(frames, ignore_index=True).to_csv(index=False).encode('utf-8')
+
+    def _bind_columns(self, batch: pd.DataFrame) -> None:
+        """Fix the timestamp and temperature columns from the first batch."""
+        timestamp_column = find_timestamp_column(batch)
+        if timestamp_column is None:
+            raise LiveRunError("No timestamp column in samples")
+
+        probe = batch.copy()
+        for col in probe.columns:
+            if col != timestamp_column:
+                probe[col] = pd.to_numeric(probe[col], errors='coerce')
+        temp_columns = list(TraceFrame.from_dataframe(probe).roles['temperature'])
+        selection = self.spec.sensor_selection
+        if selection and selection.sensors:
+            temp_columns = [col for col in selection.sensors if col in temp_columns]
+        if not temp_columns:
+            raise LiveRunError("No temperature columns in samples")
+
+        self.columns = list(batch.columns)
+        self.timestamp_column = timestamp_column
+        self.temp_columns = temp_columns
+
+    def _combined(self, sensors: pd.DataFrame, mode: SensorMode, threshold_C: Optional[float] = None) -> np.ndarray:
+        try:
+            return TraceFrame.from_dataframe(sensors).combined(
+                self.temp_columns, mode, self.require_at_least, threshold_C
+            ).to_numpy()
+        except DecisionError as e:
+            raise LiveRunError(str(e))
+
+    def _update_trackers(self, times_s: np.ndarray, sensors: pd.DataFrame) -> None:
+        majority = self.sensor_mode == SensorMode.MAJORITY_OVER_THRESHOLD
+        # Numeric trackers need temperatures even when holds are decided by majority vote
+        numeric_mode = SensorMode.MEAN_OF_SET if majority else self.sensor_mode
+        temps = self._combined(sensors, numeric_mode).astype(float)
+
+        if self.hold is not None:
+            above = self._combined(sensors, self.sensor_mode, self.hold.threshold_C).astype(bool) if majority else None
+            self.hold.update(times_s, temps, above)
+        if self.fo is not None:
+            self.fo.update(times_s, temps)
+        if self.excursions is not None:
+            self.excursions.update(times_s, temps)
+        if self.phases is not None:
+            self.phases.update(times_s, temps)
+
+    def _elapsed_s(self) -> float:
+        if self._start_ns is None:
+            return 0.0
+        return (self._last_ns - self._start_ns) / 1e9
+
+    def _evaluate(self) -> Dict[str, Any]:
+        """Status and reasons from the online state."""
+        required_s = self.spec.spec.hold_time_s
+        elapsed_s = self._elapsed_s()
+        reasons = []
+        failed = False
+        met = False
+
+        if self.hold is not None:
+            continuous = self.spec.logic.continuous if self.spec.logic else True
+            hold_s = self.hold.runs.longest_s if continuous else self.hold.runs.total_s
+            met = hold_s >= required_s
+            reasons.append(
+                f"{'Continuous' if continuous else 'Cumulative'} hold {hold_s:.0f}s of {required_s}s "
+                f"above {self.hold.threshold_C:.1f}°C"
+            )
+            preconditions = self.spec.preconditions
+            limit_s = preconditions.max_time_to_threshold_s if preconditions else None
+            reached_s = self.hold.runs.first_true_s
+            if limit_s is not None and (reached_s if reached_s is not None else elapsed_s) > limit_s:
+                failed = True
+                reasons.append(f"Threshold not reached within {limit_s}s")
+
+        if self.fo is not None:
+            met = met and self.fo.fo_value >= AUTOCLAVE_MIN_FO
+            reasons.append(f"Fo {self.fo.fo_value:.1f} of {AUTOCLAVE_MIN_FO:.0f} min")
+
+        if self.phases is not None:
+            start_limit_C = fahrenheit_to_celsius(135.0) - 0.1
+            if self.phases.start_temp_C is not None and self.phases.start_temp_C < start_limit_C:
+                failed = True
+                reasons.append("Starting temperature below 135°F")
+            all_met = True
+            for key, limit_s, label in (
+                ('time_to_70f_s', HACCP_PHASE_1_LIMIT_S, "70°F"),
+                ('time_to_41f_s', HACCP_PHASE_2_LIMIT_S, "41°F"),
+            ):
+                crossing_s = self.phases.crossings[key]
+                if crossing_s is None:
+                    all_met = False
+                    if elapsed_s > limit_s:
+                        failed = True
+                        reasons.append(f"{label} not reached within {limit_s / 3600:.0f}h")
+                elif crossing_s > limit_s:
+                    all_met = False
+                    failed = True
+                    reasons.append(f"{label} reached after {crossing_s / 3600:.1f}h (limit {limit_s / 3600:.0f}h)")
+                else:
+                    reasons.append(f"{label} reached at {crossing_s / 60:.0f} min")
+            met = all_met and self.phases.start_temp_C is not None
+
+        if self.excursions is not None and self.excursions.in_alarm:
+            reasons.append(f"Temperature outside {COLDCHAIN_MIN_C:.0f}-{COLDCHAIN_MAX_C:.0f}°C for "
+                           f"{self.excursions.runs.current_s / 60:.0f} min")
+
+        # Failures are sticky: a deadline missed once stays missed
+        if failed:
+            self._failures = reasons
+        if self._failures:
+            return {'status': STATUS_FAILED, 'reasons': self._failures}
+        return {'status': STATUS_REQUIREMENT_MET if met else STATUS_IN_PROGRESS, 'reasons': reasons}
+
+    def _snapshot(self) -> Dict[str, Any]:
+        state = {}
+        for tracker in (self.hold, self.fo, self.excursions, self.phases):
+            if tracker is not None:
+                state.update(tracker.state())
+        return {
+            'run_id': self.run_id,
+            'job_id': self.spec.job.job_id,
+            'industry': self.industry,
+            'samples': self.sample_count,
+            'sensors': self.temp_columns,
+            'elapsed_s': self._elapsed_s(),
+            'required_hold_time_s': self.spec.spec.hold_time_s,
+            'last_timestamp': pd.Timestamp(self._last_ns, tz='UTC').isoformat() if self._last_ns is not None else None,
+            **self._evaluate(),
+            'state': state,
+        }
+
+
+def _runs_db_path() -> Path:
+    return LIVE_STORAGE_DIR / LIVE_DB_NAME
+
+
+def _connect_runs():
+    """Open the live run database, creating the schema on first use."""
+    conn = connect(_runs_db_path())
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS live_runs (
+            run_id TEXT PRIMARY KEY,
+            owner TEXT NOT NULL,
+            state TEXT NOT NULL,
+            batches INTEGER NOT NULL DEFAULT 0,
+            closing INTEGER NOT NULL DEFAULT 0,
+            updated_at REAL NOT NULL
+        )
+    """)
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_live_runs_updated ON live_runs (updated_at)")
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS live_batches (
+            run_id TEXT NOT NULL,
+            seq INTEGER NOT NULL,
+            records TEXT NOT NULL,
+            PRIMARY KEY (run_id, seq)
+        )
+    """)
+    return conn
+
+
+def _load_row(conn, run_id: str) -> Optional[sqlite3.Row]:
+    """The run's live_runs row, or None if it does not exist or sat idle past LIVE_RUN_TTL_S."""
+    return conn.execute(
+        "SELECT * FROM live_runs WHERE run_id = ? AND updated_at >= ?",
+        (run_id, time.time() - LIVE_RUN_TTL_S)
+    ).fetchone()
+
+
+def _load_batches(conn, run_id: str) -> List[List[Dict[str, Any]]]:
+    rows = conn.execute("SELECT records FROM live_batches WHERE run_id = ? ORDER BY seq", (run_id,))
+    return [json.loads(row['records']) for row in rows]
+
+
+def _delete_run(conn, run_id: str) -> None:
+    conn.execute("DELETE FROM live_batches WHERE run_id = ?", (run_id,))
+    conn.execute("DELETE FROM live_runs WHERE run_id = ?", (run_id,))
+
+
+def _expire_idle_runs(conn) -> None:
+    """Drop runs idle for longer than LIVE_RUN_TTL_S. Caller holds a write transaction."""
+    cutoff = time.time() - LIVE_RUN_TTL_S
+    for row in conn.execute("SELECT run_id FROM live_runs WHERE updated_at < ?", (cutoff,)).fetchall():
+        logger.info(f"Expiring idle live run {row['run_id']}")
+        _delete_run(conn, row['run_id'])
+
+
+def open_run(spec: SpecV1, spec_data: Dict[str, Any], owner: str) -> LiveRun:
+    """
+    Open a new live run.
+
+    Args:
+        spec: Validated specification
+        spec_data: Specification dictionary used when compiling the run
+        owner: Email of the user opening the run
+
+    Returns:
+        The new LiveRun
+    """
+    run = LiveRun(uuid.uuid4().hex, spec, spec_data, owner)
+    conn = _connect_runs()
+    try:
+        with immediate_transaction(conn):
+            _expire_idle_runs(conn)
+            conn.execute(
+                "INSERT INTO live_runs (run_id, owner, state, batches, updated_at) VALUES (?, ?, ?, 0, ?)",
+                (run.run_id, owner, run._dump_state(), run.updated_at)
+            )
+    finally:
+        conn.close()
+    logger.info(f"Opened live run {run.run_id} ({run.industry}) for {owner}")
+    return run
+
+
+def get_run(run_id: str, owner: str) -> Optional[LiveRun]:
+    """
+    Look up an open run.
+
+    Args:
+        run_id: Run identifier
+        owner: Email of the requesting user
+
+    Returns:
+        The LiveRun, or None if it does not exist, expired, is being closed or
+        belongs to someone else
+    """
+    conn = _connect_runs()
+    try:
+        row = _load_row(conn, run_id)
+    finally:
+        conn.close()
+    if row is None or row['owner'] != owner or row['closing']:
+        return None
+    return LiveRun._from_row(row)
+
+
+def close_run(run_id: str, owner: str) -> Optional[LiveRun]:
+    """
+    Start closing a run: stop accepting samples and snapshot the stored ones.
+
+    The run stays in the database until finish_close() or cancel_close().
+
+    Args:
+        run_id: Run identifier
+        owner: Email of the requesting user
+
+    Returns:
+        The LiveRun with every sample appended before the close, or None if it
+        does not exist or belongs to someone else
+
+    Raises:
+        LiveRunError: If another request is already closing the run
+    """
+    conn = _connect_runs()
+    try:
+        with immediate_transaction(conn):
+            row = _load_row(conn, run_id)
+            if row is None or row['owner'] != owner:
+                return None
+            if row['closing']:
+                raise LiveRunError("Live run is already being closed")
+            run = LiveRun._from_row(row)
+            run._closed_batches = _load_batches(conn, run_id)
+            conn.execute("UPDATE live_runs SET closing = 1 WHERE run_id = ?", (run_id,))
+    finally:
+        conn.close()
+    logger.info(f"Closing live run {run_id} with {run.sample_count} samples")
+    return run
+
+
+def finish_close(run_id: str) -> bool:
+    """
+    Remove a run started closing by close_run().
+
+    Args:
+        run_id: Run identifier
+
+    Returns:
+        True if this call removed the run, False if it was already gone
+    """
+    conn = _connect_runs()
+    try:
+        with immediate_transaction(conn):
+            row = conn.execute("SELECT closing FROM live_runs WHERE run_id = ?", (run_id,)).fetchone()
+            if row is None or not row['closing']:
+                return False
+            _delete_run(conn, run_id)
+    finally:
+        conn.close()
+    logger.info(f"Closed live run {run_id}")
+    return True
+
+
+def cancel_close(run_id: str) -> None:
+    """
+    Reopen a run started closing by close_run(), e.g. after its compile failed.
+
+    Args:
+        run_id: Run identifier
+    """
+    conn = _connect_runs()
+    try:
+        with immediate_transaction(conn):
+            conn.execute("UPDATE live_runs SET closing = 0 WHERE run_id = ?", (run_id,))
+    finally:
+        conn.close()
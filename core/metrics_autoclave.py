@@ -25,8 +25,8 @@ from datetime import datetime, timezone
 import logging
 
 from core.models import SpecV1, DecisionResult, SensorMode
-from core.sensor_utils import combine_sensor_readings
-from core.temperature_utils import detect_temperature_columns, DecisionError
+from core.trace import detect_role_columns, get_trace
+from core.temperature_utils import DecisionError
 from core.temperature_utils import calculate_continuous_hold_time
 from core.errors import RequiredSignalMissingError
 
@@ -88,26 +88,7 @@ def detect_pressure_columns(df: pd.DataFrame) -> List[str]:
     Returns:
         List of pressure column names
     """
-    import re
-    
-    pressure_patterns = [
-        r'.*pressure.*', r'.*press.*', r'.*psi.*', r'.*kpa.*', r'.*bar.*',
-        r'.*_p$', r'.*_pressure$'
-    ]
-    
-    pressure_columns = []
-    
-    for col in df.columns:
-        if col.lower() == 'timestamp' or 'time' in col.lower():
-            continue
-            
-        col_lower = col.lower()
-        if any(re.match(pattern, col_lower) for pattern in pressure_patterns):
-            # Verify it's numeric
-            if pd.api.types.is_numeric_dtype(df[col]):
-                pressure_columns.append(col)
-    
-    return pressure_columns
+    return detect_role_columns(df, 'pressure')
 
 
 def psi_to_kpa(pressure_psi: float) -> float:
@@ -381,12 +362,9 @@ def validate_autoclave_sterilization(normalized_df: pd.DataFrame, spec: SpecV1)
         if spec.industry != "autoclave":
             raise DecisionError(f"Invalid industry '{spec.industry}' for autoclave sterilization validation")
         
-        # Detect timestamp column
-        timestamp_col = None
-        for col in normalized_df.columns:
-            if 'time' in col.lower() or pd.api.types.is_datetime64_any_dtype(normalized_df[col]):
-                timestamp_col = col
-                break
+        # Timestamp column and sensor roles are resolved once per normalized trace
+        trace = get_trace(normalized_df)
+        timestamp_col = trace.timestamp_column
         
         if timestamp_col is None:
             raise DecisionError("No timestamp column found in normalized data")
@@ -396,7 +374,7 @@ def validate_autoclave_sterilization(normalized_df: pd.DataFrame, spec: SpecV1)
             normalized_df[timestamp_col] = pd.to_datetime(normalized_df[timestamp_col])
         
         # Detect temperature columns
-        temp_columns = detect_temperature_columns(normalized_df)
+        temp_columns = list(trace.roles['temperature'])
         if not temp_columns:
             # Get available columns (excluding timestamp)
             available_cols = [col for col in normalized_df.columns if col != timestamp_col]
@@ -407,7 +385,7 @@ def validate_autoclave_sterilization(normalized_df: pd.DataFrame, spec: SpecV1)
             )
         
         # Detect pressure columns (optional by default; may be required by spec)
-        pressure_columns = detect_pressure_columns(normalized_df)
+        pressure_columns = list(trace.roles['pressure'])
         
         # Get sensor selection configuration
         sensor_selection = spec.sensor_selection
@@ -438,8 +416,8 @@ def validate_autoclave_sterilization(normalized_df: pd.DataFrame, spec: SpecV1)
         require_at_least = sensor_selection.require_at_least if sensor_selection else None
         
         try:
-            combined_temp = combine_sensor_readings(
-                normalized_df, temp_columns, sensor_mode, require_at_least
+            combined_temp = trace.combined(
+                temp_columns, sensor_mode, require_at_least
             )
         except DecisionError as e:
             reasons.append(f"Temperature sensor combination failed: {str(e)}")
@@ -461,8 +439,8 @@ def validate_autoclave_sterilization(normalized_df: pd.DataFrame, spec: SpecV1)
         combined_pressure = None
         if pressure_columns:
             try:
-                combined_pressure = combine_sensor_readings(
-                    normalized_df, pressure_columns, SensorMode.MIN_OF_SET  # Use min pressure for conservative validation
+                combined_pressure = trace.combined(
+                    pressure_columns, SensorMode.MIN_OF_SET  # Use min pressure for conservative validation
                 )
             except DecisionError as e:
                 warnings.append(f"Pressure sensor combination failed: {str(e)}")
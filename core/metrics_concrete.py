@@ -26,8 +26,8 @@ from datetime import datetime, timezone
 import logging
 
 from core.models import SpecV1, DecisionResult, SensorMode
-from core.sensor_utils import combine_sensor_readings
-from core.temperature_utils import detect_temperature_columns, DecisionError
+from core.trace import detect_role_columns, get_trace
+from core.temperature_utils import DecisionError
 from core.temperature_utils import calculate_continuous_hold_time
 from core.errors import RequiredSignalMissingError
 
@@ -44,26 +44,7 @@ def detect_humidity_columns(df: pd.DataFrame) -> List[str]:
     Returns:
         List of humidity column names
     """
-    import re
-    
-    humidity_patterns = [
-        r'.*humidity.*', r'.*rh.*', r'.*relative.*', r'.*moisture.*',
-        r'.*_rh$', r'.*_humidity$', r'.*%rh.*'
-    ]
-    
-    humidity_columns = []
-    
-    for col in df.columns:
-        if col.lower() == 'timestamp' or 'time' in col.lower():
-            continue
-            
-        col_lower = col.lower()
-        if any(re.match(pattern, col_lower) for pattern in humidity_patterns):
-            # Verify it's numeric
-            if pd.api.types.is_numeric_dtype(df[col]):
-                humidity_columns.append(col)
-    
-    return humidity_columns
+    return detect_role_columns(df, 'humidity')
 
 
 def fahrenheit_to_celsius(temp_f: float) -> float:
@@ -292,12 +273,9 @@ def validate_concrete_curing(normalized_df: pd.DataFrame, spec: SpecV1) -> Decis
         if spec.industry != "concrete":
             raise DecisionError(f"Invalid industry '{spec.industry}' for concrete curing validation")
         
-        # Detect timestamp column
-        timestamp_col = None
-        for col in normalized_df.columns:
-            if 'time' in col.lower() or pd.api.types.is_datetime64_any_dtype(normalized_df[col]):
-                timestamp_col = col
-                break
+        # Timestamp column and sensor roles are resolved once per normalized trace
+        trace = get_trace(normalized_df)
+        timestamp_col = trace.timestamp_column
         
         if timestamp_col is None:
             raise DecisionError("No timestamp column found in normalized data")
@@ -310,7 +288,7 @@ def validate_concrete_curing(normalized_df: pd.DataFrame, spec: SpecV1) -> Decis
             normalized_df[timestamp_col] = pd.to_datetime(normalized_df[timestamp_col])
         
         # Detect temperature columns
-        temp_columns = detect_temperature_columns(normalized_df)
+        temp_columns = list(trace.roles['temperature'])
         if not temp_columns:
             # Get available columns (excluding timestamp)
             available_cols = [col for col in normalized_df.columns if col != timestamp_col]
@@ -321,7 +299,7 @@ def validate_concrete_curing(normalized_df: pd.DataFrame, spec: SpecV1) -> Decis
             )
         
         # Detect humidity columns
-        humidity_columns = detect_humidity_columns(normalized_df)
+        humidity_columns = list(trace.roles['humidity'])
         
         # Get sensor selection configuration
         sensor_selection = spec.sensor_selection
@@ -352,8 +330,8 @@ def validate_concrete_curing(normalized_df: pd.DataFrame, spec: SpecV1) -> Decis
         require_at_least = sensor_selection.require_at_least if sensor_selection else None
         
         try:
-            combined_temp = combine_sensor_readings(
-                normalized_df, temp_columns, sensor_mode, require_at_least
+            combined_temp = trace.combined(
+                temp_columns, sensor_mode, require_at_least
             )
         except DecisionError as e:
             reasons.append(f"Temperature sensor combination failed: {str(e)}")
@@ -375,8 +353,8 @@ def validate_concrete_curing(normalized_df: pd.DataFrame, spec: SpecV1) -> Decis
         combined_humidity = None
         if humidity_columns:
             try:
-                combined_humidity = combine_sensor_readings(
-                    normalized_df, humidity_columns, SensorMode.MEAN_OF_SET
+                combined_humidity = trace.combined(
+                    humidity_columns, SensorMode.MEAN_OF_SET
                 )
             except DecisionError as e:
                 warnings.append(f"Humidity sensor combination failed: {str(e)}")
@@ -24,8 +24,8 @@ from datetime import datetime, timezone
 import logging
 
 from core.models import SpecV1, DecisionResult, SensorMode
-from core.sensor_utils import combine_sensor_readings
-from core.temperature_utils import detect_temperature_columns, DecisionError
+from core.trace import get_trace
+from core.temperature_utils import DecisionError
 from core.errors import RequiredSignalMissingError
 
 logger = logging.getLogger(__name__)
@@ -198,12 +198,9 @@ def validate_haccp_cooling(normalized_df: pd.DataFrame, spec: SpecV1) -> Decisio
         if spec.industry != "haccp":
             raise DecisionError(f"Invalid industry '{spec.industry}' for HACCP cooling validation")
         
-        # Detect timestamp column
-        timestamp_col = None
-        for col in normalized_df.columns:
-            if 'time' in col.lower() or pd.api.types.is_datetime64_any_dtype(normalized_df[col]):
-                timestamp_col = col
-                break
+        # Timestamp column and sensor roles are resolved once per normalized trace
+        trace = get_trace(normalized_df)
+        timestamp_col = trace.timestamp_column
         
         if timestamp_col is None:
             raise DecisionError("No timestamp column found in normalized data")
@@ -214,7 +211,7 @@ def validate_haccp_cooling(normalized_df: pd.DataFrame, spec: SpecV1) -> Decisio
         
         # Detect temperature columns - this must be done first before any other processing
         # For HACCP, we require columns with explicit temperature naming (temp|temperature|°f|°c)
-        temp_columns = detect_temperature_columns(normalized_df)
+        temp_columns = list(trace.roles['temperature'])
         if not temp_columns:
             # Get available columns (excluding timestamp)
             available_cols = [col for col in normalized_df.columns if col != timestamp_col]
@@ -243,8 +240,8 @@ def validate_haccp_cooling(normalized_df: pd.DataFrame, spec: SpecV1) -> Decisio
         require_at_least = sensor_selection.require_at_least if sensor_selection else None
         
         try:
-            combined_temp = combine_sensor_readings(
-                normalized_df, temp_columns, sensor_mode, require_at_least
+            combined_temp = trace.combined(
+                temp_columns, sensor_mode, require_at_least
             )
         except DecisionError as e:
             reasons.append(f"Sensor combination failed: {str(e)}")
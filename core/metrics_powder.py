@@ -26,8 +26,8 @@ from datetime import datetime, timezone
 import logging
 
 from core.models import DecisionResult, SensorMode
-from core.sensor_utils import combine_sensor_readings
-from core.temperature_utils import detect_temperature_columns, DecisionError
+from core.trace import get_trace
+from core.temperature_utils import DecisionError
 from core.normalize import DataQualityError
 from core.errors import RequiredSignalMissingError
 
@@ -293,12 +293,9 @@ def validate_powder_coating_cure(normalized_df: pd.DataFrame, spec: Dict[str, An
         if spec.get("industry") not in ["powder", "powder-coating"]:
             raise DecisionError(f"Invalid industry '{spec.get('industry')}' for powder coating validation")
         
-        # Detect timestamp column
-        timestamp_col = None
-        for col in normalized_df.columns:
-            if 'time' in col.lower() or pd.api.types.is_datetime64_any_dtype(normalized_df[col]):
-                timestamp_col = col
-                break
+        # Timestamp column and sensor roles are resolved once per normalized trace
+        trace = get_trace(normalized_df)
+        timestamp_col = trace.timestamp_column
         
         if timestamp_col is None:
             raise DecisionError("No timestamp column found in normalized data")
@@ -308,7 +305,7 @@ def validate_powder_coating_cure(normalized_df: pd.DataFrame, spec: Dict[str, An
             normalized_df[timestamp_col] = pd.to_datetime(normalized_df[timestamp_col])
         
         # Detect temperature columns EARLY and check sensor requirements
-        temp_columns = detect_temperature_columns(normalized_df)
+        temp_columns = list(trace.roles['temperature'])
         if not temp_columns:
             # For powder industry, missing temperature columns is an ERROR
             available_cols = [col for col in normalized_df.columns if col != timestamp_col]
@@ -394,8 +391,8 @@ def validate_powder_coating_cure(normalized_df: pd.DataFrame, spec: Dict[str, An
         require_at_least = sensor_selection.require_at_least if sensor_selection else None
         
         try:
-            combined_pmt = combine_sensor_readings(
-                normalized_df, temp_columns, sensor_mode, require_at_least, conservative_threshold_C
+            combined_pmt = trace.combined(
+                temp_columns, sensor_mode, require_at_least, conservative_threshold_C
             )
         except DecisionError as e:
             # For powder industry, sensor combination failure is an ERROR
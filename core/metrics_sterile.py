@@ -26,8 +26,8 @@ from datetime import datetime, timezone
 import logging
 
 from core.models import SpecV1, DecisionResult, SensorMode
-from core.sensor_utils import combine_sensor_readings
-from core.temperature_utils import detect_temperature_columns, DecisionError
+from core.trace import detect_role_columns, get_trace
+from core.temperature_utils import DecisionError
 from core.temperature_utils import calculate_continuous_hold_time
 from core.errors import RequiredSignalMissingError
 
@@ -144,26 +144,7 @@ def detect_humidity_columns(df: pd.DataFrame) -> List[str]:
     Returns:
         List of humidity column names
     """
-    import re
-    
-    humidity_patterns = [
-        r'.*humidity.*', r'.*rh.*', r'.*relative.*', r'.*moisture.*',
-        r'.*_rh$', r'.*_humidity$', r'.*%rh.*'
-    ]
-    
-    humidity_columns = []
-    
-    for col in df.columns:
-        if col.lower() == 'timestamp' or 'time' in col.lower():
-            continue
-            
-        col_lower = col.lower()
-        if any(re.match(pattern, col_lower) for pattern in humidity_patterns):
-            # Verify it's numeric
-            if pd.api.types.is_numeric_dtype(df[col]):
-                humidity_columns.append(col)
-    
-    return humidity_columns
+    return detect_role_columns(df, 'humidity')
 
 
 def detect_gas_concentration_columns(df: pd.DataFrame) -> List[str]:
@@ -176,26 +157,7 @@ def detect_gas_concentration_columns(df: pd.DataFrame) -> List[str]:
     Returns:
         List of gas concentration column names
     """
-    import re
-    
-    gas_patterns = [
-        r'.*eto.*', r'.*ethylene.*oxide.*', r'.*gas.*', r'.*concentration.*',
-        r'.*ppm.*', r'.*mg/l.*', r'.*_eto$', r'.*_gas$'
-    ]
-    
-    gas_columns = []
-    
-    for col in df.columns:
-        if col.lower() == 'timestamp' or 'time' in col.lower():
-            continue
-            
-        col_lower = col.lower()
-        if any(re.match(pattern, col_lower) for pattern in gas_patterns):
-            # Verify it's numeric
-            if pd.api.types.is_numeric_dtype(df[col]):
-                gas_columns.append(col)
-    
-    return gas_columns
+    return detect_role_columns(df, 'gas')
 
 
 def identify_eto_cycle_phases(temperature_series: pd.Series, humidity_series: Optional[pd.Series],
@@ -467,12 +429,9 @@ def validate_eto_sterilization(normalized_df: pd.DataFrame, spec: SpecV1) -> Dec
         if spec.industry != "sterile":
             raise DecisionError(f"Invalid industry '{spec.industry}' for EtO sterilization validation")
         
-        # Detect timestamp column
-        timestamp_col = None
-        for col in normalized_df.columns:
-            if 'time' in col.lower() or pd.api.types.is_datetime64_any_dtype(normalized_df[col]):
-                timestamp_col = col
-                break
+        # Timestamp column and sensor roles are resolved once per normalized trace
+        trace = get_trace(normalized_df)
+        timestamp_col = trace.timestamp_column
         
         if timestamp_col is None:
             raise DecisionError("No timestamp column found in normalized data")
@@ -482,7 +441,7 @@ def validate_eto_sterilization(normalized_df: pd.DataFrame, spec: SpecV1) -> Dec
             normalized_df[timestamp_col] = pd.to_datetime(normalized_df[timestamp_col])
         
         # Detect temperature columns
-        temp_columns = detect_temperature_columns(normalized_df)
+        temp_columns = list(trace.roles['temperature'])
         if not temp_columns:
             # Get available columns (excluding timestamp)
             available_cols = [col for col in normalized_df.columns if col != timestamp_col]
@@ -493,8 +452,8 @@ def validate_eto_sterilization(normalized_df: pd.DataFrame, spec: SpecV1) -> Dec
             )
         
         # Detect humidity and gas concentration columns
-        humidity_columns = detect_humidity_columns(normalized_df)
-        gas_columns = detect_gas_concentration_columns(normalized_df)
+        humidity_columns = list(trace.roles['humidity'])
+        gas_columns = list(trace.roles['gas'])
         
         # Get sensor selection configuration
         sensor_selection = spec.sensor_selection
@@ -527,8 +486,8 @@ def validate_eto_sterilization(normalized_df: pd.DataFrame, spec: SpecV1) -> Dec
         require_at_least = sensor_selection.require_at_least if sensor_selection else None
         
         try:
-            combined_temp = combine_sensor_readings(
-                normalized_df, temp_columns, sensor_mode, require_at_least, threshold_C=50.0
+            combined_temp = trace.combined(
+                temp_columns, sensor_mode, require_at_least, threshold_C=50.0
             )
         except DecisionError as e:
             reasons.append(f"Temperature sensor combination failed: {str(e)}")
@@ -552,8 +511,8 @@ def validate_eto_sterilization(normalized_df: pd.DataFrame, spec: SpecV1) -> Dec
         
         if humidity_columns:
             try:
-                combined_humidity = combine_sensor_readings(
-                    normalized_df, humidity_columns, SensorMode.MEAN_OF_SET
+                combined_humidity = trace.combined(
+                    humidity_columns, SensorMode.MEAN_OF_SET
                 )
             except DecisionError as e:
                 warnings.append(f"Humidity sensor combination failed: {str(e)}")
@@ -565,8 +524,8 @@ def validate_eto_sterilization(normalized_df: pd.DataFrame, spec: SpecV1) -> Dec
         
         if gas_columns:
             try:
-                combined_gas = combine_sensor_readings(
-                    normalized_df, gas_columns, SensorMode.MEAN_OF_SET
+                combined_gas = trace.combined(
+                    gas_columns, SensorMode.MEAN_OF_SET
                 )
             except DecisionError as e:
                 warnings.append(f"Gas concentration sensor combination failed: {str(e)}")
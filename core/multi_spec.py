@@ -0,0 +1,193 @@
+"""
+Multi-spec evaluation for ProofKit.
+
+Evaluates one uploaded trace against several specifications in a single pass.
+The CSV is parsed once and normalized once per distinct set of normalization
+parameters (sampling limits and industry); every spec sharing those parameters
+is decided against the same normalized frame. Because normalization registers a
+TraceFrame, sensor combinations (and majority-over-threshold masks) are computed
+once per distinct (mode, sensors, threshold) and shared between specs.
+
+Example usage:
+    from core.multi_spec import evaluate_specs, render_certificates
+
+    evaluations = evaluate_specs(df, [spec_a, spec_b, spec_c])
+    for evaluation in evaluations:
+        print(evaluation.index, evaluation.status)
+
+    certificates = render_certificates(evaluations, Path("out"))
+"""
+
+import hashlib
+import logging
+import os
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import pandas as pd
+
+from core.decide import make_decision
+from core.models import DecisionResult, SpecV1
+from core.normalize import normalize_temperature_data
+
+logger = logging.getLogger(__name__)
+
+# Upper bound on specs per request and certificate rendering parallelism
+MULTI_SPEC_MAX = int(os.environ.get('MULTI_SPEC_MAX', '20'))
+MULTI_SPEC_WORKERS = int(os.environ.get('MULTI_SPEC_WORKERS', '4'))
+
+TARGET_STEP_S = 30.0
+
+
+@dataclass
+class SpecEvaluation:
+    """Outcome of evaluating one spec against the shared trace."""
+    index: int
+    spec: SpecV1
+    normalized_df: Optional[pd.DataFrame] = None
+    decision: Optional[DecisionResult] = None
+    error: Optional[str] = None
+    error_stage: Optional[str] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.decision is not None
+
+    @property
+    def status(self) -> str:
+        """Decision status, or ERROR if the spec could not be decided."""
+        if self.decision is None:
+            return "ERROR"
+        return getattr(self.decision, 'status', 'PASS' if self.decision.pass_ else 'FAIL')
+
+
+def normalization_key(spec: SpecV1) -> Tuple[float, float, Optional[str]]:
+    """
+    Parameters that change the normalized frame for a spec.
+
+    Args:
+        spec: Process specification
+
+    Returns:
+        (allowed_gaps_s, max_sample_period_s, industry)
+    """
+    return (
+        spec.data_requirements.allowed_gaps_s,
+        spec.data_requirements.max_sample_period_s,
+        spec.industry,
+    )
+
+
+def evaluate_specs(df: pd.DataFrame, specs: List[SpecV1],
+                   target_step_s: float = TARGET_STEP_S) -> List[SpecEvaluation]:
+    """
+    Decide one raw trace against several specs.
+
+    Normalization runs once per distinct normalization_key(); a failure there
+    is reported for every spec that shares the key. Each spec is decided
+    independently, so one failing spec does not affect the others.
+
+    Args:
+        df: Raw DataFrame from load_csv_with_metadata
+        specs: Specifications to evaluate, in request order
+        target_step_s: Resampling period in seconds
+
+    Returns:
+        One SpecEvaluation per spec, in the same order
+    """
+    evaluations = [SpecEvaluation(index=i, spec=spec) for i, spec in enumerate(specs)]
+
+    groups: Dict[Tuple[float, float, Optional[str]], List[SpecEvaluation]] = {}
+    for evaluation in evaluations:
+        groups.setdefault(normalization_key(evaluation.spec), []).append(evaluation)
+
+    for (allowed_gaps_s, max_sample_period_s, industry), members in groups.items():
+        try:
+            normalized_df = normalize_temperature_data(
+                df,
+                target_step_s=target_step_s,
+                allowed_gaps_s=allowed_gaps_s,
+                max_sample_period_s=max_sample_period_s,
+                industry=industry
+            )
+        except Exception as e:
+            logger.warning(f"Normalization failed for specs {[m.index for m in members]}: {e}")
+            for evaluation in members:
+                evaluation.error = str(e)
+                evaluation.error_stage = "normalization"
+            continue
+
+        for evaluation in members:
+            evaluation.normalized_df = normalized_df
+            try:
+                evaluation.decision = make_decision(normalized_df, evaluation.spec)
+            except Exception as e:
+                logger.warning(f"Decision failed for spec {evaluation.index}: {e}")
+                evaluation.error = str(e)
+                evaluation.error_stage = "decision"
+
+    logger.info(
+        f"Evaluated {len(evaluations)} specs with {len(groups)} normalization pass(es)"
+    )
+    return evaluations
+
+
+def _render_certificate(evaluation: SpecEvaluation, output_dir: Path) -> Path:
+    """Render plot and proof PDF for one evaluated spec."""
+    from core.plot import generate_proof_plot
+    from core.render_pdf import generate_proof_pdf
+
+    spec, decision = evaluation.spec, evaluation.decision
+    cert_dir = output_dir / f"{evaluation.index:02d}_{spec.job.job_id}"
+    cert_dir.mkdir(parents=True, exist_ok=True)
+
+    plot_path = cert_dir / "plot.png"
+    generate_proof_plot(evaluation.normalized_df, spec, decision, str(plot_path))
+
+    verification_hash = hashlib.sha256(
+        f"{spec.job.job_id}{decision.pass_}{decision.actual_hold_time_s}".encode()
+    ).hexdigest()
+    pdf_path = cert_dir / "proof.pdf"
+    generate_proof_pdf(
+        spec=spec,
+        decision=decision,
+        plot_path=str(plot_path),
+        verification_hash=verification_hash,
+        output_path=str(pdf_path)
+    )
+    return pdf_path
+
+
+def render_certificates(evaluations: List[SpecEvaluation], output_dir: Path,
+                        max_workers: Optional[int] = None) -> Dict[int, Path]:
+    """
+    Render proof certificates for every decided spec in parallel.
+
+    Args:
+        evaluations: Results from evaluate_specs
+        output_dir: Directory receiving one sub-directory per spec
+        max_workers: Worker threads (default: MULTI_SPEC_WORKERS)
+
+    Returns:
+        Mapping of spec index to proof PDF path (failed renders are omitted)
+    """
+    decided = [evaluation for evaluation in evaluations if evaluation.ok]
+    if not decided:
+        return {}
+
+    output_dir.mkdir(parents=True, exist_ok=True)
+    certificates = {}
+    with ThreadPoolExecutor(max_workers=max_workers or MULTI_SPEC_WORKERS,
+                            thread_name_prefix="multi-spec") as pool:
+        futures = {
+            evaluation.index: pool.submit(_render_certificate, evaluation, output_dir)
+            for evaluation in decided
+        }
+        for index, future in futures.items():
+            try:
+                certificates[index] = future.result()
+            except Exception as e:
+                logger.error(f"Certificate rendering failed for spec {index}: {e}")
+    return certificates
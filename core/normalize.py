@@ -22,6 +22,7 @@ import pandas as pd
 import numpy as np
 from typing import Dict, Tuple, Optional, List, Any, Union, Callable
 from datetime import datetime, timezone
+import os
 import pytz
 import re
 import warnings
@@ -32,12 +33,15 @@ import csv
 import codecs
 import chardet
 import json
+from functools import lru_cache
 
 logger = logging.getLogger(__name__)
 
 # Import DataQualityError from core.errors
 from core.errors import DataQualityError
+from core.trace import register_trace
 from core.columns_map import normalize_column_names
+from core.csv_profiles import CsvProfileCache, header_fingerprint
 
 # Import policy settings
 from core.policy import should_fail_on_parser_warnings, is_safe_mode_enabled
@@ -46,6 +50,27 @@ from core.policy import should_fail_on_parser_warnings, is_safe_mode_enabled
 FAIL_ON_PARSER_WARNINGS = should_fail_on_parser_warnings()  # Default: False (log only)
 SAFE_MODE = is_safe_mode_enabled()  # Default: False (permissive)
 
+# Lean ingest: opt-in float32 sensor storage, allowed when the spec's sensor
+# uncertainty dwarfs float32 rounding, and categorical repeated string columns
+FLOAT32_SENSORS = os.environ.get('FLOAT32_SENSORS', 'false').lower() == 'true'
+FLOAT32_MIN_UNCERTAINTY_C = 0.01
+FLOAT32_MAX_DECIMALS = 3
+CATEGORICAL_MAX_UNIQUE_RATIO = 0.5
+
+# Common timestamp column names
+TIMESTAMP_COLUMN_CANDIDATES = [
+    'timestamp', 'time', 'datetime', 'date_time', 
+    'ts', 't', 'sample_time', 'time_stamp'
+]
+
+# Rows sampled to find the numeric columns before pruning the full parse
+PRUNE_SAMPLE_ROWS = 100
+
+# Names any temperature detector in normalize or the engines accepts
+_TEMPERATURE_NAME_PATTERN = re.compile(
+    r'temp|celsius|fahrenheit|°[cf]|[cf]°|deg|thermal|pmt|sensor|thermocouple|rtd|t_c|t_f|_c$|_f$'
+)
+
 
 class NormalizationError(Exception):
     """Raised when CSV normalization fails quality checks."""
@@ -336,7 +361,254 @@ def convert_excel_serial_dates(df: pd.DataFrame, timestamp_col: str) -> pd.Serie
     return df[timestamp_col]
 
 
-def load_csv_with_metadata(csv_path: str, safe_mode: bool = None) -> Tuple[pd.DataFrame, Dict[str, str]]:
+def _read_metadata_and_data_lines(csv_path: Path, encoding: str) -> Tuple[Dict[str, str], List[str]]:
+    """Split a CSV into metadata from '# key: value' comment lines and its data lines."""
+    metadata = {}
+    data_lines = []
+    with open(csv_path, 'r', encoding=encoding) as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+                
+            # Extract metadata from comment lines
+            if line.startswith('#'):
+                match = re.match(r'#\s*([^:]+):\s*(.+)', line)
+                if match:
+                    key = match.group(1).strip()
+                    value = match.group(2).strip()
+                    metadata[key] = value
+            else:
+                data_lines.append(line)
+    return metadata, data_lines
+
+
+def _load_with_profile(csv_path: Path, profile: Dict[str, Any],
+                       spec: Any = None) -> Optional[Tuple[pd.DataFrame, Dict[str, Any]]]:
+    """
+    Parse a CSV with the settings of a learned vendor profile.
+    
+    Returns:
+        (DataFrame, metadata), or None if the file does not fit the profile
+    """
+    try:
+        metadata, data_lines = _read_metadata_and_data_lines(csv_path, profile['encoding'])
+    except UnicodeDecodeError:
+        return None
+    if not data_lines:
+        return None
+    
+    csv_content = '\n'.join(data_lines)
+    if profile['decimal_normalized']:
+        csv_content = normalize_decimal_separators(csv_content)
+    
+    usecols = None
+    if spec is not None:
+        usecols = _spec_usecols(csv_content, profile['delimiter'], profile['column_mapping'], spec)
+    columns = usecols or profile['columns']
+    try:
+        df = pd.read_csv(StringIO(csv_content), delimiter=profile['delimiter'], usecols=columns,
+                         dtype={col: dtype for col, dtype in profile['dtypes'].items() if col in columns})
+    except (ValueError, TypeError, pd.errors.ParserError) as e:
+        logger.debug(f"CSV profile did not fit {csv_path.name}: {e}")
+        return None
+    if df.empty or list(df.columns) != columns:
+        return None
+    
+    original_shape = df.shape
+    column_mapping = {raw: col for raw, col in profile['column_mapping'].items() if raw in columns}
+    if column_mapping:
+        df = df.rename(columns=column_mapping)
+        metadata['_column_mapping'] = column_mapping
+    if usecols and not detect_temperature_columns(df):
+        return None
+    
+    metadata['_parsing_info'] = {
+        'detected_encoding': profile['encoding'],
+        'detected_delimiter': profile['delimiter'],
+        'decimal_normalized': True,
+        'original_columns': list(df.columns),
+        'original_shape': original_shape,
+        'parser_warnings': [],
+        'timestamp_format': profile['timestamp_format'],
+        'columns_pruned': _pruned_columns(profile['columns'], usecols, profile['column_mapping']),
+    }
+    return df, metadata
+
+
+def _learn_profile(df: pd.DataFrame, header: List[str], parsed_columns: List[str],
+                   column_mapping: Dict[str, str], encoding: str, delimiter: str,
+                   decimal_normalized: bool) -> Dict[str, Any]:
+    """Record the parse settings resolved for a freshly sniffed CSV."""
+    try:
+        timestamp_col = detect_timestamp_column(df)
+        timestamp_format = infer_timestamp_format(df[timestamp_col])
+    except ValueError:
+        timestamp_col, timestamp_format = None, None
+    
+    return {
+        'encoding': encoding,
+        'delimiter': delimiter,
+        'decimal_normalized': decimal_normalized,
+        'columns': header,
+        'dtypes': {
+            raw: str(dtype) for raw, dtype in zip(parsed_columns, df.dtypes)
+            if pd.api.types.is_numeric_dtype(dtype) or pd.api.types.is_bool_dtype(dtype)
+        },
+        'column_mapping': column_mapping,
+        'timestamp_column': timestamp_col,
+        'timestamp_format': timestamp_format,
+    }
+
+
+def spec_signal_columns(sample: pd.DataFrame, spec: Any) -> List[str]:
+    """
+    Select the columns a spec's engines can read: timestamp plus signals.
+    
+    Every engine detector requires numeric columns, so non-numeric columns
+    other than the timestamp (operator notes, status strings) are dropped.
+    When all of the spec's sensor_selection sensors are present and include
+    a temperature column, temperature probes outside the selection are
+    dropped too. Other numeric columns are kept, since engines may read them
+    (e.g. a pre-calculated fo_value).
+    
+    Args:
+        sample: First rows of the CSV, with mapped column names
+        spec: Specification (SpecV1)
+        
+    Returns:
+        Columns to keep in input order
+    """
+    columns = list(sample.columns)
+    timestamp_col = _timestamp_column_by_name(columns) or columns[0]
+    selection = getattr(spec, 'sensor_selection', None)
+    sensors = [sensor for sensor in (selection.sensors or []) if sensor in columns] if selection else []
+    
+    numeric = [col for col in columns if col != timestamp_col and pd.api.types.is_numeric_dtype(sample[col])]
+    temperatures = {col for col in numeric if _TEMPERATURE_NAME_PATTERN.search(col.lower())}
+    if selection and selection.sensors and len(sensors) == len(selection.sensors) and temperatures & set(sensors):
+        numeric = [col for col in numeric if col not in temperatures or col in sensors]
+    
+    keep = {timestamp_col, *sensors, *numeric}
+    return [col for col in columns if col in keep]
+
+
+def _spec_usecols(csv_content: str, delimiter: str, column_mapping: Dict[str, str],
+                  spec: Any) -> Optional[List[str]]:
+    """Raw column names to parse for a spec, or None to parse all of them."""
+    try:
+        sample = pd.read_csv(StringIO(csv_content), delimiter=delimiter, nrows=PRUNE_SAMPLE_ROWS)
+    except (ValueError, pd.errors.ParserError):
+        return None
+    if sample.empty or sample.columns.duplicated().any():
+        return None
+    
+    raw_columns = list(sample.columns)
+    keep = set(spec_signal_columns(sample.rename(columns=column_mapping), spec))
+    usecols = [raw for raw in raw_columns if column_mapping.get(raw, raw) in keep]
+    return usecols if len(usecols) < len(raw_columns) else None
+
+
+def _pruned_columns(header: List[str], usecols: Optional[List[str]],
+                    column_mapping: Dict[str, str]) -> List[str]:
+    """Mapped names of the header columns left out of usecols."""
+    if usecols is None:
+        return []
+    return [column_mapping.get(raw, raw) for raw in header if raw not in usecols]
+
+
+def _float32_decimals(values: np.ndarray) -> Optional[int]:
+    """
+    Decimal places that let float32 storage round-trip a column exactly.
+    
+    Returns:
+        d such that rounding the float32 values to d places restores the
+        parsed float64 values bit for bit, or None if no such d exists
+    """
+    finite = values[np.isfinite(values)]
+    for decimals in range(FLOAT32_MAX_DECIMALS + 1):
+        if np.array_equal(np.round(finite, decimals), finite):
+            restored = np.round(finite.astype(np.float32).astype(np.float64), decimals)
+            return decimals if np.array_equal(restored, finite) else None
+    return None
+
+
+def _restore_float64(df: pd.DataFrame) -> pd.DataFrame:
+    """Undo lean float32 storage before any arithmetic, recovering the parsed values exactly."""
+    decimals = df.attrs.get('float32_decimals')
+    if not decimals:
+        return df
+    df = df.copy()
+    for col, places in decimals.items():
+        if col in df.columns:
+            df[col] = np.round(df[col].astype(np.float64), places)
+    df.attrs.pop('float32_decimals', None)
+    return df
+
+
+def _apply_lean_dtypes(df: pd.DataFrame, spec: Any, pruned: List[str]) -> Dict[str, Any]:
+    """
+    Shrink a freshly parsed frame in place and report the memory saved.
+    
+    With FLOAT32_SENSORS on and a spec sensor uncertainty of at least
+    FLOAT32_MIN_UNCERTAINTY_C, float64 sensor columns whose values have few
+    enough decimals to round-trip exactly are stored as float32 until
+    normalization restores them. String columns other than the timestamp
+    become categorical when their values repeat.
+    
+    Returns:
+        Memory report for the normalization trace
+    """
+    bytes_before = int(df.memory_usage(deep=True).sum())
+    
+    try:
+        timestamp_col = detect_timestamp_column(df)
+    except ValueError:
+        timestamp_col = None
+    
+    uncertainty = getattr(getattr(spec, 'spec', None), 'sensor_uncertainty_C', None)
+    use_float32 = FLOAT32_SENSORS and uncertainty is not None and uncertainty >= FLOAT32_MIN_UNCERTAINTY_C
+    float32_columns = {}
+    categorical_columns = []
+    for col in df.columns:
+        if col == timestamp_col:
+            continue
+        if use_float32 and df[col].dtype == np.float64:
+            decimals = _float32_decimals(df[col].to_numpy())
+            if decimals is not None:
+                df[col] = df[col].astype(np.float32)
+                float32_columns[col] = decimals
+        elif df[col].dtype == object and df[col].nunique() <= CATEGORICAL_MAX_UNIQUE_RATIO * len(df):
+            df[col] = df[col].astype('category')
+            categorical_columns.append(col)
+    
+    if float32_columns:
+        df.attrs['float32_decimals'] = float32_columns
+    
+    bytes_after = int(df.memory_usage(deep=True).sum())
+    # Pruned columns were never parsed; 8 bytes per cell is a lower bound
+    pruned_bytes_estimate = 8 * len(df) * len(pruned)
+    return {
+        'columns_pruned': pruned,
+        'float32_columns': float32_columns,
+        'categorical_columns': categorical_columns,
+        'bytes_before': bytes_before,
+        'bytes_after': bytes_after,
+        'pruned_bytes_estimate': pruned_bytes_estimate,
+        'bytes_saved': bytes_before - bytes_after + pruned_bytes_estimate,
+    }
+
+
+def _record_lean_ingest(df: pd.DataFrame, spec: Any, metadata: Dict[str, Any]) -> None:
+    """Apply lean dtypes and attach the memory report for normalization to pick up."""
+    memory = _apply_lean_dtypes(df, spec, metadata['_parsing_info']['columns_pruned'])
+    metadata['_parsing_info']['memory'] = memory
+    df.attrs['ingest_memory'] = memory
+
+
+def load_csv_with_metadata(csv_path: str, safe_mode: bool = None,
+                           profile_cache: Optional[CsvProfileCache] = None,
+                           spec: Any = None) -> Tuple[pd.DataFrame, Dict[str, str]]:
     """
     Load CSV file with robust parsing and extract metadata from comment lines.
     
@@ -347,10 +619,17 @@ def load_csv_with_metadata(csv_path: str, safe_mode: bool = None) -> Tuple[pd.Da
     - Converts Excel serial dates
     - Extracts metadata from # comment lines
     - Parser warning handling with safe mode
+    - Optional learned vendor profiles: files whose header fingerprint is
+      known skip sniffing and timestamp format inference
+    - Optional spec-driven ingest: only timestamp and signal columns are
+      parsed, repeated strings become categorical and, with FLOAT32_SENSORS,
+      sensor columns are stored as float32 when the spec's tolerance allows
     
     Args:
         csv_path: Path to the CSV file
         safe_mode: Enable conservative parsing (default: use global SAFE_MODE)
+        profile_cache: Vendor profile cache to consult and learn into (default: None, always sniff)
+        spec: Specification driving column pruning and lean dtypes (default: None, keep everything)
         
     Returns:
         Tuple of (DataFrame, metadata_dict)
@@ -367,6 +646,22 @@ def load_csv_with_metadata(csv_path: str, safe_mode: bool = None) -> Tuple[pd.Da
     if safe_mode is None:
         safe_mode = is_safe_mode_enabled()
     
+    fingerprint = header_fingerprint(csv_path) if profile_cache is not None else None
+    profile = profile_cache.get(fingerprint) if fingerprint else None
+    if profile is not None:
+        loaded = _load_with_profile(csv_path, profile, spec)
+        if loaded is not None:
+            df, metadata = loaded
+            metadata['_parsing_info']['profile'] = fingerprint
+            if spec is not None:
+                _record_lean_ingest(df, spec, metadata)
+            if profile['timestamp_format']:
+                df.attrs['timestamp_format'] = profile['timestamp_format']
+                df.attrs['timestamp_column'] = profile['timestamp_column']
+            logger.debug(f"Parsed {csv_path.name} with vendor profile {fingerprint[:12]}")
+            return df, metadata
+        profile_cache.invalidate(fingerprint)
+    
     parse_warnings = []
     
     # Detect encoding and delimiter
@@ -375,26 +670,9 @@ def load_csv_with_metadata(csv_path: str, safe_mode: bool = None) -> Tuple[pd.Da
     
     logger.debug(f"Detected encoding: {encoding}, delimiter: {repr(delimiter)}")
     
-    metadata = {}
-    data_lines = []
-    
     # Read file line by line to extract metadata and data
     try:
-        with open(csv_path, 'r', encoding=encoding) as f:
-            for line in f:
-                line = line.strip()
-                if not line:
-                    continue
-                    
-                # Extract metadata from comment lines
-                if line.startswith('#'):
-                    match = re.match(r'#\s*([^:]+):\s*(.+)', line)
-                    if match:
-                        key = match.group(1).strip()
-                        value = match.group(2).strip()
-                        metadata[key] = value
-                else:
-                    data_lines.append(line)
+        metadata, data_lines = _read_metadata_and_data_lines(csv_path, encoding)
     except UnicodeDecodeError as e:
         logger.warning(f"Encoding {encoding} failed, trying latin1 fallback: {e}")
         parse_warnings.append(ParseWarning(
@@ -404,30 +682,28 @@ def load_csv_with_metadata(csv_path: str, safe_mode: bool = None) -> Tuple[pd.Da
         ))
         
         # Fallback to latin1 which can read any byte sequence
-        with open(csv_path, 'r', encoding='latin1') as f:
-            for line in f:
-                line = line.strip()
-                if not line:
-                    continue
-                if line.startswith('#'):
-                    match = re.match(r'#\s*([^:]+):\s*(.+)', line)
-                    if match:
-                        key = match.group(1).strip()
-                        value = match.group(2).strip()
-                        metadata[key] = value
-                else:
-                    data_lines.append(line)
+        metadata, data_lines = _read_metadata_and_data_lines(csv_path, 'latin1')
     
     if not data_lines:
         raise ValueError("No data lines found in CSV file")
     
     # Normalize decimal separators before parsing
-    csv_content = '\n'.join(data_lines)
-    csv_content = normalize_decimal_separators(csv_content)
+    raw_content = '\n'.join(data_lines)
+    csv_content = normalize_decimal_separators(raw_content)
+    
+    # With a spec, parse only the columns its engines can use
+    header = None
+    usecols = None
+    if spec is not None:
+        try:
+            header = list(pd.read_csv(StringIO(csv_content), delimiter=delimiter, nrows=0).columns)
+            usecols = _spec_usecols(csv_content, delimiter, normalize_column_names(header), spec)
+        except (ValueError, pd.errors.ParserError):
+            header = None
     
     # Parse CSV data with detected delimiter
     try:
-        df = pd.read_csv(StringIO(csv_content), delimiter=delimiter)
+        df = pd.read_csv(StringIO(csv_content), delimiter=delimiter, usecols=usecols)
     except Exception as e:
         # Fallback: try with default comma delimiter
         logger.warning(f"Failed with delimiter {repr(delimiter)}, trying comma: {e}")
@@ -437,6 +713,7 @@ def load_csv_with_metadata(csv_path: str, safe_mode: bool = None) -> Tuple[pd.Da
             context='delimiter_fallback'
         ))
         
+        header, usecols = None, None
         try:
             df = pd.read_csv(StringIO(csv_content), delimiter=',')
         except Exception as e2:
@@ -450,8 +727,16 @@ def load_csv_with_metadata(csv_path: str, safe_mode: bool = None) -> Tuple[pd.Da
     if df.empty:
         raise ValueError("CSV file contains no data rows")
     
+    parsed_columns = list(df.columns)
+    header = header or parsed_columns
+    
     # Apply column name mapping for common variations
-    column_mapping = normalize_column_names(df.columns.tolist())
+    full_mapping = normalize_column_names(header)
+    column_mapping = {raw: col for raw, col in full_mapping.items() if raw in parsed_columns}
+    if usecols is not None and not detect_temperature_columns(df.rename(columns=column_mapping)):
+        # Pruning hid the temperature signal from detection; parse everything instead
+        df = pd.read_csv(StringIO(csv_content), delimiter=delimiter)
+        parsed_columns, usecols, column_mapping = header, None, full_mapping
     if column_mapping:
         logger.debug(f"Applying column mapping: {column_mapping}")
         df = df.rename(columns=column_mapping)
@@ -472,6 +757,12 @@ def load_csv_with_metadata(csv_path: str, safe_mode: bool = None) -> Tuple[pd.Da
             else:
                 raise ValueError(f"Parser errors detected: {'; '.join([str(w) for w in critical_warnings])}")
     
+    if fingerprint and not parse_warnings:
+        profile_cache.put(fingerprint, _learn_profile(
+            df, header, parsed_columns, full_mapping, encoding, delimiter,
+            decimal_normalized=csv_content != raw_content
+        ))
+    
     # Store parsing information in metadata
     metadata['_parsing_info'] = {
         'detected_encoding': encoding,
@@ -479,8 +770,11 @@ def load_csv_with_metadata(csv_path: str, safe_mode: bool = None) -> Tuple[pd.Da
         'decimal_normalized': True,
         'original_columns': list(df.columns),
         'original_shape': df.shape,
-        'parser_warnings': [str(w) for w in parse_warnings] if parse_warnings else []
+        'parser_warnings': [str(w) for w in parse_warnings] if parse_warnings else [],
+        'columns_pruned': _pruned_columns(header, usecols, full_mapping),
     }
+    if spec is not None:
+        _record_lean_ingest(df, spec, metadata)
     
     return df, metadata
 
@@ -522,6 +816,20 @@ def detect_timestamp_format(df: pd.DataFrame) -> Tuple[str, str]:
     return "iso", timestamp_col
 
 
+def _timestamp_column_by_name(columns) -> Optional[str]:
+    """Find the timestamp column from column names alone, or None."""
+    # Check for exact matches first
+    for col in columns:
+        if col.lower() in TIMESTAMP_COLUMN_CANDIDATES:
+            return col
+    
+    # Check for columns containing timestamp-like patterns
+    for col in columns:
+        if any(candidate in col.lower() for candidate in TIMESTAMP_COLUMN_CANDIDATES):
+            return col
+    return None
+
+
 def detect_timestamp_column(df: pd.DataFrame) -> str:
     """
     Detect the timestamp column in the DataFrame.
@@ -535,21 +843,9 @@ def detect_timestamp_column(df: pd.DataFrame) -> str:
     Raises:
         ValueError: If no timestamp column is found
     """
-    # Common timestamp column names
-    timestamp_candidates = [
-        'timestamp', 'time', 'datetime', 'date_time', 
-        'ts', 't', 'sample_time', 'time_stamp'
-    ]
-    
-    # Check for exact matches first
-    for col in df.columns:
-        if col.lower() in timestamp_candidates:
-            return col
-    
-    # Check for columns containing timestamp-like patterns
-    for col in df.columns:
-        if any(candidate in col.lower() for candidate in timestamp_candidates):
-            return col
+    named = _timestamp_column_by_name(df.columns)
+    if named is not None:
+        return named
     
     # If no obvious timestamp column, check first column
     first_col = df.columns[0]
@@ -565,15 +861,180 @@ def detect_timestamp_column(df: pd.DataFrame) -> str:
     raise ValueError("No timestamp column found in CSV data")
 
 
+# Known logger timestamp layouts: (pattern on the value shape, candidate formats in preference order).
+# Shapes replace every digit with '0'. Slash and dash dates prefer month-first like pandas does;
+# dotted dates are day-first by convention (dd.mm.yyyy).
+TIMESTAMP_FORMATS = [
+    (r'^0{4}-00-00[T ]00:00(:00(\.0+)?)?(Z|[+-]00:?00)?$', ['ISO8601']),
+    (r'^0{1,2}\.0{1,2}\.0{4} 0{1,2}:00:00$', ['%d.%m.%Y %H:%M:%S', '%m.%d.%Y %H:%M:%S']),
+    (r'^0{1,2}\.0{1,2}\.0{4} 0{1,2}:00$', ['%d.%m.%Y %H:%M', '%m.%d.%Y %H:%M']),
+    (r'^0{1,2}/0{1,2}/0{4} 0{1,2}:00:00 [AaPp][Mm]$', ['%m/%d/%Y %I:%M:%S %p', '%d/%m/%Y %I:%M:%S %p']),
+    (r'^0{1,2}/0{1,2}/0{4} 0{1,2}:00 [AaPp][Mm]$', ['%m/%d/%Y %I:%M %p', '%d/%m/%Y %I:%M %p']),
+    (r'^0{1,2}/0{1,2}/0{4} 0{1,2}:00:00$', ['%m/%d/%Y %H:%M:%S', '%d/%m/%Y %H:%M:%S']),
+    (r'^0{1,2}/0{1,2}/0{4} 0{1,2}:00$', ['%m/%d/%Y %H:%M', '%d/%m/%Y %H:%M']),
+    (r'^0{4}/00/00 00:00:00$', ['%Y/%m/%d %H:%M:%S']),
+    (r'^0{1,2}-0{1,2}-0{4} 0{1,2}:00:00$', ['%m-%d-%Y %H:%M:%S', '%d-%m-%Y %H:%M:%S']),
+    (r'^0{1,2}-[A-Za-z]{3}-0{4} 0{1,2}:00:00$', ['%d-%b-%Y %H:%M:%S']),
+]
+_COMPILED_TIMESTAMP_FORMATS = [(re.compile(pattern), formats) for pattern, formats in TIMESTAMP_FORMATS]
+_DIGITS_TO_ZERO = str.maketrans('0123456789', '0000000000')
+TIMESTAMP_SAMPLE_SIZE = 200
+
+# Byte offsets of the fixed-width ISO-8601 fields YYYY-MM-DD?HH:MM:SS
+_ISO_OFFSET_SUFFIX = re.compile(r'(Z|[+-]\d{2}:?\d{2})$')
+_ISO_FIELDS = {'year': (0, 4), 'month': (5, 7), 'day': (8, 10), 'hour': (11, 13), 'minute': (14, 16), 'second': (17, 19)}
+
+
+@lru_cache(maxsize=512)
+def _formats_for_shape(shape: str) -> Tuple[str, ...]:
+    """Candidate formats for one timestamp shape (digits replaced by '0')."""
+    for pattern, formats in _COMPILED_TIMESTAMP_FORMATS:
+        if pattern.match(shape):
+            return tuple(formats)
+    return ()
+
+
+def infer_timestamp_format(values: pd.Series) -> Optional[str]:
+    """
+    Infer an explicit format for a string timestamp column from a sample of rows.
+    
+    Rows are sampled across the whole column, matched against TIMESTAMP_FORMATS
+    and the first candidate format that parses every sampled value wins, so
+    dd.mm dates are recognised even when the first rows are ambiguous.
+    
+    Args:
+        values: Timestamp column
+        
+    Returns:
+        strptime format, 'ISO8601', or None if no registered format fits
+    """
+    non_null = values.dropna()
+    if non_null.empty or not pd.api.types.is_object_dtype(non_null) and not pd.api.types.is_string_dtype(non_null):
+        return None
+    
+    positions = np.unique(np.linspace(0, len(non_null) - 1, min(TIMESTAMP_SAMPLE_SIZE, len(non_null))).astype(int))
+    sample = non_null.iloc[positions]
+    if not all(isinstance(value, str) for value in sample):
+        return None
+    
+    candidates = None
+    for shape in {value.strip().translate(_DIGITS_TO_ZERO) for value in sample}:
+        formats = _formats_for_shape(shape)
+        candidates = formats if candidates is None else tuple(f for f in candidates if f in formats)
+        if not candidates:
+            return None
+    
+    for fmt in candidates:
+        try:
+            pd.to_datetime(sample, format=fmt, utc=True)
+            return fmt
+        except (ValueError, TypeError):
+            continue
+    return None
+
+
+def _parse_fixed_width_iso(values: pd.Series) -> Optional[pd.Series]:
+    """
+    Parse fixed-width ISO-8601 strings with numpy digit arithmetic.
+    
+    Handles YYYY-MM-DD[T ]HH:MM:SS with an optional fixed-width fraction and a
+    'Z' or ±HH:MM / ±HHMM suffix. Returns None (caller falls back to pandas)
+    unless every value has the same length and layout and a valid date.
+    Naive values are left to pandas, whose own ISO parser is already fast
+    for them; it is the offset-suffixed layouts that pandas parses slowly.
+    """
+    if values.isna().any() or len(values) == 0:
+        return None
+    first = values.iloc[0]
+    if not isinstance(first, str) or not _ISO_OFFSET_SUFFIX.search(first[19:]):
+        return None
+    try:
+        raw = values.to_numpy().astype('S')
+    except (UnicodeEncodeError, ValueError, TypeError):
+        return None
+    width = raw.dtype.itemsize
+    if width < 19 or (np.char.str_len(raw) != width).any():
+        return None
+    
+    chars = raw.view(np.uint8).reshape(len(raw), width)
+    
+    def field(start, end):
+        digits = chars[:, start:end].astype(np.int64) - 48
+        if ((digits < 0) | (digits > 9)).any():
+            raise ValueError("non-digit in ISO field")
+        return digits @ (10 ** np.arange(end - start - 1, -1, -1))
+    
+    separators = {4: b'-', 7: b'-', 13: b':', 16: b':'}
+    if any((chars[:, pos] != ord(sep)).any() for pos, sep in separators.items()):
+        return None
+    if not np.isin(chars[:, 10], [ord('T'), ord(' ')]).all():
+        return None
+    
+    try:
+        parts = {name: field(*span) for name, span in _ISO_FIELDS.items()}
+        
+        # Optional fraction, then an optional timezone suffix
+        position = 19
+        fraction_ns = np.zeros(len(raw), dtype=np.int64)
+        if width > 19 and (chars[:, 19] == ord('.')).all():
+            end = 20
+            while end < width and chars[0, end] not in (ord('Z'), ord('+'), ord('-')):
+                end += 1
+            if end == 20 or end - 20 > 9:
+                return None
+            fraction_ns = field(20, end) * 10 ** (9 - (end - 20))
+            position = end
+        
+        offset_s = np.zeros(len(raw), dtype=np.int64)
+        suffix = width - position
+        if suffix == 1:
+            if (chars[:, position] != ord('Z')).any():
+                return None
+        elif suffix in (5, 6):
+            sign = chars[:, position]
+            if not np.isin(sign, [ord('+'), ord('-')]).all():
+                return None
+            minutes_at = position + (4 if suffix == 6 else 3)
+            if suffix == 6 and (chars[:, position + 3] != ord(':')).any():
+                return None
+            offset_s = (field(position + 1, position + 3) * 3600 + field(minutes_at, minutes_at + 2) * 60)
+            offset_s = np.where(sign == ord('-'), -offset_s, offset_s)
+        else:
+            return None
+    except ValueError:
+        return None
+    
+    month = parts['month']
+    if ((month < 1) | (month > 12) | (parts['day'] < 1) | (parts['hour'] > 23)
+            | (parts['minute'] > 59) | (parts['second'] > 59)).any():
+        return None
+    months = ((parts['year'] - 1970) * 12 + month - 1).astype('datetime64[M]')
+    days = months.astype('datetime64[D]') + (parts['day'] - 1)
+    if (days.astype('datetime64[M]') != months).any():
+        return None  # Day past the end of the month
+    
+    ns = (days.astype(np.int64) * 86400 + parts['hour'] * 3600 + parts['minute'] * 60
+          + parts['second'] - offset_s) * 1_000_000_000 + fraction_ns
+    return pd.Series(pd.DatetimeIndex(ns.view('datetime64[ns]')).tz_localize('UTC'),
+                     index=values.index, name=values.name)
+
+
 def parse_timestamps(df: pd.DataFrame, timestamp_col: str, 
-                    source_tz: Optional[str] = None) -> pd.Series:
+                    source_tz: Optional[str] = None,
+                    timestamp_format: Optional[str] = None) -> pd.Series:
     """
     Parse timestamp column and convert to UTC.
     
+    String columns are parsed with an explicit format: timestamp_format when
+    given (e.g. from a vendor profile), otherwise the one inferred by
+    infer_timestamp_format(). Fixed-width ISO-8601 takes a numpy fast path.
+    Columns that match no registered format use pandas inference as before.
+    
     Args:
         df: Input DataFrame
         timestamp_col: Name of timestamp column
         source_tz: Source timezone (if None, attempts auto-detection)
+        timestamp_format: Known strptime format or 'ISO8601' for this column
         
     Returns:
         Series of UTC timestamps
@@ -599,6 +1060,17 @@ def parse_timestamps(df: pd.DataFrame, timestamp_col: str,
         # Excel conversion succeeded
         return excel_timestamps
     
+    fmt = timestamp_format or infer_timestamp_format(df[timestamp_col])
+    if fmt:
+        try:
+            if fmt == 'ISO8601':
+                fast = _parse_fixed_width_iso(df[timestamp_col])
+                if fast is not None:
+                    return fast
+            return pd.to_datetime(df[timestamp_col], format=fmt, utc=True)
+        except (ValueError, TypeError) as e:
+            logger.warning(f"Timestamp format {fmt} did not fit column '{timestamp_col}': {e}")
+    
     try:
         # Try pandas automatic parsing for ISO/string timestamps
         timestamps = pd.to_datetime(df[timestamp_col], utc=True)
@@ -810,11 +1282,130 @@ def check_data_quality(df: pd.DataFrame, timestamp_col: str,
     return issues
 
 
-def resample_temperature_data(df: pd.DataFrame, timestamp_col: str,
+def _bin_means(values: np.ndarray, counts: np.ndarray) -> np.ndarray:
+    """
+    NaN-skipping per-bin means of rows already grouped by bin.
+    
+    Matches pandas' groupby mean bit for bit. Pandas sums with compensated
+    (Kahan) accumulation in row order, which equals plain sequential
+    addition for bins of up to two rows, so those come from np.add.reduceat.
+    Bins with three or more rows repeat the compensated sum, all bins in
+    parallel, one row position per pass.
+    """
+    nonempty = np.flatnonzero(counts)
+    if len(nonempty) == len(values):
+        # At most one row per bin: the means are the rows themselves
+        out = np.full((len(counts), values.shape[1]), np.nan)
+        out[nonempty] = values
+        return out
+    
+    valid = ~np.isnan(values)
+    starts = np.zeros(len(counts), dtype=np.int64)
+    np.cumsum(counts[:-1], out=starts[1:])
+    
+    sums = np.zeros((len(counts), values.shape[1]))
+    nobs = np.zeros((len(counts), values.shape[1]), dtype=np.int64)
+    if len(nonempty):
+        sums[nonempty] = np.add.reduceat(np.where(valid, values, 0.0), starts[nonempty], axis=0)
+        nobs[nonempty] = np.add.reduceat(valid, starts[nonempty], axis=0)
+    
+    heavy = np.flatnonzero(counts >= 3)
+    if len(heavy):
+        heavy_sums = np.zeros((len(heavy), values.shape[1]))
+        compensation = np.zeros_like(heavy_sums)
+        with np.errstate(invalid='ignore'):
+            for position in range(int(counts[heavy].max())):
+                active = counts[heavy] > position
+                rows = values[starts[heavy[active]] + position]
+                y = rows - compensation[active]
+                t = heavy_sums[active] + y
+                c = t - heavy_sums[active] - y
+                c[np.isnan(c)] = 0.0  # +/-inf samples must not turn the sum into NaN
+                keep = ~np.isnan(rows)
+                heavy_sums[active] = np.where(keep, t, heavy_sums[active])
+                compensation[active] = np.where(keep, c, compensation[active])
+        sums[heavy] = heavy_sums
+    
+    with np.errstate(invalid='ignore', divide='ignore'):
+        return np.where(nobs > 0, sums / nobs, np.nan)
+
+
+def _resample_arrays(timestamps_ns: np.ndarray, values: np.ndarray,
+                     step_ns: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Resample a 2-D sensor array onto a fixed grid.
+    
+    Mirrors resample(freq).mean().ffill(limit=2).interpolate(method='time',
+    limit_direction='both'): bins are left-closed and anchored at midnight
+    of the first sample's day, as pandas' default origin is.
+    
+    Args:
+        timestamps_ns: int64 nanosecond timestamps, one per row
+        values: float64 array of shape (rows, sensors)
+        step_ns: Bin width in nanoseconds
+        
+    Returns:
+        (bin start nanoseconds, resampled float64 array)
+    """
+    day_ns = 86_400 * 1_000_000_000
+    origin = timestamps_ns.min() // day_ns * day_ns
+    first_bin = (timestamps_ns.min() - origin) // step_ns
+    bins = (timestamps_ns - origin) // step_ns - first_bin
+    
+    if (np.diff(timestamps_ns) < 0).any():
+        # Pandas sorts by timestamp first, which fixes the summation order within a bin
+        order = np.argsort(timestamps_ns, kind='stable')
+        bins, values = bins[order], values[order]
+    counts = np.bincount(bins)
+    grid_ns = origin + (first_bin + np.arange(len(counts), dtype=np.int64)) * step_ns
+    
+    out = _bin_means(values, counts)
+    
+    # Forward fill gaps of up to 2 steps, then interpolate linearly in time,
+    # holding edge values at both ends
+    positions = np.arange(len(out))
+    for j in np.flatnonzero(np.isnan(out).any(axis=0)):
+        column = out[:, j]
+        missing = np.isnan(column)
+        if missing.all():
+            continue
+        last_valid = np.maximum.accumulate(np.where(missing, -1, positions))
+        fill = missing & (last_valid >= 0) & (positions - last_valid <= 2)
+        column[fill] = column[last_valid[fill]]
+        missing &= ~fill
+        if missing.any():
+            column[missing] = np.interp(grid_ns[missing], grid_ns[~missing], column[~missing])
+    
+    return grid_ns, out
+
+
+def _resample_with_pandas(df: pd.DataFrame, timestamp_col: str, target_step_s: float) -> pd.DataFrame:
+    """Resample with pandas, for frames the array resampler does not cover."""
+    df = df.set_index(timestamp_col)
+    
+    # Resample using forward fill for short gaps, interpolation for longer ones
+    resampled = df.resample(f'{int(target_step_s)}s').mean()
+    
+    # Forward fill small gaps (up to 2 target steps)
+    resampled = resampled.ffill(limit=2)
+    
+    # Interpolate remaining NaN values
+    resampled = resampled.interpolate(method='time', limit_direction='both')
+    
+    # Reset index to make timestamp a column again
+    return resampled.reset_index()
+
+
+def resample_temperature_data(df: pd.DataFrame, timestamp_col: str, 
                             target_step_s: float = 30.0) -> pd.DataFrame:
     """
     Resample temperature data to fixed time step.
     
+    Bin means, bounded forward fill and time interpolation run on an int64
+    timestamp array and a 2-D float64 sensor array. Frames with non-numeric
+    columns, missing timestamps, non-UTC time zones or sub-second steps go
+    through pandas instead; both paths give identical results.
+    
     Args:
         df: Input DataFrame with timestamps
         timestamp_col: Name of timestamp column
@@ -823,8 +1414,6 @@ def resample_temperature_data(df: pd.DataFrame, timestamp_col: str,
     Returns:
         Resampled DataFrame
     """
-    df = df.copy()
-    
     # Calculate current sampling interval to determine if resampling is needed
     if len(df) >= 2:
         # Calculate median interval to handle irregular sampling
@@ -836,38 +1425,40 @@ def resample_temperature_data(df: pd.DataFrame, timestamp_col: str,
             # This prevents downsampling good data
             if current_interval_s <= target_step_s:
                 logger.debug(f"Current interval ({current_interval_s}s) ≤ target ({target_step_s}s), preserving original data")
-                return df
+                return df.copy()
             
             # If current interval matches target closely, preserve original cadence
             if abs(current_interval_s - target_step_s) / target_step_s < 0.15:  # Within 15%
                 logger.debug(f"Current interval ({current_interval_s}s) matches target ({target_step_s}s), preserving original cadence")
-                return df
+                return df.copy()
             
             # If target is much smaller than current, only resample if we have sufficient data density
             if target_step_s < current_interval_s * 0.5:
                 logger.warning(f"Target step ({target_step_s}s) much smaller than data interval ({current_interval_s}s), keeping original resolution")
-                return df
-    
-    df = df.set_index(timestamp_col)
-    
-    # Create regular time index
-    start_time = df.index.min()
-    end_time = df.index.max()
-    freq = f'{int(target_step_s)}s'
-    
-    # Resample using forward fill for short gaps, interpolation for longer ones
-    resampled = df.resample(freq).mean()
-    
-    # Forward fill small gaps (up to 2 target steps)
-    max_fill_limit = 2
-    resampled = resampled.ffill(limit=max_fill_limit)
-    
-    # Interpolate remaining NaN values
-    resampled = resampled.interpolate(method='time', limit_direction='both')
+                return df.copy()
+    
+    timestamps = df[timestamp_col]
+    value_columns = [col for col in df.columns if col != timestamp_col]
+    supported = (
+        len(df) > 0 and target_step_s >= 1 and float(target_step_s).is_integer()
+        and timestamps.dtype in (np.dtype('datetime64[ns]'), pd.DatetimeTZDtype('ns', 'UTC'))
+        and not timestamps.isna().any()
+        and all(df[col].dtype in (np.float64, np.int64) for col in value_columns)
+    )
+    if not supported:
+        return _resample_with_pandas(df, timestamp_col, target_step_s)
     
-    # Reset index to make timestamp a column again
-    resampled = resampled.reset_index()
+    grid_ns, values = _resample_arrays(
+        pd.DatetimeIndex(timestamps).asi8,
+        df[value_columns].to_numpy(dtype=np.float64),
+        int(target_step_s) * 1_000_000_000,
+    )
+    grid = pd.DatetimeIndex(grid_ns.view('datetime64[ns]'), name=timestamp_col)
+    if isinstance(timestamps.dtype, pd.DatetimeTZDtype):
+        grid = grid.tz_localize('UTC')
     
+    resampled = pd.DataFrame(values, columns=value_columns)
+    resampled.insert(0, timestamp_col, grid)
     return resampled
 
 
@@ -930,7 +1521,8 @@ def normalize_temperature_data(df: pd.DataFrame,
                              tz_resolver: Optional[Callable[[str], str]] = None,
                              unit_resolver: Optional[Callable[[str], str]] = None,
                              industry: Optional[str] = None,
-                             return_trace: bool = False) -> Union[pd.DataFrame, NormalizedTrace]:
+                             return_trace: bool = False,
+                             timestamp_format: Optional[str] = None) -> Union[pd.DataFrame, NormalizedTrace]:
     """
     Normalize temperature data according to ProofKit requirements.
     
@@ -951,6 +1543,8 @@ def normalize_temperature_data(df: pd.DataFrame,
         unit_resolver: Optional callable to resolve temperature units (default: None)
         industry: Industry type for industry-specific validation (default: None)
         return_trace: If True, return NormalizedTrace with processing info (default: False)
+        timestamp_format: Known timestamp format, skips format inference (default: None,
+            or the format a vendor profile attached to df.attrs)
         
     Returns:
         Normalized DataFrame or NormalizedTrace if return_trace=True
@@ -982,13 +1576,21 @@ def normalize_temperature_data(df: pd.DataFrame,
     timestamp_col = detect_timestamp_column(df)
     trace['processing_steps'].append(f'Detected timestamp column: {timestamp_col}')
     
+    # Memory report from a spec-driven load, completed once the data is normalized
+    ingest_memory = df.attrs.get('ingest_memory', {})
+    df = _restore_float64(df)
+    
+    # Use the format learned by a vendor profile when it describes this column
+    if timestamp_format is None and df.attrs.get('timestamp_column') == timestamp_col:
+        timestamp_format = df.attrs.get('timestamp_format')
+    
     # Parse and normalize timestamps to UTC
     resolved_timezone = source_timezone
     if tz_resolver and source_timezone:
         resolved_timezone = tz_resolver(source_timezone)
         trace['conversions'].append(f'Resolved timezone: {source_timezone} -> {resolved_timezone}')
     
-    utc_timestamps = parse_timestamps(df, timestamp_col, resolved_timezone)
+    utc_timestamps = parse_timestamps(df, timestamp_col, resolved_timezone, timestamp_format)
     df = df.copy()
     df[timestamp_col] = utc_timestamps
     trace['processing_steps'].append(f'Converted timestamps to UTC (source_tz: {resolved_timezone})')
@@ -1104,6 +1706,10 @@ def normalize_temperature_data(df: pd.DataFrame,
     trace['processing_steps'].append(f'Resampled data: {pre_resample_count} -> {post_resample_count} samples')
     trace['final_shape'] = normalized_df.shape
     trace['final_columns'] = list(normalized_df.columns)
+    trace['memory'] = {**ingest_memory, 'normalized_bytes': int(normalized_df.memory_usage(deep=True).sum())}
+    
+    # Resolve timestamps, sensor arrays and column roles once for all later stages
+    register_trace(normalized_df)
     
     if return_trace:
         return NormalizedTrace(normalized_df, trace)
@@ -23,13 +23,14 @@ Example usage:
 """
 
 import hashlib
-import json
 import zipfile
 from datetime import datetime, timezone
 from pathlib import Path
 from typing import Dict, List, Optional, Tuple, Any
 import logging
 
+from core.serialization import dumps_canonical, loads
+
 logger = logging.getLogger(__name__)
 
 
@@ -262,7 +263,7 @@ def create_evidence_bundle(raw_csv_path: str,
         manifest, root_hash = create_manifest(file_info, metadata, deterministic)
         
         # Create manifest JSON content
-        manifest_json = json.dumps(manifest, indent=2, sort_keys=True)
+        manifest_json = dumps_canonical(manifest, sort_keys=True)
         manifest_bytes = manifest_json.encode('utf-8')
         manifest_hash = calculate_content_hash(manifest_bytes)
         
@@ -346,7 +347,7 @@ def verify_evidence_bundle(bundle_path: str) -> Dict[str, Any]:
             
             # Read and parse manifest
             manifest_content = zipf.read("manifest.json")
-            manifest = json.loads(manifest_content.decode('utf-8'))
+            manifest = loads(manifest_content)
             
             # Get root hash from manifest (check both field names for compatibility)
             verification_result["root_hash"] = manifest.get("root_sha256") or manifest.get("root_hash")
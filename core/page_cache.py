@@ -0,0 +1,145 @@
+"""
+Caches for ProofKit's marketing, docs and blog pages.
+
+Three layers take these routes from a template render per hit down to a
+dictionary lookup:
+
+- FileParseCache memoizes what is parsed from a content file (a blog post's
+  title, excerpt and HTML) until the file's mtime or size changes.
+- StaticPageCache keeps the rendered HTML of pages that do not depend on who
+  is asking.
+- configure_bytecode_cache() points Jinja2 at a filesystem bytecode cache so
+  fresh workers skip template compilation.
+
+Pages carry a per-request CSP nonce. A page is rendered once with a
+placeholder in its place and the request's nonce is substituted on the way
+out. Since every response has a fresh nonce, pages are sent with no-store and
+never revalidated: a 304 would leave the browser with a body whose nonce no
+longer matches the CSP header.
+
+Example usage:
+    from core.page_cache import FileParseCache, StaticPageCache
+
+    static_pages = StaticPageCache(templates)
+    return static_pages.render(request, "trust.html")
+"""
+
+import os
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional, TypeVar, Union
+
+from jinja2 import FileSystemBytecodeCache
+from starlette.requests import Request
+from starlette.responses import HTMLResponse
+from starlette.templating import Jinja2Templates
+
+from core.ttl_cache import TTLCache
+
+# Rendered pages are reused for this long; 0 renders on every request (dev)
+STATIC_PAGE_TTL_S = float(os.environ.get('STATIC_PAGE_TTL_S', '300'))
+STATIC_PAGE_MAX_ENTRIES = int(os.environ.get('STATIC_PAGE_MAX_ENTRIES', '512'))
+# Compiled template cache; unset uses Jinja's private per-user temp directory
+JINJA_BYTECODE_CACHE_DIR = os.environ.get('JINJA_BYTECODE_CACHE_DIR')
+
+NONCE_PLACEHOLDER = "__proofkit_csp_nonce__"
+# Pages embed a per-response CSP nonce, so no copy may be reused
+STATIC_PAGE_CACHE_CONTROL = "no-store"
+
+T = TypeVar('T')
+
+
+def configure_bytecode_cache(templates: Jinja2Templates,
+                             directory: Optional[str] = JINJA_BYTECODE_CACHE_DIR) -> None:
+    """
+    Store compiled templates on disk so new workers load instead of compile them.
+
+    Args:
+        templates: Application template renderer
+        directory: Cache directory (created if missing); None uses Jinja's default
+    """
+    if directory:
+        Path(directory).mkdir(parents=True, exist_ok=True)
+    templates.env.bytecode_cache = FileSystemBytecodeCache(directory)
+
+
+class FileParseCache:
+    """Memoize a parse of each file until its mtime or size changes."""
+
+    def __init__(self, max_entries: int = 256):
+        # No TTL: entries stay valid until the file changes
+        self._entries = TTLCache(ttl_s=float('inf'), max_entries=max_entries)
+
+    def get(self, path: Union[str, Path], parse: Callable[[str], T]) -> T:
+        """
+        Return parse(text) for the file, reusing the last result if unchanged.
+
+        Args:
+            path: Content file
+            parse: Module-level function building the cached value from the
+                file's text; part of the cache key, so one file can be parsed
+                several ways
+
+        Raises:
+            OSError: If the file cannot be read
+        """
+        path = Path(path)
+        stat_result = path.stat()
+        version = (stat_result.st_mtime_ns, stat_result.st_size)
+        key = (str(path), parse)
+        entry = self._entries.get(key)
+        if entry is not None and entry[0] == version:
+            return entry[1]
+        value = parse(path.read_text(encoding='utf-8'))
+        self._entries.put(key, (version, value))
+        return value
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+
+class StaticPageCache:
+    """Rendered pages that are the same for every visitor, with per-response nonces."""
+
+    def __init__(self, templates: Jinja2Templates, ttl_s: float = STATIC_PAGE_TTL_S,
+                 max_entries: int = STATIC_PAGE_MAX_ENTRIES):
+        self.templates = templates
+        self._pages = TTLCache(ttl_s, max_entries)
+
+    def _render(self, request: Request, name: str, context: Dict[str, Any]) -> str:
+        """Render with the nonce placeholder in place of the request's nonce."""
+        nonce = getattr(request.state, 'nonce', '')
+        request.state.nonce = NONCE_PLACEHOLDER
+        try:
+            body = self.templates.get_template(name).render({**context, "request": request})
+        finally:
+            request.state.nonce = nonce
+        return body
+
+    def render(self, request: Request, name: str,
+               context: Optional[Dict[str, Any]] = None) -> HTMLResponse:
+        """
+        Serve a page from cache, rendering it on first use.
+
+        Args:
+            request: Incoming request (its URL is part of the page, e.g. canonical link)
+            name: Template name
+            context: Template variables; must not depend on the visitor
+
+        Returns:
+            The page with the request's nonce filled in
+        """
+        context = context or {}
+        key = (name, str(request.url), repr(sorted(context.items())))
+        body = self._pages.get(key)
+        if body is None:
+            body = self._render(request, name, context)
+            self._pages.put(key, body)
+
+        nonce = getattr(request.state, 'nonce', '')
+        return HTMLResponse(body.replace(NONCE_PLACEHOLDER, nonce), headers={
+            "Cache-Control": STATIC_PAGE_CACHE_CONTROL,
+        })
+
+    def clear(self) -> None:
+        self._pages.clear()
+
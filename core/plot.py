@@ -23,6 +23,8 @@ Example usage:
 
 import pandas as pd
 import numpy as np
+import matplotlib
+matplotlib.use('Agg')  # Headless backend; set before pyplot is imported
 import matplotlib.pyplot as plt
 import matplotlib.dates as mdates
 from matplotlib.patches import Rectangle
@@ -31,17 +33,21 @@ from typing import List, Tuple, Optional, Dict, Any
 from pathlib import Path
 import logging
 import os
+import threading
 
 from core.models import SpecV1, DecisionResult, SensorMode, Industry
 from core.decide import (
-    combine_sensor_readings, 
-    detect_temperature_columns,
     calculate_continuous_hold_time,
     calculate_cumulative_hold_time
 )
+from core.trace import get_trace
 
 logger = logging.getLogger(__name__)
 
+# pyplot keeps global figure state; serialize figure creation and saving so
+# certificates can be rendered from worker threads
+_pyplot_lock = threading.Lock()
+
 
 class PlotError(Exception):
     """Raised when plot generation encounters errors."""
@@ -177,12 +183,9 @@ def extract_combined_pmt_data(df: pd.DataFrame, spec: SpecV1) -> Tuple[pd.Series
     Raises:
         PlotError: If PMT data cannot be extracted
     """
-    # Detect timestamp column
-    timestamp_col = None
-    for col in df.columns:
-        if 'time' in col.lower() or pd.api.types.is_datetime64_any_dtype(df[col]):
-            timestamp_col = col
-            break
+    # Reuse the timestamp column and sensor roles resolved at normalization
+    trace = get_trace(df)
+    timestamp_col = trace.timestamp_column
     
     if timestamp_col is None:
         raise PlotError("No timestamp column found in normalized data")
@@ -191,8 +194,7 @@ def extract_combined_pmt_data(df: pd.DataFrame, spec: SpecV1) -> Tuple[pd.Series
     if not pd.api.types.is_datetime64_any_dtype(df[timestamp_col]):
         df[timestamp_col] = pd.to_datetime(df[timestamp_col])
     
-    # Detect temperature columns
-    temp_columns = detect_temperature_columns(df)
+    temp_columns = list(trace.roles['temperature'])
     if not temp_columns:
         raise PlotError("No temperature columns found in normalized data")
     
@@ -213,8 +215,8 @@ def extract_combined_pmt_data(df: pd.DataFrame, spec: SpecV1) -> Tuple[pd.Series
     require_at_least = sensor_selection.require_at_least if sensor_selection else None
     
     try:
-        combined_pmt = combine_sensor_readings(
-            df, temp_columns, sensor_mode, require_at_least, conservative_threshold_C
+        combined_pmt = trace.combined(
+            temp_columns, sensor_mode, require_at_least, conservative_threshold_C
         )
     except Exception as e:
         raise PlotError(f"Failed to combine sensor readings: {str(e)}")
@@ -405,9 +407,6 @@ def generate_proof_plot(normalized_df: pd.DataFrame, spec: SpecV1,
         PlotError: If plot generation fails
     """
     try:
-        # Configure matplotlib for deterministic rendering
-        configure_matplotlib_for_deterministic_rendering()
-        
         # Extract combined PMT data
         timestamps, temperatures, sensor_names = extract_combined_pmt_data(normalized_df, spec)
         
@@ -418,24 +417,28 @@ def generate_proof_plot(normalized_df: pd.DataFrame, spec: SpecV1,
         if len(timestamps) < 2:
             raise PlotError("Insufficient data points for plotting")
         
-        # Create the plot
-        fig = create_temperature_plot(timestamps, temperatures, spec, decision, sensor_names, industry)
-        
-        # Save the plot
         output_path = Path(output_path).resolve()
         output_path.parent.mkdir(parents=True, exist_ok=True)
         
-        fig.savefig(
-            output_path,
-            dpi=100,
-            bbox_inches='tight',
-            facecolor='white',
-            edgecolor='none',
-            format='png'
-        )
-        
-        # Close figure to free memory
-        plt.close(fig)
+        with _pyplot_lock:
+            # Configure matplotlib for deterministic rendering
+            configure_matplotlib_for_deterministic_rendering()
+            
+            # Create the plot
+            fig = create_temperature_plot(timestamps, temperatures, spec, decision, sensor_names, industry)
+            
+            # Save the plot
+            fig.savefig(
+                output_path,
+                dpi=100,
+                bbox_inches='tight',
+                facecolor='white',
+                edgecolor='none',
+                format='png'
+            )
+            
+            # Close figure to free memory
+            plt.close(fig)
         
         logger.info(f"Proof plot generated successfully: {output_path}")
         return str(output_path)
@@ -469,14 +472,12 @@ def validate_plot_inputs(normalized_df: pd.DataFrame, spec: SpecV1,
         errors.append("Insufficient data points (need at least 2)")
     
     # Check for timestamp column
-    timestamp_cols = [col for col in normalized_df.columns 
-                     if 'time' in col.lower() or pd.api.types.is_datetime64_any_dtype(normalized_df[col])]
-    if not timestamp_cols:
+    trace = get_trace(normalized_df)
+    if trace.timestamp_column is None:
         errors.append("No timestamp column found")
     
     # Check for temperature columns
-    temp_columns = detect_temperature_columns(normalized_df)
-    if not temp_columns:
+    if not trace.roles['temperature']:
         errors.append("No temperature columns found")
     
     # Validate spec
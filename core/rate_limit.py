@@ -0,0 +1,139 @@
+"""
+Host-shared rate limit storage for ProofKit.
+
+slowapi's default in-memory storage is private to each gunicorn worker, so
+every worker enforced the full limit on its own. This module registers a
+SQLite storage backend with the `limits` library under the ``sqlite://``
+scheme; all workers on a host count hits in the same database file. Any
+other `limits` storage URI (``memory://``, ``redis://host:6379`` with the
+redis package installed) can be selected through RATE_LIMIT_STORAGE_URI to
+share limits across machines as well.
+
+Requests draw from one per-client budget, weighted by route: a compile costs
+COMPILE_REQUEST_COST units, lighter routes cost 1.
+
+Example usage:
+    from slowapi import Limiter
+    from core.rate_limit import COMPILE_REQUEST_COST, RATE_LIMIT_STORAGE_URI
+
+    limiter = Limiter(key_func=get_remote_address, storage_uri=RATE_LIMIT_STORAGE_URI)
+    limiter.shared_limit("50/minute", scope="requests", cost=COMPILE_REQUEST_COST)
+"""
+
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Optional
+
+from limits.storage import Storage
+
+from core.logging import get_logger
+from core.sqlite_store import connect, immediate_transaction
+
+logger = get_logger(__name__)
+
+RATE_LIMIT_STORAGE_URI = os.environ.get('RATE_LIMIT_STORAGE_URI', 'sqlite:///storage/ratelimit.db')
+
+# Budget units consumed per request; the per-minute budget is sized so a
+# client sending only compiles still gets RATE_LIMIT_PER_MIN of them
+COMPILE_REQUEST_COST = int(os.environ.get('RATE_LIMIT_COMPILE_COST', '5'))
+LIGHT_REQUEST_COST = 1
+
+# Expired counters are deleted after this many increments
+PURGE_EVERY_INCREMENTS = 500
+
+
+def _sqlite_path(uri: str) -> str:
+    """Map sqlite:///relative.db and sqlite:////abs/path.db to file paths."""
+    path = uri.split('://', 1)[1]
+    return path[1:] if path.startswith('/') else path
+
+
+class SQLiteStorage(Storage):
+    """
+    Fixed-window counters in a SQLite file shared by every worker on a host.
+
+    Each increment is one IMMEDIATE transaction, so concurrent workers
+    serialize on the counter row instead of losing hits.
+    """
+
+    STORAGE_SCHEME = ['sqlite']
+
+    def __init__(self, uri: str, wrap_exceptions: bool = False, **options: Any):
+        super().__init__(uri, wrap_exceptions=wrap_exceptions, **options)
+        self.db_path = _sqlite_path(uri)
+        self._conn = None
+        self._pid: Optional[int] = None
+        self._lock = threading.Lock()
+        self._increments = 0
+
+    @property
+    def base_exceptions(self):
+        return sqlite3.Error
+
+    def _connection(self):
+        # Connections must not cross a fork, so reopen in each worker process
+        if self._conn is None or self._pid != os.getpid():
+            self._conn = connect(self.db_path)
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS rate_limits ("
+                "key TEXT PRIMARY KEY, value INTEGER NOT NULL, expires_at REAL NOT NULL)"
+            )
+            self._pid = os.getpid()
+        return self._conn
+
+    def incr(self, key: str, expiry: float, amount: int = 1, **_: Any) -> int:
+        """Add amount to the window counter, starting a new window if the old one expired."""
+        now = time.time()
+        with self._lock:
+            conn = self._connection()
+            with immediate_transaction(conn):
+                row = conn.execute(
+                    "SELECT value, expires_at FROM rate_limits WHERE key = ?", (key,)
+                ).fetchone()
+                if row is None or row['expires_at'] <= now:
+                    value = amount
+                    conn.execute(
+                        "INSERT OR REPLACE INTO rate_limits (key, value, expires_at) VALUES (?, ?, ?)",
+                        (key, value, now + expiry),
+                    )
+                else:
+                    value = row['value'] + amount
+                    conn.execute("UPDATE rate_limits SET value = ? WHERE key = ?", (value, key))
+
+                self._increments += 1
+                if self._increments % PURGE_EVERY_INCREMENTS == 0:
+                    conn.execute("DELETE FROM rate_limits WHERE expires_at <= ?", (now,))
+        return value
+
+    def get(self, key: str) -> int:
+        with self._lock:
+            row = self._connection().execute(
+                "SELECT value FROM rate_limits WHERE key = ? AND expires_at > ?", (key, time.time())
+            ).fetchone()
+        return row['value'] if row else 0
+
+    def get_expiry(self, key: str) -> float:
+        with self._lock:
+            row = self._connection().execute(
+                "SELECT expires_at FROM rate_limits WHERE key = ?", (key,)
+            ).fetchone()
+        return row['expires_at'] if row else time.time()
+
+    def check(self) -> bool:
+        try:
+            with self._lock:
+                self._connection().execute("SELECT 1")
+            return True
+        except Exception as e:
+            logger.warning(f"Rate limit storage unavailable: {e}")
+            return False
+
+    def reset(self) -> Optional[int]:
+        with self._lock:
+            return self._connection().execute("DELETE FROM rate_limits").rowcount
+
+    def clear(self, key: str) -> None:
+        with self._lock:
+            self._connection().execute("DELETE FROM rate_limits WHERE key = ?", (key,))
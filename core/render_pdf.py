@@ -58,7 +58,7 @@ import PyPDF2
 try:
     from cryptography.hazmat.primitives import hashes
     from cryptography.x509 import load_pem_x509_certificate
-    import rfc3161ng
+    import rfc3161ng  # noqa: F401  # availability probe; core.tsa_client does the requests
     from lxml import etree
     PDF_COMPLIANCE_AVAILABLE = True
 except ImportError:
@@ -67,6 +67,8 @@ except ImportError:
 from core.models import SpecV1, DecisionResult, Industry
 from core.policy import should_block_if_no_tsa, should_enforce_pdf_a3
 from core.timestamp import get_timestamp_with_retry, TimestampResult
+from core.tsa_client import DEFAULT_TSA_URLS, get_tsa_client
+from core.build_info import get_build_info
 
 # Initialize logger
 logger = logging.getLogger(__name__)
@@ -159,12 +161,8 @@ PDF_A3_NAMESPACE = {
     'pdfaProperty': 'http://www.aiim.org/pdfa/ns/property#'
 }
 
-# RFC 3161 TSA URLs (using public TSAs for demonstration)
-RFC3161_TSA_URLS = [
-    'http://timestamp.apple.com/ts01',
-    'http://time.certum.pl',
-    'http://timestamp.digicert.com'
-]
+# RFC 3161 TSA URLs (shared with the pooled TSA client; override with TSA_URLS)
+RFC3161_TSA_URLS = DEFAULT_TSA_URLS
 
 # Page margins and layout constants
 MARGIN_LEFT = 0.75 * inch
@@ -652,7 +650,11 @@ def _create_footer_info(now_provider: Optional[Callable[[], datetime]] = None,
         spaceAfter=0
     )
     
-    footer_parts = [f"Generated by ProofKit v1.0 | {timestamp} | Powder-Coat Cure Validation Certificate"]
+    build_info = get_build_info()
+    footer_parts = [
+        f"Generated by ProofKit v{build_info.version} ({build_info.short_commit}) | {timestamp} | "
+        "Powder-Coat Cure Validation Certificate"
+    ]
     
     # Add notes for unavailable features and pending timestamps
     notes = []
@@ -730,21 +732,8 @@ def _generate_rfc3161_timestamp(data: bytes, timestamp_provider: Optional[Callab
         digest.update(data)
         data_hash = digest.finalize()
         
-        # Try each TSA URL
-        for tsa_url in RFC3161_TSA_URLS:
-            try:
-                # Create timestamp request
-                rt = rfc3161ng.RemoteTimestamper(tsa_url, hashname='sha256')
-                
-                # Get timestamp
-                timestamp = rt.timestamp(data=data_hash)
-                return timestamp
-                
-            except Exception as e:
-                # print(f"TSA {tsa_url} failed: {e}") # Original code had this line commented out
-                continue
-        
-        return None
+        # Hedged request over the shared pooled client
+        return get_tsa_client().timestamp(data_hash)
     except Exception as e:
         # print(f"RFC 3161 timestamp generation failed: {e}") # Original code had this line commented out
         return None
@@ -1245,8 +1234,9 @@ def _create_footer_with_branding(config: Dict[str, Any],
     else:
         timestamp = datetime.now(timezone.utc).strftime("%Y-%m-%d %H:%M:%S UTC")
     
+    build_info = get_build_info()
     footer_lines = [
-        f"Generated: {timestamp}",
+        f"Generated: {timestamp} | ProofKit v{build_info.version} ({build_info.short_commit})",
         "This certificate provides cryptographic proof of temperature validation compliance."
     ]
     
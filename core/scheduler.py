@@ -1,189 +1,431 @@
 """
 Background task scheduler for ProofKit production operations.
 
-Handles automated cleanup and backup tasks without requiring cron.
+Handles automated cleanup, backup, upsell emails and TSA retries without
+requiring cron.
+
+Every gunicorn worker starts a scheduler, but only the one holding the
+host-wide leader lock (an flock on storage/scheduler/leader.lock) runs tasks.
+The others retry the lock every SCHEDULER_LEADER_RETRY_S and take over if the
+leader exits. The leader computes each task's next fire time and sleeps until
+the earliest one instead of polling the clock. Missed daily runs (downtime at
+02:00) fire once on takeover.
+
+Runs are spread by per-task jitter, and failures are retried with exponential
+backoff. Each run holds a per-task lock, so an admin "run now" never overlaps a
+scheduled run. Run counts, durations and errors go to
+storage/scheduler/scheduler.db, so any worker can report them.
+
+Example usage:
+    from core.scheduler import get_scheduler, start_background_tasks
+
+    start_background_tasks()  # app startup, in every worker
+    get_scheduler().run_now("cleanup")  # admin hook
+    status = get_scheduler().get_status()
 """
 
 import os
+import random
+import threading
 import time
 import logging
-import threading
 import subprocess
-from datetime import datetime, timezone
-from typing import Optional
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any, Callable, Dict, IO, List, Optional, Tuple
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - Windows fallback
+    fcntl = None
 
 from core.cleanup import cleanup_old_artifacts
+from core.sqlite_store import connect
 from core.upsell import process_queue_once
 from core.timestamp import process_retry_queue
 
-# Configure logging
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+BASE_DIR = Path(__file__).resolve().parent.parent
+
+SCHEDULER_DIR = Path(os.environ.get("SCHEDULER_DIR", BASE_DIR / "storage" / "scheduler"))
+SCHEDULER_DB_NAME = "scheduler.db"
+# How often standby workers try to take over the leader lock
+SCHEDULER_LEADER_RETRY_S = float(os.environ.get("SCHEDULER_LEADER_RETRY_S", "30"))
+# Upper bound for the retry delay of a repeatedly failing task
+SCHEDULER_MAX_BACKOFF_S = 3600.0
+
+BACKUP_SCRIPT = "/app/scripts/backup_to_s3.sh"
+
+
+@dataclass
+class ScheduledTask:
+    """A task fired every interval_s seconds or daily at daily_at (UTC hour, minute)."""
+
+    name: str
+    func: Callable[[datetime], Any]
+    interval_s: Optional[float] = None
+    daily_at: Optional[Tuple[int, int]] = None
+    jitter_s: float = 0.0
+    retry_base_s: float = 60.0
+
+    def next_fire_after(self, after: datetime) -> datetime:
+        """First scheduled time strictly after `after` (without jitter)."""
+        if self.daily_at is not None:
+            hour, minute = self.daily_at
+            fire = after.replace(hour=hour, minute=minute, second=0, microsecond=0)
+            if fire <= after:
+                fire += timedelta(days=1)
+            return fire
+        return after + timedelta(seconds=self.interval_s)
+
+
+def _try_lock(path: Path) -> Optional[IO]:
+    """Take an exclusive flock without blocking; return the open file or None."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    lock_file = open(path, 'a+')
+    if fcntl is None:
+        return lock_file  # Single-process platforms: every caller is the leader
+    try:
+        fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except BlockingIOError:
+        lock_file.close()
+        return None
+    return lock_file
+
+
+def _unlock(lock_file: IO) -> None:
+    if fcntl is not None:
+        fcntl.flock(lock_file, fcntl.LOCK_UN)
+    lock_file.close()
+
+
+def _run_cleanup(now: datetime) -> None:
+    """Remove artifacts older than RETENTION_DAYS."""
+    stats = cleanup_old_artifacts(storage_dir=BASE_DIR / "storage")
+    logger.info(f"Cleanup completed: {stats['removed']} artifacts removed")
+    print(f"cleanup_removed:{stats['removed']}|c")
+
+
+def _has_backup_credentials() -> bool:
+    """Check if AWS backup credentials are available."""
+    return all([
+        os.environ.get("S3_BUCKET"),
+        os.environ.get("AWS_ACCESS_KEY_ID"),
+        os.environ.get("AWS_SECRET_ACCESS_KEY")
+    ])
+
+
+def _run_backup(now: datetime) -> None:
+    """Upload storage to S3 when credentials and the backup script are present."""
+    if not _has_backup_credentials():
+        return
+    if not os.path.exists(BACKUP_SCRIPT):
+        logger.warning("Backup script not found, skipping backup")
+        return
+
+    result = subprocess.run(
+        [BACKUP_SCRIPT],
+        capture_output=True,
+        text=True,
+        timeout=300  # 5 minute timeout
+    )
+    if result.returncode != 0:
+        print("backup_failed:1|c")
+        raise RuntimeError(f"Backup failed: {result.stderr}")
+    logger.info("Backup completed successfully")
+    print("backup_success:1|c")
+
+
+def _run_upsell(now: datetime) -> None:
+    process_queue_once(now)
+
+
+def _run_tsa_retry(now: datetime) -> None:
+    tsa_stats = process_retry_queue(lambda: now)
+    if tsa_stats['jobs_processed'] > 0:
+        logger.info(f"TSA retry queue: {tsa_stats}")
+
+
+def default_tasks() -> List[ScheduledTask]:
+    """Production task table."""
+    return [
+        ScheduledTask("cleanup", _run_cleanup, daily_at=(2, 0), jitter_s=60, retry_base_s=300),
+        ScheduledTask("backup", _run_backup, daily_at=(2, 0), jitter_s=60, retry_base_s=300),
+        ScheduledTask("upsell", _run_upsell, interval_s=30, jitter_s=5, retry_base_s=30),
+        ScheduledTask("tsa_retry", _run_tsa_retry, interval_s=30, jitter_s=5, retry_base_s=30),
+    ]
+
+
 class BackgroundScheduler:
-    """Simple background task scheduler for production operations."""
-    
-    def __init__(self):
+    """Leader-elected scheduler running each task at its next fire time."""
+
+    def __init__(self, tasks: Optional[List[ScheduledTask]] = None,
+                 state_dir: Path = SCHEDULER_DIR,
+                 clock: Callable[[], datetime] = lambda: datetime.now(timezone.utc)):
+        self.tasks: Dict[str, ScheduledTask] = {t.name: t for t in (tasks if tasks is not None else default_tasks())}
+        self.state_dir = Path(state_dir)
+        self._clock = clock
         self.running = False
-        self.cleanup_thread: Optional[threading.Thread] = None
-        self.backup_thread: Optional[threading.Thread] = None
-        
+        self.thread: Optional[threading.Thread] = None
+        self._wake = threading.Event()
+        self._leader_file: Optional[IO] = None
+        self._next_run: Dict[str, datetime] = {}
+        self._failures: Dict[str, int] = {}
+
+    @property
+    def is_leader(self) -> bool:
+        return self._leader_file is not None
+
     def start(self):
-        """Start background scheduler threads."""
+        """Start the scheduler thread."""
         if self.running:
             logger.warning("Scheduler already running")
             return
-            
+
         self.running = True
-        logger.info("Starting background scheduler")
-        
-        # Start cleanup scheduler thread
-        self.cleanup_thread = threading.Thread(target=self._cleanup_scheduler, daemon=True)
-        self.cleanup_thread.start()
-        
-        # Start backup scheduler thread  
-        self.backup_thread = threading.Thread(target=self._backup_scheduler, daemon=True)
-        self.backup_thread.start()
-        
-        logger.info("Background scheduler started successfully")
-    
-    def stop(self):
-        """Stop background scheduler."""
+        self._wake.clear()
+        self.thread = threading.Thread(target=self._run, name="scheduler", daemon=True)
+        self.thread.start()
+        logger.info("Background scheduler started")
+
+    def stop(self, timeout: float = 5.0):
+        """Stop the scheduler and hand leadership to another worker."""
         self.running = False
+        self._wake.set()
+        if self.thread is not None and self.thread is not threading.current_thread():
+            self.thread.join(timeout)
+        self.thread = None
+        if self._leader_file is not None:
+            _unlock(self._leader_file)
+            self._leader_file = None
         logger.info("Background scheduler stopped")
-    
-    def _cleanup_scheduler(self):
-        """Run cleanup task daily at 2:00 AM UTC."""
-        while self.running:
-            try:
-                current_time = datetime.now(timezone.utc)
-                
-                # Check if it's 2:00 AM UTC (allow 1-minute window)
-                if current_time.hour == 2 and current_time.minute == 0:
-                    logger.info("Starting scheduled cleanup task")
-                    
-                    try:
-                        # Run cleanup
-                        removed_count = cleanup_old_artifacts()
-                        logger.info(f"Cleanup completed: {removed_count} artifacts removed")
-                        
-                        # Log metrics in statsd format
-                        print(f"cleanup_removed:{removed_count}|c")
-                        
-                        # Sleep for 70 seconds to avoid running multiple times in the same minute
-                        time.sleep(70)
-                        
-                    except Exception as e:
-                        logger.error(f"Cleanup task failed: {e}")
-                        
-                else:
-                    # Sleep for 30 seconds and check again
-                    time.sleep(30)
-                    
-            except Exception as e:
-                logger.error(f"Error in cleanup scheduler: {e}")
-                time.sleep(60)  # Wait a minute before retrying
-    
-    def _backup_scheduler(self):
-        """Run backup task daily at 2:00 AM UTC."""
+
+    def _connect_state(self):
+        conn = connect(self.state_dir / SCHEDULER_DB_NAME)
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS task_runs (
+                task TEXT PRIMARY KEY,
+                runs INTEGER NOT NULL DEFAULT 0,
+                failures INTEGER NOT NULL DEFAULT 0,
+                last_started_at REAL,
+                last_duration_s REAL,
+                last_error TEXT,
+                next_run_at REAL
+            )
+        """)
+        return conn
+
+    def _try_become_leader(self) -> bool:
+        lock_file = _try_lock(self.state_dir / "leader.lock")
+        if lock_file is None:
+            return False
+        lock_file.truncate(0)
+        lock_file.write(str(os.getpid()))
+        lock_file.flush()
+        self._leader_file = lock_file
+        logger.info(f"Scheduler leader elected: pid {os.getpid()}")
+        self._plan_all()
+        return True
+
+    def _plan_all(self) -> None:
+        """Schedule every task after its last run, so missed runs fire now."""
+        now = self._clock()
+        conn = self._connect_state()
+        try:
+            last_started = {row["task"]: row["last_started_at"]
+                            for row in conn.execute("SELECT task, last_started_at FROM task_runs")}
+        finally:
+            conn.close()
+        for name, task in self.tasks.items():
+            started = last_started.get(name)
+            after = datetime.fromtimestamp(started, timezone.utc) if started is not None else now
+            self._schedule(name, max(task.next_fire_after(after), now))
+
+    def _schedule(self, name: str, fire_at: datetime) -> None:
+        task = self.tasks[name]
+        self._next_run[name] = fire_at + timedelta(seconds=random.uniform(0, task.jitter_s))
+        conn = self._connect_state()
+        try:
+            conn.execute(
+                """
+                INSERT INTO task_runs (task, next_run_at) VALUES (?, ?)
+                ON CONFLICT(task) DO UPDATE SET next_run_at = excluded.next_run_at
+                """,
+                (name, self._next_run[name].timestamp())
+            )
+        finally:
+            conn.close()
+
+    def _run(self):
         while self.running:
             try:
-                current_time = datetime.now(timezone.utc)
-                
-                # Check if it's 2:00 AM UTC and we have AWS credentials
-                if (current_time.hour == 2 and current_time.minute == 0 and 
-                    self._has_backup_credentials()):
-                    
-                    logger.info("Starting scheduled backup task")
-                    
-                    try:
-                        # Run backup script
-                        backup_script = "/app/scripts/backup_to_s3.sh"
-                        if os.path.exists(backup_script):
-                            result = subprocess.run(
-                                [backup_script], 
-                                capture_output=True, 
-                                text=True,
-                                timeout=300  # 5 minute timeout
-                            )
-                            
-                            if result.returncode == 0:
-                                logger.info("Backup completed successfully")
-                                print("backup_success:1|c")
-                            else:
-                                logger.error(f"Backup failed: {result.stderr}")
-                                print("backup_failed:1|c")
-                        else:
-                            logger.warning("Backup script not found, skipping backup")
-                        
-                        # Sleep for 70 seconds to avoid running multiple times
-                        time.sleep(70)
-                        
-                    except Exception as e:
-                        logger.error(f"Backup task failed: {e}")
-                        print("backup_failed:1|c")
-                        
-                else:
-                    # Sleep for 30 seconds and check again
-                    # Also run upsell queue processor and TSA retry queue every 30s
-                    try:
-                        process_queue_once(current_time)
-                    except Exception as e:
-                        logger.error(f"Upsell queue processing error: {e}")
-                    
-                    try:
-                        tsa_stats = process_retry_queue(lambda: current_time)
-                        if tsa_stats['jobs_processed'] > 0:
-                            logger.info(f"TSA retry queue: {tsa_stats}")
-                    except Exception as e:
-                        logger.error(f"TSA retry queue processing error: {e}")
-                    
-                    time.sleep(30)
-                    
+                if not self.is_leader and not self._try_become_leader():
+                    self._wake.wait(SCHEDULER_LEADER_RETRY_S)
+                    continue
+
+                now = self._clock()
+                due = sorted((fire_at, name) for name, fire_at in self._next_run.items() if fire_at <= now)
+                for _, name in due:
+                    if not self.running:
+                        break
+                    succeeded = self._execute(name)
+                    if succeeded is None:
+                        # Running elsewhere (admin run-now); check again shortly
+                        self._schedule(name, self._clock() + timedelta(seconds=self.tasks[name].retry_base_s))
+                    elif succeeded:
+                        self._failures[name] = 0
+                        self._schedule(name, self.tasks[name].next_fire_after(self._clock()))
+                    else:
+                        failures = self._failures[name] = self._failures.get(name, 0) + 1
+                        backoff = min(self.tasks[name].retry_base_s * 2 ** (failures - 1), SCHEDULER_MAX_BACKOFF_S)
+                        self._schedule(name, self._clock() + timedelta(seconds=backoff))
+
+                if not due:
+                    delay = (min(self._next_run.values()) - self._clock()).total_seconds()
+                    self._wake.wait(max(0.0, delay))
             except Exception as e:
-                logger.error(f"Error in backup scheduler: {e}")
-                time.sleep(60)  # Wait a minute before retrying
-    
-    def _has_backup_credentials(self) -> bool:
-        """Check if AWS backup credentials are available."""
-        return all([
-            os.environ.get("S3_BUCKET"),
-            os.environ.get("AWS_ACCESS_KEY_ID"), 
-            os.environ.get("AWS_SECRET_ACCESS_KEY")
-        ])
+                logger.error(f"Error in scheduler: {e}")
+                self._wake.wait(60)  # Wait a minute before retrying
+
+    def _execute(self, name: str, lock_file: Optional[IO] = None) -> Optional[bool]:
+        """
+        Run one task under its task lock and record the run.
+
+        Returns:
+            True on success, False on failure, None if the task was already running
+        """
+        if lock_file is None:
+            lock_file = _try_lock(self.state_dir / f"{name}.lock")
+            if lock_file is None:
+                return None
+
+        started = self._clock()
+        t0 = time.monotonic()
+        error = None
+        try:
+            self.tasks[name].func(started)
+        except Exception as e:
+            error = str(e) or type(e).__name__
+            logger.error(f"Scheduled task {name} failed: {error}")
+        finally:
+            _unlock(lock_file)
+        duration = time.monotonic() - t0
+
+        print(f"scheduler_{name}_duration_ms:{duration * 1000:.0f}|ms")
+        conn = self._connect_state()
+        try:
+            conn.execute(
+                """
+                INSERT INTO task_runs (task, runs, failures, last_started_at, last_duration_s, last_error)
+                VALUES (?, 1, ?, ?, ?, ?)
+                ON CONFLICT(task) DO UPDATE SET
+                    runs = runs + 1,
+                    failures = failures + excluded.failures,
+                    last_started_at = excluded.last_started_at,
+                    last_duration_s = excluded.last_duration_s,
+                    last_error = excluded.last_error
+                """,
+                (name, 1 if error else 0, started.timestamp(), duration, error)
+            )
+        finally:
+            conn.close()
+        return error is None
+
+    def run_now(self, name: str) -> bool:
+        """
+        Run a task immediately in a background thread, whichever worker is leader.
+
+        Raises:
+            KeyError: If there is no task with this name
+
+        Returns:
+            True if started, False if the task is already running on this host
+        """
+        if name not in self.tasks:
+            raise KeyError(name)
+        lock_file = _try_lock(self.state_dir / f"{name}.lock")
+        if lock_file is None:
+            return False
+        logger.info(f"Scheduled task {name} started on demand")
+        threading.Thread(target=self._execute, args=(name, lock_file),
+                         name=f"scheduler-{name}", daemon=True).start()
+        return True
+
+    def get_status(self) -> Dict[str, Any]:
+        """Host-wide leader pid and per-task run statistics."""
+        leader_path = self.state_dir / "leader.lock"
+        try:
+            leader_pid = int(leader_path.read_text().strip() or 0) or None
+        except (OSError, ValueError):
+            leader_pid = None
+
+        conn = self._connect_state()
+        try:
+            rows = {row["task"]: row for row in conn.execute("SELECT * FROM task_runs")}
+        finally:
+            conn.close()
+
+        def _iso(ts: Optional[float]) -> Optional[str]:
+            return datetime.fromtimestamp(ts, timezone.utc).isoformat() if ts is not None else None
+
+        tasks = {}
+        for name in self.tasks:
+            row = rows.get(name)
+            tasks[name] = {
+                "runs": row["runs"] if row else 0,
+                "failures": row["failures"] if row else 0,
+                "last_started_at": _iso(row["last_started_at"]) if row else None,
+                "last_duration_s": row["last_duration_s"] if row else None,
+                "last_error": row["last_error"] if row else None,
+                "next_run_at": _iso(row["next_run_at"]) if row else None,
+            }
+        return {"leader_pid": leader_pid, "this_pid": os.getpid(), "tasks": tasks}
 
 
 # Global scheduler instance
 _scheduler: Optional[BackgroundScheduler] = None
+_scheduler_lock = threading.Lock()
+
+
+def get_scheduler() -> BackgroundScheduler:
+    """Return this process's scheduler, creating it (not started) on first use."""
+    global _scheduler
+    with _scheduler_lock:
+        if _scheduler is None:
+            _scheduler = BackgroundScheduler()
+        return _scheduler
+
 
 def start_background_tasks():
     """Start background task scheduler."""
-    global _scheduler
-    
-    if _scheduler is None:
-        _scheduler = BackgroundScheduler()
-        _scheduler.start()
-    else:
+    scheduler = get_scheduler()
+    if scheduler.running:
         logger.warning("Background tasks already started")
+        return
+    scheduler.start()
+
 
 def stop_background_tasks():
     """Stop background task scheduler."""
     global _scheduler
-    
-    if _scheduler:
-        _scheduler.stop()
-        _scheduler = None
+
+    with _scheduler_lock:
+        scheduler, _scheduler = _scheduler, None
+    if scheduler:
+        scheduler.stop()
 
 
 if __name__ == "__main__":
     # For testing
     scheduler = BackgroundScheduler()
     scheduler.start()
-    
+
     try:
         # Keep running
         while True:
             time.sleep(60)
     except KeyboardInterrupt:
         scheduler.stop()
-        print("Scheduler stopped")
\ No newline at end of file
+        print("Scheduler stopped")
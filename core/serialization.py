@@ -0,0 +1,133 @@
+"""
+JSON serialization for ProofKit, using orjson when it is installed.
+
+There are two output modes:
+
+- Canonical output is for files that are hashed, signed or bundled, such as
+  specification.json, decision.json, meta.json and the evidence manifest.
+  dumps_canonical() returns exactly the text json.dumps() produced for these
+  files before, byte for byte. orjson writes the candidate and non-ASCII
+  characters are escaped the way ensure_ascii does. The result is used only
+  when it provably matches the stdlib encoding: no float is written in a
+  different style and the output parses back to equal data. Otherwise the
+  stdlib encoder writes the text.
+- Fast output is compact UTF-8 for API responses, where only the parsed value
+  matters. NaN and infinity become null instead of failing the response.
+
+Without orjson, everything falls back to the stdlib json module.
+
+Example usage:
+    from core.serialization import FastJSONResponse, dumps_canonical, loads
+
+    decision_json = dumps_canonical(decision.model_dump(by_alias=True))
+    manifest_json = dumps_canonical(manifest, sort_keys=True)
+    return FastJSONResponse(content=result)
+"""
+
+import json
+import re
+from typing import Any, Callable, Optional, Union
+
+from starlette.responses import JSONResponse
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional speedup
+    orjson = None
+
+# orjson spellings that differ from float.__repr__: exponents ("1e16" vs
+# "1e+16"), small values written out ("0.00001" vs "1e-05") and values of
+# 1e16 and above written out. A match inside a string only costs the fast path.
+_FLOAT_STYLE_RE = re.compile(rb'[0-9](?:[eE]|\.0000|[0-9]{16}\.)')
+# Characters ensure_ascii escapes that orjson writes raw (orjson escapes < 0x20)
+_NON_ASCII_RE = re.compile('[\x7f-\U0010ffff]')
+
+_FAST_OPTIONS = (orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY) if orjson else 0
+
+
+def _escape_non_ascii(match: 're.Match[str]') -> str:
+    """Escape one character as json.dumps(ensure_ascii=True) does."""
+    n = ord(match.group(0))
+    if n < 0x10000:
+        return f'\\u{n:04x}'
+    n -= 0x10000
+    return f'\\u{0xd800 | ((n >> 10) & 0x3ff):04x}\\u{0xdc00 | (n & 0x3ff):04x}'
+
+
+def _orjson_canonical(obj: Any, sort_keys: bool, compact: bool,
+                      default: Optional[Callable[[Any], Any]]) -> Optional[str]:
+    """orjson encoding of obj if it is byte-identical to the stdlib form, else None."""
+    option = 0 if compact else orjson.OPT_INDENT_2
+    if sort_keys:
+        option |= orjson.OPT_SORT_KEYS
+    try:
+        data = orjson.dumps(obj, default=default, option=option)
+    except TypeError:  # Non-str keys, >64-bit ints, unsupported types
+        return None
+    if _FLOAT_STYLE_RE.search(data):
+        return None
+    # Catches NaN/inf (written as null), tuples, enums and anything default() changed
+    if orjson.loads(data) != obj:
+        return None
+    if data.isascii() and b'\x7f' not in data:
+        return data.decode('ascii')
+    return _NON_ASCII_RE.sub(_escape_non_ascii, data.decode('utf-8'))
+
+
+def dumps_canonical(obj: Any, sort_keys: bool = False, compact: bool = False,
+                    default: Optional[Callable[[Any], Any]] = None) -> str:
+    """
+    Serialize to the byte-stable text used for stored and hashed artifacts.
+
+    Args:
+        obj: Value to serialize
+        sort_keys: Sort object keys
+        compact: Use (',', ':') separators instead of two-space indentation
+        default: Called for objects that are not JSON types
+
+    Returns:
+        Exactly json.dumps(obj, indent=2, sort_keys=sort_keys, default=default),
+        or with separators=(',', ':') and no indent when compact
+    """
+    if orjson is not None:
+        text = _orjson_canonical(obj, sort_keys, compact, default)
+        if text is not None:
+            return text
+    if compact:
+        return json.dumps(obj, sort_keys=sort_keys, separators=(',', ':'), default=default)
+    return json.dumps(obj, indent=2, sort_keys=sort_keys, default=default)
+
+
+def dumps_fast(obj: Any, default: Optional[Callable[[Any], Any]] = None) -> bytes:
+    """
+    Serialize to compact UTF-8 JSON for responses and caches.
+
+    Args:
+        obj: Value to serialize
+        default: Called for objects that are not JSON types
+
+    Returns:
+        Encoded JSON bytes
+    """
+    if orjson is not None:
+        return orjson.dumps(obj, default=default, option=_FAST_OPTIONS)
+    return json.dumps(obj, ensure_ascii=False, separators=(',', ':'), default=default).encode('utf-8')
+
+
+def loads(data: Union[str, bytes, bytearray, memoryview]) -> Any:
+    """Parse JSON text or bytes, including the NaN/Infinity tokens json.dumps writes."""
+    if orjson is not None:
+        try:
+            return orjson.loads(data)
+        except orjson.JSONDecodeError:
+            pass  # Let the stdlib parse NaN/Infinity or raise its own error
+    if isinstance(data, memoryview):
+        data = bytes(data)
+    return json.loads(data)
+
+
+class FastJSONResponse(JSONResponse):
+    """JSONResponse rendered with dumps_fast()."""
+
+    def render(self, content: Any) -> bytes:
+        return dumps_fast(content)
@@ -12,15 +12,24 @@ Example usage:
     from core.models import SpecV1
     
     comparator = ShadowComparator()
-    result = comparator.run_shadow_comparison(normalized_df, spec)
+    
+    # Start the independent calculator, run the engine meanwhile, then compare
+    independent_future = comparator.submit_independent(normalized_df, spec)
+    decision = make_decision(normalized_df, spec)
+    result = comparator.run_shadow_comparison(
+        normalized_df, spec, engine_result=decision, independent_future=independent_future
+    )
     
     if result.status == 'INDETERMINATE':
         print(f"Tolerance violation: {result.reason}")
 """
 
 import logging
+import os
+import threading
 import numpy as np
 import pandas as pd
+from concurrent.futures import Future, ThreadPoolExecutor
 from typing import Dict, Any, Optional, List, Tuple, Union
 from datetime import datetime
 from enum import Enum
@@ -29,19 +38,34 @@ from core.models import SpecV1, DecisionResult
 from core.decide import make_decision
 from core.temperature_utils import detect_temperature_columns
 
-# Independent calculator imports
+# Independent calculator imports (array-native variants on int64 epoch-ns)
+from validation.independent.arrays import to_epoch_ns
 from validation.independent.powder_hold import (
-    calculate_hold_time, 
-    calculate_ramp_rate as powder_ramp_rate,
-    calculate_time_to_threshold
+    calculate_hold_time_ns,
+    calculate_ramp_rate_ns as powder_ramp_rate,
+    calculate_time_to_threshold_ns
 )
-from validation.independent.haccp_cooling import validate_cooling_phases
-from validation.independent.coldchain_daily import calculate_daily_compliance
-from validation.independent.autoclave_fo import calculate_fo_value, calculate_fo_metrics
-from validation.independent.concrete_window import validate_concrete_curing
+from validation.independent.haccp_cooling import validate_cooling_phases_ns
+from validation.independent.coldchain_daily import calculate_daily_compliance_ns
+from validation.independent.autoclave_fo import calculate_fo_metrics_ns
+from validation.independent.concrete_window import validate_concrete_curing_ns
 
 logger = logging.getLogger(__name__)
 
+# Shared pool for independent calculators run alongside the main engine
+SHADOW_WORKERS = int(os.environ.get('SHADOW_WORKERS', '2'))
+_executor: Optional[ThreadPoolExecutor] = None
+_executor_lock = threading.Lock()
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    """Return the process-wide shadow worker pool, creating it on first use."""
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=SHADOW_WORKERS, thread_name_prefix="shadow")
+        return _executor
+
 
 class ShadowStatus(Enum):
     """Shadow comparison status codes."""
@@ -122,15 +146,49 @@ class ShadowComparator:
         """
         self.default_tolerance = default_tolerance
     
+    def submit_independent(self, 
+                           normalized_df: pd.DataFrame, 
+                           spec: SpecV1) -> Future:
+        """
+        Start the independent calculator in the shadow worker pool.
+        
+        The input arrays are copied on the calling thread, so the main engine
+        can run on the same frame while the independent calculation proceeds.
+        
+        Args:
+            normalized_df: Normalized temperature data
+            spec: Process specification
+            
+        Returns:
+            Future resolving to the independent result (None if not supported)
+        """
+        industry = spec.industry.lower() if spec.industry else "powder"
+        arrays = self._extract_arrays(normalized_df)
+        if arrays is None:
+            future: Future = Future()
+            future.set_result(None)
+            return future
+        
+        timestamps, temperatures = arrays
+        return _get_executor().submit(
+            self._calculate_independent, timestamps, temperatures, spec, industry
+        )
+    
     def run_shadow_comparison(self, 
                             normalized_df: pd.DataFrame, 
-                            spec: SpecV1) -> ShadowResult:
+                            spec: SpecV1,
+                            engine_result: Optional[DecisionResult] = None,
+                            independent_future: Optional[Future] = None) -> ShadowResult:
         """
         Run complete shadow comparison: engine vs independent calculator.
         
         Args:
             normalized_df: Normalized temperature data
             spec: Process specification
+            engine_result: Decision already computed by the caller (the engine
+                is only run here if omitted)
+            independent_future: Result of submit_independent() started before
+                the engine ran (computed inline if omitted)
             
         Returns:
             ShadowResult with comparison outcome
@@ -140,13 +198,17 @@ class ShadowComparator:
         logger.info(f"Starting shadow comparison for {industry} industry")
         
         try:
-            # Run main engine
-            logger.debug("Running main engine calculation...")
-            engine_result = make_decision(normalized_df, spec)
+            # Run main engine unless the caller already has its decision
+            if engine_result is None:
+                logger.debug("Running main engine calculation...")
+                engine_result = make_decision(normalized_df, spec)
             
-            # Run independent calculator
+            # Collect (or run) the independent calculator
             logger.debug("Running independent calculation...")
-            independent_result = self._run_independent_calculator(normalized_df, spec, industry)
+            if independent_future is not None:
+                independent_result = independent_future.result()
+            else:
+                independent_result = self._run_independent_calculator(normalized_df, spec, industry)
             
             if independent_result is None:
                 return ShadowResult(
@@ -183,6 +245,12 @@ class ShadowComparator:
                 
         except Exception as e:
             logger.error(f"Shadow comparison failed: {e}")
+            if engine_result is not None:
+                return ShadowResult(
+                    status=ShadowStatus.INDEPENDENT_ERROR,
+                    engine_result=engine_result,
+                    reason=f"Independent calculator error: {str(e)}"
+                )
             try:
                 # Try to still get engine result
                 engine_result = make_decision(normalized_df, spec)
@@ -197,6 +265,20 @@ class ShadowComparator:
                     reason=f"Engine error: {str(engine_e)}, Independent error: {str(e)}"
                 )
     
+    def _extract_arrays(self, 
+                        normalized_df: pd.DataFrame) -> Optional[Tuple[np.ndarray, np.ndarray]]:
+        """Copy int64 epoch-ns timestamps and the first temperature column out of the frame."""
+        temp_columns = detect_temperature_columns(normalized_df)
+        
+        if not temp_columns:
+            logger.warning("No temperature columns found for independent calculation")
+            return None
+        
+        # Use first temperature column for independent calculation
+        timestamps_ns = to_epoch_ns(normalized_df['timestamp'])
+        temperatures = normalized_df[temp_columns[0]].to_numpy(dtype=np.float64, copy=True)
+        return timestamps_ns, temperatures
+    
     def _run_independent_calculator(self, 
                                   normalized_df: pd.DataFrame, 
                                   spec: SpecV1, 
@@ -212,17 +294,19 @@ class ShadowComparator:
         Returns:
             Independent calculation results or None if not supported
         """
-        # Extract common data
-        timestamps = normalized_df['timestamp'].values
-        temp_columns = detect_temperature_columns(normalized_df)
-        
-        if not temp_columns:
-            logger.warning("No temperature columns found for independent calculation")
+        arrays = self._extract_arrays(normalized_df)
+        if arrays is None:
             return None
         
-        # Use first temperature column for independent calculation
-        temperatures = normalized_df[temp_columns[0]].values
-        
+        timestamps, temperatures = arrays
+        return self._calculate_independent(timestamps, temperatures, spec, industry)
+    
+    def _calculate_independent(self, 
+                               timestamps: np.ndarray, 
+                               temperatures: np.ndarray, 
+                               spec: SpecV1, 
+                               industry: str) -> Optional[Dict[str, Any]]:
+        """Dispatch to the industry's independent calculator."""
         try:
             if industry in ['powder', 'powder-coating']:
                 return self._calculate_powder_independent(timestamps, temperatures, spec)
@@ -250,12 +334,12 @@ class ShadowComparator:
         threshold = spec.spec.target_temp_C + spec.spec.sensor_uncertainty_C
         
         # Calculate independent metrics
-        hold_time = calculate_hold_time(
+        hold_time = calculate_hold_time_ns(
             timestamps, temperatures, threshold, 
             hysteresis=2.0, continuous_only=True
         )
         ramp_rate = powder_ramp_rate(timestamps, temperatures)
-        time_to_threshold = calculate_time_to_threshold(timestamps, temperatures, threshold)
+        time_to_threshold = calculate_time_to_threshold_ns(timestamps, temperatures, threshold)
         
         return {
             'industry': 'powder',
@@ -271,7 +355,7 @@ class ShadowComparator:
                                    temperatures: np.ndarray, 
                                    spec: SpecV1) -> Dict[str, Any]:
         """Calculate HACCP cooling metrics using independent calculator."""
-        phases = validate_cooling_phases(timestamps, temperatures)
+        phases = validate_cooling_phases_ns(timestamps, temperatures)
         return {
             'industry': 'haccp',
             'phase1_actual_time_s': phases.get('phase1_actual_time_s'),
@@ -290,7 +374,7 @@ class ShadowComparator:
                                        spec: SpecV1) -> Dict[str, Any]:
         """Calculate cold chain metrics using independent calculator."""
         # Default cold chain parameters (2-8°C range)
-        daily_compliance = calculate_daily_compliance(timestamps, temperatures, 2.0, 8.0)
+        daily_compliance = calculate_daily_compliance_ns(timestamps, temperatures, 2.0, 8.0)
         
         return {
             'industry': 'coldchain',
@@ -306,7 +390,7 @@ class ShadowComparator:
                                        temperatures: np.ndarray, 
                                        spec: SpecV1) -> Dict[str, Any]:
         """Calculate autoclave metrics using independent calculator."""
-        fo_metrics = calculate_fo_metrics(timestamps, temperatures, 121.0, 10.0)
+        fo_metrics = calculate_fo_metrics_ns(timestamps, temperatures, 121.0, 10.0)
         
         return {
             'industry': 'autoclave',
@@ -326,7 +410,7 @@ class ShadowComparator:
         min_temp = getattr(spec.spec, 'min_temp_C', 10.0)
         max_temp = getattr(spec.spec, 'max_temp_C', 35.0)
         
-        curing_result = validate_concrete_curing(
+        curing_result = validate_concrete_curing_ns(
             timestamps, temperatures, 
             min_temp_C=min_temp, max_temp_C=max_temp,
             window_hours=24.0, min_compliance_pct=95.0
@@ -0,0 +1,153 @@
+"""
+Industry preset and default specification registry for ProofKit.
+
+The presets page, the /app upload form and the /api/presets endpoints all
+show the same handful of specification files from core/spec_library and
+examples/. The registry parses them once per process and also keeps each
+one's pretty-printed JSON, which the upload form embeds. A file is reloaded
+when its mtime or size changes. The files are stat'ed at most every
+SPEC_REGISTRY_CHECK_S seconds, so edits show up without a restart.
+
+Returned presets are shared between requests and must be treated as
+read-only.
+
+Example usage:
+    from core.spec_registry import get_spec_registry
+
+    registry = get_spec_registry()
+    presets = registry.presets()
+    form_json = registry.preset_json("haccp") or registry.default_spec_json()
+"""
+
+import json
+import logging
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+
+# Minimum seconds between file modification checks (0 checks on every access)
+SPEC_REGISTRY_CHECK_S = float(os.environ.get('SPEC_REGISTRY_CHECK_S', '2'))
+
+# Industry -> preset file, relative to the repository root
+PRESET_FILES: Dict[str, str] = {
+    "powder": "examples/powder_coat_cure_spec_standard_180c_10min.json",
+    "powder-coating": "examples/powder_coat_cure_spec_standard_180c_10min.json",  # Same as powder
+    "haccp": "core/spec_library/haccp_v1.json",
+    "autoclave": "core/spec_library/autoclave_v1.json",
+    "sterile": "core/spec_library/sterile_v1.json",
+    "eto": "core/spec_library/sterile_v1.json",  # ETO uses same preset as sterile
+    "concrete": "core/spec_library/concrete_v1.json",
+    "coldchain": "core/spec_library/coldchain_v1.json",
+}
+DEFAULT_SPEC_FILE = "examples/spec_example.json"
+
+# Presets that predate the v2 industry field get it filled in
+IMPLIED_INDUSTRY = {"powder": "powder", "powder-coating": "powder"}
+
+
+class SpecRegistry:
+    """Parsed presets and default spec, reloaded when their files change."""
+
+    def __init__(self, base_dir: Path = BASE_DIR,
+                 preset_files: Optional[Dict[str, str]] = None,
+                 default_spec_file: str = DEFAULT_SPEC_FILE,
+                 check_interval_s: float = SPEC_REGISTRY_CHECK_S):
+        self.base_dir = Path(base_dir)
+        self.preset_files = dict(PRESET_FILES if preset_files is None else preset_files)
+        self.default_spec_file = default_spec_file
+        self.check_interval_s = check_interval_s
+        self._lock = threading.Lock()
+        self._last_check = float('-inf')
+        # path -> (file version, parsed data) for every file seen so far
+        self._files: Dict[str, Tuple[Optional[Tuple[int, int]], Optional[Dict[str, Any]]]] = {}
+        self._presets: Dict[str, Dict[str, Any]] = {}
+        self._preset_json: Dict[str, str] = {}
+        self._default_json: Optional[str] = None
+
+    def _load_file(self, rel_path: str) -> Tuple[Optional[Dict[str, Any]], bool]:
+        """Return (parsed data or None, changed since the last check)."""
+        path = self.base_dir / rel_path
+        try:
+            stat_result = path.stat()
+            version = (stat_result.st_mtime_ns, stat_result.st_size)
+        except OSError:
+            version = None
+
+        cached = self._files.get(rel_path)
+        if cached is not None and cached[0] == version:
+            return cached[1], False
+
+        data = None
+        if version is None:
+            logger.warning(f"Preset file not found: {path}")
+        else:
+            try:
+                with open(path, 'r') as f:
+                    data = json.load(f)
+            except (OSError, ValueError) as e:
+                logger.error(f"Failed to load spec file {path}: {e}")
+        self._files[rel_path] = (version, data)
+        return data, True
+
+    def _refresh(self) -> None:
+        """Reload changed files if the check interval has elapsed."""
+        now = time.monotonic()
+        if now - self._last_check < self.check_interval_s:
+            return
+        with self._lock:
+            if now - self._last_check < self.check_interval_s:
+                return
+            changed = False
+            loaded = {}
+            for rel_path in set(self.preset_files.values()) | {self.default_spec_file}:
+                loaded[rel_path], file_changed = self._load_file(rel_path)
+                changed = changed or file_changed
+
+            if changed:
+                presets = {}
+                for industry, rel_path in self.preset_files.items():
+                    data = loaded[rel_path]
+                    if data is None:
+                        continue
+                    if industry in IMPLIED_INDUSTRY and "industry" not in data:
+                        data = {**data, "industry": IMPLIED_INDUSTRY[industry]}
+                    presets[industry] = data
+                default = loaded[self.default_spec_file]
+                self._presets = presets
+                self._preset_json = {k: json.dumps(v, indent=2) for k, v in presets.items()}
+                self._default_json = json.dumps(default, indent=2) if default is not None else None
+            self._last_check = now
+
+    def presets(self) -> Dict[str, Dict[str, Any]]:
+        """Return all presets by industry (a new mapping of shared, read-only specs)."""
+        self._refresh()
+        return dict(self._presets)
+
+    def preset_json(self, industry: str) -> Optional[str]:
+        """Return a preset as indented JSON, or None if there is no such preset."""
+        self._refresh()
+        return self._preset_json.get(industry)
+
+    def default_spec_json(self) -> Optional[str]:
+        """Return the default specification as indented JSON, or None if unreadable."""
+        self._refresh()
+        return self._default_json
+
+
+_registry: Optional[SpecRegistry] = None
+_registry_lock = threading.Lock()
+
+
+def get_spec_registry() -> SpecRegistry:
+    """Return the process-wide spec registry, creating it on first use."""
+    global _registry
+    with _registry_lock:
+        if _registry is None:
+            _registry = SpecRegistry()
+        return _registry
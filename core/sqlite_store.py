@@ -0,0 +1,63 @@
+"""
+Embedded SQLite helpers for host-local durable state.
+
+Provides connections configured for safe concurrent use by several gunicorn
+workers on the same host (WAL journal, busy timeout) and an IMMEDIATE
+transaction helper for read-modify-write sequences such as queue leasing.
+
+Example usage:
+    from core.sqlite_store import connect, immediate_transaction
+
+    conn = connect(Path("storage/queue.db"))
+    with immediate_transaction(conn):
+        rows = conn.execute("SELECT ...").fetchall()
+        conn.execute("UPDATE ...")
+"""
+
+import sqlite3
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Iterator, Union
+
+DEFAULT_BUSY_TIMEOUT_SECONDS = 30.0
+
+
+def connect(db_path: Union[str, Path], timeout: float = DEFAULT_BUSY_TIMEOUT_SECONDS) -> sqlite3.Connection:
+    """
+    Open an autocommit SQLite connection tuned for multi-process access.
+
+    Args:
+        db_path: Database file path (parent directory is created if missing)
+        timeout: Seconds to wait on a locked database before failing
+
+    Returns:
+        sqlite3.Connection with sqlite3.Row rows; use immediate_transaction()
+        for multi-statement atomic updates
+    """
+    db_path = Path(db_path)
+    db_path.parent.mkdir(parents=True, exist_ok=True)
+
+    conn = sqlite3.connect(str(db_path), timeout=timeout, isolation_level=None,
+                           check_same_thread=False)
+    conn.row_factory = sqlite3.Row
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.execute(f"PRAGMA busy_timeout={int(timeout * 1000)}")
+    return conn
+
+
+@contextmanager
+def immediate_transaction(conn: sqlite3.Connection) -> Iterator[sqlite3.Connection]:
+    """
+    Run a block inside BEGIN IMMEDIATE ... COMMIT.
+
+    The write lock is taken up front, so concurrent processes serialize on the
+    whole read-modify-write block instead of failing at upgrade time.
+    """
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        yield conn
+    except BaseException:
+        conn.execute("ROLLBACK")
+        raise
+    conn.execute("COMMIT")
@@ -3,6 +3,13 @@ TSA (Time Stamp Authority) resilient implementation for ProofKit.
 
 Provides non-blocking timestamp generation with retry queuing for RFC 3161 TSA services.
 When TSA is unreachable, certificates are marked "Timestamp pending" and retry jobs are queued.
+TSA requests go through the shared pooled client in core.tsa_client. With TSA_ASYNC=true
+(or defer=True) the PDF is returned immediately and the token is obtained by the retry
+queue, which attaches it next to the PDF as a detached <pdf>.tst token file.
+
+Retry jobs live in a SQLite table indexed by next_attempt_at with exponential
+backoff; workers lease due jobs in batches so each job is processed by exactly one
+gunicorn worker and jobs that are still backing off are never read.
 
 Example usage:
     from core.timestamp import get_timestamp_with_retry, process_retry_queue
@@ -18,37 +25,47 @@ import hashlib
 import json
 import os
 import time
+import uuid
 import logging
 from datetime import datetime, timezone, timedelta
 from pathlib import Path
 from typing import Optional, Dict, Any, List, Callable
-from dataclasses import dataclass, asdict
+from dataclasses import dataclass
 from threading import Lock
 
+from core.sqlite_store import connect, immediate_transaction
+
 # TSA compliance imports
 try:
     from cryptography.hazmat.primitives import hashes
-    import rfc3161ng
-    TSA_AVAILABLE = True
+    from core.tsa_client import TSA_CLIENT_AVAILABLE, DEFAULT_TSA_URLS, get_tsa_client
+    TSA_AVAILABLE = TSA_CLIENT_AVAILABLE
 except ImportError:
     TSA_AVAILABLE = False
+    DEFAULT_TSA_URLS = []
 
 logger = logging.getLogger(__name__)
 
-# RFC 3161 TSA URLs (using public TSAs)
-RFC3161_TSA_URLS = [
-    'http://timestamp.apple.com/ts01',
-    'http://time.certum.pl',
-    'http://timestamp.digicert.com'
-]
+# RFC 3161 TSA URLs (using public TSAs); override with TSA_URLS
+RFC3161_TSA_URLS = DEFAULT_TSA_URLS
+
+# Return PDFs immediately and attach the token from the retry queue
+TSA_ASYNC_DEFAULT = False
+
+# Suffix of the detached token written next to a PDF by the retry queue
+TIMESTAMP_TOKEN_SUFFIX = '.tst'
 
 # Retry queue configuration
 RETRY_QUEUE_DIR = Path("/tmp/tsa_retry_queue")
+RETRY_QUEUE_DB_NAME = "retry_queue.db"
 MAX_RETRY_ATTEMPTS = 3
-RETRY_DELAY_SECONDS = 300  # 5 minutes
+RETRY_DELAY_SECONDS = 300  # 5 minutes, doubled after each failed attempt
+RETRY_MAX_DELAY_SECONDS = 3600
 RETRY_MAX_AGE_HOURS = 24
+RETRY_BATCH_SIZE = 50
+RETRY_LEASE_SECONDS = 600  # Reclaim jobs leased by a worker that died mid-batch
 
-# Thread-safe lock for queue operations
+# Thread-safe lock for in-process queue writes (cross-process safety comes from SQLite)
 _queue_lock = Lock()
 
 
@@ -82,11 +99,6 @@ class TimestampResult:
             self.errors = []
 
 
-def _ensure_retry_queue_dir():
-    """Ensure retry queue directory exists."""
-    RETRY_QUEUE_DIR.mkdir(parents=True, exist_ok=True)
-
-
 def _generate_rfc3161_timestamp(pdf_content: bytes) -> Optional[bytes]:
     """
     Generate RFC 3161 timestamp for PDF content.
@@ -106,33 +118,24 @@ def _generate_rfc3161_timestamp(pdf_content: bytes) -> Optional[bytes]:
         digest.update(pdf_content)
         data_hash = digest.finalize()
         
-        # Try each TSA URL with timeout
-        for tsa_url in RFC3161_TSA_URLS:
-            try:
-                logger.debug(f"Attempting TSA request to {tsa_url}")
-                rt = rfc3161ng.RemoteTimestamper(tsa_url, hashname='sha256', timeout=10)
-                
-                timestamp = rt.timestamp(data=data_hash)
-                if timestamp:
-                    logger.info(f"Successfully obtained timestamp from {tsa_url}")
-                    return timestamp
-                    
-            except Exception as e:
-                logger.warning(f"TSA {tsa_url} failed: {e}")
-                continue
-        
-        logger.warning("All TSA URLs failed")
-        return None
+        # Hedged request over the shared pooled client
+        return get_tsa_client().timestamp(data_hash)
         
     except Exception as e:
         logger.error(f"RFC 3161 timestamp generation failed: {e}")
         return None
 
 
+def is_tsa_async_enabled() -> bool:
+    """Check whether timestamps should be deferred to the retry queue (TSA_ASYNC)."""
+    return os.environ.get('TSA_ASYNC', str(TSA_ASYNC_DEFAULT)).lower() == 'true'
+
+
 def get_timestamp_with_retry(pdf_content: bytes, 
                            job_id: str,
                            pdf_path: Optional[str] = None,
-                           now_provider: Optional[Callable[[], datetime]] = None) -> TimestampResult:
+                           now_provider: Optional[Callable[[], datetime]] = None,
+                           defer: Optional[bool] = None) -> TimestampResult:
     """
     Get RFC 3161 timestamp with resilient retry fallback.
     
@@ -141,14 +144,20 @@ def get_timestamp_with_retry(pdf_content: bytes,
         job_id: Job identifier for retry tracking
         pdf_path: Optional path to PDF file (for retry jobs)
         now_provider: Optional function to provide current datetime (for testing)
+        defer: Skip the synchronous TSA request and queue it instead
+            (defaults to TSA_ASYNC; only applies when pdf_path is provided)
         
     Returns:
         TimestampResult with success status and optional timestamp
     """
     timestamp_now = now_provider() if now_provider else datetime.now(timezone.utc)
     
-    # First attempt to get timestamp
-    timestamp_token = _generate_rfc3161_timestamp(pdf_content)
+    if defer is None:
+        defer = is_tsa_async_enabled()
+    deferred = bool(defer and pdf_path)
+    
+    # First attempt to get timestamp (unless deferred to the retry queue)
+    timestamp_token = None if deferred else _generate_rfc3161_timestamp(pdf_content)
     
     if timestamp_token:
         # Success case - return timestamp info
@@ -175,7 +184,10 @@ def get_timestamp_with_retry(pdf_content: bytes,
                 created_at=timestamp_now
             )
             _queue_retry_job(retry_job)
-            logger.info(f"TSA failed, queued retry job for {job_id}")
+            if deferred:
+                logger.info(f"TSA deferred, queued timestamp job for {job_id}")
+            else:
+                logger.info(f"TSA failed, queued retry job for {job_id}")
         except Exception as e:
             logger.error(f"Failed to queue retry job for {job_id}: {e}")
     
@@ -188,6 +200,14 @@ def get_timestamp_with_retry(pdf_content: bytes,
         'retry_queued': pdf_path is not None
     }
     
+    if deferred:
+        timestamp_info['deferred'] = True
+        return TimestampResult(
+            success=False,
+            pending=True,
+            timestamp_info=timestamp_info
+        )
+    
     return TimestampResult(
         success=False,
         pending=True,
@@ -196,6 +216,111 @@ def get_timestamp_with_retry(pdf_content: bytes,
     )
 
 
+def _queue_db_path() -> Path:
+    """Path of the SQLite retry queue inside RETRY_QUEUE_DIR."""
+    return RETRY_QUEUE_DIR / RETRY_QUEUE_DB_NAME
+
+
+def _connect_queue():
+    """
+    Open the retry queue database, creating the schema on first use.
+    
+    Legacy one-file-per-job JSON entries left in RETRY_QUEUE_DIR by earlier
+    releases are imported once into the table and removed.
+    """
+    conn = connect(_queue_db_path())
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS tsa_retry_jobs (
+            job_id TEXT PRIMARY KEY,
+            pdf_path TEXT NOT NULL,
+            pdf_hash TEXT NOT NULL,
+            created_at REAL NOT NULL,
+            attempts INTEGER NOT NULL DEFAULT 0,
+            last_attempt_at REAL,
+            next_attempt_at REAL NOT NULL,
+            tsa_errors TEXT NOT NULL DEFAULT '[]',
+            lease_owner TEXT,
+            lease_expires_at REAL
+        )
+    """)
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_tsa_retry_next ON tsa_retry_jobs (next_attempt_at)")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_tsa_retry_created ON tsa_retry_jobs (created_at)")
+    
+    if any(RETRY_QUEUE_DIR.glob("*.json")):
+        _import_legacy_queue(conn)
+    
+    return conn
+
+
+def _import_legacy_queue(conn) -> None:
+    """Move legacy JSON retry jobs into the table; jobs already queued are left as is."""
+    with immediate_transaction(conn):
+        imported = 0
+        # Re-listed under the write lock: another worker may have imported them first
+        for job_file in RETRY_QUEUE_DIR.glob("*.json"):
+            retry_job = _load_retry_job(job_file)
+            if retry_job and conn.execute(
+                "SELECT 1 FROM tsa_retry_jobs WHERE job_id = ?", (retry_job.job_id,)
+            ).fetchone() is None:
+                _upsert_retry_job(conn, retry_job)
+                imported += 1
+            _remove_retry_job(job_file)
+        logger.info(f"Imported {imported} legacy TSA retry jobs")
+
+
+def _retry_backoff_seconds(attempts: int) -> float:
+    """Exponential backoff after the given number of failed retry attempts."""
+    if attempts <= 0:
+        return 0.0
+    return min(RETRY_DELAY_SECONDS * (2 ** (attempts - 1)), RETRY_MAX_DELAY_SECONDS)
+
+
+def _upsert_retry_job(conn, retry_job: TimestampRetryJob):
+    """Insert or replace a retry job row, scheduling its next attempt."""
+    if retry_job.last_attempt_at:
+        last_attempt = retry_job.last_attempt_at.timestamp()
+        next_attempt = last_attempt + _retry_backoff_seconds(retry_job.attempts)
+    else:
+        last_attempt = None
+        next_attempt = retry_job.created_at.timestamp()
+    
+    conn.execute(
+        """
+        INSERT INTO tsa_retry_jobs
+            (job_id, pdf_path, pdf_hash, created_at, attempts, last_attempt_at,
+             next_attempt_at, tsa_errors, lease_owner, lease_expires_at)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, NULL, NULL)
+        ON CONFLICT(job_id) DO UPDATE SET
+            pdf_path = excluded.pdf_path,
+            pdf_hash = excluded.pdf_hash,
+            created_at = excluded.created_at,
+            attempts = excluded.attempts,
+            last_attempt_at = excluded.last_attempt_at,
+            next_attempt_at = excluded.next_attempt_at,
+            tsa_errors = excluded.tsa_errors,
+            lease_owner = NULL,
+            lease_expires_at = NULL
+        """,
+        (retry_job.job_id, retry_job.pdf_path, retry_job.pdf_hash,
+         retry_job.created_at.timestamp(), retry_job.attempts, last_attempt,
+         next_attempt, json.dumps(retry_job.tsa_errors))
+    )
+
+
+def _row_to_retry_job(row) -> TimestampRetryJob:
+    """Convert a tsa_retry_jobs row to a TimestampRetryJob."""
+    return TimestampRetryJob(
+        job_id=row['job_id'],
+        pdf_path=row['pdf_path'],
+        pdf_hash=row['pdf_hash'],
+        created_at=datetime.fromtimestamp(row['created_at'], timezone.utc),
+        attempts=row['attempts'],
+        last_attempt_at=(datetime.fromtimestamp(row['last_attempt_at'], timezone.utc)
+                         if row['last_attempt_at'] is not None else None),
+        tsa_errors=json.loads(row['tsa_errors'])
+    )
+
+
 def _queue_retry_job(retry_job: TimestampRetryJob):
     """
     Add retry job to queue.
@@ -204,25 +329,44 @@ def _queue_retry_job(retry_job: TimestampRetryJob):
         retry_job: Job to queue for retry
     """
     with _queue_lock:
-        _ensure_retry_queue_dir()
-        
-        job_file = RETRY_QUEUE_DIR / f"{retry_job.job_id}.json"
-        
-        # Convert datetime objects to ISO strings for JSON serialization
-        job_data = asdict(retry_job)
-        job_data['created_at'] = retry_job.created_at.isoformat()
-        if retry_job.last_attempt_at:
-            job_data['last_attempt_at'] = retry_job.last_attempt_at.isoformat()
-        
-        with open(job_file, 'w') as f:
-            json.dump(job_data, f, indent=2)
+        conn = _connect_queue()
+        try:
+            _upsert_retry_job(conn, retry_job)
+        finally:
+            conn.close()
         
-        logger.debug(f"Queued retry job: {job_file}")
+        logger.debug(f"Queued retry job: {retry_job.job_id}")
+
+
+def _lease_due_jobs(conn, now_ts: float, lease_owner: str, limit: int) -> List[TimestampRetryJob]:
+    """
+    Atomically claim up to limit due, unleased jobs for lease_owner.
+    
+    The claim runs under BEGIN IMMEDIATE so two workers can never lease the same
+    job; a lease that is not completed (worker crash) becomes claimable again
+    after RETRY_LEASE_SECONDS.
+    """
+    with immediate_transaction(conn):
+        rows = conn.execute(
+            """
+            SELECT * FROM tsa_retry_jobs
+            WHERE next_attempt_at <= ?
+              AND (lease_expires_at IS NULL OR lease_expires_at <= ?)
+            ORDER BY next_attempt_at
+            LIMIT ?
+            """,
+            (now_ts, now_ts, limit)
+        ).fetchall()
+        conn.executemany(
+            "UPDATE tsa_retry_jobs SET lease_owner = ?, lease_expires_at = ? WHERE job_id = ?",
+            [(lease_owner, now_ts + RETRY_LEASE_SECONDS, row['job_id']) for row in rows]
+        )
+    return [_row_to_retry_job(row) for row in rows]
 
 
 def _load_retry_job(job_file: Path) -> Optional[TimestampRetryJob]:
     """
-    Load retry job from file.
+    Load legacy retry job from file.
     
     Args:
         job_file: Path to job file
@@ -247,7 +391,7 @@ def _load_retry_job(job_file: Path) -> Optional[TimestampRetryJob]:
 
 
 def _remove_retry_job(job_file: Path):
-    """Remove retry job file."""
+    """Remove legacy retry job file."""
     try:
         job_file.unlink()
         logger.debug(f"Removed retry job: {job_file}")
@@ -255,17 +399,26 @@ def _remove_retry_job(job_file: Path):
         logger.warning(f"Failed to remove retry job {job_file}: {e}")
 
 
-def process_retry_queue(now_provider: Optional[Callable[[], datetime]] = None) -> Dict[str, int]:
+def process_retry_queue(now_provider: Optional[Callable[[], datetime]] = None,
+                        batch_size: int = RETRY_BATCH_SIZE) -> Dict[str, int]:
     """
     Process TSA retry queue - called by scheduler.
     
+    Only due jobs are read: expired jobs are dropped with one indexed DELETE and
+    due jobs are leased in batches ordered by next_attempt_at, so jobs that are
+    still backing off are never touched. Safe to run concurrently from several
+    workers; each job is leased by exactly one of them.
+    
     Args:
         now_provider: Optional function to provide current datetime (for testing)
+        batch_size: Maximum number of jobs leased per batch
         
     Returns:
         Dictionary with processing statistics
     """
     current_time = now_provider() if now_provider else datetime.now(timezone.utc)
+    now_ts = current_time.timestamp()
+    lease_owner = f"{os.getpid()}:{uuid.uuid4().hex[:8]}"
     
     stats = {
         'jobs_processed': 0,
@@ -275,54 +428,57 @@ def process_retry_queue(now_provider: Optional[Callable[[], datetime]] = None) -
         'jobs_deferred': 0
     }
     
-    if not RETRY_QUEUE_DIR.exists():
+    if not _queue_db_path().exists() and not any(RETRY_QUEUE_DIR.glob("*.json")):
         return stats
     
-    with _queue_lock:
-        # Process all job files
-        for job_file in RETRY_QUEUE_DIR.glob("*.json"):
-            retry_job = _load_retry_job(job_file)
-            if not retry_job:
-                _remove_retry_job(job_file)
-                continue
-            
-            stats['jobs_processed'] += 1
-            
-            # Check if job has expired
-            age = current_time - retry_job.created_at
-            if age > timedelta(hours=RETRY_MAX_AGE_HOURS):
-                logger.warning(f"Retry job {retry_job.job_id} expired after {age}")
-                _remove_retry_job(job_file)
-                stats['jobs_expired'] += 1
-                continue
+    conn = _connect_queue()
+    try:
+        # Drop expired jobs without loading them
+        expiry_cutoff = now_ts - timedelta(hours=RETRY_MAX_AGE_HOURS).total_seconds()
+        expired = conn.execute(
+            "DELETE FROM tsa_retry_jobs WHERE created_at < ?", (expiry_cutoff,)
+        ).rowcount
+        if expired:
+            logger.warning(f"Dropped {expired} expired TSA retry jobs")
+        stats['jobs_processed'] += expired
+        stats['jobs_expired'] += expired
+        
+        seen = set()
+        while True:
+            batch = [job for job in _lease_due_jobs(conn, now_ts, lease_owner, batch_size)
+                     if job.job_id not in seen]
+            if not batch:
+                break
             
-            # Check if we should retry (wait between attempts)
-            if retry_job.last_attempt_at:
-                time_since_last = current_time - retry_job.last_attempt_at
-                if time_since_last < timedelta(seconds=RETRY_DELAY_SECONDS):
-                    stats['jobs_deferred'] += 1
+            for retry_job in batch:
+                seen.add(retry_job.job_id)
+                stats['jobs_processed'] += 1
+                
+                # Check max attempts
+                if retry_job.attempts >= MAX_RETRY_ATTEMPTS:
+                    logger.warning(f"Retry job {retry_job.job_id} max attempts reached")
+                    _complete_leased_job(conn, retry_job.job_id, lease_owner)
+                    stats['jobs_failed'] += 1
                     continue
+                
+                # Attempt to process the job
+                success = _process_retry_job(retry_job, current_time)
+                
+                if success:
+                    logger.info(f"Retry job {retry_job.job_id} succeeded")
+                    _complete_leased_job(conn, retry_job.job_id, lease_owner)
+                    stats['jobs_succeeded'] += 1
+                else:
+                    # Record failed attempt and back off exponentially
+                    retry_job.attempts += 1
+                    retry_job.last_attempt_at = current_time
+                    _reschedule_leased_job(conn, retry_job, lease_owner)
+                    stats['jobs_deferred'] += 1
             
-            # Check max attempts
-            if retry_job.attempts >= MAX_RETRY_ATTEMPTS:
-                logger.warning(f"Retry job {retry_job.job_id} max attempts reached")
-                _remove_retry_job(job_file)
-                stats['jobs_failed'] += 1
-                continue
-            
-            # Attempt to process the job
-            success = _process_retry_job(retry_job, current_time)
-            
-            if success:
-                logger.info(f"Retry job {retry_job.job_id} succeeded")
-                _remove_retry_job(job_file)
-                stats['jobs_succeeded'] += 1
-            else:
-                # Update job with failed attempt and save back
-                retry_job.attempts += 1
-                retry_job.last_attempt_at = current_time
-                _queue_retry_job(retry_job)
-                stats['jobs_deferred'] += 1
+            if len(batch) < batch_size:
+                break
+    finally:
+        conn.close()
     
     if stats['jobs_processed'] > 0:
         logger.info(f"TSA retry queue processed: {stats}")
@@ -330,6 +486,30 @@ def process_retry_queue(now_provider: Optional[Callable[[], datetime]] = None) -
     return stats
 
 
+def _complete_leased_job(conn, job_id: str, lease_owner: str):
+    """Remove a job this worker still holds the lease for."""
+    conn.execute(
+        "DELETE FROM tsa_retry_jobs WHERE job_id = ? AND lease_owner = ?",
+        (job_id, lease_owner)
+    )
+
+
+def _reschedule_leased_job(conn, retry_job: TimestampRetryJob, lease_owner: str):
+    """Release the lease and schedule the next attempt with exponential backoff."""
+    last_attempt = retry_job.last_attempt_at.timestamp()
+    conn.execute(
+        """
+        UPDATE tsa_retry_jobs
+        SET attempts = ?, last_attempt_at = ?, next_attempt_at = ?, tsa_errors = ?,
+            lease_owner = NULL, lease_expires_at = NULL
+        WHERE job_id = ? AND lease_owner = ?
+        """,
+        (retry_job.attempts, last_attempt,
+         last_attempt + _retry_backoff_seconds(retry_job.attempts),
+         json.dumps(retry_job.tsa_errors), retry_job.job_id, lease_owner)
+    )
+
+
 def _process_retry_job(retry_job: TimestampRetryJob, current_time: datetime) -> bool:
     """
     Process a single retry job.
@@ -361,8 +541,8 @@ def _process_retry_job(retry_job: TimestampRetryJob, current_time: datetime) ->
         timestamp_token = _generate_rfc3161_timestamp(pdf_content)
         
         if timestamp_token:
-            # TODO: Update the PDF with the timestamp and re-save
-            # This would require implementing PDF metadata updating
+            # Attach as a detached token so the PDF bytes (and their hash) stay unchanged
+            _attach_timestamp_token(retry_job.pdf_path, timestamp_token)
             logger.info(f"Successfully obtained timestamp for retry job {retry_job.job_id}")
             return True
         else:
@@ -375,10 +555,32 @@ def _process_retry_job(retry_job: TimestampRetryJob, current_time: datetime) ->
         return False
 
 
-def get_retry_queue_status() -> Dict[str, Any]:
+def _attach_timestamp_token(pdf_path: str, timestamp_token: bytes) -> Path:
+    """
+    Write a DER-encoded timestamp token next to its PDF.
+    
+    Args:
+        pdf_path: Path to the timestamped PDF
+        timestamp_token: DER-encoded RFC 3161 TimeStampToken
+        
+    Returns:
+        Path to the written token file
+    """
+    token_path = Path(f"{pdf_path}{TIMESTAMP_TOKEN_SUFFIX}")
+    temp_path = token_path.with_name(token_path.name + '.tmp')
+    temp_path.write_bytes(timestamp_token)
+    os.replace(temp_path, token_path)
+    logger.debug(f"Attached timestamp token: {token_path}")
+    return token_path
+
+
+def get_retry_queue_status(now_provider: Optional[Callable[[], datetime]] = None) -> Dict[str, Any]:
     """
     Get current retry queue status.
     
+    Args:
+        now_provider: Optional function to provide current datetime (for testing)
+    
     Returns:
         Dictionary with queue status information
     """
@@ -389,36 +591,45 @@ def get_retry_queue_status() -> Dict[str, Any]:
             'queue_directory_exists': False
         }
     
-    job_files = list(RETRY_QUEUE_DIR.glob("*.json"))
+    now_ts = (now_provider() if now_provider else datetime.now(timezone.utc)).timestamp()
+    
+    with _queue_lock:
+        conn = _connect_queue()
+        try:
+            summary = conn.execute(
+                """
+                SELECT COUNT(*) AS queue_size,
+                       SUM(CASE WHEN next_attempt_at <= ? THEN 1 ELSE 0 END) AS due_jobs,
+                       SUM(CASE WHEN lease_expires_at > ? THEN 1 ELSE 0 END) AS leased_jobs
+                FROM tsa_retry_jobs
+                """,
+                (now_ts, now_ts)
+            ).fetchone()
+            oldest = conn.execute(
+                "SELECT job_id, created_at FROM tsa_retry_jobs ORDER BY created_at ASC LIMIT 1"
+            ).fetchone()
+            newest = conn.execute(
+                "SELECT job_id, created_at FROM tsa_retry_jobs ORDER BY created_at DESC LIMIT 1"
+            ).fetchone()
+        finally:
+            conn.close()
     
-    status = {
-        'queue_size': len(job_files),
-        'oldest_job': None,
-        'newest_job': None,
+    def _job_summary(row) -> Optional[Dict[str, str]]:
+        if row is None:
+            return None
+        return {
+            'job_id': row['job_id'],
+            'created': datetime.fromtimestamp(row['created_at'], timezone.utc).isoformat()
+        }
+    
+    return {
+        'queue_size': summary['queue_size'],
+        'due_jobs': summary['due_jobs'] or 0,
+        'leased_jobs': summary['leased_jobs'] or 0,
+        'oldest_job': _job_summary(oldest),
+        'newest_job': _job_summary(newest),
         'queue_directory_exists': True
     }
-    
-    if job_files:
-        # Find oldest and newest jobs
-        oldest_mtime = float('inf')
-        newest_mtime = 0
-        
-        for job_file in job_files:
-            mtime = job_file.stat().st_mtime
-            if mtime < oldest_mtime:
-                oldest_mtime = mtime
-                status['oldest_job'] = {
-                    'file': job_file.name,
-                    'created': datetime.fromtimestamp(mtime, timezone.utc).isoformat()
-                }
-            if mtime > newest_mtime:
-                newest_mtime = mtime
-                status['newest_job'] = {
-                    'file': job_file.name,  
-                    'created': datetime.fromtimestamp(mtime, timezone.utc).isoformat()
-                }
-    
-    return status
 
 
 def clear_retry_queue() -> int:
@@ -436,6 +647,12 @@ def clear_retry_queue() -> int:
         for job_file in RETRY_QUEUE_DIR.glob("*.json"):
             _remove_retry_job(job_file)
             count += 1
+        
+        conn = _connect_queue()
+        try:
+            count += conn.execute("DELETE FROM tsa_retry_jobs").rowcount
+        finally:
+            conn.close()
     
     return count
 
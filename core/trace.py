@@ -0,0 +1,321 @@
+"""
+Compact trace representation shared across decide, plot and verify.
+
+Normalization produces a TraceFrame once per job: int64 UTC nanosecond
+timestamps, read-only views of the frame's float sensor columns (no second copy
+of the data) and the resolved column roles (temperature, humidity, pressure,
+gas). Combined PMT series are computed lazily with numpy and memoized per sensor
+mode, so the decision engines, the plotter and the verifier stop re-detecting
+columns and copying df[temp_columns] for every stage.
+
+Engines keep their (normalized_df, spec) signatures and look the trace up with
+get_trace(); frames that were not registered by normalization get a fresh,
+unregistered trace. A registered trace whose columns or values changed after
+normalization is rebuilt instead of reused.
+
+Example usage:
+    from core.trace import get_trace
+
+    trace = get_trace(normalized_df)
+    temp_columns = list(trace.roles['temperature'])
+    combined_pmt = trace.combined(temp_columns, SensorMode.MIN_OF_SET)
+"""
+
+import functools
+import hashlib
+import logging
+import re
+import threading
+import weakref
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Mapping, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from core.models import SensorMode
+from core.temperature_utils import DecisionError, detect_temperature_columns
+
+logger = logging.getLogger(__name__)
+
+ROLE_PATTERNS = {
+    'humidity': [
+        r'.*humidity.*', r'.*rh.*', r'.*relative.*', r'.*moisture.*',
+        r'.*_rh$', r'.*_humidity$', r'.*%rh.*'
+    ],
+    'pressure': [
+        r'.*pressure.*', r'.*press.*', r'.*psi.*', r'.*kpa.*', r'.*bar.*',
+        r'.*_p$', r'.*_pressure$'
+    ],
+    'gas': [
+        r'.*eto.*', r'.*ethylene.*oxide.*', r'.*gas.*', r'.*concentration.*',
+        r'.*ppm.*', r'.*mg/l.*', r'.*_eto$', r'.*_gas$'
+    ],
+}
+_COMPILED_ROLE_PATTERNS = {
+    role: [re.compile(pattern) for pattern in patterns]
+    for role, patterns in ROLE_PATTERNS.items()
+}
+
+
+def find_timestamp_column(df: pd.DataFrame) -> Optional[str]:
+    """
+    Find the timestamp column the same way the decision engines do.
+
+    Args:
+        df: Normalized DataFrame
+
+    Returns:
+        First column whose name contains 'time' or that has a datetime dtype, or None
+    """
+    for col in df.columns:
+        if 'time' in col.lower() or pd.api.types.is_datetime64_any_dtype(df[col]):
+            return col
+    return None
+
+
+def detect_role_columns(df: pd.DataFrame, role: str) -> List[str]:
+    """
+    Detect numeric columns for a non-temperature sensor role.
+
+    Args:
+        df: Input DataFrame
+        role: One of 'humidity', 'pressure' or 'gas'
+
+    Returns:
+        List of matching column names
+    """
+    patterns = _COMPILED_ROLE_PATTERNS[role]
+    columns = []
+
+    for col in df.columns:
+        col_lower = col.lower()
+        if col_lower == 'timestamp' or 'time' in col_lower:
+            continue
+
+        if any(pattern.match(col_lower) for pattern in patterns):
+            # Verify it's numeric
+            if pd.api.types.is_numeric_dtype(df[col]):
+                columns.append(col)
+
+    return columns
+
+
+def _read_only(array: np.ndarray) -> np.ndarray:
+    array.setflags(write=False)
+    return array
+
+
+def _sensor_array(series: pd.Series) -> np.ndarray:
+    """Read-only view of a float column; other dtypes are converted to float64."""
+    if isinstance(series.dtype, np.dtype) and series.dtype.kind == 'f':
+        return _read_only(series.to_numpy().view())
+    return _read_only(series.to_numpy(dtype=np.float64, na_value=np.nan))
+
+
+def _checksum(array: Optional[np.ndarray]) -> Optional[bytes]:
+    """Content hash of an array's bytes (None for a missing array)."""
+    if array is None:
+        return None
+    return hashlib.blake2b(np.ascontiguousarray(array).data, digest_size=16).digest()
+
+
+def _parse_timestamps(df: pd.DataFrame, timestamp_col: Optional[str]) -> Optional[np.ndarray]:
+    """int64 UTC nanoseconds of the timestamp column, or None if absent or unparseable."""
+    if timestamp_col is None:
+        return None
+    try:
+        parsed = pd.DatetimeIndex(pd.to_datetime(df[timestamp_col], utc=True))
+        return _read_only(parsed.asi8.view())
+    except (ValueError, TypeError) as e:
+        logger.debug(f"Could not parse timestamp column {timestamp_col!r}: {e}")
+        return None
+
+
+@dataclass(frozen=True)
+class TraceFrame:
+    """
+    Immutable, array-backed view of a normalized trace.
+
+    Attributes:
+        timestamp_column: Name of the timestamp column, or None if there is none
+        timestamps_ns: int64 UTC nanoseconds since the epoch (None if unparseable)
+        columns: Sensor column names, in the order of ``arrays``
+        arrays: Read-only 1-D float array per sensor column, viewing the
+            DataFrame's own data where its dtype allows
+        roles: Resolved column names per role (temperature, humidity, pressure, gas)
+        index: Index of the source DataFrame, used for returned Series
+    """
+    timestamp_column: Optional[str]
+    timestamps_ns: Optional[np.ndarray]
+    columns: Tuple[str, ...]
+    arrays: Tuple[np.ndarray, ...]
+    roles: Mapping[str, Tuple[str, ...]]
+    index: pd.Index
+    source_columns: Tuple[Any, ...] = field(default=(), repr=False)
+    checksums: Tuple[bytes, ...] = field(default=(), repr=False)
+    timestamps_checksum: Optional[bytes] = field(default=None, repr=False)
+    _combined: Dict[tuple, np.ndarray] = field(default_factory=dict, repr=False, compare=False)
+
+    @classmethod
+    def from_dataframe(cls, df: pd.DataFrame) -> 'TraceFrame':
+        """
+        Build a trace from a normalized DataFrame.
+
+        Args:
+            df: Normalized DataFrame
+
+        Returns:
+            TraceFrame holding the timestamps and every sensor column with a role
+        """
+        timestamp_col = find_timestamp_column(df)
+        timestamps_ns = _parse_timestamps(df, timestamp_col)
+
+        roles = {'temperature': tuple(detect_temperature_columns(df))}
+        for role in ROLE_PATTERNS:
+            roles[role] = tuple(detect_role_columns(df, role))
+
+        columns = tuple(dict.fromkeys(col for cols in roles.values() for col in cols))
+        arrays = tuple(_sensor_array(df[col]) for col in columns)
+
+        return cls(
+            timestamp_column=timestamp_col,
+            timestamps_ns=timestamps_ns,
+            columns=columns,
+            arrays=arrays,
+            roles=roles,
+            index=df.index,
+            source_columns=tuple(df.columns),
+            checksums=tuple(_checksum(array) for array in arrays),
+            timestamps_checksum=_checksum(timestamps_ns),
+        )
+
+    def __len__(self) -> int:
+        return len(self.index)
+
+    def column(self, name: str) -> np.ndarray:
+        """Read-only float view of one sensor column."""
+        return self.arrays[self.columns.index(name)]
+
+    def matches(self, df: pd.DataFrame) -> bool:
+        """Whether the trace still describes the index, columns, timestamps and sensor values of df."""
+        if len(df) != len(self) or tuple(df.columns) != self.source_columns or not df.index.equals(self.index):
+            return False
+        if _checksum(_parse_timestamps(df, self.timestamp_column)) != self.timestamps_checksum:
+            return False
+        return all(_checksum(_sensor_array(df[col])) == checksum
+                   for col, checksum in zip(self.columns, self.checksums))
+
+    def combined(self, columns: Sequence[str], mode: SensorMode,
+                 require_at_least: Optional[int] = None,
+                 threshold_C: Optional[float] = None) -> pd.Series:
+        """
+        Combined sensor reading, memoized per mode and column set.
+
+        Same semantics as core.sensor_utils.combine_sensor_readings, computed on
+        the shared array instead of a copied DataFrame slice. Each caller gets
+        its own Series over a copy of the memoized 1-D result.
+
+        Args:
+            columns: Sensor columns to combine
+            mode: Sensor combination mode
+            require_at_least: Minimum number of valid sensors required
+            threshold_C: Threshold for majority_over_threshold mode
+
+        Returns:
+            Series of combined readings (boolean for majority_over_threshold)
+
+        Raises:
+            DecisionError: If insufficient valid sensors or invalid mode
+        """
+        if not columns:
+            raise DecisionError("No temperature columns provided for sensor combination")
+
+        columns = tuple(columns)
+        key = (mode, columns, require_at_least,
+               threshold_C if mode == SensorMode.MAJORITY_OVER_THRESHOLD else None)
+        cached = self._combined.get(key)
+        if cached is not None:
+            return pd.Series(cached.copy(), index=self.index)
+
+        arrays = [self.column(col) for col in columns]
+        valid_counts = sum((~np.isnan(array)).astype(np.int64) for array in arrays)
+
+        # Check minimum sensor requirement
+        if require_at_least is not None:
+            insufficient = valid_counts < require_at_least
+            if insufficient.any():
+                count = int(insufficient.sum())
+                raise DecisionError(f"Insufficient valid sensors: {count} samples have < {require_at_least} sensors")
+
+        # Reduce column by column so no (samples, sensors) copy is made
+        if mode == SensorMode.MIN_OF_SET:
+            result = functools.reduce(np.fmin, arrays).astype(np.float64)
+        elif mode == SensorMode.MEAN_OF_SET:
+            total = sum(np.nan_to_num(array, nan=0.0).astype(np.float64, copy=False) for array in arrays)
+            with np.errstate(invalid='ignore', divide='ignore'):
+                result = total / valid_counts
+        elif mode == SensorMode.MAJORITY_OVER_THRESHOLD:
+            if threshold_C is None:
+                raise DecisionError("threshold_C required for majority_over_threshold mode")
+            sensors_above = sum((array >= threshold_C).astype(np.int64) for array in arrays)
+            if require_at_least is not None:
+                result = sensors_above >= require_at_least
+            else:
+                result = sensors_above > (valid_counts / 2)
+        else:
+            raise DecisionError(f"Unknown sensor combination mode: {mode}")
+
+        self._combined[key] = _read_only(result)
+        return pd.Series(result.copy(), index=self.index)
+
+
+_registry: Dict[int, Tuple[weakref.ref, TraceFrame]] = {}
+_registry_lock = threading.Lock()
+
+
+def _forget(key: int) -> None:
+    with _registry_lock:
+        _registry.pop(key, None)
+
+
+def register_trace(df: pd.DataFrame, trace: Optional[TraceFrame] = None) -> TraceFrame:
+    """
+    Attach a trace to a normalized DataFrame for the lifetime of the frame.
+
+    Args:
+        df: Normalized DataFrame (treated as read-only from here on)
+        trace: Pre-built trace (default: built from df)
+
+    Returns:
+        The registered TraceFrame
+    """
+    if trace is None:
+        trace = TraceFrame.from_dataframe(df)
+    key = id(df)
+    ref = weakref.ref(df, lambda _ref, key=key: _forget(key))
+    with _registry_lock:
+        _registry[key] = (ref, trace)
+    return trace
+
+
+def get_trace(df: pd.DataFrame) -> TraceFrame:
+    """
+    Return the trace registered for df, or build an unregistered one.
+
+    A registered trace is only reused while the frame keeps its shape, columns
+    and sensor values; otherwise it is rebuilt and registered again.
+
+    Args:
+        df: Normalized DataFrame
+
+    Returns:
+        TraceFrame for df
+    """
+    with _registry_lock:
+        entry = _registry.get(id(df))
+    if entry is not None:
+        ref, trace = entry
+        if ref() is df:
+            return trace if trace.matches(df) else register_trace(df)
+    return TraceFrame.from_dataframe(df)
@@ -0,0 +1,305 @@
+"""
+Connection-pooled RFC 3161 TSA client for ProofKit.
+
+Replaces the one-RemoteTimestamper-per-URL-per-PDF pattern with a shared client:
+- Persistent HTTP keep-alive connections per TSA host (requests.Session pool)
+- Hedged parallel requests: the next TSA is tried if the previous one has not
+  answered within the hedge delay, and the first valid token wins
+- Per-TSA circuit breaker so known-down TSAs are skipped instead of timing out
+- Token validation (PKI status, message imprint and nonce) before acceptance
+
+Configuration via environment:
+- TSA_URLS: comma-separated TSA endpoints (default: public TSAs below)
+- TSA_TIMEOUT_SECONDS: overall deadline per timestamp (default: 10)
+- TSA_HEDGE_DELAY_SECONDS: delay before hedging to the next TSA (default: 0.5)
+- TSA_CIRCUIT_FAILURES: consecutive failures that open a circuit (default: 3)
+- TSA_CIRCUIT_RESET_SECONDS: how long an open circuit skips a TSA (default: 300)
+
+Example usage:
+    from core.tsa_client import get_tsa_client
+
+    token = get_tsa_client().timestamp(data_hash)
+    if token is None:
+        # All TSAs failed or are circuit-open - queue for retry
+        pass
+"""
+
+import hashlib
+import logging
+import os
+import secrets
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from threading import Lock
+from typing import Callable, Dict, List, Optional
+
+try:
+    import requests
+    from requests.adapters import HTTPAdapter
+    import rfc3161ng
+    from pyasn1.codec.der import encoder as der_encoder
+    TSA_CLIENT_AVAILABLE = True
+except ImportError:
+    TSA_CLIENT_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+# RFC 3161 TSA URLs (using public TSAs)
+DEFAULT_TSA_URLS = [
+    'http://timestamp.apple.com/ts01',
+    'http://time.certum.pl',
+    'http://timestamp.digicert.com'
+]
+
+DEFAULT_TIMEOUT_SECONDS = 10.0
+DEFAULT_HEDGE_DELAY_SECONDS = 0.5
+DEFAULT_CIRCUIT_FAILURES = 3
+DEFAULT_CIRCUIT_RESET_SECONDS = 300.0
+
+# PKIStatus values that carry a usable token (granted, grantedWithMods)
+_GRANTED_STATUSES = (0, 1)
+
+
+class CircuitBreaker:
+    """
+    Consecutive-failure circuit breaker for a single TSA endpoint.
+
+    States:
+    - closed: requests allowed
+    - open: requests skipped until reset_seconds have elapsed
+    - half-open: a single trial request is allowed; success closes, failure re-opens
+    """
+
+    def __init__(self, failure_threshold: int = DEFAULT_CIRCUIT_FAILURES,
+                 reset_seconds: float = DEFAULT_CIRCUIT_RESET_SECONDS,
+                 clock: Callable[[], float] = time.monotonic):
+        self.failure_threshold = max(1, failure_threshold)
+        self.reset_seconds = reset_seconds
+        self._clock = clock
+        self._lock = Lock()
+        self.consecutive_failures = 0
+        self.opened_at: Optional[float] = None
+        self._trial_in_flight = False
+
+    @property
+    def state(self) -> str:
+        """Current breaker state: closed, open or half-open."""
+        with self._lock:
+            return self._state_locked()
+
+    def _state_locked(self) -> str:
+        if self.opened_at is None:
+            return 'closed'
+        if self._clock() - self.opened_at >= self.reset_seconds:
+            return 'half-open'
+        return 'open'
+
+    def allow_request(self) -> bool:
+        """Return True if a request may be sent to this endpoint now."""
+        with self._lock:
+            state = self._state_locked()
+            if state == 'closed':
+                return True
+            if state == 'half-open' and not self._trial_in_flight:
+                self._trial_in_flight = True
+                return True
+            return False
+
+    def record_success(self) -> None:
+        with self._lock:
+            self.consecutive_failures = 0
+            self.opened_at = None
+            self._trial_in_flight = False
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self.consecutive_failures += 1
+            if self._trial_in_flight or self.consecutive_failures >= self.failure_threshold:
+                self.opened_at = self._clock()
+            self._trial_in_flight = False
+
+
+class TSAClient:
+    """
+    Shared RFC 3161 client with pooled connections, hedging and circuit breakers.
+
+    A single instance is intended to be reused for every timestamp in the process
+    (see get_tsa_client()).
+    """
+
+    def __init__(self, urls: Optional[List[str]] = None,
+                 timeout: float = DEFAULT_TIMEOUT_SECONDS,
+                 hedge_delay: float = DEFAULT_HEDGE_DELAY_SECONDS,
+                 failure_threshold: int = DEFAULT_CIRCUIT_FAILURES,
+                 reset_seconds: float = DEFAULT_CIRCUIT_RESET_SECONDS,
+                 hashname: str = 'sha256',
+                 clock: Callable[[], float] = time.monotonic):
+        if not TSA_CLIENT_AVAILABLE:
+            raise RuntimeError("TSA client requires requests and rfc3161ng")
+
+        self.urls = list(urls if urls is not None else DEFAULT_TSA_URLS)
+        self.timeout = timeout
+        self.hedge_delay = hedge_delay
+        self.hashname = hashname
+        self._clock = clock
+        self.breakers: Dict[str, CircuitBreaker] = {
+            url: CircuitBreaker(failure_threshold, reset_seconds, clock) for url in self.urls
+        }
+
+        pool_size = max(4, len(self.urls) * 2)
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=max(1, len(self.urls)), pool_maxsize=pool_size)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+        self._executor = ThreadPoolExecutor(max_workers=pool_size, thread_name_prefix='tsa')
+
+    def close(self) -> None:
+        """Release pooled connections and worker threads."""
+        self._executor.shutdown(wait=False, cancel_futures=True)
+        self.session.close()
+
+    def timestamp(self, data: bytes) -> Optional[bytes]:
+        """
+        Obtain a DER-encoded TimeStampToken for data.
+
+        The TSAs are tried in configured order; each additional TSA is started
+        hedge_delay seconds after the previous one unless a valid token has already
+        arrived. Circuit-open TSAs are skipped.
+
+        Args:
+            data: Data to timestamp (hashed with self.hashname for the imprint)
+
+        Returns:
+            DER-encoded TimeStampToken or None if no TSA produced a valid token
+        """
+        digest = hashlib.new(self.hashname, data).digest()
+        nonce = secrets.randbits(63)
+        request = rfc3161ng.make_timestamp_request(digest=digest, hashname=self.hashname, nonce=nonce)
+        body = rfc3161ng.encode_timestamp_request(request)
+
+        deadline = self._clock() + self.timeout
+        pending: Dict[Future, str] = {}
+        remaining = list(self.urls)
+        attempted = 0
+
+        while remaining or pending:
+            # Launch the next TSA whose circuit allows a request
+            while remaining:
+                url = remaining.pop(0)
+                if self.breakers[url].allow_request():
+                    future = self._executor.submit(self._request_token, url, body, digest, nonce, deadline)
+                    pending[future] = url
+                    attempted += 1
+                    break
+                logger.debug(f"Skipping TSA {url} - circuit open")
+
+            if not pending:
+                break
+
+            time_left = deadline - self._clock()
+            if time_left <= 0:
+                break
+            wait_for = min(self.hedge_delay, time_left) if remaining else time_left
+            done, _ = wait(list(pending), timeout=wait_for, return_when=FIRST_COMPLETED)
+
+            for future in done:
+                url = pending.pop(future)
+                token = future.result()
+                if token is not None:
+                    logger.info(f"Successfully obtained timestamp from {url}")
+                    return token
+
+        if attempted == 0:
+            logger.warning("All TSA circuits open - skipping timestamp request")
+            return None
+        logger.warning("All TSA URLs failed")
+        return None
+
+    def _request_token(self, url: str, body: bytes, digest: bytes, nonce: int,
+                       deadline: float) -> Optional[bytes]:
+        """Send one request over the pooled session; never raises."""
+        breaker = self.breakers[url]
+        try:
+            timeout = max(0.1, deadline - self._clock())
+            logger.debug(f"Attempting TSA request to {url}")
+            response = self.session.post(
+                url,
+                data=body,
+                timeout=timeout,
+                headers={'Content-Type': 'application/timestamp-query'}
+            )
+            response.raise_for_status()
+            token = self._extract_token(response.content, digest, nonce)
+        except Exception as e:
+            logger.warning(f"TSA {url} failed: {e}")
+            breaker.record_failure()
+            return None
+
+        breaker.record_success()
+        return token
+
+    def _extract_token(self, content: bytes, digest: bytes, nonce: int) -> bytes:
+        """Decode a TimeStampResp and validate it against the request."""
+        tsr = rfc3161ng.decode_timestamp_response(content)
+        status = int(tsr.status['status'])
+        if status not in _GRANTED_STATUSES:
+            raise ValueError(f"TSA rejected request with PKIStatus {status}")
+
+        tst = tsr.time_stamp_token
+        if not tst.isValue:
+            raise ValueError("TSA response has no TimeStampToken")
+
+        tst_info = tst.tst_info
+        if bytes(tst_info.message_imprint.hashed_message) != digest:
+            raise ValueError("Message imprint mismatch")
+        if not tst_info['nonce'].isValue or int(tst_info['nonce']) != nonce:
+            raise ValueError("Nonce is different or missing")
+
+        return der_encoder.encode(tst)
+
+    def get_status(self) -> Dict[str, Dict[str, object]]:
+        """Return circuit breaker state per TSA URL."""
+        return {
+            url: {
+                'state': breaker.state,
+                'consecutive_failures': breaker.consecutive_failures
+            }
+            for url, breaker in self.breakers.items()
+        }
+
+
+# Process-wide client instance
+_client: Optional[TSAClient] = None
+_client_lock = Lock()
+
+
+def _client_from_env() -> TSAClient:
+    urls_env = os.environ.get('TSA_URLS', '')
+    urls = [u.strip() for u in urls_env.split(',') if u.strip()] or None
+    return TSAClient(
+        urls=urls,
+        timeout=float(os.environ.get('TSA_TIMEOUT_SECONDS', DEFAULT_TIMEOUT_SECONDS)),
+        hedge_delay=float(os.environ.get('TSA_HEDGE_DELAY_SECONDS', DEFAULT_HEDGE_DELAY_SECONDS)),
+        failure_threshold=int(os.environ.get('TSA_CIRCUIT_FAILURES', DEFAULT_CIRCUIT_FAILURES)),
+        reset_seconds=float(os.environ.get('TSA_CIRCUIT_RESET_SECONDS', DEFAULT_CIRCUIT_RESET_SECONDS)),
+    )
+
+
+def get_tsa_client() -> TSAClient:
+    """Return the shared TSA client, creating it from the environment on first use."""
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                _client = _client_from_env()
+    return _client
+
+
+def set_tsa_client(client: Optional[TSAClient]) -> None:
+    """Replace the shared TSA client (closing the previous one); None resets to env config."""
+    global _client
+    with _client_lock:
+        if _client is not None and _client is not client:
+            _client.close()
+        _client = client
+
@@ -0,0 +1,85 @@
+"""
+Size-bounded, time-limited in-process cache for ProofKit.
+
+Used for small lookups that are read on almost every request but change
+rarely, such as a user's plan or a decoded JWT. Entries expire after a TTL
+(or an explicit per-entry deadline) and the least recently used entry is
+dropped once the cache is full. Callers invalidate entries when they change
+the underlying data; other worker processes pick the change up when their
+copy expires.
+
+Example usage:
+    from core.ttl_cache import TTLCache
+
+    plans = TTLCache(ttl_s=30, max_entries=4096)
+    plan = plans.get(email)
+    if plan is None:
+        plan = load_plan(email)
+        plans.put(email, plan)
+    ...
+    plans.invalidate(email)  # after changing the plan
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Hashable, Optional, Tuple
+
+
+class TTLCache:
+    """Thread-safe LRU cache whose entries expire after ttl_s seconds."""
+
+    def __init__(self, ttl_s: float, max_entries: int):
+        self.ttl_s = ttl_s
+        self.max_entries = max_entries
+        self._entries: 'OrderedDict[Hashable, Tuple[float, Any]]' = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """Return the cached value, or None if missing or expired."""
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at <= now:
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def put(self, key: Hashable, value: Any, expires_at: Optional[float] = None) -> None:
+        """
+        Cache a value for ttl_s seconds.
+
+        Args:
+            key: Cache key
+            value: Value to cache (None cannot be told apart from a miss)
+            expires_at: Optional Unix time after which the value is stale
+                even if ttl_s has not elapsed
+        """
+        if self.ttl_s <= 0 or self.max_entries <= 0:
+            return
+        deadline = time.time() + self.ttl_s
+        if expires_at is not None:
+            deadline = min(deadline, expires_at)
+        with self._lock:
+            self._entries[key] = (deadline, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, key: Hashable) -> None:
+        """Drop one entry."""
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        """Drop every entry."""
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
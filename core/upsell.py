@@ -4,27 +4,59 @@ Simple upsell scheduler:
 - Sends reminder at +5d
 - Sends urgency email at +7d (expiry)
 
-Uses a file-backed queue in storage to avoid DB.
+Pending stages live in a SQLite table in storage indexed by the time the next
+email is due, so each scheduler pass reads only the due rows instead of every
+user ever enqueued. Due rows are leased in batches (one worker per row) and
+sent with one Postmark batch call per batch. Enqueueing from the compile path
+is handed to a background thread.
+
+Example usage:
+    from core.upsell import enqueue_upsell, process_queue_once
+
+    enqueue_upsell(email, job_id, industry, spec_name)  # returns immediately
+    process_queue_once()  # called by the scheduler every 30s
 """
 
 from __future__ import annotations
 
 import json
 import os
-import time
-from dataclasses import dataclass, asdict
+import threading
+import uuid
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
 from datetime import datetime, timedelta, timezone
 from pathlib import Path
-from typing import Optional, List
+from typing import Any, Dict, List, Optional
 
-from core.email import send_postmark_email
+from core.email import send_postmark_batch
 from core.logging import get_logger
+from core.sqlite_store import connect, immediate_transaction
 
 logger = get_logger(__name__)
 
 STORAGE_DIR = Path(os.environ.get("UPSSELL_STORAGE_DIR", Path(__file__).resolve().parents[1] / "storage"))
+QUEUE_DB_NAME = "upsell_queue.db"
+# JSONL queue used by earlier releases, imported on first use
 QUEUE_FILE = STORAGE_DIR / "upsell_queue.jsonl"
 
+UPSELL_BATCH_SIZE = int(os.environ.get("UPSELL_BATCH_SIZE", "100"))
+UPSELL_RETRY_DELAY_SECONDS = 300  # Failed sends are retried after this delay
+UPSELL_LEASE_SECONDS = 600  # Reclaim rows leased by a worker that died mid-batch
+# Stages that fell due together (e.g. after downtime) are sent at least this far apart
+UPSELL_MIN_STAGE_GAP_SECONDS = 3600
+
+# Stage -> time after certificate creation when its email is due
+STAGE_DELAYS = {
+    "scheduled72h": timedelta(hours=72),
+    "reminder5d": timedelta(days=5),
+    "urgency7d": timedelta(days=7),
+}
+NEXT_STAGE = {"scheduled72h": "reminder5d", "reminder5d": "urgency7d", "urgency7d": "done"}
+
+_executor: Optional[ThreadPoolExecutor] = None
+_executor_lock = threading.Lock()
+
 
 @dataclass
 class UpsellJob:
@@ -40,8 +72,107 @@ def _now_iso() -> str:
     return datetime.now(timezone.utc).isoformat()
 
 
-def enqueue_upsell(email: str, certificate_id: str, industry: str, spec_type: str) -> None:
-    STORAGE_DIR.mkdir(parents=True, exist_ok=True)
+def _queue_db_path() -> Path:
+    return STORAGE_DIR / QUEUE_DB_NAME
+
+
+def _due_at(created_at: str, stage: str) -> float:
+    """Epoch seconds when a stage's email is due."""
+    return (datetime.fromisoformat(created_at) + STAGE_DELAYS[stage]).timestamp()
+
+
+def _connect_queue():
+    """
+    Open the upsell queue database, creating the schema on first use.
+
+    A legacy upsell_queue.jsonl is imported once and renamed.
+    """
+    conn = connect(_queue_db_path())
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS upsell_jobs (
+            email TEXT NOT NULL,
+            certificate_id TEXT NOT NULL,
+            industry TEXT NOT NULL,
+            spec_type TEXT NOT NULL,
+            created_at TEXT NOT NULL,
+            stage TEXT NOT NULL,
+            next_send_at REAL NOT NULL,
+            lease_owner TEXT,
+            lease_expires_at REAL,
+            PRIMARY KEY (email, certificate_id)
+        )
+    """)
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_upsell_next ON upsell_jobs (next_send_at)")
+
+    if QUEUE_FILE.exists():
+        _import_legacy_queue(conn)
+
+    return conn
+
+
+def _insert_jobs(conn, jobs: List[UpsellJob]) -> None:
+    """Add pending stages; a certificate already queued for the user is left as is."""
+    conn.executemany(
+        """
+        INSERT OR IGNORE INTO upsell_jobs
+            (email, certificate_id, industry, spec_type, created_at, stage, next_send_at)
+        VALUES (?, ?, ?, ?, ?, ?, ?)
+        """,
+        [(j.email, j.certificate_id, j.industry, j.spec_type, j.created_at, j.stage,
+          _due_at(j.created_at, j.stage)) for j in jobs if j.stage in STAGE_DELAYS]
+    )
+
+
+def _import_legacy_queue(conn) -> None:
+    """Move pending stages from the legacy JSONL file into the table."""
+    with immediate_transaction(conn):
+        if not QUEUE_FILE.exists():
+            return  # Another worker imported it first
+        jobs: List[UpsellJob] = []
+        with QUEUE_FILE.open("r", encoding="utf-8") as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    jobs.append(UpsellJob(**json.loads(line)))
+                except Exception:
+                    continue
+        _insert_jobs(conn, jobs)
+        QUEUE_FILE.rename(QUEUE_FILE.with_suffix(".jsonl.imported"))
+        logger.info(f"Imported {len(jobs)} legacy upsell jobs")
+
+
+def _store_job(job: UpsellJob) -> None:
+    conn = _connect_queue()
+    try:
+        _insert_jobs(conn, [job])
+    finally:
+        conn.close()
+    logger.info(f"Enqueued upsell for {job.email} cert={job.certificate_id}")
+
+
+def _log_store_failure(future: Future) -> None:
+    error = future.exception()
+    if error is not None:
+        logger.error(f"Failed to store upsell job: {error}")
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="upsell")
+        return _executor
+
+
+def enqueue_upsell(email: str, certificate_id: str, industry: str, spec_type: str) -> Future:
+    """
+    Schedule the upsell sequence for a certificate without blocking the caller.
+
+    Returns:
+        Future that completes once the job is stored
+    """
     job = UpsellJob(
         email=email,
         certificate_id=certificate_id,
@@ -50,38 +181,12 @@ def enqueue_upsell(email: str, certificate_id: str, industry: str, spec_type: st
         created_at=_now_iso(),
         stage="scheduled72h",
     )
-    with QUEUE_FILE.open("a", encoding="utf-8") as f:
-        f.write(json.dumps(asdict(job)) + "\n")
-    logger.info(f"Enqueued upsell for {email} cert={certificate_id}")
-
-
-def _read_jobs() -> List[UpsellJob]:
-    if not QUEUE_FILE.exists():
-        return []
-    jobs: List[UpsellJob] = []
-    with QUEUE_FILE.open("r", encoding="utf-8") as f:
-        for line in f:
-            line = line.strip()
-            if not line:
-                continue
-            try:
-                data = json.loads(line)
-                jobs.append(UpsellJob(**data))
-            except Exception:
-                continue
-    return jobs
-
-
-def _write_jobs(jobs: List[UpsellJob]) -> None:
-    STORAGE_DIR.mkdir(parents=True, exist_ok=True)
-    tmp = QUEUE_FILE.with_suffix(".tmp")
-    with tmp.open("w", encoding="utf-8") as f:
-        for j in jobs:
-            f.write(json.dumps(asdict(j)) + "\n")
-    tmp.replace(QUEUE_FILE)
-
-
-def _send_stage_email(job: UpsellJob) -> bool:
+    future = _get_executor().submit(_store_job, job)
+    future.add_done_callback(_log_store_failure)
+    return future
+
+
+def _stage_message(job: UpsellJob) -> Dict[str, Any]:
     base_subject = {
         "scheduled72h": "Remove the ProofKit logo for €7",
         "reminder5d": f"How other {job.industry} teams use ProofKit",
@@ -101,29 +206,113 @@ def _send_stage_email(job: UpsellJob) -> bool:
     <p>If you have questions, just reply to this email.</p>
     <p>— ProofKit Team</p>
     """
-    return send_postmark_email(to_email=job.email, subject=base_subject, html_body=html)
+    return {"to_email": job.email, "subject": base_subject, "html_body": html}
+
+
+def _lease_due_jobs(conn, now_ts: float, lease_owner: str, limit: int) -> List[UpsellJob]:
+    """Atomically claim up to limit due, unleased rows for lease_owner."""
+    with immediate_transaction(conn):
+        rows = conn.execute(
+            """
+            SELECT * FROM upsell_jobs
+            WHERE next_send_at <= ?
+              AND (lease_expires_at IS NULL OR lease_expires_at <= ?)
+            ORDER BY next_send_at
+            LIMIT ?
+            """,
+            (now_ts, now_ts, limit)
+        ).fetchall()
+        conn.executemany(
+            """
+            UPDATE upsell_jobs SET lease_owner = ?, lease_expires_at = ?
+            WHERE email = ? AND certificate_id = ?
+            """,
+            [(lease_owner, now_ts + UPSELL_LEASE_SECONDS, row["email"], row["certificate_id"])
+             for row in rows]
+        )
+    return [
+        UpsellJob(email=row["email"], certificate_id=row["certificate_id"], industry=row["industry"],
+                  spec_type=row["spec_type"], created_at=row["created_at"], stage=row["stage"])
+        for row in rows
+    ]
+
+
+def _finish_leased_jobs(conn, sent: List[UpsellJob], failed: List[UpsellJob],
+                        now_ts: float, lease_owner: str) -> None:
+    """Advance sent rows to their next stage, back off failed ones and release leases."""
+    with immediate_transaction(conn):
+        for job in sent:
+            next_stage = NEXT_STAGE[job.stage]
+            if next_stage == "done":
+                conn.execute(
+                    "DELETE FROM upsell_jobs WHERE email = ? AND certificate_id = ? AND lease_owner = ?",
+                    (job.email, job.certificate_id, lease_owner)
+                )
+            else:
+                conn.execute(
+                    """
+                    UPDATE upsell_jobs
+                    SET stage = ?, next_send_at = ?, lease_owner = NULL, lease_expires_at = NULL
+                    WHERE email = ? AND certificate_id = ? AND lease_owner = ?
+                    """,
+                    (next_stage, max(_due_at(job.created_at, next_stage), now_ts + UPSELL_MIN_STAGE_GAP_SECONDS),
+                     job.email, job.certificate_id, lease_owner)
+                )
+        conn.executemany(
+            """
+            UPDATE upsell_jobs
+            SET next_send_at = ?, lease_owner = NULL, lease_expires_at = NULL
+            WHERE email = ? AND certificate_id = ? AND lease_owner = ?
+            """,
+            [(now_ts + UPSELL_RETRY_DELAY_SECONDS, job.email, job.certificate_id, lease_owner)
+             for job in failed]
+        )
+
+
+def process_queue_once(now: Optional[datetime] = None,
+                       batch_size: int = UPSELL_BATCH_SIZE) -> Dict[str, int]:
+    """
+    Send every upsell email that is due - called by the scheduler.
+
+    Only due rows are read, via the next_send_at index. Each batch is leased,
+    sent with one Postmark batch call and moved to its next stage; failed sends
+    are retried after UPSELL_RETRY_DELAY_SECONDS. Safe to run from several
+    workers at once.
 
+    Args:
+        now: Current time (for testing)
+        batch_size: Maximum number of emails leased and sent per batch
 
-def process_queue_once(now: Optional[datetime] = None) -> None:
+    Returns:
+        Dictionary with sent and failed counts
+    """
     now = now or datetime.now(timezone.utc)
-    jobs = _read_jobs()
-    changed = False
-    for j in jobs:
-        created = datetime.fromisoformat(j.created_at)
-        if j.stage == "scheduled72h" and now - created >= timedelta(hours=72):
-            if _send_stage_email(j):
-                j.stage = "reminder5d"
-                changed = True
-        elif j.stage == "reminder5d" and now - created >= timedelta(days=5):
-            if _send_stage_email(j):
-                j.stage = "urgency7d"
-                changed = True
-        elif j.stage == "urgency7d" and now - created >= timedelta(days=7):
-            if _send_stage_email(j):
-                j.stage = "done"
-                changed = True
-        else:
-            continue
-    if changed:
-        _write_jobs(jobs)
+    now_ts = now.timestamp()
+    lease_owner = f"{os.getpid()}:{uuid.uuid4().hex[:8]}"
+    stats = {"sent": 0, "failed": 0}
+
+    if not _queue_db_path().exists() and not QUEUE_FILE.exists():
+        return stats
+
+    conn = _connect_queue()
+    try:
+        while True:
+            batch = _lease_due_jobs(conn, now_ts, lease_owner, batch_size)
+            if not batch:
+                break
+
+            results = send_postmark_batch([_stage_message(job) for job in batch])
+            sent = [job for job, ok in zip(batch, results) if ok]
+            failed = [job for job, ok in zip(batch, results) if not ok]
+            _finish_leased_jobs(conn, sent, failed, now_ts, lease_owner)
+            stats["sent"] += len(sent)
+            stats["failed"] += len(failed)
+
+            if len(batch) < batch_size:
+                break
+    finally:
+        conn.close()
 
+    if stats["sent"] or stats["failed"]:
+        logger.info(f"Upsell queue processed: {stats}")
+    return stats
@@ -11,12 +11,16 @@ import json
 import hashlib
 import zipfile
 import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
 from datetime import datetime, timezone
 from pathlib import Path
 from typing import Dict, Any, Optional, List
-import subprocess
 import logging
 
+from core.build_info import get_build_info
+from core.job_lock import job_lock
+
 logger = logging.getLogger(__name__)
 
 # Template paths
@@ -25,38 +29,34 @@ IQ_TEMPLATE = TEMPLATE_DIR / "iq_template.pdf"
 OQ_TEMPLATE = TEMPLATE_DIR / "oq_template.pdf"
 PQ_TEMPLATE = TEMPLATE_DIR / "pq_template.pdf"
 
+# Cached pack stored beside the job artifacts
+VALIDATION_PACK_FILENAME = "validation_pack.zip"
+VALIDATION_PACK_INDEX_FILENAME = "validation_pack.json"
+VALIDATION_PACK_LOCK_FILENAME = ".validation.lock"
+
+
+@dataclass(frozen=True)
+class ValidationPackArtifact:
+    """A generated validation pack and its content hash."""
+    path: Path
+    sha256: str
+    state_key: str
+    created_at: str
+    
+    @property
+    def etag(self) -> str:
+        """Strong HTTP entity tag derived from the content hash."""
+        return f'"{self.sha256}"'
+
 
 def get_git_commit_hash() -> str:
-    """Get the current git commit hash."""
-    try:
-        result = subprocess.run(
-            ["git", "rev-parse", "HEAD"],
-            capture_output=True,
-            text=True,
-            cwd=Path(__file__).parent.parent
-        )
-        if result.returncode == 0:
-            return result.stdout.strip()[:8]  # First 8 characters
-    except Exception as e:
-        logger.warning(f"Could not get git commit hash: {e}")
-    return "unknown"
+    """Get the current commit hash (first 8 characters), resolved once per process."""
+    return get_build_info().short_commit
 
 
 def get_software_version() -> str:
-    """Get the current software version."""
-    try:
-        # Try to get version from pyproject.toml or similar
-        pyproject_path = Path(__file__).parent.parent / "pyproject.toml"
-        if pyproject_path.exists():
-            with open(pyproject_path, 'r') as f:
-                content = f.read()
-                if 'version = "' in content:
-                    start = content.find('version = "') + 11
-                    end = content.find('"', start)
-                    return content[start:end]
-    except Exception as e:
-        logger.warning(f"Could not get software version: {e}")
-    return "0.1.0"
+    """Get the current software version, resolved once per process."""
+    return get_build_info().version
 
 
 def create_filled_pdf(template_path: Path, output_path: Path, data: Dict[str, Any]) -> bool:
@@ -151,10 +151,6 @@ def create_validation_pack(job_id: str, job_meta: Dict[str, Any], output_path: P
                 "Installation Location": "Production Environment"
             })
             
-            iq_output = temp_path / "IQ_Installation_Qualification.pdf"
-            if create_filled_pdf(IQ_TEMPLATE, iq_output, iq_data):
-                files_to_zip.append(("IQ_Installation_Qualification.pdf", iq_output))
-            
             # Create OQ document
             oq_data = common_data.copy()
             oq_data.update({
@@ -165,10 +161,6 @@ def create_validation_pack(job_id: str, job_meta: Dict[str, Any], output_path: P
                 "All Tests Passed": "Yes"
             })
             
-            oq_output = temp_path / "OQ_Operational_Qualification.pdf"
-            if create_filled_pdf(OQ_TEMPLATE, oq_output, oq_data):
-                files_to_zip.append(("OQ_Operational_Qualification.pdf", oq_output))
-            
             # Create PQ document
             pq_data = common_data.copy()
             pq_data.update({
@@ -180,9 +172,21 @@ def create_validation_pack(job_id: str, job_meta: Dict[str, Any], output_path: P
                 "Accuracy Rate": "100%"
             })
             
-            pq_output = temp_path / "PQ_Performance_Qualification.pdf"
-            if create_filled_pdf(PQ_TEMPLATE, pq_output, pq_data):
-                files_to_zip.append(("PQ_Performance_Qualification.pdf", pq_output))
+            # Fill the three documents concurrently; keep IQ/OQ/PQ order in the ZIP
+            documents = [
+                ("IQ_Installation_Qualification.pdf", IQ_TEMPLATE, iq_data),
+                ("OQ_Operational_Qualification.pdf", OQ_TEMPLATE, oq_data),
+                ("PQ_Performance_Qualification.pdf", PQ_TEMPLATE, pq_data),
+            ]
+            with ThreadPoolExecutor(max_workers=len(documents)) as executor:
+                futures = [
+                    (filename, temp_path / filename,
+                     executor.submit(create_filled_pdf, template, temp_path / filename, data))
+                    for filename, template, data in documents
+                ]
+                for filename, doc_output, future in futures:
+                    if future.result():
+                        files_to_zip.append((filename, doc_output))
             
             # Create manifest file
             manifest_data = {
@@ -255,4 +259,138 @@ def get_validation_pack_info(job_id: str, job_meta: Dict[str, Any]) -> Dict[str,
             "PQ_Performance_Qualification.pdf",
             "manifest.json"
         ]
-    } 
\ No newline at end of file
+    } 
+
+
+def get_pack_state_key(job_id: str, job_meta: Dict[str, Any]) -> str:
+    """
+    Hash of every input that changes validation pack content.
+    
+    The pack only needs regenerating when the job's approval state, its creator
+    or the running software build changes.
+    """
+    build_info = get_build_info()
+    state = {
+        "job_id": job_id,
+        "creator": job_meta.get("creator", {}).get("email", "Unknown"),
+        "approved": job_meta.get("approved", False),
+        "approved_by": job_meta.get("approved_by"),
+        "approved_at": job_meta.get("approved_at"),
+        "software_version": build_info.version,
+        "commit_hash": build_info.short_commit
+    }
+    return hashlib.sha256(json.dumps(state, sort_keys=True).encode("utf-8")).hexdigest()
+
+
+def _load_pack_index(job_dir: Path) -> Optional[Dict[str, Any]]:
+    """Load the cached pack index, or None if missing or unreadable."""
+    index_path = job_dir / VALIDATION_PACK_INDEX_FILENAME
+    try:
+        with open(index_path, 'r') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def get_cached_validation_pack(job_id: str, job_meta: Dict[str, Any],
+                               job_dir: Path) -> Optional[ValidationPackArtifact]:
+    """
+    Return the stored validation pack if it matches the job's current state.
+    
+    Args:
+        job_id: Job identifier
+        job_meta: Job metadata
+        job_dir: Job artifact directory
+        
+    Returns:
+        ValidationPackArtifact or None if missing or stale
+    """
+    pack_path = job_dir / VALIDATION_PACK_FILENAME
+    index = _load_pack_index(job_dir)
+    if not index or not pack_path.exists():
+        return None
+    if index.get("state_key") != get_pack_state_key(job_id, job_meta):
+        return None
+    return ValidationPackArtifact(
+        path=pack_path,
+        sha256=index["sha256"],
+        state_key=index["state_key"],
+        created_at=index.get("created_at", "")
+    )
+
+
+def ensure_validation_pack(job_id: str, job_meta: Dict[str, Any],
+                           job_dir: Path) -> Optional[ValidationPackArtifact]:
+    """
+    Return the job's validation pack, generating it only when stale.
+    
+    The pack and its validation_pack.json index (SHA-256 and state key) are
+    both written to temporary files and then renamed into place back to back,
+    under a per-job lock so concurrent requests cannot pair one request's ZIP
+    with another's index. Readers never see a partially written file.
+    
+    Args:
+        job_id: Job identifier
+        job_meta: Job metadata
+        job_dir: Job artifact directory
+        
+    Returns:
+        ValidationPackArtifact or None if generation failed
+    """
+    cached = get_cached_validation_pack(job_id, job_meta, job_dir)
+    if cached:
+        return cached
+    
+    try:
+        with job_lock(job_dir, lock_name=VALIDATION_PACK_LOCK_FILENAME):
+            # Another request may have built it while we waited
+            cached = get_cached_validation_pack(job_id, job_meta, job_dir)
+            if cached:
+                return cached
+            return _build_validation_pack(job_id, job_meta, job_dir)
+    except TimeoutError as e:
+        logger.error(f"Validation pack for job {job_id} not generated: {e}")
+        return None
+
+
+def _build_validation_pack(job_id: str, job_meta: Dict[str, Any],
+                           job_dir: Path) -> Optional[ValidationPackArtifact]:
+    """Generate the pack and its index, then swap both into place."""
+    state_key = get_pack_state_key(job_id, job_meta)
+    pack_path = job_dir / VALIDATION_PACK_FILENAME
+    fd, temp_name = tempfile.mkstemp(prefix=".validation_pack.", suffix=".zip", dir=job_dir)
+    os.close(fd)
+    temp_path = Path(temp_name)
+    fd, index_temp_name = tempfile.mkstemp(prefix=".validation_pack.", suffix=".json", dir=job_dir)
+    os.close(fd)
+    index_temp_path = Path(index_temp_name)
+    
+    try:
+        if not create_validation_pack(job_id, job_meta, temp_path):
+            return None
+        
+        with open(temp_path, 'rb') as f:
+            pack_hash = hashlib.sha256(f.read()).hexdigest()
+        
+        artifact = ValidationPackArtifact(
+            path=pack_path,
+            sha256=pack_hash,
+            state_key=state_key,
+            created_at=datetime.now(timezone.utc).isoformat()
+        )
+        with open(index_temp_path, 'w') as f:
+            json.dump({
+                "sha256": artifact.sha256,
+                "state_key": artifact.state_key,
+                "created_at": artifact.created_at
+            }, f, indent=2)
+        
+        os.replace(temp_path, pack_path)
+        os.replace(index_temp_path, job_dir / VALIDATION_PACK_INDEX_FILENAME)
+        
+        logger.info(f"Validation pack stored for job {job_id}: sha256={pack_hash[:12]}")
+        return artifact
+    finally:
+        for path in (temp_path, index_temp_path):
+            if path.exists():
+                path.unlink()
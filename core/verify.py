@@ -18,7 +18,6 @@ Example usage:
         print(f"Verification failed: {report.issues}")
 """
 
-import json
 import tempfile
 import zipfile
 from datetime import datetime, timezone, timedelta
@@ -43,6 +42,7 @@ from core.models import SpecV1, DecisionResult
 from core.normalize import normalize_temperature_data, load_csv_with_metadata
 from core.decide import make_decision
 from core.pack import calculate_content_hash, PackingError
+from core.serialization import dumps_canonical, loads
 
 logger = logging.getLogger(__name__)
 
@@ -314,7 +314,7 @@ def verify_bundle_integrity(bundle_path: str, extracted_files: Dict[str, str]) -
         # Read and parse manifest
         manifest_path = extracted_files["manifest.json"]
         with open(manifest_path, 'r', encoding='utf-8') as f:
-            manifest = json.load(f)
+            manifest = loads(f.read())
         
         verification["manifest_valid"] = True
         verification["root_hash"] = manifest.get("root_hash")
@@ -405,7 +405,7 @@ def recompute_decision(extracted_files: Dict[str, str]) -> Tuple[bool, Optional[
         # Load specification
         spec_path = Path(extracted_files["inputs/specification.json"])
         with open(spec_path, 'r', encoding='utf-8') as f:
-            spec_data = json.load(f)
+            spec_data = loads(f.read())
         
         try:
             spec = SpecV1(**spec_data)
@@ -455,7 +455,6 @@ def calculate_manifest_hash(manifest: Dict[str, Any]) -> str:
     Returns:
         SHA-256 hash of manifest
     """
-    import json
     import hashlib
     
     # Normalize manifest for consistent hashing
@@ -464,7 +463,7 @@ def calculate_manifest_hash(manifest: Dict[str, Any]) -> str:
         del manifest_copy['root_hash']  # Exclude root hash from hash calculation
     
     # Convert to JSON with sorted keys for deterministic output
-    manifest_json = json.dumps(manifest_copy, sort_keys=True, separators=(',', ':'))
+    manifest_json = dumps_canonical(manifest_copy, sort_keys=True, compact=True)
     return hashlib.sha256(manifest_json.encode('utf-8')).hexdigest()
 
 
@@ -832,7 +831,7 @@ def verify_evidence_bundle(bundle_path: str,
                 if "outputs/decision.json" in extracted_files:
                     decision_path = Path(extracted_files["outputs/decision.json"])
                     with open(decision_path, 'r', encoding='utf-8') as f:
-                        original_decision_data = json.load(f)
+                        original_decision_data = loads(f.read())
                     
                     try:
                         report.original_decision = DecisionResult(**original_decision_data)
@@ -0,0 +1,49 @@
+"""
+Gunicorn configuration for ProofKit.
+
+Gunicorn reads this file from the working directory automatically, so the
+command lines in the Dockerfile and fly.toml pick it up without changes.
+
+The app is imported once in the master (preload_app) and the plotting, PDF
+and metrics stacks that app.py loads lazily are imported there too before any
+worker is forked. Workers recycled by --max-requests then start from a warm
+copy-on-write image instead of re-importing matplotlib and reportlab, and
+gc.freeze() keeps the collector from touching (and so copying) the shared
+pages. Background threads are started per worker from the FastAPI startup
+event, never at import, so nothing the master holds is lost in the fork.
+
+Example usage:
+    gunicorn app:app --worker-class uvicorn.workers.UvicornWorker
+    GUNICORN_PRELOAD=0 gunicorn app:app ...   # import per worker instead
+"""
+
+import gc
+import importlib
+import os
+
+preload_app = os.environ.get("GUNICORN_PRELOAD", "1").lower() not in ("0", "false", "no")
+
+# Modules app.py defers until first use
+PREWARM_MODULES = (
+    "core.plot",
+    "core.render_pdf",
+    "core.metrics_powder",
+    "core.metrics_autoclave",
+    "core.metrics_coldchain",
+    "core.metrics_haccp",
+    "core.metrics_concrete",
+    "core.metrics_sterile",
+)
+
+
+def when_ready(server):
+    """Pre-warm lazily imported stacks in the master before workers fork."""
+    if not preload_app:
+        return
+    for module_name in PREWARM_MODULES:
+        try:
+            importlib.import_module(module_name)
+        except Exception as e:
+            server.log.warning(f"Could not pre-warm {module_name}: {e}")
+    gc.freeze()
+    server.log.info(f"Pre-warmed {len(PREWARM_MODULES)} modules in master")
@@ -20,7 +20,7 @@ from starlette.responses import Response
 from auth.magic import auth_handler
 from auth.models import User, UserRole
 from core.logging import get_logger
-from middleware.quota import load_user_quota_data
+from middleware.quota import get_user_plan
 
 logger = get_logger(__name__)
 
@@ -58,8 +58,7 @@ class CurrentUserMiddleware(BaseHTTPMiddleware):
                 if payload:
                     # Get user's current plan from quota system
                     try:
-                        quota_data = load_user_quota_data(payload["sub"])
-                        user_plan = quota_data.get('plan', 'free')
+                        user_plan = get_user_plan(payload["sub"])
                     except Exception as e:
                         logger.warning(f"Failed to load quota data for {payload['sub']}: {e}")
                         user_plan = 'free'  # Default to free plan if lookup fails
@@ -12,13 +12,18 @@ Example usage:
         
     # Record usage after successful compilation
     record_usage(user, 'certificate_compiled')
+    
+    # Batches reserve the whole quota up front and give back failed jobs
+    reserved, error_data = reserve_compilation_quota(user, len(jobs))
+    release_quota_reservation(user, failed_jobs)
 """
 
-import json
 import os
+import threading
+from contextlib import contextmanager
 from datetime import datetime, timezone, timedelta
 from pathlib import Path
-from typing import Dict, Any, Optional, Tuple, List
+from typing import Dict, Any, Iterator, Optional, Tuple, List
 try:
     import fcntl  # Unix-based file locking
 except ImportError:  # pragma: no cover - Windows fallback
@@ -54,6 +59,8 @@ except ImportError:
     def create_usage_record(*args, **kwargs):
         return None
 from core.logging import get_logger
+from core.serialization import dumps_canonical, loads
+from core.ttl_cache import TTLCache
 from auth.models import User
 
 logger = get_logger(__name__)
@@ -62,6 +69,16 @@ logger = get_logger(__name__)
 QUOTA_STORAGE_DIR = Path("storage/quota")
 QUOTA_STORAGE_DIR.mkdir(parents=True, exist_ok=True)
 
+# Fallback for platforms without fcntl (single process only)
+_transaction_lock = threading.Lock()
+
+# Plans looked up by the auth middleware on every authenticated request.
+# Plan changes in this process invalidate immediately; other workers see
+# them once their copy expires.
+USER_CONTEXT_TTL_S = float(os.environ.get('USER_CONTEXT_TTL_S', '30'))
+USER_CONTEXT_MAX_ENTRIES = int(os.environ.get('USER_CONTEXT_MAX_ENTRIES', '4096'))
+_user_plans = TTLCache(USER_CONTEXT_TTL_S, USER_CONTEXT_MAX_ENTRIES)
+
 
 def get_user_quota_file(user_email: str) -> Path:
     """
@@ -82,6 +99,37 @@ def get_user_quota_file(user_email: str) -> Path:
     return QUOTA_STORAGE_DIR / f"quota_{email_hash}.json"
 
 
+@contextmanager
+def quota_transaction(user_email: str) -> Iterator[None]:
+    """
+    Serialize read-modify-write updates of one user's quota data.
+    
+    Uses a per-user lock file (separate from the write lock taken by
+    save_user_quota_data) so threads and worker processes cannot lose
+    each other's updates.
+    
+    Args:
+        user_email: User email address
+        
+    Example:
+        >>> with quota_transaction('user@example.com'):
+        ...     data = load_user_quota_data('user@example.com')
+        ...     save_user_quota_data('user@example.com', data)
+    """
+    if fcntl is None:
+        with _transaction_lock:
+            yield
+        return
+    
+    lock_file = get_user_quota_file(user_email).with_suffix('.txn.lock')
+    with open(lock_file, 'w') as lf:
+        fcntl.flock(lf, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(lf, fcntl.LOCK_UN)
+
+
 def load_user_quota_data(user_email: str) -> Dict[str, Any]:
     """
     Load user's quota usage data.
@@ -104,6 +152,7 @@ def load_user_quota_data(user_email: str) -> Dict[str, Any]:
             'user_email': user_email,
             'plan': 'free',
             'total_certificates': 0,  # All-time count for free tier
+            'single_cert_credits': 0,  # Purchased certificates not yet used; never reset
             'current_month': {
                 'month': datetime.now(timezone.utc).strftime('%Y-%m'),
                 'certificates_compiled': 0,
@@ -121,7 +170,7 @@ def load_user_quota_data(user_email: str) -> Dict[str, Any]:
     
     try:
         with open(quota_file, 'r') as f:
-            data = json.load(f)
+            data = loads(f.read())
             
         # Reset monthly counters if new month
         current_month = datetime.now(timezone.utc).strftime('%Y-%m')
@@ -166,11 +215,11 @@ def save_user_quota_data(user_email: str, data: Dict[str, Any]) -> bool:
             with open(lock_file, 'w') as lf:
                 fcntl.flock(lf, fcntl.LOCK_EX)
                 with open(quota_file, 'w') as f:
-                    json.dump(data, f, indent=2)
+                    f.write(dumps_canonical(data))
                 fcntl.flock(lf, fcntl.LOCK_UN)
         else:
             with open(quota_file, 'w') as f:
-                json.dump(data, f, indent=2)
+                f.write(dumps_canonical(data))
         return True
         
     except Exception as e:
@@ -178,6 +227,34 @@ def save_user_quota_data(user_email: str, data: Dict[str, Any]) -> bool:
         return False
 
 
+def get_user_plan(user_email: str) -> str:
+    """
+    Return the user's plan, served from a short-lived cache.
+    
+    Args:
+        user_email: User email address
+        
+    Returns:
+        Plan name, 'free' if the quota data cannot be read
+        
+    Example:
+        >>> get_user_plan('user@example.com')
+        'pro'
+    """
+    plan = _user_plans.get(user_email)
+    if plan is not None:
+        return plan
+    
+    plan = load_user_quota_data(user_email).get('plan', 'free')
+    _user_plans.put(user_email, plan)
+    return plan
+
+
+def invalidate_user_plan(user_email: str) -> None:
+    """Drop the cached plan so the next request reads the quota file."""
+    _user_plans.invalidate(user_email)
+
+
 def check_compilation_quota(user: Optional[User]) -> Tuple[bool, Optional[Dict[str, Any]]]:
     """
     Check if user can compile another certificate within their quota.
@@ -212,12 +289,13 @@ def check_compilation_quota(user: Optional[User]) -> Tuple[bool, Optional[Dict[s
         }
     
     current_month_usage = quota_data['current_month']['certificates_compiled']
+    remaining = _remaining_certificates(quota_data, plan)
     
-    # Free tier logic - 2 certificates total (lifetime)
+    # Free tier logic - 2 certificates total (lifetime), plus purchased single certificates
     if user_plan == 'free':
         total_certificates = quota_data.get('total_certificates', 0)
         
-        if total_certificates >= 2:
+        if remaining < 1:
             # Free tier exceeded - offer upgrade or single purchase
             single_cert_price = get_single_cert_price('free')
             checkout_session = create_oneoff_checkout(
@@ -250,7 +328,8 @@ def check_compilation_quota(user: Optional[User]) -> Tuple[bool, Optional[Dict[s
     else:
         monthly_quota = plan['jobs_month']
         
-        if current_month_usage >= monthly_quota:
+        over_quota = current_month_usage >= monthly_quota if remaining is None else remaining < 1
+        if over_quota:
             # Over monthly quota - check if overage is available
             overage_price = plan.get('overage_price_usd')
             
@@ -304,39 +383,185 @@ def record_usage(user: Optional[User], usage_type: str = 'certificate_compiled')
         
     try:
         user_email = user.email
+        with quota_transaction(user_email):
+            quota_data = load_user_quota_data(user_email)
+            
+            # Update counters
+            if usage_type == 'certificate_compiled':
+                _apply_certificate_usage(quota_data, 1)
+            
+            # Save updated data
+            return save_user_quota_data(user_email, quota_data)
+        
+    except Exception as e:
+        logger.error(f"Error recording usage for user {user.email if user else 'anonymous'}: {e}")
+        return False
+
+
+def _plan_usage(quota_data: Dict[str, Any], plan: Dict[str, Any]) -> Tuple[int, Optional[int]]:
+    """Certificates counted against the plan allowance, and the allowance (None if uncapped)."""
+    if quota_data.get('plan', 'free') == 'free':
+        # Free tier allowance is lifetime, not monthly
+        return quota_data.get('total_certificates', 0), plan['jobs_month']
+    used = quota_data['current_month']['certificates_compiled']
+    if plan['jobs_month'] == -1 or (plan.get('overage_price_usd') or 0) > 0:
+        # Unlimited plan, or overage is billed
+        return used, None
+    return used, plan['jobs_month']
+
+
+def _remaining_certificates(quota_data: Dict[str, Any], plan: Dict[str, Any]) -> Optional[int]:
+    """Certificates left on the plan allowance plus purchased credits, or None if uncapped."""
+    used, allowance = _plan_usage(quota_data, plan)
+    if allowance is None:
+        return None
+    return max(0, allowance - used) + quota_data.get('single_cert_credits', 0)
+
+
+def _credits_beyond_allowance(quota_data: Dict[str, Any], plan: Optional[Dict[str, Any]]) -> int:
+    """Certificates compiled past the plan allowance, each paid for by a purchased credit."""
+    if not plan:
+        return 0
+    used, allowance = _plan_usage(quota_data, plan)
+    return max(0, used - allowance) if allowance is not None else 0
+
+
+def _apply_certificate_usage(quota_data: Dict[str, Any], count: int) -> None:
+    """Add count compiled certificates to the usage counters, spending purchased credits past the allowance."""
+    user_email = quota_data.get('user_email')
+    user_plan = quota_data.get('plan', 'free')
+    plan = get_plan(user_plan)
+    beyond_before = _credits_beyond_allowance(quota_data, plan)
+    quota_data['current_month']['certificates_compiled'] += count
+    
+    # Update total for free tier
+    if user_plan == 'free':
+        quota_data['total_certificates'] = quota_data.get('total_certificates', 0) + count
+    
+    spent = _credits_beyond_allowance(quota_data, plan) - beyond_before
+    if spent:
+        quota_data['single_cert_credits'] = max(0, quota_data.get('single_cert_credits', 0) - spent)
+    
+    # Check if this is overage usage for paid plans
+    if plan and user_plan != 'free':
+        monthly_quota = plan['jobs_month']
+        current_usage = quota_data['current_month']['certificates_compiled']
+        
+        if monthly_quota != -1 and current_usage > monthly_quota:
+            # This is overage - increment overage counter
+            quota_data['current_month']['overage_used'] += min(count, current_usage - monthly_quota)
+            
+            # Create Stripe usage record if subscription active
+            subscription_id = quota_data.get('subscription', {}).get('stripe_subscription_id')
+            if subscription_id:
+                # Note: In real implementation, you'd need the subscription_item_id
+                # for the overage price. This would be stored during subscription creation.
+                logger.info(f"Overage usage recorded for {user_email}: {current_usage}/{monthly_quota}")
+
+
+def reserve_compilation_quota(user: Optional[User], count: int) -> Tuple[bool, Optional[Dict[str, Any]]]:
+    """
+    Atomically reserve quota for a batch of certificate compilations.
+    
+    The whole batch is granted or refused: usage is incremented by count in
+    one locked update, so concurrent requests cannot overshoot the quota.
+    Release the share of failed jobs with release_quota_reservation().
+    
+    Args:
+        user: Authenticated user object (None for anonymous)
+        count: Number of certificates to reserve
+        
+    Returns:
+        Tuple of (reserved, error_response_data)
+        
+    Example:
+        >>> reserved, error = reserve_compilation_quota(current_user, len(jobs))
+        >>> if not reserved:
+        ...     return JSONResponse(status_code=402, content=error)
+    """
+    if not user or count <= 0:
+        return True, None
+    
+    user_email = user.email
+    with quota_transaction(user_email):
         quota_data = load_user_quota_data(user_email)
         user_plan = quota_data.get('plan', 'free')
+        plan = get_plan(user_plan)
+        if not plan:
+            logger.error(f"Invalid plan for user {user_email}: {user_plan}")
+            return False, {
+                'error': 'Invalid user plan configuration',
+                'code': 'INVALID_PLAN'
+            }
         
-        # Update counters
-        if usage_type == 'certificate_compiled':
-            quota_data['current_month']['certificates_compiled'] += 1
+        # Same allowance rule as check_compilation_quota, for count certificates
+        remaining = _remaining_certificates(quota_data, plan)
+        if remaining is not None and remaining < count:
+            return False, {
+                'error': 'Batch exceeds remaining quota',
+                'code': 'BATCH_QUOTA_EXCEEDED',
+                'message': f'This batch needs {count} certificates but only {remaining} remain on your plan.',
+                'requested': count,
+                'remaining': remaining,
+                'plan': user_plan,
+                'upgrade_url': '/pricing'
+            }
+        
+        _apply_certificate_usage(quota_data, count)
+        if not save_user_quota_data(user_email, quota_data):
+            return False, {
+                'error': 'Quota reservation failed',
+                'code': 'QUOTA_STORAGE_ERROR'
+            }
+    
+    logger.info(f"Reserved {count} certificates for {user_email}")
+    return True, None
+
+
+def release_quota_reservation(user: Optional[User], count: int) -> bool:
+    """
+    Return unused certificates from a reservation (e.g. failed batch jobs).
+    
+    Args:
+        user: Authenticated user object (None for anonymous)
+        count: Number of reserved certificates to give back
+        
+    Returns:
+        True if released successfully, False otherwise
+        
+    Example:
+        >>> release_quota_reservation(current_user, failed_jobs)
+    """
+    if not user or count <= 0:
+        return True
+    
+    try:
+        user_email = user.email
+        with quota_transaction(user_email):
+            quota_data = load_user_quota_data(user_email)
+            month = quota_data['current_month']
+            user_plan = quota_data.get('plan', 'free')
+            plan = get_plan(user_plan)
+            beyond_before = _credits_beyond_allowance(quota_data, plan)
+            month['certificates_compiled'] = max(0, month['certificates_compiled'] - count)
             
-            # Update total for free tier
             if user_plan == 'free':
-                quota_data['total_certificates'] = quota_data.get('total_certificates', 0) + 1
+                quota_data['total_certificates'] = max(0, quota_data.get('total_certificates', 0) - count)
+            else:
+                if plan and plan['jobs_month'] != -1:
+                    over_quota = max(0, month['certificates_compiled'] - plan['jobs_month'])
+                    month['overage_used'] = min(month['overage_used'], over_quota)
             
-            # Check if this is overage usage for paid plans
-            plan = get_plan(user_plan)
-            if plan and user_plan != 'free':
-                monthly_quota = plan['jobs_month']
-                current_usage = quota_data['current_month']['certificates_compiled']
-                
-                if current_usage > monthly_quota:
-                    # This is overage - increment overage counter
-                    quota_data['current_month']['overage_used'] += 1
-                    
-                    # Create Stripe usage record if subscription active
-                    subscription_id = quota_data.get('subscription', {}).get('stripe_subscription_id')
-                    if subscription_id:
-                        # Note: In real implementation, you'd need the subscription_item_id
-                        # for the overage price. This would be stored during subscription creation.
-                        logger.info(f"Overage usage recorded for {user_email}: {current_usage}/{monthly_quota}")
-        
-        # Save updated data
-        return save_user_quota_data(user_email, quota_data)
-        
+            # Give back the purchased credits the released certificates spent
+            refunded = beyond_before - _credits_beyond_allowance(quota_data, plan)
+            if refunded > 0:
+                quota_data['single_cert_credits'] = quota_data.get('single_cert_credits', 0) + refunded
+            
+            logger.info(f"Released {count} reserved certificates for {user_email}")
+            return save_user_quota_data(user_email, quota_data)
+    
     except Exception as e:
-        logger.error(f"Error recording usage for user {user.email if user else 'anonymous'}: {e}")
+        logger.error(f"Error releasing quota for user {user.email if user else 'anonymous'}: {e}")
         return False
 
 
@@ -356,19 +581,22 @@ def update_user_plan(user_email: str, new_plan: str, subscription_data: Optional
         >>> update_user_plan('user@example.com', 'pro', stripe_subscription_data)
     """
     try:
-        quota_data = load_user_quota_data(user_email)
-        quota_data['plan'] = new_plan
-        
-        if subscription_data:
-            quota_data['subscription'] = {
-                'stripe_subscription_id': subscription_data.get('id'),
-                'stripe_customer_id': subscription_data.get('customer'),
-                'active': subscription_data.get('status') == 'active',
-                'current_period_end': subscription_data.get('current_period_end')
-            }
-        
-        logger.info(f"Updated plan for {user_email}: {new_plan}")
-        return save_user_quota_data(user_email, quota_data)
+        with quota_transaction(user_email):
+            quota_data = load_user_quota_data(user_email)
+            quota_data['plan'] = new_plan
+            
+            if subscription_data:
+                quota_data['subscription'] = {
+                    'stripe_subscription_id': subscription_data.get('id'),
+                    'stripe_customer_id': subscription_data.get('customer'),
+                    'active': subscription_data.get('status') == 'active',
+                    'current_period_end': subscription_data.get('current_period_end')
+                }
+            
+            logger.info(f"Updated plan for {user_email}: {new_plan}")
+            saved = save_user_quota_data(user_email, quota_data)
+            invalidate_user_plan(user_email)
+            return saved
         
     except Exception as e:
         logger.error(f"Error updating plan for {user_email}: {e}")
@@ -456,11 +684,14 @@ def process_single_certificate_purchase(user_email: str, certificate_count: int
         >>> process_single_certificate_purchase('user@example.com', 3)
     """
     try:
-        quota_data = load_user_quota_data(user_email)
-        quota_data['current_month']['single_certs_purchased'] += certificate_count
-        
-        logger.info(f"Processed single cert purchase for {user_email}: {certificate_count} certificates")
-        return save_user_quota_data(user_email, quota_data)
+        with quota_transaction(user_email):
+            quota_data = load_user_quota_data(user_email)
+            quota_data['current_month']['single_certs_purchased'] += certificate_count
+            # Purchases carry over month to month until used
+            quota_data['single_cert_credits'] = quota_data.get('single_cert_credits', 0) + certificate_count
+            
+            logger.info(f"Processed single cert purchase for {user_email}: {certificate_count} certificates")
+            return save_user_quota_data(user_email, quota_data)
         
     except Exception as e:
         logger.error(f"Error processing single cert purchase for {user_email}: {e}")
@@ -17,47 +17,113 @@ import hashlib
 import time
 import os
 from typing import Tuple, Optional, Dict, Any
-from datetime import datetime, timedelta
 from pathlib import Path
 from fastapi import Request
 import logging
 
+from core.sqlite_store import connect, immediate_transaction
+
 logger = logging.getLogger(__name__)
 
-# Storage for trial tracking using persistent storage directory
+# Storage for trial tracking using persistent storage directory. One row per
+# signup, indexed by IP, fingerprint and time; rows older than
+# TRIAL_RETENTION_DAYS are purged as new signups are recorded.
+TRIAL_DB_PATH = Path("storage/trial_tracking/trials.db")
+
+# Single-blob JSON store used by earlier releases, imported on first use
 TRIAL_DATA_PATH = Path("storage/trial_tracking/trial_data.json")
 
 # Configuration from environment variables (with defaults)
 MAX_TRIALS_PER_IP = int(os.environ.get("MAX_TRIALS_PER_IP", "2"))
 MAX_TRIALS_PER_FINGERPRINT = int(os.environ.get("MAX_TRIALS_PER_FINGERPRINT", "3"))
 COOLDOWN_DAYS = int(os.environ.get("TRIAL_COOLDOWN_DAYS", "30"))
+TRIAL_RETENTION_DAYS = int(os.environ.get("TRIAL_RETENTION_DAYS", "90"))
 
 
-def load_trial_data() -> Dict[str, Any]:
-    """Load trial tracking data from storage."""
+def _retention_cutoff(days: int = TRIAL_RETENTION_DAYS) -> float:
+    return time.time() - (days * 24 * 60 * 60)
+
+
+def _connect_trials():
+    """
+    Open the trial tracking database, creating the schema on first use.
+    
+    A legacy trial_data.json blob is imported once and renamed so its
+    history keeps counting towards the limits.
+    """
+    conn = connect(TRIAL_DB_PATH)
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS trial_signups (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            email TEXT NOT NULL,
+            ip TEXT NOT NULL,
+            fingerprint TEXT NOT NULL,
+            created_at REAL NOT NULL
+        )
+    """)
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_trial_ip ON trial_signups (ip, created_at)")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_trial_fingerprint ON trial_signups (fingerprint, created_at)")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_trial_created ON trial_signups (created_at)")
+    
     if TRIAL_DATA_PATH.exists():
+        _import_legacy_trial_data(conn)
+    
+    return conn
+
+
+def _import_legacy_trial_data(conn) -> None:
+    """Move signups from the legacy JSON blob into the table."""
+    with immediate_transaction(conn):
+        if not TRIAL_DATA_PATH.exists():
+            return  # Another worker imported it first
         try:
             with open(TRIAL_DATA_PATH, 'r') as f:
-                return json.load(f)
+                data = json.load(f)
         except Exception as e:
-            logger.error(f"Failed to load trial data: {e}")
+            logger.error(f"Failed to load legacy trial data: {e}")
+            return
+        
+        rows = [
+            (trial.get("email", ""), ip, trial.get("fingerprint", ""), trial.get("timestamp", 0))
+            for ip, trials in data.get("ip_trials", {}).items()
+            for trial in trials
+        ]
+        conn.executemany(
+            "INSERT INTO trial_signups (email, ip, fingerprint, created_at) VALUES (?, ?, ?, ?)", rows
+        )
+        TRIAL_DATA_PATH.rename(TRIAL_DATA_PATH.with_suffix(".json.imported"))
+        logger.info(f"Imported {len(rows)} legacy trial signups")
+
+
+def load_trial_data() -> Dict[str, Any]:
+    """
+    Load all retained trial signups in the legacy nested-dictionary layout.
     
-    return {
+    Reads the whole table; meant for admin tooling, not request handling.
+    """
+    data = {
         "ip_trials": {},  # IP -> list of emails and timestamps
         "fingerprint_trials": {},  # Fingerprint -> list of emails and timestamps
         "email_ips": {},  # Email -> list of IPs used
-        "suspicious_patterns": []  # List of suspicious behavior patterns
     }
-
-
-def save_trial_data(data: Dict[str, Any]) -> None:
-    """Save trial tracking data to storage."""
+    conn = _connect_trials()
     try:
-        TRIAL_DATA_PATH.parent.mkdir(parents=True, exist_ok=True)
-        with open(TRIAL_DATA_PATH, 'w') as f:
-            json.dump(data, f, indent=2, default=str)
-    except Exception as e:
-        logger.error(f"Failed to save trial data: {e}")
+        rows = conn.execute(
+            "SELECT email, ip, fingerprint, created_at FROM trial_signups WHERE created_at > ? ORDER BY id",
+            (_retention_cutoff(),)
+        ).fetchall()
+    finally:
+        conn.close()
+    
+    for row in rows:
+        data["ip_trials"].setdefault(row["ip"], []).append(
+            {"email": row["email"], "timestamp": row["created_at"], "fingerprint": row["fingerprint"]})
+        data["fingerprint_trials"].setdefault(row["fingerprint"], []).append(
+            {"email": row["email"], "timestamp": row["created_at"], "ip": row["ip"]})
+        ips = data["email_ips"].setdefault(row["email"], [])
+        if row["ip"] not in ips:
+            ips.append(row["ip"])
+    return data
 
 
 def get_client_ip(request: Request) -> str:
@@ -156,25 +222,34 @@ def check_trial_abuse(request: Request, email: str) -> Tuple[bool, Optional[str]
     # Log the identifiers for debugging
     logger.info(f"Checking trial abuse for {email} from IP: {client_ip}, fingerprint: {device_fingerprint[:8]}...")
     
-    # Load tracking data
-    data = load_trial_data()
+    # Load this IP's and device's retained signups
+    conn = _connect_trials()
+    try:
+        retention_cutoff = _retention_cutoff()
+        ip_trials = [
+            {"email": row["email"], "timestamp": row["created_at"]}
+            for row in conn.execute(
+                "SELECT email, created_at FROM trial_signups WHERE ip = ? AND created_at > ? ORDER BY id",
+                (client_ip, retention_cutoff)
+            )
+        ]
+        fp_trial_count = conn.execute(
+            "SELECT COUNT(*) FROM trial_signups WHERE fingerprint = ? AND created_at > ?",
+            (device_fingerprint, retention_cutoff)
+        ).fetchone()[0]
+    finally:
+        conn.close()
     
     # Check IP-based limits
-    ip_trials = data.get("ip_trials", {}).get(client_ip, [])
-    recent_ip_trials = []
     cutoff_time = time.time() - (COOLDOWN_DAYS * 24 * 60 * 60)
-    
-    for trial in ip_trials:
-        if trial.get("timestamp", 0) > cutoff_time:
-            recent_ip_trials.append(trial)
+    recent_ip_trials = [trial for trial in ip_trials if trial["timestamp"] > cutoff_time]
     
     if len(recent_ip_trials) >= MAX_TRIALS_PER_IP:
         logger.warning(f"Trial abuse detected - IP limit reached: {client_ip} -> {email}")
         return True, f"Maximum trial accounts reached from this network. Please upgrade existing account."
     
     # Check device fingerprint limits
-    fp_trials = data.get("fingerprint_trials", {}).get(device_fingerprint, [])
-    if len(fp_trials) >= MAX_TRIALS_PER_FINGERPRINT:
+    if fp_trial_count >= MAX_TRIALS_PER_FINGERPRINT:
         logger.warning(f"Trial abuse detected - Device limit reached: {device_fingerprint} -> {email}")
         return True, f"Maximum trial accounts reached from this device. Please upgrade existing account."
     
@@ -227,37 +302,16 @@ def record_trial_signup(request: Request, email: str) -> None:
     
     logger.info(f"Recording trial signup for {email} from IP: {client_ip}, fingerprint: {device_fingerprint[:8]}...")
     
-    data = load_trial_data()
-    
-    # Record IP trial
-    if client_ip not in data["ip_trials"]:
-        data["ip_trials"][client_ip] = []
-    
-    data["ip_trials"][client_ip].append({
-        "email": email,
-        "timestamp": time.time(),
-        "fingerprint": device_fingerprint
-    })
-    
-    # Record device fingerprint trial
-    if device_fingerprint not in data["fingerprint_trials"]:
-        data["fingerprint_trials"][device_fingerprint] = []
-    
-    data["fingerprint_trials"][device_fingerprint].append({
-        "email": email,
-        "timestamp": time.time(),
-        "ip": client_ip
-    })
-    
-    # Record email -> IP mapping
-    if email not in data["email_ips"]:
-        data["email_ips"][email] = []
-    
-    if client_ip not in data["email_ips"][email]:
-        data["email_ips"][email].append(client_ip)
-    
-    # Save updated data
-    save_trial_data(data)
+    conn = _connect_trials()
+    try:
+        with immediate_transaction(conn):
+            conn.execute(
+                "INSERT INTO trial_signups (email, ip, fingerprint, created_at) VALUES (?, ?, ?, ?)",
+                (email, client_ip, device_fingerprint, time.time())
+            )
+            conn.execute("DELETE FROM trial_signups WHERE created_at <= ?", (_retention_cutoff(),))
+    finally:
+        conn.close()
     
     logger.info(f"Recorded trial signup: {email} from {client_ip}")
 
@@ -269,66 +323,84 @@ def get_trial_statistics() -> Dict[str, Any]:
     Returns:
         Dictionary with trial statistics
     """
-    data = load_trial_data()
-    
-    stats = {
-        "total_ips": len(data.get("ip_trials", {})),
-        "total_fingerprints": len(data.get("fingerprint_trials", {})),
-        "total_emails": len(data.get("email_ips", {})),
-        "suspicious_ips": [],
-        "suspicious_fingerprints": []
-    }
-    
-    # Find IPs with multiple trials
-    for ip, trials in data.get("ip_trials", {}).items():
-        if len(trials) >= MAX_TRIALS_PER_IP:
-            stats["suspicious_ips"].append({
-                "ip": ip,
-                "trial_count": len(trials),
-                "emails": [t["email"] for t in trials]
-            })
-    
-    # Find fingerprints with multiple trials  
-    for fp, trials in data.get("fingerprint_trials", {}).items():
-        if len(trials) >= MAX_TRIALS_PER_FINGERPRINT:
-            stats["suspicious_fingerprints"].append({
-                "fingerprint": fp,
-                "trial_count": len(trials),
-                "emails": [t["email"] for t in trials]
-            })
-    
-    return stats
+    conn = _connect_trials()
+    try:
+        retention_cutoff = _retention_cutoff()
+        
+        def distinct(column: str) -> int:
+            return conn.execute(
+                f"SELECT COUNT(DISTINCT {column}) FROM trial_signups WHERE created_at > ?", (retention_cutoff,)
+            ).fetchone()[0]
+        
+        def over_limit(column: str, limit: int):
+            return [
+                {column: key, "trial_count": len(emails), "emails": emails}
+                for key, emails in _grouped_emails(conn, column, retention_cutoff, limit).items()
+            ]
+        
+        return {
+            "total_ips": distinct("ip"),
+            "total_fingerprints": distinct("fingerprint"),
+            "total_emails": distinct("email"),
+            "suspicious_ips": over_limit("ip", MAX_TRIALS_PER_IP),
+            "suspicious_fingerprints": over_limit("fingerprint", MAX_TRIALS_PER_FINGERPRINT),
+        }
+    finally:
+        conn.close()
+
 
+def _grouped_emails(conn, column: str, since: float, min_count: int) -> Dict[str, list]:
+    """Emails signed up per IP or fingerprint, for groups with at least min_count signups."""
+    grouped: Dict[str, list] = {}
+    rows = conn.execute(
+        f"""
+        SELECT {column} AS key, email FROM trial_signups
+        WHERE created_at > ? AND {column} IN (
+            SELECT {column} FROM trial_signups WHERE created_at > ?
+            GROUP BY {column} HAVING COUNT(*) >= ?
+        )
+        ORDER BY id
+        """,
+        (since, since, min_count)
+    )
+    for row in rows:
+        grouped.setdefault(row["key"], []).append(row["email"])
+    return grouped
 
-def cleanup_old_trial_data(days: int = 90) -> None:
+
+def cleanup_old_trial_data(days: int = TRIAL_RETENTION_DAYS) -> int:
     """
     Remove trial tracking data older than specified days.
     
     Args:
         days: Number of days to keep data
+        
+    Returns:
+        Number of signups removed
+    """
+    conn = _connect_trials()
+    try:
+        removed = conn.execute(
+            "DELETE FROM trial_signups WHERE created_at <= ?", (_retention_cutoff(days),)
+        ).rowcount
+    finally:
+        conn.close()
+    logger.info(f"Cleaned up trial data older than {days} days")
+    return removed
+
+
+def reset_trial_ip(ip: str) -> int:
     """
-    data = load_trial_data()
-    cutoff_time = time.time() - (days * 24 * 60 * 60)
+    Forget every trial signup recorded for one IP address.
     
-    # Clean IP trials
-    for ip in list(data.get("ip_trials", {}).keys()):
-        trials = data["ip_trials"][ip]
-        recent_trials = [t for t in trials if t.get("timestamp", 0) > cutoff_time]
-        
-        if recent_trials:
-            data["ip_trials"][ip] = recent_trials
-        else:
-            del data["ip_trials"][ip]
-    
-    # Clean fingerprint trials
-    for fp in list(data.get("fingerprint_trials", {}).keys()):
-        trials = data["fingerprint_trials"][fp]
-        recent_trials = [t for t in trials if t.get("timestamp", 0) > cutoff_time]
+    Args:
+        ip: Client IP address
         
-        if recent_trials:
-            data["fingerprint_trials"][fp] = recent_trials
-        else:
-            del data["fingerprint_trials"][fp]
-    
-    save_trial_data(data)
-    logger.info(f"Cleaned up trial data older than {days} days")
\ No newline at end of file
+    Returns:
+        Number of signups removed
+    """
+    conn = _connect_trials()
+    try:
+        return conn.execute("DELETE FROM trial_signups WHERE ip = ?", (ip,)).rowcount
+    finally:
+        conn.close()
@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+ProofKit Startup Import Profile
+
+Measures what a fresh worker pays to import the application, using
+`python -X importtime` in a clean subprocess, and lists the slowest
+top-level imports. Used by `make benchmark-startup` to catch heavy stacks
+(matplotlib, reportlab, metrics engines) creeping back into module import.
+
+Usage:
+    python scripts/import_profile.py
+    python scripts/import_profile.py --module app --top 15
+    python scripts/import_profile.py --budget-ms 2500 --forbid matplotlib reportlab
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+
+MODULES_MARKER = "--- loaded modules ---"
+
+# Stacks app.py loads on first use; importing the app must not pull them in
+LAZY_MODULES = ["matplotlib", "reportlab", "PyPDF2", "qrcode", "core.plot", "core.render_pdf"]
+
+
+def profile_import(module: str) -> Tuple[List[Tuple[str, int, int, int]], List[str]]:
+    """
+    Import a module in a fresh interpreter with -X importtime.
+
+    Args:
+        module: Dotted module name to import
+
+    Returns:
+        Tuple of (rows of (name, self_us, cumulative_us, depth), loaded module names)
+    """
+    code = f"import sys, {module}; print('{MODULES_MARKER}'); print('\\n'.join(sorted(sys.modules)))"
+    env = dict(os.environ, PYTHONPATH=str(BASE_DIR))
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        cwd=BASE_DIR, env=env, capture_output=True, text=True, check=True,
+    )
+
+    rows = []
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        if not self_us.strip().isdigit():
+            continue  # Header line
+        depth = (len(name) - len(name.lstrip())) // 2
+        rows.append((name.strip(), int(self_us), int(cumulative_us), depth))
+    loaded = proc.stdout.split(MODULES_MARKER, 1)[-1].split()
+    return rows, loaded
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Profile application import time")
+    parser.add_argument("--module", default="app", help="Module to import (default: app)")
+    parser.add_argument("--top", type=int, default=20, help="Number of imports to list")
+    parser.add_argument("--budget-ms", type=float, help="Fail if total import time exceeds this")
+    parser.add_argument("--forbid", nargs="*", default=LAZY_MODULES,
+                        help="Modules that must not be loaded by the import")
+    args = parser.parse_args()
+
+    rows, loaded = profile_import(args.module)
+    target = [r for r in rows if r[0] == args.module]
+    total_ms = target[-1][2] / 1000 if target else sum(r[1] for r in rows) / 1000
+
+    # Direct dependencies of the target carry the useful attribution
+    top_level: Dict[str, int] = {}
+    min_depth = min((r[3] for r in rows), default=0)
+    for name, _, cumulative_us, depth in rows:
+        if depth == min_depth + 1 or (depth == min_depth and name != args.module):
+            top_level[name] = max(top_level.get(name, 0), cumulative_us)
+
+    print(f"import {args.module}: {total_ms:.0f} ms ({len(loaded)} modules loaded)")
+    print(f"{'cumulative ms':>14}  module")
+    for name, cumulative_us in sorted(top_level.items(), key=lambda kv: -kv[1])[:args.top]:
+        print(f"{cumulative_us / 1000:14.1f}  {name}")
+
+    failed = False
+    eager = [m for m in args.forbid if m in loaded]
+    if eager:
+        print(f"FAIL: loaded at import: {', '.join(eager)}")
+        failed = True
+    if args.budget_ms is not None and total_ms > args.budget_ms:
+        print(f"FAIL: {total_ms:.0f} ms exceeds budget of {args.budget_ms:.0f} ms")
+        failed = True
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+ProofKit JSON Serialization Benchmark
+
+Times the stdlib json module against core.serialization on the payloads the
+compile path writes and returns: the stored decision, the sorted evidence
+manifest and the API response. Checks that the canonical output is still
+byte-identical to json.dumps, since those bytes are hashed into evidence
+bundles. Used by `make benchmark-json`.
+
+Usage:
+    python scripts/serialize_benchmark.py
+    python scripts/serialize_benchmark.py --iterations 5000
+"""
+
+import argparse
+import json
+import sys
+import timeit
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Tuple
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(BASE_DIR))
+
+from core.serialization import dumps_canonical, dumps_fast, loads, orjson  # noqa: E402
+
+DECISION_FILES = sorted((BASE_DIR / "validation_outputs").glob("*/decision.json"))
+MANIFEST_FILE = BASE_DIR / "web" / "static" / "examples" / "manifest.json"
+
+
+def load_payloads() -> Dict[str, Any]:
+    """Load representative payloads from the repository."""
+    payloads: Dict[str, Any] = {}
+    if DECISION_FILES:
+        payloads["decision"] = json.loads(DECISION_FILES[0].read_text())
+        payloads["decisions (batch)"] = [json.loads(p.read_text()) for p in DECISION_FILES]
+    if MANIFEST_FILE.exists():
+        payloads["manifest"] = json.loads(MANIFEST_FILE.read_text())
+    return payloads
+
+
+def time_us(func: Callable[[], Any], iterations: int) -> float:
+    """Best-of-3 microseconds per call."""
+    return min(timeit.repeat(func, number=iterations, repeat=3)) / iterations * 1e6
+
+
+def benchmark(payload: Any, iterations: int) -> List[Tuple[str, float, float]]:
+    """Return (operation, stdlib µs, core.serialization µs) rows."""
+    text = json.dumps(payload, indent=2)
+    return [
+        ("canonical (indent=2)",
+         time_us(lambda: json.dumps(payload, indent=2), iterations),
+         time_us(lambda: dumps_canonical(payload), iterations)),
+        ("canonical (sorted)",
+         time_us(lambda: json.dumps(payload, indent=2, sort_keys=True), iterations),
+         time_us(lambda: dumps_canonical(payload, sort_keys=True), iterations)),
+        ("response body",
+         time_us(lambda: json.dumps(payload, ensure_ascii=False, allow_nan=False,
+                                    separators=(',', ':')).encode('utf-8'), iterations),
+         time_us(lambda: dumps_fast(payload), iterations)),
+        ("parse",
+         time_us(lambda: json.loads(text), iterations),
+         time_us(lambda: loads(text), iterations)),
+    ]
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark JSON serialization paths")
+    parser.add_argument("--iterations", type=int, default=2000, help="Calls per timing run")
+    args = parser.parse_args()
+
+    payloads = load_payloads()
+    if not payloads:
+        print("No example payloads found")
+        return 1
+
+    print(f"orjson: {orjson.__version__ if orjson else 'not installed (stdlib fallback)'}")
+    mismatches = 0
+    for name, payload in payloads.items():
+        for sort_keys in (False, True):
+            if dumps_canonical(payload, sort_keys=sort_keys) != json.dumps(payload, indent=2, sort_keys=sort_keys):
+                mismatches += 1
+                print(f"MISMATCH: canonical output differs from json.dumps for {name}")
+
+        size = len(json.dumps(payload, indent=2))
+        print(f"\n{name} ({size:,} bytes)")
+        print(f"  {'operation':<22}{'stdlib µs':>12}{'fast µs':>12}{'speedup':>10}")
+        for operation, stdlib_us, fast_us in benchmark(payload, args.iterations):
+            print(f"  {operation:<22}{stdlib_us:>12.1f}{fast_us:>12.1f}{stdlib_us / fast_us:>9.1f}x")
+
+    return 1 if mismatches else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
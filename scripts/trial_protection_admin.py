@@ -10,7 +10,6 @@ Commands:
   check    - Check if IP or email would be blocked
 """
 
-import json
 import sys
 import time
 from datetime import datetime
@@ -19,20 +18,7 @@ from pathlib import Path
 # Add project root to path
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-def load_trial_data():
-    """Load trial tracking data."""
-    trial_path = Path("storage/trial_tracking/trial_data.json")
-    if trial_path.exists():
-        with open(trial_path, 'r') as f:
-            return json.load(f)
-    return {"ip_trials": {}, "fingerprint_trials": {}, "email_ips": {}}
-
-def save_trial_data(data):
-    """Save trial tracking data."""
-    trial_path = Path("storage/trial_tracking/trial_data.json")
-    trial_path.parent.mkdir(parents=True, exist_ok=True)
-    with open(trial_path, 'w') as f:
-        json.dump(data, f, indent=2, default=str)
+from middleware.trial_protection import cleanup_old_trial_data, load_trial_data, reset_trial_ip
 
 def show_stats():
     """Display trial usage statistics."""
@@ -80,59 +66,17 @@ def list_all():
 
 def clean_old_data(days=30):
     """Clean up old trial data."""
-    data = load_trial_data()
-    cutoff_time = time.time() - (days * 24 * 60 * 60)
-    
-    cleaned_ips = 0
-    cleaned_fingerprints = 0
-    
-    # Clean IP trials
-    for ip in list(data.get("ip_trials", {}).keys()):
-        trials = data["ip_trials"][ip]
-        recent_trials = [t for t in trials if t.get("timestamp", 0) > cutoff_time]
-        
-        if recent_trials:
-            data["ip_trials"][ip] = recent_trials
-        else:
-            del data["ip_trials"][ip]
-            cleaned_ips += 1
-    
-    # Clean fingerprint trials
-    for fp in list(data.get("fingerprint_trials", {}).keys()):
-        trials = data["fingerprint_trials"][fp]
-        recent_trials = [t for t in trials if t.get("timestamp", 0) > cutoff_time]
-        
-        if recent_trials:
-            data["fingerprint_trials"][fp] = recent_trials
-        else:
-            del data["fingerprint_trials"][fp]
-            cleaned_fingerprints += 1
-    
-    save_trial_data(data)
+    removed = cleanup_old_trial_data(days)
     
     print(f"🧹 Cleaned up data older than {days} days")
-    print(f"  - Removed {cleaned_ips} old IP records")
-    print(f"  - Removed {cleaned_fingerprints} old fingerprint records")
+    print(f"  - Removed {removed} old trial signups")
 
 def reset_ip(ip):
     """Reset trial data for a specific IP."""
-    data = load_trial_data()
+    removed = reset_trial_ip(ip)
     
-    if ip in data.get("ip_trials", {}):
-        trials = data["ip_trials"][ip]
-        emails = [t.get("email", "unknown") for t in trials]
-        del data["ip_trials"][ip]
-        
-        # Also clean up email mappings
-        for email in emails:
-            if email in data.get("email_ips", {}):
-                if ip in data["email_ips"][email]:
-                    data["email_ips"][email].remove(ip)
-                if not data["email_ips"][email]:
-                    del data["email_ips"][email]
-        
-        save_trial_data(data)
-        print(f"✅ Reset trial data for IP {ip} ({len(trials)} trials removed)")
+    if removed:
+        print(f"✅ Reset trial data for IP {ip} ({removed} trials removed)")
     else:
         print(f"❌ No trial data found for IP {ip}")
 
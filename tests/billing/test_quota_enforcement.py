@@ -287,7 +287,7 @@ class TestQuotaEnforcementIntegration:
         """Test quota system handles errors gracefully."""
         with patch('middleware.quota.QUOTA_STORAGE_DIR', tmp_path):
             # Test with corrupted quota file
-            with patch('middleware.quota.json.load', side_effect=ValueError("Invalid JSON")):
+            with patch('middleware.quota.loads', side_effect=ValueError("Invalid JSON")):
                 # Should fall back to default data
                 data = load_user_quota_data(mock_user.email)
                 assert data['plan'] == 'free'
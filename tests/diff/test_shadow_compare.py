@@ -440,5 +440,79 @@ class TestShadowResultSerialization:
         assert result_dict['independent_result'] is None
 
 
+class TestPrecomputedEngineResult:
+    """Shadow comparison reusing the caller's decision and a concurrent independent run."""
+    
+    def setup_method(self):
+        self.comparator = ShadowComparator()
+        timestamps = pd.date_range('2024-01-01 12:00:00', periods=100, freq='30s')
+        temperatures = np.concatenate([
+            np.linspace(20, 180, 30),
+            np.full(40, 185),
+            np.linspace(180, 25, 30)
+        ])
+        self.sample_df = pd.DataFrame({'timestamp': timestamps, 'temperature': temperatures})
+        self.sample_spec = SpecV1(**{
+            "job": {"job_id": "test123"},
+            "industry": "powder",
+            "spec": {
+                "method": "PMT",
+                "target_temp_C": 180.0,
+                "hold_time_s": 600.0,
+                "sensor_uncertainty_C": 2.0
+            },
+            "data_requirements": {
+                "max_sample_period_s": 60.0,
+                "allowed_gaps_s": 300.0
+            }
+        })
+    
+    def test_engine_not_rerun_with_precomputed_result(self):
+        """Passing engine_result must skip the engine entirely."""
+        engine_result = make_decision(self.sample_df, self.sample_spec)
+        
+        with patch('core.shadow_compare.make_decision') as mock_decide:
+            result = self.comparator.run_shadow_comparison(
+                self.sample_df, self.sample_spec, engine_result=engine_result
+            )
+            mock_decide.assert_not_called()
+        
+        assert result.engine_result is engine_result
+        assert result.independent_result is not None
+    
+    def test_submitted_independent_matches_inline(self):
+        """The pooled independent run gives the same result as the inline run."""
+        engine_result = make_decision(self.sample_df, self.sample_spec)
+        future = self.comparator.submit_independent(self.sample_df, self.sample_spec)
+        
+        pooled = self.comparator.run_shadow_comparison(
+            self.sample_df, self.sample_spec,
+            engine_result=engine_result, independent_future=future
+        )
+        inline = self.comparator.run_shadow_comparison(
+            self.sample_df, self.sample_spec, engine_result=engine_result
+        )
+        
+        assert pooled.status == inline.status
+        assert pooled.independent_result == inline.independent_result
+    
+    def test_independent_error_keeps_precomputed_result(self):
+        """A failing independent run reports INDEPENDENT_ERROR without re-running the engine."""
+        engine_result = make_decision(self.sample_df, self.sample_spec)
+        
+        with patch.object(self.comparator, '_calculate_powder_independent',
+                          side_effect=Exception("Independent calc failed")):
+            future = self.comparator.submit_independent(self.sample_df, self.sample_spec)
+            with patch('core.shadow_compare.make_decision') as mock_decide:
+                result = self.comparator.run_shadow_comparison(
+                    self.sample_df, self.sample_spec,
+                    engine_result=engine_result, independent_future=future
+                )
+                mock_decide.assert_not_called()
+        
+        assert result.status == ShadowStatus.INDEPENDENT_ERROR
+        assert result.engine_result is engine_result
+
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
\ No newline at end of file
@@ -0,0 +1,116 @@
+"""
+Tests for learned vendor CSV profiles.
+
+Example usage:
+    pytest tests/normalize/test_csv_profiles.py -v
+"""
+import pandas as pd
+import pytest
+
+import core.normalize
+from core.csv_profiles import CsvProfileCache, header_fingerprint
+from core.normalize import load_csv_with_metadata, normalize_temperature_data
+
+
+VENDOR_CSV = """# Device: TL-200
+# Serial: {serial}
+Date Time;Temp °C;Probe 2 °C
+{rows}
+"""
+
+
+def write_vendor_csv(path, serial="A1", start_day=1, rows=8):
+    lines = [
+        f"{start_day + i // 4:02d}.03.2024 10:{(i % 4) * 15:02d}:00;{180 + i}.5;{181 + i}.0"
+        for i in range(rows)
+    ]
+    path.write_text(VENDOR_CSV.format(serial=serial, rows="\n".join(lines)), encoding="utf-8")
+    return path
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return CsvProfileCache(tmp_path / "profiles")
+
+
+class TestHeaderFingerprint:
+    """Test fingerprinting of header and comment layout."""
+
+    def test_ignores_comment_values_but_not_header(self, tmp_path):
+        first = write_vendor_csv(tmp_path / "a.csv", serial="A1")
+        second = write_vendor_csv(tmp_path / "b.csv", serial="B7", start_day=14)
+        other = tmp_path / "c.csv"
+        other.write_text("timestamp,temp_1\n2024-01-01T00:00:00Z,180.0\n")
+
+        assert header_fingerprint(first) == header_fingerprint(second)
+        assert header_fingerprint(first) != header_fingerprint(other)
+
+    def test_no_header_returns_none(self, tmp_path):
+        path = tmp_path / "empty.csv"
+        path.write_text("# Device: TL-200\n\n")
+        assert header_fingerprint(path) is None
+
+
+class TestProfileCache:
+    """Test that a learned profile reproduces the sniffed parse."""
+
+    def test_hit_skips_sniffing_and_matches_full_parse(self, tmp_path, cache, monkeypatch):
+        load_csv_with_metadata(write_vendor_csv(tmp_path / "a.csv"), profile_cache=cache)
+        second = write_vendor_csv(tmp_path / "b.csv", serial="B7", start_day=14)
+        expected_df, expected_meta = load_csv_with_metadata(second)
+
+        def no_sniffing(*args, **kwargs):
+            raise AssertionError("sniffing should be skipped on a profile hit")
+
+        monkeypatch.setattr(core.normalize, "detect_encoding", no_sniffing)
+        monkeypatch.setattr(core.normalize, "detect_delimiter", no_sniffing)
+        df, metadata = load_csv_with_metadata(second, profile_cache=cache)
+
+        pd.testing.assert_frame_equal(df, expected_df)
+        assert metadata["Serial"] == "B7"
+        assert metadata["_parsing_info"]["profile"] == header_fingerprint(second)
+        assert df.attrs["timestamp_format"] == "%d.%m.%Y %H:%M:%S"
+
+    def test_profile_is_shared_through_storage(self, tmp_path, cache):
+        path = write_vendor_csv(tmp_path / "a.csv")
+        load_csv_with_metadata(path, profile_cache=cache)
+
+        other_worker = CsvProfileCache(cache.directory)
+        profile = other_worker.get(header_fingerprint(path))
+        assert profile["delimiter"] == ";"
+        assert profile["decimal_normalized"] is False
+        assert profile["timestamp_format"] == "%d.%m.%Y %H:%M:%S"
+
+    def test_misfit_falls_back_and_relearns(self, tmp_path, cache):
+        path = write_vendor_csv(tmp_path / "a.csv")
+        load_csv_with_metadata(path, profile_cache=cache)
+        fingerprint = header_fingerprint(path)
+        profile = {**cache.get(fingerprint), "dtypes": {"Temp °C": "int64"}}
+        cache.put(fingerprint, profile)
+
+        df, metadata = load_csv_with_metadata(path, profile_cache=cache)
+
+        assert "profile" not in metadata["_parsing_info"]
+        assert cache.get(fingerprint)["dtypes"]["Temp °C"] == "float64"
+        assert df.iloc[0, 1] == pytest.approx(180.5)
+
+    def test_no_cache_learns_nothing(self, tmp_path, monkeypatch):
+        monkeypatch.chdir(tmp_path)
+        load_csv_with_metadata(write_vendor_csv(tmp_path / "a.csv"))
+        assert not (tmp_path / "storage").exists()
+
+    def test_normalize_uses_profile_timestamp_format(self, tmp_path, cache, monkeypatch):
+        write_vendor_csv(tmp_path / "a.csv")
+        load_csv_with_metadata(tmp_path / "a.csv", profile_cache=cache)
+        df, _ = load_csv_with_metadata(write_vendor_csv(tmp_path / "b.csv", start_day=5, rows=4),
+                                      profile_cache=cache)
+
+        def no_inference(values):
+            raise AssertionError("format inference should be skipped with a profile hint")
+
+        monkeypatch.setattr(core.normalize, "infer_timestamp_format", no_inference)
+
+        normalized = normalize_temperature_data(df, target_step_s=900.0, max_sample_period_s=900.0,
+                                                allowed_gaps_s=86400.0)
+        timestamps = normalized.iloc[:, 0]
+        assert timestamps.iloc[0] == pd.Timestamp("2024-03-05 10:00:00", tz="UTC")
@@ -0,0 +1,127 @@
+"""
+Tests for spec-driven column pruning and lean dtypes during ingest.
+
+Example usage:
+    pytest tests/normalize/test_lean_ingest.py -v
+"""
+import numpy as np
+import pandas as pd
+
+import core.normalize
+from core.csv_profiles import CsvProfileCache
+from core.models import SpecV1
+from core.normalize import (
+    _apply_lean_dtypes,
+    load_csv_with_metadata,
+    normalize_temperature_data,
+)
+
+
+def make_spec(sensors=None, uncertainty=2.0):
+    spec_data = {
+        "version": "1.0",
+        "job": {"job_id": "lean_test"},
+        "spec": {"method": "PMT", "target_temp_C": 180.0, "hold_time_s": 600,
+                 "sensor_uncertainty_C": uncertainty},
+        "data_requirements": {"max_sample_period_s": 60.0, "allowed_gaps_s": 120.0},
+    }
+    if sensors:
+        spec_data["sensor_selection"] = {"mode": "min_of_set", "sensors": sensors}
+    return SpecV1(**spec_data)
+
+
+def write_csv(path, rows=40):
+    timestamps = pd.date_range("2024-01-01T10:00:00Z", periods=rows, freq="30s")
+    df = pd.DataFrame({
+        "timestamp": timestamps.strftime("%Y-%m-%dT%H:%M:%SZ"),
+        "pmt_1": np.round(np.linspace(150, 185, rows), 1),
+        "operator_note": [f"checked by operator {i}" for i in range(rows)],
+        "pmt_2": np.round(np.linspace(151, 186, rows), 1),
+        "status": ["RUN"] * rows,
+        "fo_value": np.round(np.linspace(0, 1, rows), 3),
+        "pmt_spare": np.round(np.linspace(20, 25, rows), 2),
+    })
+    df.to_csv(path, index=False)
+    return path
+
+
+class TestColumnPruning:
+    """Test that only timestamp and signal columns are parsed."""
+
+    def test_prunes_strings_and_unselected_probes(self, tmp_path):
+        spec = make_spec(sensors=["pmt_1", "pmt_2"])
+        df, metadata = load_csv_with_metadata(write_csv(tmp_path / "run.csv"), spec=spec)
+
+        assert list(df.columns) == ["timestamp", "pmt_1", "pmt_2", "fo_value"]
+        memory = metadata["_parsing_info"]["memory"]
+        assert memory["columns_pruned"] == ["operator_note", "status", "pmt_spare"]
+        assert memory["bytes_saved"] >= memory["pruned_bytes_estimate"] > 0
+
+    def test_keeps_all_probes_without_sensor_selection(self, tmp_path):
+        df, _ = load_csv_with_metadata(write_csv(tmp_path / "run.csv"), spec=make_spec())
+
+        assert list(df.columns) == ["timestamp", "pmt_1", "pmt_2", "fo_value", "pmt_spare"]
+
+    def test_keeps_probes_when_selected_sensor_is_missing(self, tmp_path):
+        spec = make_spec(sensors=["pmt_1", "pmt_9"])
+        df, _ = load_csv_with_metadata(write_csv(tmp_path / "run.csv"), spec=spec)
+
+        assert "pmt_spare" in df.columns
+
+    def test_profile_hit_prunes_too(self, tmp_path):
+        cache = CsvProfileCache(tmp_path / "profiles")
+        path = write_csv(tmp_path / "run.csv")
+        spec = make_spec(sensors=["pmt_1", "pmt_2"])
+        load_csv_with_metadata(path, profile_cache=cache)
+
+        df, metadata = load_csv_with_metadata(path, profile_cache=cache, spec=spec)
+
+        assert "profile" in metadata["_parsing_info"]
+        assert list(df.columns) == ["timestamp", "pmt_1", "pmt_2", "fo_value"]
+
+    def test_normalization_trace_reports_memory(self, tmp_path):
+        df, _ = load_csv_with_metadata(write_csv(tmp_path / "run.csv"), spec=make_spec(sensors=["pmt_1"]))
+
+        trace = normalize_temperature_data(df, return_trace=True)
+
+        assert trace.trace["memory"]["columns_pruned"] == ["operator_note", "pmt_2", "status", "pmt_spare"]
+        assert trace.trace["memory"]["normalized_bytes"] > 0
+
+
+class TestLeanDtypes:
+    """Test float32 storage and categorical string columns."""
+
+    def test_float32_round_trips_exactly(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(core.normalize, "FLOAT32_SENSORS", True)
+        path = write_csv(tmp_path / "run.csv")
+        spec = make_spec()
+        expected = normalize_temperature_data(load_csv_with_metadata(path)[0][
+            ["timestamp", "pmt_1", "pmt_2", "fo_value", "pmt_spare"]])
+
+        df, metadata = load_csv_with_metadata(path, spec=spec)
+
+        assert df["pmt_1"].dtype == np.float32
+        assert metadata["_parsing_info"]["memory"]["float32_columns"] == {
+            "pmt_1": 1, "pmt_2": 1, "fo_value": 3, "pmt_spare": 2
+        }
+        pd.testing.assert_frame_equal(normalize_temperature_data(df), expected)
+
+    def test_float32_needs_tolerance(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(core.normalize, "FLOAT32_SENSORS", True)
+        df, _ = load_csv_with_metadata(write_csv(tmp_path / "run.csv"), spec=make_spec(uncertainty=0.001))
+
+        assert df["pmt_1"].dtype == np.float64
+
+    def test_repeated_strings_become_categorical(self):
+        df = pd.DataFrame({
+            "timestamp": pd.date_range("2024-01-01", periods=6, freq="30s").strftime("%Y-%m-%dT%H:%M:%SZ"),
+            "phase": ["ramp", "ramp", "hold", "hold", "hold", "cool"],
+            "note": list("abcdef"),
+        })
+
+        memory = _apply_lean_dtypes(df, make_spec(), pruned=[])
+
+        assert df["phase"].dtype == "category"
+        assert df["note"].dtype == object
+        assert df["timestamp"].dtype == object
+        assert memory["categorical_columns"] == ["phase"]
@@ -0,0 +1,79 @@
+"""
+Tests for the array-based resampler against the pandas implementation.
+
+Example usage:
+    pytest tests/normalize/test_resample.py -v
+"""
+import numpy as np
+import pandas as pd
+import pytest
+
+from core.normalize import (
+    _resample_arrays,
+    _resample_with_pandas,
+    resample_temperature_data,
+)
+
+
+def irregular_run(rows=300, seed=0, mean_interval_s=50.0, tz='UTC'):
+    rng = np.random.default_rng(seed)
+    offsets = np.cumsum(rng.uniform(0.3, 1.7, rows)) * mean_interval_s
+    timestamps = pd.Timestamp('2024-01-01 13:17:03', tz=tz) + pd.to_timedelta(offsets, unit='s')
+    df = pd.DataFrame({
+        'timestamp': timestamps,
+        'temp_1': rng.normal(180, 5, rows),
+        'temp_2': rng.normal(120, 20, rows),
+        'count': rng.integers(0, 100, rows),
+    })
+    df.loc[rng.random(rows) < 0.2, 'temp_1'] = np.nan
+    return df
+
+
+class TestArrayResampler:
+    """Test that the numpy resampler reproduces pandas bit for bit."""
+
+    @pytest.mark.parametrize('seed', range(5))
+    @pytest.mark.parametrize('tz', ['UTC', None])
+    def test_matches_pandas(self, seed, tz):
+        df = irregular_run(seed=seed, tz=tz)
+
+        resampled = resample_temperature_data(df, 'timestamp', 30.0)
+
+        assert len(resampled) != len(df)
+        pd.testing.assert_frame_equal(
+            resampled, _resample_with_pandas(df.copy(), 'timestamp', 30.0),
+            check_exact=True, check_freq=False,
+        )
+
+    def test_empty_sensor(self):
+        df = irregular_run(seed=7)
+        df['temp_2'] = np.nan
+
+        pd.testing.assert_frame_equal(
+            resample_temperature_data(df, 'timestamp', 30.0),
+            _resample_with_pandas(df.copy(), 'timestamp', 30.0),
+            check_exact=True, check_freq=False,
+        )
+
+    def test_compensated_bin_means_of_unsorted_rows(self):
+        rng = np.random.default_rng(3)
+        index = pd.Timestamp('2024-01-01 13:17:03') + pd.to_timedelta(
+            np.cumsum(rng.uniform(0.5, 12, 500)), unit='s')
+        df = pd.DataFrame({'a': rng.normal(180, 5, 500) * 1e3, 'b': rng.normal(1, 1e-6, 500)}, index=index)
+        df.iloc[::7, 0] = np.nan
+        df.iloc[2, 1] = np.inf
+        df = df.sample(frac=1, random_state=1)
+
+        expected = df.resample('60s').mean().ffill(limit=2).interpolate(method='time', limit_direction='both')
+        grid_ns, values = _resample_arrays(df.index.asi8, df.to_numpy(), 60 * 1_000_000_000)
+
+        np.testing.assert_array_equal(grid_ns, expected.index.asi8)
+        np.testing.assert_array_equal(values, expected.to_numpy())
+
+    def test_fractional_step_uses_pandas(self):
+        df = irregular_run(mean_interval_s=13.0)
+
+        pd.testing.assert_frame_equal(
+            resample_temperature_data(df, 'timestamp', 7.5),
+            _resample_with_pandas(df.copy(), 'timestamp', 7.5),
+        )
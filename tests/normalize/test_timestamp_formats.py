@@ -0,0 +1,91 @@
+"""
+Tests for timestamp format inference and the fixed-width ISO-8601 fast path.
+
+Example usage:
+    pytest tests/normalize/test_timestamp_formats.py -v
+"""
+import pandas as pd
+import pytest
+
+from core.normalize import (
+    _parse_fixed_width_iso,
+    infer_timestamp_format,
+    parse_timestamps,
+)
+
+
+def column(values):
+    return pd.DataFrame({'timestamp': values})
+
+
+class TestInferTimestampFormat:
+    """Test matching sampled rows against the logger format registry."""
+
+    def test_dotted_dates_are_day_first_even_when_ambiguous_at_start(self):
+        df = column(['05.03.2024 10:00:00', '06.03.2024 10:00:00', '16.03.2024 10:00:00'])
+
+        assert infer_timestamp_format(df['timestamp']) == '%d.%m.%Y %H:%M:%S'
+        parsed = parse_timestamps(df, 'timestamp')
+        assert parsed.iloc[0] == pd.Timestamp('2024-03-05 10:00:00', tz='UTC')
+        assert parsed.iloc[2] == pd.Timestamp('2024-03-16 10:00:00', tz='UTC')
+
+    def test_slash_dates_fall_back_to_day_first(self):
+        df = column(['12/03/2024 10:00', '25/03/2024 10:00'])
+
+        assert infer_timestamp_format(df['timestamp']) == '%d/%m/%Y %H:%M'
+
+    def test_am_pm_matches_pandas(self):
+        values = ['3/5/2024 11:59:30 AM', '3/5/2024 12:00:00 PM', '3/5/2024 1:00:00 PM']
+        df = column(values)
+
+        assert infer_timestamp_format(df['timestamp']) == '%m/%d/%Y %I:%M:%S %p'
+        pd.testing.assert_series_equal(
+            parse_timestamps(df, 'timestamp'),
+            pd.to_datetime(pd.Series(values, name='timestamp'), format='mixed', utc=True),
+        )
+
+    def test_unknown_layout_returns_none(self):
+        assert infer_timestamp_format(pd.Series(['March 5th 2024, 10am'])) is None
+        assert infer_timestamp_format(pd.Series([1704103200, 1704103230])) is None
+
+    def test_hint_overrides_inference(self):
+        df = column(['05/03/2024 10:00:00', '06/03/2024 10:00:00'])
+
+        parsed = parse_timestamps(df, 'timestamp', timestamp_format='%d/%m/%Y %H:%M:%S')
+        assert parsed.iloc[0] == pd.Timestamp('2024-03-05 10:00:00', tz='UTC')
+
+
+class TestFixedWidthIso:
+    """Test that the numpy ISO-8601 parser matches pandas exactly."""
+
+    @pytest.mark.parametrize('fmt', [
+        '%Y-%m-%dT%H:%M:%SZ',
+        '%Y-%m-%d %H:%M:%S+02:00',
+        '%Y-%m-%dT%H:%M:%S-0530',
+        '%Y-%m-%dT%H:%M:%S.%fZ',
+    ])
+    def test_matches_pandas(self, fmt):
+        values = pd.Series(
+            pd.date_range('2024-02-28 22:00:00.250', periods=500, freq='397s').strftime(fmt),
+            index=range(10, 510), name='timestamp',
+        )
+
+        fast = _parse_fixed_width_iso(values)
+        assert fast is not None
+        pd.testing.assert_series_equal(fast, pd.to_datetime(values, utc=True))
+        pd.testing.assert_series_equal(parse_timestamps(values.to_frame(), 'timestamp'), fast)
+
+    @pytest.mark.parametrize('values', [
+        ['2024-01-01T10:00:00', '2024-01-01T10:00:30'],
+        ['2024-01-01T10:00:00Z', '2024-01-01T10:00:00.5Z'],
+        ['2023-02-29T10:00:00Z', '2023-03-01T10:00:00Z'],
+        ['2024-01-01T10:00:00Z', None],
+    ])
+    def test_declines_naive_ragged_or_invalid(self, values):
+        assert _parse_fixed_width_iso(pd.Series(values)) is None
+
+    def test_mixed_width_column_still_parses(self):
+        df = column(['2024-01-01T10:00:00Z', '2024-01-01T10:00:00.5Z'])
+
+        parsed = parse_timestamps(df, 'timestamp')
+        assert parsed.iloc[1] == pd.Timestamp('2024-01-01 10:00:00.5', tz='UTC')
@@ -581,7 +581,8 @@ class TestApplicationIntegration:
         
         # Should have proper title and version
         assert app.title == "ProofKit"
-        assert app.version == "0.1.0"
+        from core.build_info import get_build_info
+        assert app.version == get_build_info().version
     
     def test_openapi_schema_generation(self):
         """
@@ -326,14 +326,14 @@ class TestCurrentUserMiddleware:
     def test_middleware_extracts_bearer_token(self, app):
         """Test middleware extracts JWT from Authorization header."""
         with patch('middleware.current_user.auth_handler') as mock_auth, \
-             patch('middleware.current_user.load_user_quota_data') as mock_quota:
+             patch('middleware.current_user.get_user_plan') as mock_plan:
             
             mock_auth.verify_jwt_token.return_value = {
                 "sub": "test@example.com",
                 "role": "op",
                 "exp": 9999999999
             }
-            mock_quota.return_value = {'plan': 'free'}
+            mock_plan.return_value = 'free'
             
             client = TestClient(app)
             
@@ -49,9 +49,6 @@ class TestMagicLinkAuth:
         self.auth = MagicLinkAuth()
         self.temp_dir = tempfile.mkdtemp()
         self.auth.storage_dir = Path(self.temp_dir)
-        # Clear in-memory storage
-        from auth.magic import MAGIC_LINKS
-        MAGIC_LINKS.clear()
     
     def teardown_method(self):
         """Clean up test environment."""
@@ -62,7 +59,7 @@ class TestMagicLinkAuth:
         """Test magic link generation."""
         token = self.auth.generate_magic_link("test@example.com", UserRole.OPERATOR)
         assert len(token) > 32  # Should be a secure random token
-        # Check that the token was stored (we can't access MAGIC_LINKS directly in test)
+        # Check that the token was stored
         link_data = self.auth.validate_magic_link(token)
         assert link_data is not None
     
@@ -85,21 +82,11 @@ class TestMagicLinkAuth:
         # Generate a link
         token = self.auth.generate_magic_link("test@example.com", UserRole.OPERATOR)
         
-        # Clear in-memory storage to force reload from file
-        from auth.magic import MAGIC_LINKS
-        if token in MAGIC_LINKS:
-            del MAGIC_LINKS[token]
-        
-        # Manually expire it by modifying the stored file
-        import json
-        from datetime import datetime, timezone
-        file_path = self.auth.storage_dir / f"{token}.json"
-        if file_path.exists():
-            with open(file_path, 'r') as f:
-                data = json.load(f)
-            data["expires_at"] = "2020-01-01T00:00:00+00:00"
-            with open(file_path, 'w') as f:
-                json.dump(data, f)
+        # Manually expire it in the store
+        conn = self.auth._connect_links()
+        conn.execute("UPDATE magic_links SET expires_at = ? WHERE token = ?",
+                     (datetime(2020, 1, 1, tzinfo=timezone.utc).timestamp(), token))
+        conn.close()
         
         # Should not validate
         link_data = self.auth.validate_magic_link(token)
@@ -0,0 +1,195 @@
+"""
+Tests for batch compilation helpers and batch quota reservation.
+
+Example usage:
+    pytest tests/test_batch.py -v
+"""
+
+import asyncio
+import io
+import json
+import threading
+import time
+import zipfile
+from datetime import datetime, timezone
+from pathlib import Path
+
+import pytest
+
+import middleware.quota
+from auth.models import User, UserRole
+from core.batch import extract_zip_csvs, ndjson_line, stream_job_results
+from middleware.quota import (
+    check_compilation_quota,
+    load_user_quota_data,
+    process_single_certificate_purchase,
+    release_quota_reservation,
+    reserve_compilation_quota,
+    save_user_quota_data,
+)
+
+CSV = b"timestamp,temp_1\n2024-01-01T00:00:00Z,180.0\n"
+
+
+def make_zip(members):
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w") as archive:
+        for name, content in members.items():
+            archive.writestr(name, content)
+    return buffer.getvalue()
+
+
+@pytest.fixture
+def quota_storage(tmp_path, monkeypatch):
+    monkeypatch.setattr(middleware.quota, "QUOTA_STORAGE_DIR", Path(tmp_path))
+    return tmp_path
+
+
+@pytest.fixture
+def free_user():
+    return User(email="batch@example.com", role=UserRole.OPERATOR, created_at=datetime.now(timezone.utc))
+
+
+class TestExtractZipCsvs:
+    """Test reading CSVs out of an uploaded archive."""
+
+    def test_reads_csv_members_only(self):
+        archive = make_zip({
+            "runs/a.csv": CSV,
+            "runs/B.CSV": CSV,
+            "runs/notes.txt": b"ignored",
+            "__MACOSX/runs/._a.csv": b"ignored",
+            "runs/.hidden.csv": b"ignored",
+        })
+
+        assert extract_zip_csvs(archive, max_files=10, max_file_size=1024) == [
+            ("a.csv", CSV), ("B.CSV", CSV)
+        ]
+
+    def test_rejects_invalid_archive(self):
+        with pytest.raises(ValueError, match="Invalid ZIP archive"):
+            extract_zip_csvs(b"not a zip", max_files=10, max_file_size=1024)
+
+    def test_rejects_archive_without_csvs(self):
+        with pytest.raises(ValueError, match="no CSV files"):
+            extract_zip_csvs(make_zip({"a.txt": b"x"}), max_files=10, max_file_size=1024)
+
+    def test_enforces_limits(self):
+        archive = make_zip({f"{i}.csv": CSV for i in range(3)})
+        with pytest.raises(ValueError, match="at most 2 allowed"):
+            extract_zip_csvs(archive, max_files=2, max_file_size=1024)
+        with pytest.raises(ValueError, match="exceeds"):
+            extract_zip_csvs(archive, max_files=10, max_file_size=10)
+
+
+class TestStreamJobResults:
+    """Test completion-order streaming of batch jobs."""
+
+    def test_yields_in_completion_order_with_errors(self):
+        def job(delay, value):
+            def run():
+                time.sleep(delay)
+                if value is None:
+                    raise RuntimeError("boom")
+                return value
+            return run
+
+        async def collect():
+            jobs = [(0, job(0.3, "slow")), (1, job(0.0, "fast")), (2, job(0.1, None))]
+            return [item async for item in stream_job_results(jobs)]
+
+        results = asyncio.run(collect())
+
+        assert [index for index, _, _ in results] == [1, 2, 0]
+        assert results[0][1] == "fast"
+        assert isinstance(results[1][2], RuntimeError)
+        assert results[2][1:] == ("slow", None)
+
+    def test_ndjson_line(self):
+        line = ndjson_line({"type": "summary", "count": 2})
+        assert line.endswith(b"\n")
+        assert json.loads(line) == {"type": "summary", "count": 2}
+
+
+class TestBatchQuotaReservation:
+    """Test all-or-nothing quota reservation for batches."""
+
+    def test_reserves_whole_batch_or_nothing(self, quota_storage, free_user):
+        reserved, error = reserve_compilation_quota(free_user, 3)
+        assert not reserved
+        assert error["code"] == "BATCH_QUOTA_EXCEEDED"
+        assert error["remaining"] == 2
+        assert load_user_quota_data(free_user.email)["total_certificates"] == 0
+
+        reserved, error = reserve_compilation_quota(free_user, 2)
+        assert reserved and error is None
+        data = load_user_quota_data(free_user.email)
+        assert data["total_certificates"] == 2
+        assert data["current_month"]["certificates_compiled"] == 2
+
+    def test_release_returns_failed_jobs(self, quota_storage, free_user):
+        reserve_compilation_quota(free_user, 2)
+        assert release_quota_reservation(free_user, 1)
+
+        data = load_user_quota_data(free_user.email)
+        assert data["total_certificates"] == 1
+        assert data["current_month"]["certificates_compiled"] == 1
+
+    def test_paid_plan_without_overage_is_capped(self, quota_storage, free_user, monkeypatch):
+        plans = {"capped": {"name": "Capped", "jobs_month": 5, "overage_price_usd": None}}
+        monkeypatch.setattr(middleware.quota, "get_plan", plans.get)
+        data = load_user_quota_data(free_user.email)
+        data["plan"] = "capped"
+        data["current_month"]["certificates_compiled"] = 3
+        save_user_quota_data(free_user.email, data)
+
+        reserved, error = reserve_compilation_quota(free_user, 3)
+        assert not reserved and error["remaining"] == 2
+        assert reserve_compilation_quota(free_user, 2) == (True, None)
+
+    def test_purchased_certificates_extend_allowance(self, quota_storage, free_user, monkeypatch):
+        data = load_user_quota_data(free_user.email)
+        data["total_certificates"] = 2
+        # Purchased in an earlier month: the balance survives the monthly reset
+        data["current_month"]["month"] = "2000-01"
+        save_user_quota_data(free_user.email, data)
+        assert process_single_certificate_purchase(free_user.email, 3)
+        data = load_user_quota_data(free_user.email)
+        data["current_month"]["month"] = "2000-01"
+        save_user_quota_data(free_user.email, data)
+
+        assert check_compilation_quota(free_user) == (True, None)
+        reserved, error = reserve_compilation_quota(free_user, 4)
+        assert not reserved and error["remaining"] == 3
+        assert reserve_compilation_quota(free_user, 3) == (True, None)
+        assert load_user_quota_data(free_user.email)["single_cert_credits"] == 0
+        assert not check_compilation_quota(free_user)[0]
+
+        # Released certificates give their credits back
+        assert release_quota_reservation(free_user, 2)
+        assert load_user_quota_data(free_user.email)["single_cert_credits"] == 2
+
+        plans = {"capped": {"name": "Capped", "jobs_month": 5, "overage_price_usd": None}}
+        monkeypatch.setattr(middleware.quota, "get_plan", plans.get)
+        data = load_user_quota_data(free_user.email)
+        data["plan"] = "capped"
+        data["current_month"]["certificates_compiled"] = 4
+        save_user_quota_data(free_user.email, data)
+        assert reserve_compilation_quota(free_user, 3) == (True, None)
+        assert load_user_quota_data(free_user.email)["single_cert_credits"] == 0
+        assert not reserve_compilation_quota(free_user, 1)[0]
+
+    def test_concurrent_reservations_do_not_overshoot(self, quota_storage, free_user):
+        outcomes = []
+
+        def reserve():
+            outcomes.append(reserve_compilation_quota(free_user, 1)[0])
+
+        threads = [threading.Thread(target=reserve) for _ in range(6)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert outcomes.count(True) == 2
+        assert load_user_quota_data(free_user.email)["total_certificates"] == 2
@@ -0,0 +1,160 @@
+"""
+Tests for conditional and range-capable artifact downloads.
+
+Example usage:
+    pytest tests/test_downloads.py -v
+"""
+
+import asyncio
+
+import pytest
+from starlette.datastructures import Headers
+from starlette.requests import Request
+
+from core.downloads import (
+    IMMUTABLE_CACHE_CONTROL,
+    REVALIDATE_CACHE_CONTROL,
+    ArtifactFileResponse,
+    artifact_response,
+    etag_matches,
+    file_sha256,
+    parse_range,
+    version_token,
+)
+
+
+@pytest.fixture
+def artifact(tmp_path):
+    """A stored artifact with known contents."""
+    path = tmp_path / "proof.pdf"
+    path.write_bytes(bytes(range(256)) * 1024)
+    return path
+
+
+def fetch(artifact, headers=None, query=""):
+    """Run artifact_response for a GET request and collect the ASGI messages."""
+    sha256 = file_sha256(artifact)
+    scope = {
+        "type": "http",
+        "method": "GET",
+        "path": "/download",
+        "query_string": query.encode(),
+        "headers": [(k.lower().encode(), v.encode()) for k, v in (headers or {}).items()],
+    }
+    response = artifact_response(Request(scope), artifact, sha256,
+                                 filename="proof.pdf", media_type="application/pdf")
+    messages = []
+
+    async def send(message):
+        messages.append(message)
+
+    asyncio.run(response(scope, None, send))
+    start = messages[0]
+    body = b"".join(m.get("body", b"") for m in messages[1:])
+    return start["status"], Headers(raw=start["headers"]), body
+
+
+class TestParseRange:
+    """Test Range header parsing."""
+
+    @pytest.mark.parametrize("header,expected", [
+        (None, None),
+        ("bytes=0-99", (0, 99)),
+        ("bytes=100-", (100, 999)),
+        ("bytes=-100", (900, 999)),
+        ("bytes=-5000", (0, 999)),
+        ("bytes=900-5000", (900, 999)),
+        ("bytes=0-1,5-9", None),
+        ("items=0-1", None),
+        ("bytes=50-10", None),
+    ])
+    def test_parse_range(self, header, expected):
+        assert parse_range(header, 1000) == expected
+
+    @pytest.mark.parametrize("header", ["bytes=1000-", "bytes=-0"])
+    def test_unsatisfiable_range(self, header):
+        with pytest.raises(ValueError):
+            parse_range(header, 1000)
+
+
+class TestEtagMatches:
+    """Test If-None-Match comparison."""
+
+    def test_etag_matches(self):
+        assert etag_matches('"abc"', '"abc"')
+        assert etag_matches('W/"abc"', '"abc"')
+        assert etag_matches('"xyz", "abc"', '"abc"')
+        assert etag_matches("*", '"abc"')
+        assert not etag_matches('"xyz"', '"abc"')
+        assert not etag_matches(None, '"abc"')
+
+
+class TestArtifactResponse:
+    """Test artifact download responses."""
+
+    def test_full_download_headers(self, artifact):
+        status, headers, body = fetch(artifact)
+
+        assert status == 200
+        assert body == artifact.read_bytes()
+        assert headers["etag"] == f'"{file_sha256(artifact)}"'
+        assert headers["accept-ranges"] == "bytes"
+        assert headers["cache-control"] == REVALIDATE_CACHE_CONTROL
+        assert headers["content-length"] == str(artifact.stat().st_size)
+        assert 'filename="proof.pdf"' in headers["content-disposition"]
+
+    def test_versioned_url_is_immutable(self, artifact):
+        _, headers, _ = fetch(artifact, query=f"v={version_token(file_sha256(artifact))}")
+        assert headers["cache-control"] == IMMUTABLE_CACHE_CONTROL
+
+        _, stale_headers, _ = fetch(artifact, query="v=0000000000000000")
+        assert stale_headers["cache-control"] == REVALIDATE_CACHE_CONTROL
+
+    def test_if_none_match_returns_304(self, artifact):
+        etag = f'"{file_sha256(artifact)}"'
+        status, headers, body = fetch(artifact, headers={"If-None-Match": etag})
+
+        assert status == 304
+        assert body == b""
+        assert headers["etag"] == etag
+
+    def test_range_request(self, artifact):
+        size = artifact.stat().st_size
+        status, headers, body = fetch(artifact, headers={"Range": "bytes=1000-1999"})
+
+        assert status == 206
+        assert body == artifact.read_bytes()[1000:2000]
+        assert headers["content-range"] == f"bytes 1000-1999/{size}"
+        assert headers["content-length"] == "1000"
+
+    def test_unsatisfiable_range_returns_416(self, artifact):
+        size = artifact.stat().st_size
+        status, headers, _ = fetch(artifact, headers={"Range": f"bytes={size}-"})
+
+        assert status == 416
+        assert headers["content-range"] == f"bytes */{size}"
+
+    def test_if_range_mismatch_serves_full_file(self, artifact):
+        etag = f'"{file_sha256(artifact)}"'
+
+        status, _, _ = fetch(artifact, headers={"Range": "bytes=0-9", "If-Range": etag})
+        assert status == 206
+
+        status, _, body = fetch(artifact, headers={"Range": "bytes=0-9", "If-Range": '"old"'})
+        assert status == 200
+        assert body == artifact.read_bytes()
+
+    def test_zerocopy_extension_used_when_available(self, artifact):
+        response = ArtifactFileResponse(artifact, 10, 20, status_code=206)
+        messages = []
+
+        async def send(message):
+            messages.append(message)
+
+        scope = {"type": "http", "method": "GET", "extensions": {"http.response.zerocopy": {}}}
+        asyncio.run(response(scope, None, send))
+
+        zerocopy = messages[1]
+        assert zerocopy["type"] == "http.response.zerocopy"
+        assert zerocopy["offset"] == 10
+        assert zerocopy["count"] == 20
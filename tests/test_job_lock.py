@@ -0,0 +1,76 @@
+"""
+Tests for per-job locking and reuse of in-flight duplicate results.
+
+Example usage:
+    pytest tests/test_job_lock.py -v
+"""
+
+import threading
+import time
+
+import pytest
+
+from core.job_lock import job_lock, run_job_once
+
+
+class TestRunJobOnce:
+    """Test that identical concurrent submissions share one pipeline run."""
+
+    def test_duplicate_waits_and_reuses_result(self, tmp_path):
+        job_dir = tmp_path / "ab" / "abc1234567"
+        calls = []
+        started = threading.Event()
+
+        def slow_compute():
+            calls.append(threading.current_thread().name)
+            started.set()
+            time.sleep(0.3)
+            return {"id": "abc1234567", "pass": True}
+
+        results = {}
+        first = threading.Thread(target=lambda: results.update(first=run_job_once(job_dir, slow_compute)))
+        first.start()
+        started.wait(5)
+        results["second"] = run_job_once(job_dir, slow_compute)
+        first.join()
+
+        assert len(calls) == 1
+        assert results["first"] == results["second"] == {"id": "abc1234567", "pass": True}
+
+    def test_later_submission_recomputes(self, tmp_path):
+        job_dir = tmp_path / "job"
+        run_job_once(job_dir, lambda: {"run": 1})
+
+        assert run_job_once(job_dir, lambda: {"run": 2}) == {"run": 2}
+
+    def test_failed_first_run_is_not_reused(self, tmp_path):
+        job_dir = tmp_path / "job"
+        run_job_once(job_dir, lambda: {"run": 1})
+        started = threading.Event()
+
+        def failing_compute():
+            started.set()
+            time.sleep(0.2)
+            raise RuntimeError("pipeline failed")
+
+        def first_submission():
+            with pytest.raises(RuntimeError):
+                run_job_once(job_dir, failing_compute)
+
+        first = threading.Thread(target=first_submission)
+        first.start()
+        started.wait(5)
+        assert run_job_once(job_dir, lambda: {"run": 3}) == {"run": 3}
+        first.join()
+
+    def test_unrelated_jobs_do_not_wait(self, tmp_path):
+        (tmp_path / "a").mkdir()
+        (tmp_path / "b").mkdir()
+
+        with job_lock(tmp_path / "a") as waited_a, job_lock(tmp_path / "b", timeout_s=0.1) as waited_b:
+            assert not waited_a and not waited_b
+
+    def test_timeout_computes_without_lock(self, tmp_path):
+        (tmp_path / "job").mkdir()
+        with job_lock(tmp_path / "job"):
+            assert run_job_once(tmp_path / "job", lambda: {"run": 1}, timeout_s=0.1) == {"run": 1}
@@ -0,0 +1,329 @@
+"""
+Tests for live run ingestion and its online engine state.
+
+Example usage:
+    pytest tests/test_live.py -v
+"""
+
+import copy
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from core import live
+from core.live import (
+    CONCRETE_HYSTERESIS_C,
+    CONCRETE_MIN_C,
+    STATUS_FAILED,
+    STATUS_IN_PROGRESS,
+    STATUS_REQUIREMENT_MET,
+    STERILE_HYSTERESIS_C,
+    STERILE_MIN_C,
+    LiveRunError,
+    cancel_close,
+    close_run,
+    finish_close,
+    get_run,
+    hysteresis_state,
+    open_run,
+)
+from core.metrics_autoclave import calculate_fo_value
+from core.metrics_coldchain import identify_temperature_excursions
+from core.metrics_haccp import fahrenheit_to_celsius, find_temperature_time
+from core.models import SpecV1
+from core.temperature_utils import calculate_continuous_hold_time
+
+OWNER = "live@example.com"
+
+BASE_SPEC = {
+    "version": "1.0",
+    "job": {"job_id": "live_test"},
+    "spec": {"method": "PMT", "target_temp_C": 180.0, "hold_time_s": 600, "sensor_uncertainty_C": 2.0},
+    "data_requirements": {"max_sample_period_s": 60.0, "allowed_gaps_s": 120.0},
+}
+
+
+@pytest.fixture(autouse=True)
+def run_storage(tmp_path, monkeypatch):
+    monkeypatch.setattr(live, "LIVE_STORAGE_DIR", tmp_path)
+    return tmp_path
+
+
+def make_spec(industry="powder", **spec_fields):
+    spec_data = copy.deepcopy(BASE_SPEC)
+    spec_data["industry"] = industry
+    if industry != "powder":
+        spec_data["spec"]["method"] = "OVEN_AIR"
+    spec_data["spec"].update(spec_fields)
+    return SpecV1(**spec_data), spec_data
+
+
+def make_records(temps, start="2024-01-01T10:00:00Z", step_s=30, sensors=1):
+    timestamps = pd.date_range(start, periods=len(temps), freq=f"{step_s}s")
+    rng = np.random.default_rng(3)
+    records = []
+    for ts, temp in zip(timestamps, temps):
+        record = {"timestamp": ts.isoformat()}
+        for s in range(sensors):
+            record[f"temp_{s + 1}"] = float(temp + (rng.normal(0, 0.2) if s else 0.0))
+        records.append(record)
+    return records
+
+
+def feed(run, records, batch_size):
+    snapshot = None
+    for start in range(0, len(records), batch_size):
+        snapshot = run.append(records[start:start + batch_size])
+    return snapshot
+
+
+def as_series(records, column="temp_1"):
+    df = pd.DataFrame.from_records(records)
+    return df[column], pd.to_datetime(df["timestamp"], utc=True)
+
+
+class TestHysteresisState:
+    """Test the vectorized hysteresis state machine."""
+
+    def test_matches_sequential_state_machine(self):
+        rng = np.random.default_rng(11)
+        temps = 180 + np.cumsum(rng.normal(0, 1.5, 500))
+        temps[::37] = np.nan
+
+        expected = []
+        above = False
+        for temp in temps:
+            if not above and temp >= 180.0:
+                above = True
+            elif above and temp < 178.0:
+                above = False
+            expected.append(above)
+
+        state = np.concatenate([
+            hysteresis_state(temps[:123], 180.0, 2.0, False),
+            hysteresis_state(temps[123:], 180.0, 2.0, expected[122]),
+        ])
+        np.testing.assert_array_equal(state, expected)
+
+
+class TestOnlineState:
+    """Test that batched online state matches the whole-series engine functions."""
+
+    @pytest.mark.parametrize("batch_size", [1, 7, 1000])
+    def test_hold_matches_continuous_hold_time(self, batch_size):
+        rng = np.random.default_rng(5)
+        profile = np.concatenate([np.linspace(25, 185, 30), 183 + rng.normal(0, 2.5, 80), np.linspace(183, 60, 20)])
+        records = make_records(profile)
+        spec, spec_data = make_spec()
+        run = open_run(spec, spec_data, OWNER)
+
+        snapshot = feed(run, records, batch_size)
+
+        temps, times = as_series(records)
+        expected, _, _ = calculate_continuous_hold_time(temps, times, 182.0, hysteresis_C=2.0)
+        assert snapshot["state"]["longest_hold_s"] == pytest.approx(expected)
+        assert snapshot["samples"] == len(records)
+        reference = open_run(spec, spec_data, OWNER).append(records)
+        assert snapshot["state"]["cumulative_hold_s"] == reference["state"]["cumulative_hold_s"]
+
+    def test_fo_matches_calculate_fo_value(self):
+        profile = np.concatenate([np.linspace(90, 122, 20), np.full(40, 122.0), np.linspace(122, 90, 20)])
+        records = make_records(profile)
+        spec, spec_data = make_spec("autoclave", target_temp_C=121.0, hold_time_s=900, sensor_uncertainty_C=0.5)
+        run = open_run(spec, spec_data, OWNER)
+
+        snapshot = feed(run, records, 9)
+
+        temps, times = as_series(records)
+        assert snapshot["state"]["fo_value"] == pytest.approx(calculate_fo_value(temps, times))
+        assert snapshot["status"] == STATUS_REQUIREMENT_MET
+
+    def test_excursions_match_identify_temperature_excursions(self):
+        rng = np.random.default_rng(9)
+        profile = 5 + rng.normal(0, 2.2, 300)
+        records = make_records(profile, step_s=300)
+        spec, spec_data = make_spec("coldchain", target_temp_C=5.0, hold_time_s=3600)
+        run = open_run(spec, spec_data, OWNER)
+
+        state = feed(run, records, 13)["state"]
+
+        temps, times = as_series(records)
+        expected = identify_temperature_excursions(temps, times)
+        assert state["excursion_events"] == len(expected["excursion_events"])
+        assert state["total_excursion_time_s"] == pytest.approx(expected["total_excursion_time_s"])
+        assert state["alarm_events"] == expected["alarm_events"]
+        assert state["compliance_pct"] == pytest.approx(expected["compliance_percentage"])
+
+    def test_haccp_crossings_match_find_temperature_time(self):
+        profile = np.linspace(60, 3, 100)
+        records = make_records(profile, step_s=60)
+        spec, spec_data = make_spec("haccp", target_temp_C=5.0, hold_time_s=60)
+        run = open_run(spec, spec_data, OWNER)
+
+        snapshot = feed(run, records, 11)
+
+        temps, times = as_series(records)
+        for key, target_f in (("time_to_70f_s", 70.0), ("time_to_41f_s", 41.0)):
+            expected = find_temperature_time(temps, times, fahrenheit_to_celsius(target_f), 'cooling')
+            assert snapshot["state"][key] == pytest.approx(expected)
+        assert snapshot["status"] == STATUS_REQUIREMENT_MET
+
+
+class TestRunStatus:
+    """Test live status transitions."""
+
+    @pytest.mark.parametrize("industry, threshold_C, hysteresis_C", [
+        ("powder", 182.0, 2.0),
+        ("concrete", CONCRETE_MIN_C, CONCRETE_HYSTERESIS_C),
+        ("sterile", STERILE_MIN_C, STERILE_HYSTERESIS_C),
+    ])
+    def test_hold_threshold_follows_industry_engine(self, industry, threshold_C, hysteresis_C):
+        spec, spec_data = make_spec(industry)
+        run = open_run(spec, spec_data, OWNER)
+
+        state = run.snapshot()["state"]
+        assert (state["threshold_C"], state["hysteresis_C"]) == (threshold_C, hysteresis_C)
+
+    def test_concrete_hold_matches_engine(self):
+        rng = np.random.default_rng(2)
+        profile = 16.2 + rng.normal(0, 0.4, 200)
+        records = make_records(profile, step_s=300)
+        spec, spec_data = make_spec("concrete", target_temp_C=21.5, hold_time_s=3600)
+        run = open_run(spec, spec_data, OWNER)
+
+        snapshot = feed(run, records, 17)
+
+        temps, times = as_series(records)
+        expected, _, _ = calculate_continuous_hold_time(temps, times, CONCRETE_MIN_C, hysteresis_C=CONCRETE_HYSTERESIS_C)
+        assert snapshot["state"]["longest_hold_s"] == pytest.approx(expected)
+
+    def test_requirement_met_once_hold_reached(self):
+        spec, spec_data = make_spec(hold_time_s=300)
+        run = open_run(spec, spec_data, OWNER)
+        records = make_records(np.concatenate([np.linspace(25, 185, 10), np.full(20, 185.0)]), sensors=2)
+
+        assert run.append(records[:15])["status"] == STATUS_IN_PROGRESS
+        assert run.append(records[15:])["status"] == STATUS_REQUIREMENT_MET
+
+    def test_haccp_deadline_miss_is_sticky(self):
+        spec, spec_data = make_spec("haccp", target_temp_C=5.0, hold_time_s=60)
+        run = open_run(spec, spec_data, OWNER)
+        slow = make_records(np.linspace(60, 30, 130), step_s=60)
+
+        snapshot = run.append(slow)
+        assert snapshot["status"] == STATUS_FAILED
+        assert any("70°F" in reason for reason in snapshot["reasons"])
+
+        fast = make_records(np.linspace(20, 3, 10), start="2024-01-01T12:11:00Z", step_s=60)
+        assert run.append(fast)["status"] == STATUS_FAILED
+
+
+class TestLiveRunIngestion:
+    """Test append-only ingestion and the run registry."""
+
+    def test_rejects_out_of_order_and_mismatched_batches(self):
+        spec, spec_data = make_spec()
+        run = open_run(spec, spec_data, OWNER)
+        records = make_records(np.full(10, 150.0))
+        run.append(records[5:])
+
+        with pytest.raises(LiveRunError, match="increasing"):
+            run.append(records[:5])
+        with pytest.raises(LiveRunError, match="columns"):
+            run.append([{"timestamp": "2024-01-02T00:00:00Z", "other": 1.0}])
+        assert run.sample_count == 5
+
+    def test_close_rebuilds_csv_and_checks_owner(self):
+        spec, spec_data = make_spec()
+        run = open_run(spec, spec_data, OWNER)
+        records = make_records(np.full(4, 150.0), sensors=2)
+        feed(run, records, 2)
+
+        assert get_run(run.run_id, "other@example.com") is None
+        assert close_run(run.run_id, "other@example.com") is None
+        closed = close_run(run.run_id, OWNER)
+        assert closed.run_id == run.run_id and closed.sample_count == 4
+        assert get_run(run.run_id, OWNER) is None
+
+        lines = closed.to_csv_bytes().decode().splitlines()
+        assert lines[0] == "timestamp,temp_1,temp_2"
+        assert len(lines) == 5
+        assert finish_close(run.run_id)
+        with pytest.raises(LiveRunError, match="closed or expired"):
+            run.append(make_records([150.0], start="2024-01-02T00:00:00Z"))
+
+    def test_closing_run_rejects_appends_and_second_close(self):
+        spec, spec_data = make_spec()
+        run = open_run(spec, spec_data, OWNER)
+        records = make_records(np.full(6, 150.0))
+        run.append(records[:4])
+
+        closed = close_run(run.run_id, OWNER)
+        with pytest.raises(LiveRunError, match="being closed"):
+            run.append(records[4:])
+        with pytest.raises(LiveRunError, match="already being closed"):
+            close_run(run.run_id, OWNER)
+
+        # Only the first finish removes the run
+        assert finish_close(run.run_id)
+        assert not finish_close(run.run_id)
+        assert closed.to_csv_bytes().decode().count("\n") == 5
+
+    def test_cancelled_close_reopens_run(self):
+        spec, spec_data = make_spec()
+        run = open_run(spec, spec_data, OWNER)
+        records = make_records(np.full(6, 150.0))
+        run.append(records[:4])
+
+        close_run(run.run_id, OWNER)
+        cancel_close(run.run_id)
+        assert not finish_close(run.run_id)
+        assert run.append(records[4:])["samples"] == 6
+        assert close_run(run.run_id, OWNER).sample_count == 6
+
+    def test_state_is_shared_between_handles(self):
+        rng = np.random.default_rng(7)
+        profile = np.concatenate([np.linspace(25, 185, 30), 183 + rng.normal(0, 2.5, 60)])
+        records = make_records(profile, sensors=2)
+        spec, spec_data = make_spec()
+        reference = open_run(spec, spec_data, OWNER)
+        expected = reference.append(records)
+
+        # Handles loaded separately, as by different workers, append in turn
+        first = open_run(spec, spec_data, OWNER)
+        second = get_run(first.run_id, OWNER)
+        for start in range(0, len(records), 20):
+            handle = first if start % 40 else second
+            snapshot = handle.append(records[start:start + 20])
+
+        assert {**snapshot, "run_id": None} == {**expected, "run_id": None}
+        assert get_run(first.run_id, OWNER).snapshot() == snapshot
+        assert get_run(first.run_id, OWNER).to_csv_bytes() == close_run(reference.run_id, OWNER).to_csv_bytes()
+
+    def test_failed_batch_leaves_state_unchanged(self):
+        spec, spec_data = make_spec()
+        run = open_run(spec, spec_data, OWNER)
+        before = run.snapshot()
+
+        with pytest.raises(LiveRunError, match="timestamps"):
+            run.append([{"timestamp": "not a time", "temp_1": 150.0}])
+        assert run.columns is None
+        assert run.snapshot() == before
+        assert get_run(run.run_id, OWNER).columns is None
+
+        records = make_records(np.full(4, 150.0))
+        assert run.append(records)["samples"] == 4
+
+    def test_idle_runs_expire(self, monkeypatch):
+        spec, spec_data = make_spec()
+        run = open_run(spec, spec_data, OWNER)
+        monkeypatch.setattr(live.time, "time", lambda: run.updated_at + live.LIVE_RUN_TTL_S + 1)
+
+        assert get_run(run.run_id, OWNER) is None
+        open_run(spec, spec_data, OWNER)
+        conn = live._connect_runs()
+        try:
+            assert conn.execute("SELECT 1 FROM live_runs WHERE run_id = ?", (run.run_id,)).fetchone() is None
+        finally:
+            conn.close()
@@ -0,0 +1,123 @@
+"""
+Tests for evaluating one trace against several specifications.
+
+Example usage:
+    pytest tests/test_multi_spec.py -v
+"""
+
+import copy
+from unittest.mock import patch
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from core.decide import make_decision
+from core.models import SpecV1
+from core.multi_spec import evaluate_specs, normalization_key, render_certificates
+from core.normalize import normalize_temperature_data
+from core.trace import get_trace
+
+BASE_SPEC = {
+    "version": "1.0",
+    "job": {"job_id": "multi_spec_test"},
+    "spec": {
+        "method": "PMT",
+        "target_temp_C": 180.0,
+        "hold_time_s": 300,
+        "sensor_uncertainty_C": 2.0
+    },
+    "data_requirements": {"max_sample_period_s": 60.0, "allowed_gaps_s": 120.0},
+    "sensor_selection": {"mode": "min_of_set", "require_at_least": 1},
+    "logic": {"continuous": True, "max_total_dips_s": 0}
+}
+
+
+def make_spec(target_temp_C=180.0, mode="min_of_set", **data_requirements):
+    spec_data = copy.deepcopy(BASE_SPEC)
+    spec_data["spec"]["target_temp_C"] = target_temp_C
+    spec_data["sensor_selection"]["mode"] = mode
+    spec_data["data_requirements"].update(data_requirements)
+    return SpecV1(**spec_data)
+
+
+@pytest.fixture
+def raw_df():
+    """Oven run: ramp to ~190°C, hold for 15 minutes, cool down."""
+    timestamps = pd.date_range("2024-01-01 10:00", periods=80, freq="30s", tz="UTC")
+    profile = np.concatenate([
+        np.linspace(25, 190, 20),
+        np.full(30, 190.0),
+        np.linspace(190, 60, 30)
+    ])
+    return pd.DataFrame({
+        "timestamp": timestamps,
+        "temp_1": profile,
+        "temp_2": profile - 1.5,
+    })
+
+
+class TestEvaluateSpecs:
+    """Test multi-spec evaluation."""
+
+    def test_matches_individual_decisions(self, raw_df):
+        specs = [make_spec(180.0), make_spec(186.0, "mean_of_set"), make_spec(200.0)]
+
+        evaluations = evaluate_specs(raw_df, specs)
+
+        assert [e.index for e in evaluations] == [0, 1, 2]
+        for evaluation, spec in zip(evaluations, specs):
+            normalized = normalize_temperature_data(
+                raw_df, allowed_gaps_s=120.0, max_sample_period_s=60.0, industry=spec.industry
+            )
+            expected = make_decision(normalized, spec)
+            assert evaluation.ok
+            assert evaluation.decision.pass_ == expected.pass_
+            assert evaluation.decision.actual_hold_time_s == expected.actual_hold_time_s
+        assert evaluations[2].status == "FAIL"
+
+    def test_normalizes_once_per_key(self, raw_df):
+        specs = [make_spec(180.0), make_spec(175.0), make_spec(180.0, allowed_gaps_s=300.0)]
+        assert normalization_key(specs[0]) == normalization_key(specs[1])
+
+        with patch("core.multi_spec.normalize_temperature_data",
+                   wraps=normalize_temperature_data) as normalize:
+            evaluations = evaluate_specs(raw_df, specs)
+
+        assert normalize.call_count == 2
+        assert evaluations[0].normalized_df is evaluations[1].normalized_df
+        assert evaluations[2].normalized_df is not evaluations[0].normalized_df
+
+    def test_specs_share_trace_and_combinations(self, raw_df):
+        evaluations = evaluate_specs(raw_df, [make_spec(180.0), make_spec(175.0)])
+
+        trace = get_trace(evaluations[0].normalized_df)
+        assert trace is get_trace(evaluations[1].normalized_df)
+        # Both specs use min_of_set over the same sensors: one shared combination
+        assert len(trace._combined) == 1
+
+    def test_normalization_failure_reported_per_spec(self, raw_df):
+        gappy = raw_df.drop(index=range(30, 45)).reset_index(drop=True)
+        specs = [make_spec(180.0), make_spec(180.0, allowed_gaps_s=1200.0, max_sample_period_s=600.0)]
+
+        evaluations = evaluate_specs(gappy, specs)
+
+        assert not evaluations[0].ok
+        assert evaluations[0].error_stage == "normalization"
+        assert evaluations[0].status == "ERROR"
+        assert evaluations[1].ok
+
+
+class TestRenderCertificates:
+    """Test parallel certificate rendering."""
+
+    def test_renders_only_decided_specs(self, raw_df, tmp_path):
+        evaluations = evaluate_specs(raw_df, [make_spec(180.0), make_spec(175.0)])
+        evaluations[1].decision = None
+
+        with patch("core.multi_spec._render_certificate",
+                   side_effect=lambda e, out: out / f"{e.index}.pdf") as render:
+            certificates = render_certificates(evaluations, tmp_path, max_workers=2)
+
+        assert render.call_count == 1
+        assert certificates == {0: tmp_path / "0.pdf"}
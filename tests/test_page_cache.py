@@ -0,0 +1,100 @@
+"""
+Tests for cached content parsing and rendered static pages.
+
+Example usage:
+    pytest tests/test_page_cache.py -v
+"""
+
+import os
+
+import pytest
+from starlette.requests import Request
+from starlette.templating import Jinja2Templates
+
+from core.page_cache import FileParseCache, StaticPageCache, configure_bytecode_cache
+
+
+def make_request(path="/trust", nonce="n0nce", if_none_match=None):
+    headers = [(b"host", b"proofkit.test")]
+    if if_none_match:
+        headers.append((b"if-none-match", if_none_match.encode()))
+    request = Request({
+        "type": "http", "method": "GET", "scheme": "https", "path": path,
+        "query_string": b"", "headers": headers, "server": ("proofkit.test", 443),
+    })
+    request.state.nonce = nonce
+    return request
+
+
+@pytest.fixture
+def templates(tmp_path):
+    (tmp_path / "page.html").write_text(
+        '<link rel="canonical" href="{{ request.url }}">'
+        '<script nonce="{{ get_nonce(request) }}"></script>{{ body }}'
+    )
+    renderer = Jinja2Templates(directory=str(tmp_path))
+    renderer.env.globals["get_nonce"] = lambda request: getattr(request.state, "nonce", "")
+    return renderer
+
+
+class TestFileParseCache:
+    """Test that parsed content is reused until the file changes."""
+
+    def test_reparses_only_after_change(self, tmp_path):
+        path = tmp_path / "post.md"
+        path.write_text("# One")
+        calls = []
+
+        def parse(text):
+            calls.append(text)
+            return text.upper()
+
+        cache = FileParseCache()
+        assert cache.get(path, parse) == "# ONE"
+        assert cache.get(path, parse) == "# ONE"
+
+        path.write_text("# Two")
+        os.utime(path, ns=(0, path.stat().st_mtime_ns + 1_000_000))
+        assert cache.get(path, parse) == "# TWO"
+        assert calls == ["# One", "# Two"]
+
+    def test_missing_file_raises(self, tmp_path):
+        with pytest.raises(OSError):
+            FileParseCache().get(tmp_path / "missing.md", str.upper)
+
+
+class TestStaticPageCache:
+    """Test rendered page reuse and per-response nonce substitution."""
+
+    def test_renders_once_per_page_with_request_nonce(self, templates):
+        pages = StaticPageCache(templates, ttl_s=60, max_entries=8)
+        first = pages.render(make_request(nonce="aaa"), "page.html", {"body": "hi"})
+        second = pages.render(make_request(nonce="bbb"), "page.html", {"body": "hi"})
+
+        assert 'nonce="aaa"' in first.body.decode()
+        assert 'nonce="bbb"' in second.body.decode()
+        assert 'href="https://proofkit.test/trust"' in first.body.decode()
+        assert len(pages._pages) == 1
+
+        pages.render(make_request(), "page.html", {"body": "changed"})
+        assert len(pages._pages) == 2
+
+    def test_never_revalidated(self, templates):
+        pages = StaticPageCache(templates, ttl_s=60, max_entries=8)
+        pages.render(make_request(nonce="old"), "page.html")
+
+        request = make_request(nonce="new", if_none_match='"anything-old"')
+        response = pages.render(request, "page.html")
+
+        assert response.status_code == 200
+        assert 'nonce="new"' in response.body.decode()
+        assert request.state.nonce == "new"
+        assert response.headers["cache-control"] == "no-store"
+        assert "etag" not in response.headers
+
+    def test_bytecode_cache_directory(self, templates, tmp_path):
+        cache_dir = tmp_path / "jinja"
+        configure_bytecode_cache(templates, str(cache_dir))
+        StaticPageCache(templates, ttl_s=0, max_entries=8).render(make_request(), "page.html")
+
+        assert list(cache_dir.iterdir())
@@ -0,0 +1,67 @@
+"""
+Tests for the host-shared SQLite rate limit storage.
+
+Example usage:
+    pytest tests/test_rate_limit.py -v
+"""
+
+import time
+
+from limits import parse
+from limits.storage import storage_from_string
+from limits.strategies import FixedWindowRateLimiter
+
+from core.rate_limit import COMPILE_REQUEST_COST, SQLiteStorage
+
+
+def make_storage(tmp_path):
+    return storage_from_string(f"sqlite:///{tmp_path}/ratelimit.db")
+
+
+class TestSQLiteStorage:
+    """Test counters shared through one database file."""
+
+    def test_registered_for_sqlite_scheme(self, tmp_path):
+        storage = make_storage(tmp_path)
+
+        assert isinstance(storage, SQLiteStorage)
+        assert storage.db_path == f"{tmp_path}/ratelimit.db"
+        assert storage.check()
+
+    def test_workers_share_counts(self, tmp_path):
+        first, second = make_storage(tmp_path), make_storage(tmp_path)
+
+        assert first.incr("client", 60) == 1
+        assert second.incr("client", 60, amount=4) == 5
+        assert first.get("client") == 5
+        assert 0 < first.get_expiry("client") - time.time() <= 60
+
+    def test_expired_window_restarts(self, tmp_path):
+        storage = make_storage(tmp_path)
+        storage.incr("client", 60, amount=3)
+        storage._connection().execute("UPDATE rate_limits SET expires_at = ?", (time.time() - 1,))
+
+        assert storage.get("client") == 0
+        assert storage.incr("client", 60) == 1
+
+    def test_clear_and_reset(self, tmp_path):
+        storage = make_storage(tmp_path)
+        storage.incr("a", 60)
+        storage.incr("b", 60)
+
+        storage.clear("a")
+        assert storage.get("a") == 0
+        assert storage.reset() == 1
+
+
+class TestWeightedBudget:
+    """Test that route costs draw down one shared budget."""
+
+    def test_compiles_use_more_budget_than_page_views(self, tmp_path):
+        limiter = FixedWindowRateLimiter(make_storage(tmp_path))
+        budget = parse(f"{2 * COMPILE_REQUEST_COST}/minute")
+
+        assert limiter.hit(budget, "client", cost=COMPILE_REQUEST_COST)
+        assert limiter.hit(budget, "client", cost=COMPILE_REQUEST_COST)
+        assert not limiter.hit(budget, "client", cost=1)
+        assert limiter.hit(budget, "other-client", cost=1)
@@ -0,0 +1,131 @@
+"""
+Tests for the leader-elected background scheduler.
+
+Example usage:
+    pytest tests/test_scheduler.py -v
+"""
+
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from core.scheduler import BackgroundScheduler, ScheduledTask, default_tasks
+
+
+def wait_for(condition, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() > deadline:
+            return False
+        time.sleep(0.01)
+    return True
+
+
+@pytest.fixture
+def schedulers():
+    created = []
+    yield created
+    for scheduler in created:
+        scheduler.stop()
+
+
+def make_scheduler(schedulers, tmp_path, tasks):
+    scheduler = BackgroundScheduler(tasks=tasks, state_dir=tmp_path)
+    schedulers.append(scheduler)
+    return scheduler
+
+
+class TestScheduledTask:
+    """Test next fire time computation."""
+
+    def test_daily_fires_at_time_of_day(self):
+        task = ScheduledTask("cleanup", lambda now: None, daily_at=(2, 0))
+        before = datetime(2024, 3, 1, 1, 59, 30, tzinfo=timezone.utc)
+        at = datetime(2024, 3, 1, 2, 0, tzinfo=timezone.utc)
+
+        assert task.next_fire_after(before) == at
+        assert task.next_fire_after(at) == at + timedelta(days=1)
+
+    def test_interval(self):
+        task = ScheduledTask("upsell", lambda now: None, interval_s=30)
+        now = datetime(2024, 3, 1, 12, 0, tzinfo=timezone.utc)
+
+        assert task.next_fire_after(now) == now + timedelta(seconds=30)
+
+    def test_default_tasks(self):
+        assert {task.name for task in default_tasks()} == {"cleanup", "backup", "upsell", "tsa_retry"}
+
+
+class TestBackgroundScheduler:
+    """Test leader election, runs, backoff and run-now."""
+
+    def test_only_leader_runs_tasks(self, schedulers, tmp_path):
+        calls = []
+        tasks = [ScheduledTask("tick", lambda now: calls.append(threading.current_thread().name),
+                               interval_s=0.02)]
+        leader = make_scheduler(schedulers, tmp_path, tasks)
+        standby = make_scheduler(schedulers, tmp_path, tasks)
+
+        leader.start()
+        assert wait_for(lambda: leader.is_leader and len(calls) >= 3)
+        standby.start()
+        time.sleep(0.1)
+        assert not standby.is_leader
+
+        leader.stop()
+        assert standby._try_become_leader()
+
+        status = standby.get_status()
+        assert status["tasks"]["tick"]["runs"] >= 3
+        assert status["tasks"]["tick"]["last_duration_s"] is not None
+
+    def test_failures_back_off(self, schedulers, tmp_path):
+        calls = []
+
+        def fail(now):
+            calls.append(now)
+            raise RuntimeError("boom")
+
+        scheduler = make_scheduler(
+            schedulers, tmp_path, [ScheduledTask("flaky", fail, interval_s=0.01, retry_base_s=60)])
+        scheduler.start()
+        assert wait_for(lambda: calls)
+        time.sleep(0.1)
+
+        assert len(calls) == 1
+        assert scheduler._next_run["flaky"] - calls[0] > timedelta(seconds=59)
+        status = scheduler.get_status()["tasks"]["flaky"]
+        assert status["failures"] == 1 and status["last_error"] == "boom"
+
+    def test_missed_daily_run_fires_on_takeover(self, schedulers, tmp_path):
+        task = ScheduledTask("cleanup", lambda now: None, daily_at=(2, 0))
+        previous = make_scheduler(schedulers, tmp_path, [task])
+        previous._clock = lambda: datetime.now(timezone.utc) - timedelta(days=2)
+        previous._execute("cleanup")
+
+        scheduler = make_scheduler(schedulers, tmp_path, [task])
+        assert scheduler._try_become_leader()
+
+        assert scheduler._next_run["cleanup"] <= datetime.now(timezone.utc)
+
+    def test_run_now_skips_running_task(self, schedulers, tmp_path):
+        release = threading.Event()
+        started = threading.Event()
+
+        def slow(now):
+            started.set()
+            release.wait(5)
+
+        scheduler = make_scheduler(schedulers, tmp_path, [ScheduledTask("slow", slow, daily_at=(2, 0))])
+
+        assert scheduler.run_now("slow")
+        assert started.wait(5)
+        assert not scheduler.run_now("slow")
+        release.set()
+        assert wait_for(lambda: scheduler.get_status()["tasks"]["slow"]["runs"] == 1)
+        assert scheduler.run_now("slow")
+
+        with pytest.raises(KeyError):
+            scheduler.run_now("missing")
@@ -0,0 +1,120 @@
+"""
+Tests for the JSON serialization helpers.
+
+Example usage:
+    pytest tests/test_serialization.py -v
+"""
+
+import json
+import math
+import random
+from datetime import datetime, timezone
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from core import serialization
+from core.serialization import FastJSONResponse, dumps_canonical, dumps_fast, loads
+
+EXAMPLES_DIR = Path(__file__).resolve().parent.parent / "examples"
+
+CASES = [
+    {"pass": True, "actual_hold_time_s": 612.0, "target_temp_C": 180, "reasons": []},
+    {"unit": "°C", "name": "Ωmega ✓ 😀", "control": "\x7f\x00\t", "quote": "\"\\/"},
+    {"floats": [0.1, 1e-05, 0.00012, 1e16, 1.5e300, 123456789012345678.0, -0.0, 5e-324]},
+    {"big": 2 ** 70, "neg": -(2 ** 63), "nested": {"b": [1, {"a": None}], "a": {}}},
+    {"tuple": (1, 2), "empty": [], "text": "1234567890123456789.5e3"},
+    {1: "int key", "x": "str key"},
+    [],
+    "plain",
+]
+
+
+class TestDumpsCanonical:
+    """Canonical output must match json.dumps byte for byte."""
+
+    @pytest.mark.parametrize("obj", CASES)
+    @pytest.mark.parametrize("sort_keys", [False, True])
+    def test_matches_stdlib(self, obj, sort_keys):
+        if sort_keys and isinstance(obj, dict) and 1 in obj:
+            pytest.skip("stdlib cannot sort mixed key types")
+        assert dumps_canonical(obj, sort_keys=sort_keys) == json.dumps(obj, indent=2, sort_keys=sort_keys)
+        assert dumps_canonical(obj, sort_keys=sort_keys, compact=True) == json.dumps(
+            obj, sort_keys=sort_keys, separators=(',', ':'))
+
+    def test_matches_stdlib_on_random_documents(self):
+        rng = random.Random(1234)
+
+        def value(depth):
+            kind = rng.randrange(7 if depth < 3 else 5)
+            if kind == 0:
+                return rng.uniform(-1e6, 1e6) * 10 ** rng.randint(-12, 20)
+            if kind == 1:
+                return rng.randint(-10 ** 12, 10 ** 12)
+            if kind == 2:
+                return "".join(chr(rng.choice([rng.randint(32, 126), rng.randint(128, 0x2fff)]))
+                               for _ in range(rng.randint(0, 8)))
+            if kind == 3:
+                return rng.choice([True, False, None])
+            if kind == 4:
+                return round(rng.random() * 100, rng.randint(0, 6))
+            if kind == 5:
+                return [value(depth + 1) for _ in range(rng.randint(0, 4))]
+            return {f"k{rng.randint(0, 99)}": value(depth + 1) for _ in range(rng.randint(0, 4))}
+
+        for _ in range(500):
+            doc = {"root": value(0)}
+            assert dumps_canonical(doc, sort_keys=True) == json.dumps(doc, indent=2, sort_keys=True)
+
+    @pytest.mark.parametrize("path", sorted(EXAMPLES_DIR.glob("*.json")), ids=lambda p: p.name)
+    def test_matches_stdlib_on_examples(self, path):
+        data = json.loads(path.read_text())
+        assert dumps_canonical(data) == json.dumps(data, indent=2)
+
+    def test_nan_and_default_fall_back_to_stdlib(self):
+        doc = {"value": float("nan"), "when": datetime(2024, 1, 2, 3, 4, 5, tzinfo=timezone.utc)}
+
+        assert dumps_canonical(doc, default=str) == json.dumps(doc, indent=2, default=str)
+
+    def test_unserializable_raises_type_error(self):
+        with pytest.raises(TypeError):
+            dumps_canonical({"value": object()})
+
+    def test_without_orjson(self, monkeypatch):
+        monkeypatch.setattr(serialization, "orjson", None)
+        doc = {"unit": "°C", "hold": 1e-05}
+
+        assert dumps_canonical(doc) == json.dumps(doc, indent=2)
+        assert loads(dumps_fast(doc)) == doc
+
+
+class TestFastPath:
+    """Compact responses and parsing."""
+
+    def test_dumps_fast_round_trips(self):
+        doc = {"unit": "°C", "values": [1.5, 2, None], "pass": True}
+
+        assert isinstance(dumps_fast(doc), bytes)
+        assert json.loads(dumps_fast(doc)) == doc
+
+    def test_dumps_fast_handles_numpy(self):
+        doc = {"mean": np.float64(181.5), "count": np.int64(3), "series": np.array([1.0, 2.0])}
+
+        assert json.loads(dumps_fast(doc)) == {"mean": 181.5, "count": 3, "series": [1.0, 2.0]}
+
+    def test_loads_accepts_stdlib_nan_tokens(self):
+        data = loads(json.dumps({"a": float("nan"), "b": float("inf")}).encode("utf-8"))
+
+        assert math.isnan(data["a"]) and data["b"] == float("inf")
+
+    def test_loads_invalid_raises_value_error(self):
+        with pytest.raises(ValueError):
+            loads(b"{not json")
+
+    def test_fast_json_response(self):
+        response = FastJSONResponse(status_code=201, content={"job_id": "abc", "unit": "°C"})
+
+        assert response.status_code == 201
+        assert response.headers["content-type"] == "application/json"
+        assert json.loads(response.body) == {"job_id": "abc", "unit": "°C"}
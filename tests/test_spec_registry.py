@@ -0,0 +1,74 @@
+"""
+Tests for the cached industry preset registry.
+
+Example usage:
+    pytest tests/test_spec_registry.py -v
+"""
+
+import json
+import os
+
+import pytest
+
+from core.spec_registry import PRESET_FILES, SpecRegistry, get_spec_registry
+
+
+@pytest.fixture
+def library(tmp_path):
+    (tmp_path / "powder.json").write_text(json.dumps({"version": "1.0", "spec": {"target_temp_C": 180}}))
+    (tmp_path / "haccp.json").write_text(json.dumps({"industry": "haccp", "parameters": {}}))
+    (tmp_path / "default.json").write_text(json.dumps({"version": "1.0"}))
+    return tmp_path
+
+
+def make_registry(library, **kwargs):
+    return SpecRegistry(
+        base_dir=library,
+        preset_files={"powder": "powder.json", "haccp": "haccp.json", "concrete": "missing.json"},
+        default_spec_file="default.json",
+        **kwargs,
+    )
+
+
+def touch(path, data):
+    path.write_text(json.dumps(data))
+    os.utime(path, ns=(0, path.stat().st_mtime_ns + 1_000_000))
+
+
+class TestSpecRegistry:
+    """Test preset parsing, reuse and hot reload."""
+
+    def test_loads_presets_and_json(self, library):
+        registry = make_registry(library)
+
+        presets = registry.presets()
+
+        assert set(presets) == {"powder", "haccp"}
+        assert presets["powder"]["industry"] == "powder"
+        assert json.loads(registry.preset_json("haccp")) == {"industry": "haccp", "parameters": {}}
+        assert registry.preset_json("concrete") is None
+        assert json.loads(registry.default_spec_json()) == {"version": "1.0"}
+
+    def test_reuses_parsed_presets_until_file_changes(self, library):
+        registry = make_registry(library, check_interval_s=0)
+        first = registry.presets()["haccp"]
+        assert registry.presets()["haccp"] is first
+
+        touch(library / "haccp.json", {"industry": "haccp", "parameters": {"temp_1": 60}})
+
+        assert registry.presets()["haccp"]["parameters"] == {"temp_1": 60}
+
+    def test_check_interval_defers_reload(self, library):
+        registry = make_registry(library, check_interval_s=3600)
+        registry.presets()
+
+        touch(library / "haccp.json", {"industry": "haccp", "parameters": {"temp_1": 60}})
+
+        assert registry.presets()["haccp"]["parameters"] == {}
+
+    def test_default_registry_matches_repo_files(self):
+        presets = get_spec_registry().presets()
+
+        assert set(presets) == set(PRESET_FILES)
+        assert presets["eto"] == presets["sterile"]
+        assert presets["powder-coating"]["industry"] == "powder"
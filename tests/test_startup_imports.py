@@ -0,0 +1,49 @@
+"""
+Tests that worker startup does not import the plotting, PDF and metrics stacks.
+
+Example usage:
+    pytest tests/test_startup_imports.py -v
+"""
+
+import importlib.util
+import sys
+from pathlib import Path
+
+import pytest
+
+from core.industry_router import ENGINES, select_engine
+
+SCRIPT_PATH = Path(__file__).resolve().parent.parent / "scripts" / "import_profile.py"
+
+
+@pytest.fixture(scope="module")
+def import_profile():
+    spec = importlib.util.spec_from_file_location("import_profile", SCRIPT_PATH)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+class TestStartupImports:
+    """Test that heavy stacks load on first use rather than at import."""
+
+    def test_app_import_defers_rendering_stacks(self, import_profile):
+        rows, loaded = import_profile.profile_import("app")
+
+        assert "app" in [name for name, _, _, _ in rows]
+        assert "fastapi" in loaded
+        assert not [m for m in import_profile.LAZY_MODULES if m in loaded]
+        assert not [m for m in loaded if m.startswith("core.metrics_")]
+
+    def test_router_defers_engines(self, import_profile):
+        _, loaded = import_profile.profile_import("core.industry_router")
+
+        assert not [m for m, _ in ENGINES.values() if m in loaded]
+
+    def test_select_engine_loads_on_demand(self):
+        engine = select_engine(" ETO ")
+
+        assert engine.__name__ == "validate_sterile_environment"
+        assert "core.metrics_sterile" in sys.modules
+        with pytest.raises(ValueError, match="Unknown industry"):
+            select_engine("bakery")
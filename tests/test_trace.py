@@ -0,0 +1,159 @@
+"""
+Tests for the shared TraceFrame representation.
+
+Example usage:
+    pytest tests/test_trace.py -v
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from core.models import SensorMode
+from core.sensor_utils import combine_sensor_readings
+from core.temperature_utils import DecisionError
+from core.trace import TraceFrame, get_trace, register_trace
+
+
+@pytest.fixture
+def sensor_df():
+    """Normalized frame with three temperature sensors, humidity and pressure."""
+    rng = np.random.default_rng(7)
+    n = 200
+    df = pd.DataFrame({
+        "timestamp": pd.date_range("2024-01-01", periods=n, freq="30s", tz="UTC"),
+        "temp_1": rng.normal(180, 5, n),
+        "temp_2": rng.normal(181, 5, n),
+        "temp_3": rng.normal(179, 5, n),
+        "humidity_rh": rng.uniform(40, 60, n),
+        "chamber_pressure": rng.uniform(100, 110, n),
+    })
+    df.loc[::17, "temp_2"] = np.nan
+    df.loc[5, ["temp_1", "temp_2", "temp_3"]] = np.nan
+    return df
+
+
+class TestTraceFrame:
+    """Test trace construction and combination."""
+
+    def test_from_dataframe_resolves_roles(self, sensor_df):
+        trace = TraceFrame.from_dataframe(sensor_df)
+
+        assert trace.timestamp_column == "timestamp"
+        assert trace.timestamps_ns.dtype == np.int64
+        assert trace.timestamps_ns[1] - trace.timestamps_ns[0] == 30 * 10**9
+        assert trace.roles["temperature"] == ("temp_1", "temp_2", "temp_3")
+        assert trace.roles["humidity"] == ("humidity_rh",)
+        assert trace.roles["pressure"] == ("chamber_pressure",)
+        assert trace.roles["gas"] == ()
+        assert len(trace.arrays) == 5 and len(trace) == 200
+        assert not trace.column("temp_3").flags.writeable
+        np.testing.assert_array_equal(trace.column("temp_3"), sensor_df["temp_3"].to_numpy())
+
+    def test_float_columns_are_views_not_copies(self, sensor_df):
+        trace = TraceFrame.from_dataframe(sensor_df)
+
+        for name in trace.columns:
+            assert np.shares_memory(trace.column(name), sensor_df[name].to_numpy())
+
+    @pytest.mark.parametrize("mode,threshold,require", [
+        (SensorMode.MIN_OF_SET, None, None),
+        (SensorMode.MEAN_OF_SET, None, None),
+        (SensorMode.MAJORITY_OVER_THRESHOLD, 180.0, None),
+        (SensorMode.MAJORITY_OVER_THRESHOLD, 180.0, 2),
+    ])
+    def test_combined_matches_combine_sensor_readings(self, sensor_df, mode, threshold, require):
+        columns = ["temp_1", "temp_2", "temp_3"]
+        trace = TraceFrame.from_dataframe(sensor_df)
+
+        if mode == SensorMode.MAJORITY_OVER_THRESHOLD and require is not None:
+            # Row 5 has no valid sensors, so both implementations must reject it
+            with pytest.raises(DecisionError, match="Insufficient valid sensors"):
+                combine_sensor_readings(sensor_df, columns, mode, require, threshold)
+            with pytest.raises(DecisionError, match="Insufficient valid sensors"):
+                trace.combined(columns, mode, require, threshold)
+            return
+
+        expected = combine_sensor_readings(sensor_df, columns, mode, require, threshold)
+        actual = trace.combined(columns, mode, require, threshold)
+        pd.testing.assert_series_equal(actual, expected, check_dtype=False)
+
+    def test_combined_is_memoized(self, sensor_df):
+        trace = TraceFrame.from_dataframe(sensor_df)
+        first = trace.combined(["temp_1", "temp_2"], SensorMode.MIN_OF_SET, None, 180.0)
+        second = trace.combined(["temp_1", "temp_2"], SensorMode.MIN_OF_SET, None, 200.0)
+
+        pd.testing.assert_series_equal(first, second)
+        assert len(trace._combined) == 1
+
+        # Callers get their own copy of the memoized result
+        first.iloc[0] = -1.0
+        assert trace.combined(["temp_1", "temp_2"], SensorMode.MIN_OF_SET).iloc[0] != -1.0
+
+    def test_combined_requires_threshold_for_majority(self, sensor_df):
+        trace = TraceFrame.from_dataframe(sensor_df)
+        with pytest.raises(DecisionError, match="threshold_C required"):
+            trace.combined(["temp_1"], SensorMode.MAJORITY_OVER_THRESHOLD)
+
+
+class TestTraceRegistry:
+    """Test lookup of the trace registered by normalization."""
+
+    def test_registered_trace_is_reused(self, sensor_df):
+        trace = register_trace(sensor_df)
+        assert get_trace(sensor_df) is trace
+
+    def test_unregistered_frame_gets_fresh_trace(self, sensor_df):
+        assert get_trace(sensor_df) is not get_trace(sensor_df)
+
+    def test_reshaped_frame_is_not_reused(self, sensor_df):
+        trace = register_trace(sensor_df)
+        sensor_df["temp_4"] = sensor_df["temp_1"]
+
+        fresh = get_trace(sensor_df)
+        assert fresh is not trace
+        assert "temp_4" in fresh.roles["temperature"]
+
+    def test_changed_values_are_not_reused(self, sensor_df):
+        trace = register_trace(sensor_df)
+        stale = trace.combined(["temp_1"], SensorMode.MIN_OF_SET)
+        sensor_df.loc[10, "temp_1"] = 500.0
+
+        fresh = get_trace(sensor_df)
+        assert fresh is not trace
+        assert get_trace(sensor_df) is fresh
+        assert fresh.combined(["temp_1"], SensorMode.MIN_OF_SET).iloc[10] == 500.0
+        assert stale.iloc[10] != 500.0
+
+    def test_sum_preserving_edits_are_not_reused(self):
+        df = pd.DataFrame({
+            "timestamp": pd.date_range("2024-01-01", periods=4, freq="30s", tz="UTC"),
+            "temp_1": [100.0, 110.0, 139.0, 160.0],
+        })
+        trace = register_trace(df)
+        trace.combined(["temp_1"], SensorMode.MIN_OF_SET)
+        df.loc[[0, 1], "temp_1"] = [110.0, 100.0]
+        df.loc[[2, 3], "temp_1"] = [140.0, 159.0]
+
+        fresh = get_trace(df)
+        assert fresh is not trace
+        assert fresh.combined(["temp_1"], SensorMode.MIN_OF_SET).tolist() == [110.0, 100.0, 140.0, 159.0]
+
+    def test_reordered_timestamps_are_not_reused(self, sensor_df):
+        trace = register_trace(sensor_df)
+        sensor_df.loc[[0, 1], "timestamp"] = sensor_df.loc[[1, 0], "timestamp"].to_numpy()
+
+        fresh = get_trace(sensor_df)
+        assert fresh is not trace
+        assert fresh.timestamps_ns[0] > fresh.timestamps_ns[1]
+
+    def test_normalization_registers_trace(self):
+        from core.normalize import normalize_temperature_data
+
+        raw = pd.DataFrame({
+            "timestamp": pd.date_range("2024-01-01", periods=40, freq="30s"),
+            "temp_1": np.linspace(20, 190, 40),
+        })
+        normalized = normalize_temperature_data(raw)
+        assert get_trace(normalized) is get_trace(normalized)
+        assert get_trace(normalized).roles["temperature"] == ("temp_1",)
@@ -0,0 +1,138 @@
+"""
+Tests for the SQLite-backed magic link and trial tracking stores.
+
+Example usage:
+    pytest tests/test_trial_store.py -v
+"""
+
+import json
+import time
+
+import pytest
+from starlette.requests import Request
+
+import middleware.trial_protection as trial_protection
+from auth.magic import MagicLinkAuth
+from auth.models import UserRole
+from middleware.trial_protection import (
+    check_trial_abuse,
+    cleanup_old_trial_data,
+    get_trial_statistics,
+    load_trial_data,
+    record_trial_signup,
+    reset_trial_ip,
+)
+
+
+def make_request(ip="203.0.113.7", user_agent="Mozilla/5.0"):
+    return Request({
+        "type": "http",
+        "headers": [(b"fly-client-ip", ip.encode()), (b"user-agent", user_agent.encode())],
+        "client": (ip, 1234),
+    })
+
+
+@pytest.fixture
+def trial_store(tmp_path, monkeypatch):
+    monkeypatch.setattr(trial_protection, "TRIAL_DB_PATH", tmp_path / "trials.db")
+    monkeypatch.setattr(trial_protection, "TRIAL_DATA_PATH", tmp_path / "trial_data.json")
+    return tmp_path
+
+
+@pytest.fixture
+def auth(tmp_path):
+    handler = MagicLinkAuth()
+    handler.storage_dir = tmp_path
+    return handler
+
+
+class TestMagicLinkStore:
+    """Test magic link persistence, single use and expiry purge."""
+
+    def test_link_is_consumed_once_by_any_worker(self, auth, tmp_path):
+        token = auth.generate_magic_link("op@example.com", UserRole.OPERATOR, return_url="/dashboard")
+        other_worker = MagicLinkAuth()
+        other_worker.storage_dir = tmp_path
+
+        link = other_worker.validate_magic_link(token)
+
+        assert link["email"] == "op@example.com"
+        assert link["return_url"] == "/dashboard"
+        assert auth.validate_magic_link(token) is None
+        assert not list(tmp_path.glob("*.json"))
+
+    def test_expired_links_are_purged(self, auth):
+        old_token = auth.generate_magic_link("old@example.com")
+        conn = auth._connect_links()
+        conn.execute("UPDATE magic_links SET expires_at = ? WHERE token = ?", (time.time() - 1, old_token))
+        conn.close()
+
+        auth.generate_magic_link("new@example.com")
+
+        assert auth._load_magic_link(old_token) is None
+
+    def test_imports_legacy_token_files(self, auth, tmp_path):
+        token = auth.generate_magic_link("seed@example.com")
+        data = auth._load_magic_link(token)
+        (tmp_path / "legacytoken.json").write_text(json.dumps({**data, "email": "legacy@example.com"}))
+        (tmp_path / "dev_links.json").write_text("{}")
+
+        assert auth.validate_magic_link("legacytoken")["email"] == "legacy@example.com"
+        assert not (tmp_path / "legacytoken.json").exists()
+        assert (tmp_path / "dev_links.json").exists()
+
+
+class TestTrialStore:
+    """Test trial abuse checks against the indexed signup table."""
+
+    def test_ip_limit_and_rapid_signup(self, trial_store):
+        request = make_request()
+        assert check_trial_abuse(request, "first@example.com") == (False, None)
+        record_trial_signup(request, "first@example.com")
+
+        is_abuse, reason = check_trial_abuse(make_request(user_agent="Other"), "second@example.org")
+        assert is_abuse and "wait" in reason
+
+        record_trial_signup(make_request(user_agent="Other"), "second@example.org")
+        is_abuse, reason = check_trial_abuse(make_request(user_agent="Third"), "third@example.net")
+        assert is_abuse and "network" in reason
+
+    def test_fingerprint_limit_spans_ips(self, trial_store):
+        for i in range(3):
+            record_trial_signup(make_request(ip=f"198.51.100.{i}"), f"user{i}x@example.com")
+
+        is_abuse, reason = check_trial_abuse(make_request(ip="192.0.2.1"), "fresh@example.com")
+        assert is_abuse and "device" in reason
+
+    def test_statistics_reset_and_retention(self, trial_store):
+        record_trial_signup(make_request(), "a@example.com")
+        record_trial_signup(make_request(), "b@example.com")
+        record_trial_signup(make_request(ip="192.0.2.9", user_agent="x"), "c@example.com")
+
+        stats = get_trial_statistics()
+        assert stats["total_ips"] == 2
+        assert stats["suspicious_ips"] == [
+            {"ip": "203.0.113.7", "trial_count": 2, "emails": ["a@example.com", "b@example.com"]}
+        ]
+        assert load_trial_data()["email_ips"]["c@example.com"] == ["192.0.2.9"]
+
+        assert reset_trial_ip("203.0.113.7") == 2
+        assert cleanup_old_trial_data(days=0) == 1
+        assert get_trial_statistics()["total_emails"] == 0
+
+    def test_imports_legacy_blob(self, trial_store):
+        legacy = {
+            "ip_trials": {"203.0.113.7": [
+                {"email": "a@example.com", "timestamp": time.time() - 60, "fingerprint": "f1"},
+                {"email": "b@example.com", "timestamp": time.time() - 30, "fingerprint": "f2"},
+            ]},
+            "fingerprint_trials": {},
+            "email_ips": {},
+        }
+        (trial_store / "trial_data.json").write_text(json.dumps(legacy))
+
+        is_abuse, reason = check_trial_abuse(make_request(), "c@example.com")
+
+        assert is_abuse and "network" in reason
+        assert (trial_store / "trial_data.json.imported").exists()
+        assert not (trial_store / "trial_data.json").exists()
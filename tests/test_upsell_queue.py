@@ -0,0 +1,133 @@
+"""
+Tests for the indexed upsell queue and Postmark batch sending.
+
+Example usage:
+    pytest tests/test_upsell_queue.py -v
+"""
+
+import json
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from core import email, upsell
+
+
+@pytest.fixture
+def queue(tmp_path, monkeypatch):
+    monkeypatch.setattr(upsell, "STORAGE_DIR", tmp_path)
+    monkeypatch.setattr(upsell, "QUEUE_FILE", tmp_path / "upsell_queue.jsonl")
+    sent = []
+
+    def fake_batch(messages):
+        sent.append([(m["to_email"], m["subject"]) for m in messages])
+        return [not m["to_email"].startswith("bounce") for m in messages]
+
+    monkeypatch.setattr(upsell, "send_postmark_batch", fake_batch)
+    return sent
+
+
+def enqueue(email_address, certificate_id="cert1"):
+    upsell.enqueue_upsell(email_address, certificate_id, "powder", "Standard").result(timeout=5)
+
+
+def stages():
+    conn = upsell._connect_queue()
+    try:
+        return {row["certificate_id"]: row["stage"]
+                for row in conn.execute("SELECT certificate_id, stage FROM upsell_jobs")}
+    finally:
+        conn.close()
+
+
+class TestUpsellQueue:
+    """Test due-time scheduling, batching and retries."""
+
+    def test_sends_stages_when_due(self, queue):
+        enqueue("user@example.com")
+        now = datetime.now(timezone.utc)
+
+        assert upsell.process_queue_once(now + timedelta(hours=71)) == {"sent": 0, "failed": 0}
+        assert upsell.process_queue_once(now + timedelta(hours=73)) == {"sent": 1, "failed": 0}
+        assert stages() == {"cert1": "reminder5d"}
+        assert upsell.process_queue_once(now + timedelta(days=5, hours=1))["sent"] == 1
+        assert upsell.process_queue_once(now + timedelta(days=7, hours=1))["sent"] == 1
+
+        assert stages() == {}
+        assert [batch[0][1] for batch in queue] == [
+            "Remove the ProofKit logo for €7",
+            "How other powder teams use ProofKit",
+            "Logo-free upgrade expires tomorrow",
+        ]
+
+    def test_batches_due_jobs_and_ignores_duplicates(self, queue):
+        for i in range(5):
+            enqueue(f"user{i}@example.com", f"cert{i}")
+        enqueue("user0@example.com", "cert0")
+
+        stats = upsell.process_queue_once(datetime.now(timezone.utc) + timedelta(hours=73), batch_size=2)
+
+        assert stats == {"sent": 5, "failed": 0}
+        assert [len(batch) for batch in queue] == [2, 2, 1]
+
+    def test_failed_send_is_retried_later(self, queue):
+        enqueue("bounce@example.com")
+        due = datetime.now(timezone.utc) + timedelta(hours=73)
+
+        assert upsell.process_queue_once(due) == {"sent": 0, "failed": 1}
+        assert upsell.process_queue_once(due + timedelta(seconds=10))["failed"] == 0
+        assert upsell.process_queue_once(
+            due + timedelta(seconds=upsell.UPSELL_RETRY_DELAY_SECONDS + 1))["failed"] == 1
+        assert stages() == {"cert1": "scheduled72h"}
+
+    def test_overdue_stages_are_spaced_out(self, queue):
+        enqueue("user@example.com")
+        late = datetime.now(timezone.utc) + timedelta(days=10)
+
+        assert upsell.process_queue_once(late)["sent"] == 1
+        assert upsell.process_queue_once(late + timedelta(minutes=1))["sent"] == 0
+        assert upsell.process_queue_once(
+            late + timedelta(seconds=upsell.UPSELL_MIN_STAGE_GAP_SECONDS + 1))["sent"] == 1
+
+    def test_imports_legacy_jsonl(self, queue, tmp_path):
+        created = (datetime.now(timezone.utc) - timedelta(days=6)).isoformat()
+        lines = [
+            {"email": "a@example.com", "certificate_id": "old", "industry": "haccp",
+             "spec_type": "Cooling", "created_at": created, "stage": "urgency7d"},
+            {"email": "b@example.com", "certificate_id": "done", "industry": "haccp",
+             "spec_type": "Cooling", "created_at": created, "stage": "done"},
+        ]
+        (tmp_path / "upsell_queue.jsonl").write_text("\n".join(json.dumps(line) for line in lines) + "\n")
+
+        assert upsell.process_queue_once()["sent"] == 0
+        assert stages() == {"old": "urgency7d"}
+        assert (tmp_path / "upsell_queue.jsonl.imported").exists()
+
+
+class TestPostmarkBatch:
+    """Test per-message results from the batch endpoint."""
+
+    def test_maps_per_message_results(self, monkeypatch):
+        calls = []
+
+        def fake_post(url, headers, payload, timeout=15):
+            calls.append((url, len(payload)))
+            return 200, json.dumps([{"ErrorCode": 0 if i % 2 == 0 else 406} for i in range(len(payload))])
+
+        monkeypatch.setenv("POSTMARK_API_TOKEN", "token")
+        monkeypatch.setattr(email, "POSTMARK_BATCH_LIMIT", 2)
+        monkeypatch.setattr(email, "_post_json", fake_post)
+        messages = [{"to_email": f"u{i}@example.com", "subject": "s", "html_body": "b"} for i in range(3)]
+
+        assert email.send_postmark_batch(messages) == [True, False, True]
+        assert calls == [(email.POSTMARK_BATCH_URL, 2), (email.POSTMARK_BATCH_URL, 1)]
+
+    def test_failed_call_or_missing_token_fails_all(self, monkeypatch):
+        messages = [{"to_email": "u@example.com", "subject": "s", "html_body": "b"}]
+        monkeypatch.delenv("POSTMARK_API_TOKEN", raising=False)
+        monkeypatch.delenv("POSTMARK_TOKEN", raising=False)
+        assert email.send_postmark_batch(messages) == [False]
+
+        monkeypatch.setenv("POSTMARK_API_TOKEN", "token")
+        monkeypatch.setattr(email, "_post_json", lambda *args, **kwargs: (500, "error"))
+        assert email.send_postmark_batch(messages) == [False]
@@ -0,0 +1,90 @@
+"""
+Tests for the cached user context used by the auth middleware.
+
+Example usage:
+    pytest tests/test_user_context_cache.py -v
+"""
+
+import time
+from unittest.mock import patch
+
+import jwt
+import pytest
+
+from auth.magic import MagicLinkAuth
+from auth.models import UserRole
+from core.ttl_cache import TTLCache
+from middleware.quota import get_user_plan, save_user_quota_data, update_user_plan, load_user_quota_data
+
+
+@pytest.fixture
+def quota_dir(tmp_path):
+    with patch('middleware.quota.QUOTA_STORAGE_DIR', tmp_path), \
+         patch('middleware.quota._user_plans', TTLCache(30, 16)):
+        yield tmp_path
+
+
+class TestTTLCache:
+    """Test expiry and size bounds."""
+
+    def test_expires_and_evicts_least_recent(self):
+        cache = TTLCache(ttl_s=30, max_entries=2)
+        cache.put('a', 1)
+        cache.put('b', 2)
+        cache.get('a')
+        cache.put('c', 3)
+
+        assert cache.get('b') is None
+        assert cache.get('a') == 1
+        cache.put('d', 4, expires_at=time.time() - 1)
+        assert cache.get('d') is None
+
+    def test_zero_ttl_disables(self):
+        cache = TTLCache(ttl_s=0, max_entries=2)
+        cache.put('a', 1)
+        assert cache.get('a') is None
+
+
+class TestUserPlanCache:
+    """Test that plan lookups skip the quota file until the plan changes."""
+
+    def test_repeat_lookups_read_file_once(self, quota_dir):
+        data = load_user_quota_data('user@example.com')
+        data['plan'] = 'starter'
+        save_user_quota_data('user@example.com', data)
+
+        with patch('middleware.quota.load_user_quota_data', wraps=load_user_quota_data) as loader:
+            assert get_user_plan('user@example.com') == 'starter'
+            assert get_user_plan('user@example.com') == 'starter'
+        assert loader.call_count == 1
+
+    def test_update_user_plan_invalidates(self, quota_dir):
+        assert get_user_plan('user@example.com') == 'free'
+
+        assert update_user_plan('user@example.com', 'pro', {'id': 'sub_1', 'status': 'active'})
+
+        assert get_user_plan('user@example.com') == 'pro'
+
+
+class TestJwtMemo:
+    """Test memoized JWT verification."""
+
+    def test_decodes_once_per_token(self):
+        auth = MagicLinkAuth()
+        token = auth.create_jwt_token('qa@example.com', UserRole.QA)
+
+        with patch('auth.magic.jwt.decode', wraps=jwt.decode) as decode:
+            first = auth.verify_jwt_token(token)
+            first['sub'] = 'mutated'
+            second = auth.verify_jwt_token(token)
+
+        assert decode.call_count == 1
+        assert second['sub'] == 'qa@example.com'
+
+    def test_expired_memo_is_not_served(self):
+        auth = MagicLinkAuth()
+        token = auth.create_jwt_token('qa@example.com', UserRole.QA)
+        auth._verified_tokens.put(token, {'sub': 'qa@example.com'}, expires_at=time.time() - 1)
+
+        assert auth.verify_jwt_token(token)['sub'] == 'qa@example.com'
+        assert auth.verify_jwt_token('not.a.token') is None
@@ -4,17 +4,21 @@ Tests for M14 Validation Pack Generator.
 
 import pytest
 import json
+import os
 import tempfile
+import threading
 import zipfile
 from pathlib import Path
 from datetime import datetime, timezone
 from unittest.mock import patch, MagicMock
 
+from core.build_info import reset_build_info_cache
 from core.validation import (
     get_git_commit_hash,
     get_software_version,
     create_filled_pdf,
     create_validation_pack,
+    ensure_validation_pack,
     get_validation_pack_info
 )
 
@@ -26,45 +30,75 @@ class TestValidationPack:
         """Set up test environment."""
         self.temp_dir = tempfile.mkdtemp()
         self.temp_path = Path(self.temp_dir)
+        reset_build_info_cache()
+        # Resolve from the repository, not a baked file or deployment env
+        self.env_patch = patch.dict('os.environ', {'BUILD_INFO_PATH': str(self.temp_path / "missing.json")})
+        self.env_patch.start()
+        for key in ('GIT_COMMIT', 'SOURCE_COMMIT', 'PROOFKIT_VERSION'):
+            os.environ.pop(key, None)
     
     def teardown_method(self):
         """Clean up test environment."""
         import shutil
+        self.env_patch.stop()
+        reset_build_info_cache()
         shutil.rmtree(self.temp_dir, ignore_errors=True)
     
     def test_get_git_commit_hash(self):
-        """Test git commit hash retrieval."""
-        with patch('subprocess.run') as mock_run:
+        """Test git commit hash retrieval is resolved once and cached."""
+        with patch('core.build_info.shutil.which', return_value='/usr/bin/git'), \
+             patch('subprocess.run') as mock_run:
             mock_run.return_value.returncode = 0
             mock_run.return_value.stdout = "abc123def456\n"
             
             hash_result = get_git_commit_hash()
             assert hash_result == "abc123de"
+            assert get_git_commit_hash() == "abc123de"
+            assert mock_run.call_count == 1
     
     def test_get_git_commit_hash_failure(self):
         """Test git commit hash retrieval failure."""
-        with patch('subprocess.run') as mock_run:
+        with patch('core.build_info.shutil.which', return_value='/usr/bin/git'), \
+             patch('subprocess.run') as mock_run:
             mock_run.return_value.returncode = 1
             
             hash_result = get_git_commit_hash()
             assert hash_result == "unknown"
     
+    def test_get_git_commit_hash_without_git_binary(self):
+        """Test no process is spawned when git is not installed."""
+        with patch('core.build_info.shutil.which', return_value=None), \
+             patch('subprocess.run') as mock_run:
+            assert get_git_commit_hash() == "unknown"
+            mock_run.assert_not_called()
+    
+    def test_build_info_file_and_env_take_precedence(self):
+        """Test baked build info file wins over env, env wins over git."""
+        with patch('subprocess.run') as mock_run:
+            os.environ['GIT_COMMIT'] = "feedfacecafebeef"
+            os.environ['PROOFKIT_VERSION'] = "9.9.9"
+            assert get_git_commit_hash() == "feedface"
+            assert get_software_version() == "9.9.9"
+            
+            reset_build_info_cache()
+            build_info_path = Path(os.environ['BUILD_INFO_PATH'])
+            build_info_path.write_text(json.dumps({"version": "2.0.0", "commit": "0123456789abcdef"}))
+            assert get_git_commit_hash() == "01234567"
+            assert get_software_version() == "2.0.0"
+            mock_run.assert_not_called()
+    
     def test_get_software_version(self):
         """Test software version retrieval."""
-        with patch('pathlib.Path.exists') as mock_exists:
-            mock_exists.return_value = True
-            
-            with patch('builtins.open', create=True) as mock_open:
-                mock_open.return_value.__enter__.return_value.read.return_value = 'version = "1.2.3"'
-                
-                version = get_software_version()
-                assert version == "1.2.3"
+        pyproject = self.temp_path / "pyproject.toml"
+        pyproject.write_text('[project]\nname = "proofkit"\nversion = "1.2.3"\n')
+        
+        with patch('core.build_info.PYPROJECT_PATH', pyproject):
+            version = get_software_version()
+            assert version == "1.2.3"
     
     def test_get_software_version_fallback(self):
         """Test software version fallback."""
-        with patch('pathlib.Path.exists') as mock_exists:
-            mock_exists.return_value = False
-            
+        with patch('core.build_info.PYPROJECT_PATH', self.temp_path / "missing.toml"):
             version = get_software_version()
             assert version == "0.1.0"
     
@@ -189,6 +223,77 @@ class TestValidationPack:
             for filename, file_hash in file_hashes.items():
                 assert len(file_hash) == 64  # SHA-256 hex length
                 assert all(c in '0123456789abcdef' for c in file_hash.lower())
+    
+    def test_ensure_validation_pack_reuses_cached_pack(self):
+        """Test that an unchanged job state serves the stored pack."""
+        job_meta = {"creator": {"email": "test@example.com"}, "approved": False}
+        
+        first = ensure_validation_pack("test123", job_meta, self.temp_path)
+        assert first is not None
+        assert first.path.read_bytes()
+        
+        with patch('core.validation.create_validation_pack') as mock_create:
+            second = ensure_validation_pack("test123", job_meta, self.temp_path)
+            mock_create.assert_not_called()
+        
+        assert second.sha256 == first.sha256
+        assert second.etag == f'"{first.sha256}"'
+    
+    def test_ensure_validation_pack_regenerates_after_approval(self):
+        """Test that approving a job invalidates the stored pack."""
+        job_meta = {"creator": {"email": "test@example.com"}, "approved": False}
+        draft = ensure_validation_pack("test123", job_meta, self.temp_path)
+        
+        job_meta.update({
+            "approved": True,
+            "approved_by": "qa@example.com",
+            "approved_at": "2024-01-01T12:00:00Z"
+        })
+        approved = ensure_validation_pack("test123", job_meta, self.temp_path)
+        
+        assert approved.state_key != draft.state_key
+        with zipfile.ZipFile(approved.path, 'r') as zipf:
+            manifest = json.loads(zipf.read("manifest.json"))
+            assert manifest["validation_pack"]["approved_by"] == "qa@example.com"
+    
+    def test_validation_pack_index_matches_zip(self):
+        """Test that the stored index hash matches the ZIP bytes."""
+        import hashlib
+        
+        job_meta = {"creator": {"email": "test@example.com"}, "approved": False}
+        pack = ensure_validation_pack("test123", job_meta, self.temp_path)
+        
+        index = json.loads((self.temp_path / "validation_pack.json").read_text())
+        assert index["sha256"] == pack.sha256
+        assert index["sha256"] == hashlib.sha256(pack.path.read_bytes()).hexdigest()
+        assert not list(self.temp_path.glob(".validation_pack.*"))
+    
+    def test_concurrent_requests_build_pack_once(self):
+        """Test that simultaneous requests share one build and a matching index."""
+        import hashlib
+        from core.validation import create_validation_pack
+        
+        job_meta = {"creator": {"email": "test@example.com"}, "approved": False}
+        calls = []
+        
+        def slow_create(*args):
+            calls.append(args)
+            return create_validation_pack(*args)
+        
+        with patch('core.validation.create_validation_pack', side_effect=slow_create):
+            threads = [
+                threading.Thread(target=ensure_validation_pack, args=("test123", job_meta, self.temp_path))
+                for _ in range(4)
+            ]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        
+        assert len(calls) == 1
+        index = json.loads((self.temp_path / "validation_pack.json").read_text())
+        pack_bytes = (self.temp_path / "validation_pack.zip").read_bytes()
+        assert index["sha256"] == hashlib.sha256(pack_bytes).hexdigest()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,262 @@
+#!/usr/bin/env python3
+"""Test the pooled, hedged TSA client against a local stand-in TSA."""
+
+import hashlib
+import shutil
+import tempfile
+import threading
+import time
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+import rfc3161ng
+from pyasn1.codec.der import decoder, encoder
+from pyasn1.type import univ, useful
+from pyasn1_modules import rfc2315
+
+import core.timestamp
+from core.timestamp import (
+    TIMESTAMP_TOKEN_SUFFIX,
+    get_timestamp_with_retry,
+    process_retry_queue,
+)
+from core.tsa_client import CircuitBreaker, TSAClient, set_tsa_client
+
+ID_CT_TSTINFO = univ.ObjectIdentifier('1.2.840.113549.1.9.16.1.4')
+
+
+def build_timestamp_response(request_bytes: bytes, status: int = 0, nonce_offset: int = 0) -> bytes:
+    """Build an unsigned TimeStampResp echoing the request imprint and nonce."""
+    tsq = rfc3161ng.decode_timestamp_request(request_bytes)
+    resp = rfc3161ng.TimeStampResp()
+    resp['status']['status'] = status
+    if status not in (0, 1):
+        return encoder.encode(resp)
+
+    tst_info = rfc3161ng.TSTInfo()
+    tst_info['version'] = 'v1'
+    tst_info['policy'] = univ.ObjectIdentifier('1.2.3.4')
+    tst_info['messageImprint'] = tsq['messageImprint']
+    tst_info['serialNumber'] = 1
+    tst_info['genTime'] = useful.GeneralizedTime(datetime.now(timezone.utc).strftime('%Y%m%d%H%M%SZ'))
+    if tsq['nonce'].isValue:
+        tst_info['nonce'] = int(tsq['nonce']) + nonce_offset
+
+    token = resp['timeStampToken']
+    token['contentType'] = rfc2315.signedData
+    signed = token['content']
+    signed['version'] = 3
+    signed['digestAlgorithms'] = rfc2315.DigestAlgorithmIdentifiers()
+    signed['contentInfo']['contentType'] = ID_CT_TSTINFO
+    signed['contentInfo']['content'] = encoder.encode(univ.OctetString(encoder.encode(tst_info)))
+    signed['signerInfos'] = rfc2315.SignerInfos()
+    return encoder.encode(resp)
+
+
+class StandInTSA:
+    """Local HTTP TSA with configurable delay and behavior."""
+
+    def __init__(self, delay: float = 0.0, mode: str = 'ok'):
+        self.delay = delay
+        self.mode = mode
+        self.requests = 0
+        self.client_ports = set()
+        tsa = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def do_POST(self):
+                body = self.rfile.read(int(self.headers['Content-Length']))
+                tsa.requests += 1
+                tsa.client_ports.add(self.client_address[1])
+                if tsa.delay:
+                    time.sleep(tsa.delay)
+                if tsa.mode == 'error':
+                    payload, code = b'unavailable', 503
+                elif tsa.mode == 'reject':
+                    payload, code = build_timestamp_response(body, status=2), 200
+                elif tsa.mode == 'bad_nonce':
+                    payload, code = build_timestamp_response(body, nonce_offset=1), 200
+                else:
+                    payload, code = build_timestamp_response(body), 200
+                self.send_response(code)
+                self.send_header('Content-Type', 'application/timestamp-reply')
+                self.send_header('Content-Length', str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self.server.daemon_threads = True
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}/tsa"
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+@pytest.fixture
+def make_tsa():
+    """Factory for stand-in TSAs that are shut down after the test."""
+    servers = []
+
+    def _make(**kwargs):
+        tsa = StandInTSA(**kwargs)
+        servers.append(tsa)
+        return tsa
+
+    yield _make
+    for tsa in servers:
+        tsa.stop()
+
+
+@pytest.fixture
+def make_client():
+    """Factory for TSA clients that are closed after the test."""
+    clients = []
+
+    def _make(urls, **kwargs):
+        client = TSAClient(urls=urls, **kwargs)
+        clients.append(client)
+        return client
+
+    yield _make
+    for client in clients:
+        client.close()
+
+
+def test_client_returns_valid_token(make_tsa, make_client):
+    """A granted response yields a DER token carrying the request imprint."""
+    tsa = make_tsa()
+    client = make_client([tsa.url])
+
+    token = client.timestamp(b'data hash')
+
+    assert token is not None
+    decoded, _ = decoder.decode(token, asn1Spec=rfc3161ng.TimeStampToken())
+    imprint = bytes(decoded.tst_info.message_imprint.hashed_message)
+    assert imprint == hashlib.sha256(b'data hash').digest()
+
+
+def test_client_reuses_pooled_connection(make_tsa, make_client):
+    """Sequential timestamps reuse one keep-alive connection."""
+    tsa = make_tsa()
+    client = make_client([tsa.url])
+
+    for _ in range(5):
+        assert client.timestamp(b'pooled') is not None
+
+    assert tsa.requests == 5
+    assert len(tsa.client_ports) == 1
+
+
+def test_hedged_request_first_valid_token_wins(make_tsa, make_client):
+    """A slow primary TSA is hedged by the next one after the hedge delay."""
+    slow = make_tsa(delay=3.0)
+    fast = make_tsa()
+    client = make_client([slow.url, fast.url], hedge_delay=0.1, timeout=5)
+
+    start = time.monotonic()
+    token = client.timestamp(b'hedged')
+    elapsed = time.monotonic() - start
+
+    assert token is not None
+    assert elapsed < 2.0
+    assert fast.requests == 1
+
+
+@pytest.mark.parametrize('mode', ['error', 'reject', 'bad_nonce'])
+def test_invalid_responses_fall_through(make_tsa, make_client, mode):
+    """Errors, rejections and mismatched nonces are not accepted as tokens."""
+    bad = make_tsa(mode=mode)
+    good = make_tsa()
+    client = make_client([bad.url, good.url], hedge_delay=5)
+
+    assert client.timestamp(b'fallthrough') is not None
+    assert bad.requests == 1
+    assert good.requests == 1
+    assert client.get_status()[bad.url]['consecutive_failures'] == 1
+
+
+def test_circuit_breaker_skips_down_tsa(make_tsa, make_client):
+    """After the failure threshold a down TSA is skipped entirely."""
+    down = make_tsa(mode='error')
+    client = make_client([down.url], failure_threshold=2, reset_seconds=60)
+
+    assert client.timestamp(b'a') is None
+    assert client.timestamp(b'b') is None
+    assert client.get_status()[down.url]['state'] == 'open'
+
+    assert client.timestamp(b'c') is None
+    assert down.requests == 2
+
+
+def test_circuit_breaker_half_open_recovers():
+    """An open circuit allows one trial after the reset period."""
+    now = [0.0]
+    breaker = CircuitBreaker(failure_threshold=1, reset_seconds=10, clock=lambda: now[0])
+
+    breaker.record_failure()
+    assert breaker.state == 'open'
+    assert breaker.allow_request() is False
+
+    now[0] = 11.0
+    assert breaker.allow_request() is True
+    assert breaker.allow_request() is False  # only one trial in flight
+
+    breaker.record_success()
+    assert breaker.state == 'closed'
+    assert breaker.allow_request() is True
+
+
+def test_deferred_timestamp_attached_by_retry_queue(make_tsa, make_client):
+    """Deferred mode returns immediately and the retry queue attaches the token."""
+    tsa = make_tsa()
+    set_tsa_client(make_client([tsa.url]))
+    work_dir = Path(tempfile.mkdtemp())
+    original_queue_dir = core.timestamp.RETRY_QUEUE_DIR
+    core.timestamp.RETRY_QUEUE_DIR = work_dir / "queue"
+    try:
+        pdf_path = work_dir / "proof.pdf"
+        pdf_content = b"%PDF-1.4 deferred"
+        pdf_path.write_bytes(pdf_content)
+
+        result = get_timestamp_with_retry(pdf_content, job_id="deferred_job",
+                                          pdf_path=str(pdf_path), defer=True)
+
+        assert result.pending is True
+        assert result.timestamp_info['deferred'] is True
+        assert result.errors == []
+        assert tsa.requests == 0
+
+        stats = process_retry_queue()
+
+        assert stats['jobs_succeeded'] == 1
+        token_path = Path(f"{pdf_path}{TIMESTAMP_TOKEN_SUFFIX}")
+        assert token_path.exists()
+        assert token_path.stat().st_size > 0
+        assert pdf_path.read_bytes() == pdf_content
+    finally:
+        core.timestamp.RETRY_QUEUE_DIR = original_queue_dir
+        set_tsa_client(None)
+        shutil.rmtree(work_dir)
+
+
+def test_async_mode_from_environment():
+    """TSA_ASYNC=true defers without contacting any TSA."""
+    with patch.dict('os.environ', {'TSA_ASYNC': 'true'}), \
+         patch('core.timestamp._generate_rfc3161_timestamp') as mock_tsa, \
+         patch('core.timestamp._queue_retry_job'):
+        result = get_timestamp_with_retry(b"pdf", job_id="env_async", pdf_path="/tmp/env_async.pdf")
+
+    mock_tsa.assert_not_called()
+    assert result.pending is True
+    assert result.timestamp_info['retry_queued'] is True
@@ -5,6 +5,7 @@ import json
 import os
 import tempfile
 import shutil
+import threading
 from datetime import datetime, timezone, timedelta
 from pathlib import Path
 from unittest.mock import Mock, patch
@@ -20,6 +21,7 @@ from core.timestamp import (
     TimestampResult,
     RETRY_QUEUE_DIR
 )
+import core.timestamp as core_timestamp
 
 
 @pytest.fixture
@@ -40,6 +42,15 @@ def temp_queue_dir():
     core.timestamp.RETRY_QUEUE_DIR = original_dir
 
 
+def _queued_jobs():
+    """Return all rows currently in the SQLite retry queue."""
+    conn = core_timestamp._connect_queue()
+    try:
+        return [dict(row) for row in conn.execute("SELECT * FROM tsa_retry_jobs ORDER BY job_id")]
+    finally:
+        conn.close()
+
+
 @pytest.fixture
 def mock_pdf_content():
     """Mock PDF content for testing."""
@@ -96,17 +107,16 @@ def test_tsa_failure_with_retry_queue(temp_queue_dir, mock_pdf_content, fixed_ti
         assert 'TSA unavailable' in result.errors[0]
         
         # Check retry job was queued
-        job_files = list(temp_queue_dir.glob("*.json"))
-        assert len(job_files) == 1
+        jobs = _queued_jobs()
+        assert len(jobs) == 1
         
         # Verify job content
-        with open(job_files[0], 'r') as f:
-            job_data = json.load(f)
-        
+        job_data = jobs[0]
         assert job_data['job_id'] == "test_retry"
         assert job_data['pdf_path'] == "/tmp/test.pdf"
         assert job_data['attempts'] == 0
-        assert job_data['created_at'] == fixed_time.isoformat()
+        assert job_data['created_at'] == fixed_time.timestamp()
+        assert job_data['next_attempt_at'] == fixed_time.timestamp()
 
 
 def test_tsa_failure_without_pdf_path(mock_pdf_content, fixed_time):
@@ -171,8 +181,9 @@ def test_retry_queue_processing_success(temp_queue_dir, fixed_time):
         assert stats['jobs_failed'] == 0
         assert stats['jobs_expired'] == 0
         
-        # Job should be removed from queue
+        # Legacy job file is imported and the job removed from queue
         assert not job_file.exists()
+        assert _queued_jobs() == []
 
 
 def test_retry_queue_processing_max_attempts(temp_queue_dir, fixed_time):
@@ -235,33 +246,118 @@ def test_retry_queue_processing_expired_jobs(temp_queue_dir, fixed_time):
 
 
 def test_retry_queue_processing_deferred_jobs(temp_queue_dir, fixed_time):
-    """Test jobs are deferred when retry delay hasn't passed."""
+    """Test jobs still backing off are not touched."""
     # Create job with recent attempt (2 minutes ago, delay is 5 minutes)
     recent_attempt = fixed_time - timedelta(minutes=2)
-    job_file = temp_queue_dir / "deferred.json"
-    job_file.parent.mkdir(parents=True, exist_ok=True)
+    retry_job = TimestampRetryJob(
+        job_id="deferred",
+        pdf_path="/tmp/deferred.pdf",
+        pdf_hash="abc123",
+        created_at=fixed_time - timedelta(minutes=10),
+        attempts=1,
+        last_attempt_at=recent_attempt
+    )
+    core_timestamp._queue_retry_job(retry_job)
     
-    job_data = {
-        'job_id': "deferred",
-        'pdf_path': "/tmp/deferred.pdf", 
-        'pdf_hash': "abc123",
-        'created_at': fixed_time.isoformat(),
-        'attempts': 1,
-        'last_attempt_at': recent_attempt.isoformat(),
-        'tsa_errors': []
-    }
+    with patch('core.timestamp._process_retry_job') as mock_process:
+        stats = process_retry_queue(now_provider=lambda: fixed_time)
     
-    with open(job_file, 'w') as f:
-        json.dump(job_data, f)
+    mock_process.assert_not_called()
+    assert stats['jobs_processed'] == 0
+    assert stats['jobs_succeeded'] == 0
     
-    stats = process_retry_queue(now_provider=lambda: fixed_time)
+    # Job should still be queued
+    assert get_retry_queue_status(now_provider=lambda: fixed_time)['queue_size'] == 1
+    assert get_retry_queue_status(now_provider=lambda: fixed_time)['due_jobs'] == 0
+
+
+def test_retry_queue_exponential_backoff(temp_queue_dir, fixed_time):
+    """Test failed attempts are rescheduled with doubling delay."""
+    retry_job = TimestampRetryJob(
+        job_id="backoff",
+        pdf_path="/tmp/backoff.pdf",
+        pdf_hash="abc123",
+        created_at=fixed_time
+    )
+    core_timestamp._queue_retry_job(retry_job)
     
-    assert stats['jobs_processed'] == 1
-    assert stats['jobs_deferred'] == 1
-    assert stats['jobs_succeeded'] == 0
+    with patch('core.timestamp._process_retry_job', return_value=False):
+        now = fixed_time
+        stats = process_retry_queue(now_provider=lambda: now)
+        assert stats['jobs_deferred'] == 1
+        assert _queued_jobs()[0]['next_attempt_at'] == (now + timedelta(seconds=300)).timestamp()
+        
+        now = fixed_time + timedelta(seconds=300)
+        process_retry_queue(now_provider=lambda: now)
+        job = _queued_jobs()[0]
+        assert job['attempts'] == 2
+        assert job['next_attempt_at'] == (now + timedelta(seconds=600)).timestamp()
+
+
+def test_retry_queue_batches_and_leases_once(temp_queue_dir, fixed_time):
+    """Test concurrent processors handle every due job exactly once."""
+    for i in range(25):
+        core_timestamp._queue_retry_job(TimestampRetryJob(
+            job_id=f"lease_{i:02d}",
+            pdf_path=f"/tmp/lease_{i}.pdf",
+            pdf_hash="abc123",
+            created_at=fixed_time - timedelta(seconds=i)
+        ))
+    
+    processed = []
+    processed_lock = threading.Lock()
+    
+    def record(retry_job, current_time):
+        with processed_lock:
+            processed.append(retry_job.job_id)
+        return True
+    
+    with patch('core.timestamp._process_retry_job', side_effect=record):
+        threads = [
+            threading.Thread(target=process_retry_queue,
+                             kwargs={'now_provider': lambda: fixed_time, 'batch_size': 4})
+            for _ in range(4)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
     
-    # Job should still exist
-    assert job_file.exists()
+    assert sorted(processed) == [f"lease_{i:02d}" for i in range(25)]
+    assert get_retry_queue_status()['queue_size'] == 0
+
+
+def test_legacy_job_files_import_once(temp_queue_dir, fixed_time):
+    """Test legacy JSON jobs are imported without overwriting queued rows."""
+    core_timestamp._queue_retry_job(TimestampRetryJob(
+        job_id="leased",
+        pdf_path="/tmp/leased.pdf",
+        pdf_hash="abc123",
+        created_at=fixed_time
+    ))
+    conn = core_timestamp._connect_queue()
+    try:
+        core_timestamp._lease_due_jobs(conn, fixed_time.timestamp(), "worker-1", 10)
+    finally:
+        conn.close()
+
+    for job_id in ("leased", "legacy"):
+        with open(temp_queue_dir / f"{job_id}.json", 'w') as f:
+            json.dump({
+                'job_id': job_id,
+                'pdf_path': f"/tmp/{job_id}.pdf",
+                'pdf_hash': "old",
+                'created_at': (fixed_time - timedelta(minutes=5)).isoformat(),
+                'attempts': 0,
+                'last_attempt_at': None,
+                'tsa_errors': []
+            }, f)
+
+    jobs = {job['job_id']: job for job in _queued_jobs()}
+    assert jobs['leased']['lease_owner'] == "worker-1"
+    assert jobs['leased']['pdf_hash'] == "abc123"
+    assert jobs['legacy']['pdf_hash'] == "old"
+    assert not list(temp_queue_dir.glob("*.json"))
 
 
 def test_retry_queue_status(temp_queue_dir, fixed_time):
@@ -0,0 +1,130 @@
+"""
+Parity harness for the array-native independent calculators.
+
+Each *_ns calculator (int64 epoch-ns timestamps, float temperatures) must give
+the same result as the original scalar reference implementation fed with
+pd.Timestamp objects.
+"""
+
+import math
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from validation.independent.arrays import hysteresis_mask, run_bounds, to_epoch_ns
+from validation.independent.powder_hold import (
+    calculate_hold_time, calculate_hold_time_ns,
+    calculate_ramp_rate, calculate_ramp_rate_ns,
+    calculate_time_to_threshold, calculate_time_to_threshold_ns
+)
+from validation.independent.haccp_cooling import validate_cooling_phases, validate_cooling_phases_ns
+from validation.independent.coldchain_daily import calculate_daily_compliance, calculate_daily_compliance_ns
+from validation.independent.autoclave_fo import calculate_fo_metrics, calculate_fo_metrics_ns
+from validation.independent.concrete_window import validate_concrete_curing, validate_concrete_curing_ns
+
+SEEDS = [0, 1, 2, 3, 4]
+
+
+def make_series(seed, periods, freq_s, base, amplitude, noise):
+    """Irregularly sampled noisy temperature trace."""
+    rng = np.random.default_rng(seed)
+    steps = rng.uniform(0.5, 1.5, periods) * freq_s
+    offsets = np.concatenate(([0.0], np.cumsum(steps[:-1])))
+    timestamps = pd.Timestamp("2024-01-01") + pd.to_timedelta(np.round(offsets, 3), unit="s")
+    phase = np.linspace(0, np.pi, periods)
+    temperatures = base + amplitude * np.sin(phase) + rng.normal(0, noise, periods)
+    scalar_timestamps = np.array(list(timestamps), dtype=object)
+    return scalar_timestamps, to_epoch_ns(timestamps), temperatures
+
+
+def assert_parity(scalar, vectorized, keys=None):
+    """Compare numeric results (or the given dict keys) with a tight tolerance."""
+    if keys is None:
+        scalar, vectorized, keys = {"value": scalar}, {"value": vectorized}, ["value"]
+    for key in keys:
+        expected, actual = scalar[key], vectorized[key]
+        if expected is None or actual is None:
+            assert expected == actual, key
+        elif isinstance(expected, (float, np.floating)) and math.isnan(expected):
+            assert math.isnan(actual), key
+        else:
+            assert actual == pytest.approx(expected, rel=1e-9, abs=1e-6), key
+
+
+class TestArrayHelpers:
+    """Array helpers against a straightforward loop."""
+
+    @pytest.mark.parametrize("seed", SEEDS)
+    def test_hysteresis_mask_matches_loop(self, seed):
+        temperatures = np.random.default_rng(seed).uniform(170, 190, 500)
+        expected, state = [], False
+        for temp in temperatures:
+            if state and temp < 178.0:
+                state = False
+            elif not state and temp >= 180.0:
+                state = True
+            expected.append(state)
+        assert hysteresis_mask(temperatures, 180.0, 2.0).tolist() == expected
+
+    def test_run_bounds(self):
+        starts, ends = run_bounds(np.array([True, True, False, True, False, True]))
+        assert starts.tolist() == [0, 3, 5]
+        assert ends.tolist() == [1, 3, 5]
+
+
+class TestCalculatorParity:
+    """Scalar reference vs array-native implementation."""
+
+    @pytest.mark.parametrize("seed", SEEDS)
+    @pytest.mark.parametrize("continuous_only", [True, False])
+    def test_powder_hold_time(self, seed, continuous_only):
+        scalar_ts, ns, temps = make_series(seed, 400, 30, 150, 40, 1.5)
+        assert_parity(
+            calculate_hold_time(scalar_ts, temps, 182.0, 2.0, continuous_only),
+            calculate_hold_time_ns(ns, temps, 182.0, 2.0, continuous_only)
+        )
+
+    @pytest.mark.parametrize("seed", SEEDS)
+    def test_powder_ramp_and_threshold(self, seed):
+        scalar_ts, ns, temps = make_series(seed, 400, 30, 150, 40, 1.5)
+        assert_parity(calculate_ramp_rate(scalar_ts, temps), calculate_ramp_rate_ns(ns, temps))
+        assert_parity(
+            calculate_time_to_threshold(scalar_ts, temps, 182.0),
+            calculate_time_to_threshold_ns(ns, temps, 182.0)
+        )
+        assert calculate_time_to_threshold_ns(ns, temps, 500.0) == -1.0
+
+    @pytest.mark.parametrize("seed", SEEDS)
+    def test_haccp_cooling(self, seed):
+        scalar_ts, ns, temps = make_series(seed, 300, 60, 0, 1, 0.3)
+        temps = temps + np.linspace(65, 2, len(temps))
+        keys = ["phase1_actual_time_s", "phase2_actual_time_s", "phase1_pass", "phase2_pass",
+                "start_temp_C", "end_temp_C", "min_temp_C", "max_temp_C"]
+        assert_parity(validate_cooling_phases(scalar_ts, temps), validate_cooling_phases_ns(ns, temps), keys)
+
+    @pytest.mark.parametrize("seed", SEEDS)
+    def test_coldchain_daily(self, seed):
+        scalar_ts, ns, temps = make_series(seed, 1000, 300, 5, 2, 1.5)
+        keys = ["overall_compliance_pct", "total_excursions",
+                "total_excursion_duration_s", "mean_kinetic_temperature_C"]
+        assert_parity(calculate_daily_compliance(scalar_ts, temps), calculate_daily_compliance_ns(ns, temps), keys)
+
+    @pytest.mark.parametrize("seed", SEEDS)
+    def test_autoclave_fo(self, seed):
+        scalar_ts, ns, temps = make_series(seed, 400, 10, 100, 25, 0.8)
+        keys = ["fo_value", "hold_time_s", "max_temp_C", "min_temp_C", "sterilization_pass"]
+        assert_parity(calculate_fo_metrics(scalar_ts, temps), calculate_fo_metrics_ns(ns, temps), keys)
+
+    @pytest.mark.parametrize("seed", SEEDS)
+    @pytest.mark.parametrize("periods", [20, 400])
+    def test_concrete_curing(self, seed, periods):
+        scalar_ts, ns, temps = make_series(seed, periods, 1800, 20, 12, 3.0)
+        temps[::37] = np.nan
+        keys = ["pass", "compliance_pct", "estimated_strength_pct", "total_maturity_C_h",
+                "curing_duration_days", "compliant_windows", "total_windows",
+                "min_temp_C", "max_temp_C", "avg_temp_C", "reasons"]
+        scalar = validate_concrete_curing(scalar_ts, temps)
+        vectorized = validate_concrete_curing_ns(ns, temps)
+        assert scalar["reasons"] == vectorized["reasons"]
+        assert_parity(scalar, vectorized, [k for k in keys if k != "reasons"])
@@ -0,0 +1,75 @@
+"""
+Array helpers for the independent calculators.
+
+The *_ns calculators take timestamps as int64 nanoseconds since the epoch and
+temperatures as float arrays, and use these helpers instead of per-sample
+Python loops. They are deliberately separate from the main engine's helpers
+so the differential check stays independent.
+
+Example usage:
+    from validation.independent.arrays import to_epoch_ns, hysteresis_mask
+
+    timestamps_ns = to_epoch_ns(df['timestamp'])
+    above = hysteresis_mask(df['temperature'].to_numpy(), 180.0, 2.0)
+"""
+
+from typing import Tuple
+
+import numpy as np
+import pandas as pd
+
+NS_PER_SECOND = 1_000_000_000
+
+
+def to_epoch_ns(timestamps) -> np.ndarray:
+    """
+    Convert timestamps to int64 nanoseconds since the epoch.
+
+    Accepts datetime64 arrays, pandas Series/DatetimeIndex and sequences of
+    datetime or pd.Timestamp objects. Timezone-aware values are converted to UTC.
+    """
+    if isinstance(timestamps, np.ndarray) and timestamps.dtype.kind == 'i':
+        return timestamps.astype(np.int64, copy=False)
+    index = pd.DatetimeIndex(pd.to_datetime(timestamps, utc=True))
+    return index.asi8.astype(np.int64, copy=False)
+
+
+def elapsed_seconds(timestamps_ns: np.ndarray) -> np.ndarray:
+    """Seconds since the first sample as float64."""
+    timestamps_ns = np.asarray(timestamps_ns, dtype=np.int64)
+    return (timestamps_ns - timestamps_ns[0]) / NS_PER_SECOND
+
+
+def hysteresis_mask(temperatures: np.ndarray, threshold: float, hysteresis: float) -> np.ndarray:
+    """
+    Above-threshold state with hysteresis, without a per-sample loop.
+
+    The state turns on at temp >= threshold, turns off at
+    temp < threshold - hysteresis, and otherwise keeps its previous value
+    (initially off).
+    """
+    temperatures = np.asarray(temperatures, dtype=np.float64)
+    events = np.full(len(temperatures), -1, dtype=np.int8)
+    events[temperatures < threshold - hysteresis] = 0
+    events[temperatures >= threshold] = 1
+
+    # Carry the most recent on/off event forward
+    positions = np.where(events >= 0, np.arange(len(events)), 0)
+    np.maximum.accumulate(positions, out=positions)
+    state = events[positions]
+    return state == 1
+
+
+def run_bounds(mask: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Start and end indices (inclusive) of each run of True values.
+
+    Returns:
+        (starts, ends) index arrays of equal length
+    """
+    mask = np.asarray(mask, dtype=bool)
+    padded = np.concatenate(([False], mask, [False])).astype(np.int8)
+    edges = np.diff(padded)
+    starts = np.flatnonzero(edges == 1)
+    ends = np.flatnonzero(edges == -1) - 1
+    return starts, ends
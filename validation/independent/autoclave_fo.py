@@ -12,6 +12,9 @@ Example usage:
         temperatures=df['temperature'].values,
         reference_temp=121.0
     )
+
+calculate_fo_metrics_ns() is the array-native variant for int64 epoch-ns
+timestamps used by shadow runs.
 """
 
 import numpy as np
@@ -19,6 +22,8 @@ from typing import List, Tuple, Optional, Dict
 from datetime import datetime
 import pandas as pd
 
+from validation.independent.arrays import elapsed_seconds, hysteresis_mask, run_bounds
+
 
 def calculate_fo_value(
     timestamps: np.ndarray,
@@ -212,4 +217,87 @@ def calculate_fo_metrics(
         'max_temp_C': float(np.max(temperatures)),
         'min_temp_C': float(np.min(temperatures)),
         'sterilization_pass': fo_value >= 8.0 and hold_time >= 900.0
-    }
\ No newline at end of file
+    }
+
+
+def calculate_fo_value_ns(
+    timestamps_ns: np.ndarray,
+    temperatures: np.ndarray,
+    reference_temp: float = 121.0,
+    z_value: float = 10.0
+) -> float:
+    """
+    Array-native calculate_fo_value for int64 epoch-ns timestamps.
+    
+    Returns:
+        F0 value in minutes (trapezoidal integration of the lethal rate)
+    """
+    if len(timestamps_ns) != len(temperatures):
+        raise ValueError("Timestamps and temperatures must have same length")
+        
+    if len(timestamps_ns) < 2:
+        return 0.0
+    
+    time_seconds = elapsed_seconds(timestamps_ns)
+    lethal_rates = np.power(10, (np.asarray(temperatures, dtype=np.float64) - reference_temp) / z_value)
+    
+    dt = np.diff(time_seconds)
+    avg_lethal_rate = (lethal_rates[:-1] + lethal_rates[1:]) / 2
+    return float(np.sum(avg_lethal_rate * dt) / 60.0)
+
+
+def calculate_sterilization_hold_ns(
+    timestamps_ns: np.ndarray,
+    temperatures: np.ndarray,
+    min_temp: float = 121.0,
+    hysteresis: float = 2.0
+) -> float:
+    """
+    Array-native calculate_sterilization_hold for int64 epoch-ns timestamps.
+    
+    Returns:
+        Longest continuous hold time in seconds
+    """
+    if len(timestamps_ns) < 2:
+        return 0.0
+    
+    time_seconds = elapsed_seconds(timestamps_ns)
+    starts, ends = run_bounds(hysteresis_mask(temperatures, min_temp, hysteresis))
+    
+    if len(starts) == 0:
+        return 0.0
+    
+    return float(np.max(time_seconds[ends] - time_seconds[starts]))
+
+
+def calculate_fo_metrics_ns(
+    timestamps_ns: np.ndarray,
+    temperatures: np.ndarray,
+    reference_temp: float = 121.0,
+    z_value: float = 10.0
+) -> Dict[str, float]:
+    """
+    Array-native calculate_fo_metrics for int64 epoch-ns timestamps.
+    
+    Returns:
+        Dict with F0 value and sterilization metrics (same keys as calculate_fo_metrics)
+    """
+    if len(timestamps_ns) == 0 or len(temperatures) == 0:
+        return {
+            'fo_value': 0.0,
+            'hold_time_s': 0.0,
+            'max_temp_C': np.nan,
+            'min_temp_C': np.nan,
+            'sterilization_pass': False
+        }
+    
+    fo_value = calculate_fo_value_ns(timestamps_ns, temperatures, reference_temp, z_value)
+    hold_time = calculate_sterilization_hold_ns(timestamps_ns, temperatures, reference_temp)
+    
+    return {
+        'fo_value': fo_value,
+        'hold_time_s': hold_time,
+        'max_temp_C': float(np.max(temperatures)),
+        'min_temp_C': float(np.min(temperatures)),
+        'sterilization_pass': fo_value >= 8.0 and hold_time >= 900.0
+    }
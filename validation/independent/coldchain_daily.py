@@ -13,6 +13,9 @@ Example usage:
         min_temp=2.0,
         max_temp=8.0
     )
+
+calculate_daily_compliance_ns() is the array-native variant for int64 epoch-ns
+timestamps used by shadow runs.
 """
 
 import numpy as np
@@ -20,6 +23,8 @@ from typing import List, Tuple, Optional, Dict
 from datetime import datetime, timedelta
 import pandas as pd
 
+from validation.independent.arrays import NS_PER_SECOND, elapsed_seconds, run_bounds
+
 
 def detect_excursions(
     timestamps: np.ndarray,
@@ -312,4 +317,73 @@ def calculate_daily_compliance(
         'total_excursions': len(excursions),
         'total_excursion_duration_s': total_excursion_time_s,
         'mean_kinetic_temperature_C': mkt
-    }
\ No newline at end of file
+    }
+
+
+def excursion_durations_ns(
+    timestamps_ns: np.ndarray,
+    temperatures: np.ndarray,
+    min_temp: float = 2.0,
+    max_temp: float = 8.0,
+    min_duration_s: float = 300.0
+) -> np.ndarray:
+    """
+    Array-native excursion durations for int64 epoch-ns timestamps.
+    
+    An excursion lasts from its first out-of-range sample to the first sample
+    back in range (or the last sample if it never recovers), as in
+    detect_excursions().
+    
+    Returns:
+        Duration in seconds of each excursion lasting at least min_duration_s
+    """
+    if len(timestamps_ns) != len(temperatures):
+        raise ValueError("Timestamps and temperatures must have same length")
+        
+    if len(timestamps_ns) < 2:
+        return np.empty(0, dtype=np.float64)
+    
+    time_seconds = elapsed_seconds(timestamps_ns)
+    temperatures = np.asarray(temperatures, dtype=np.float64)
+    starts, ends = run_bounds((temperatures < min_temp) | (temperatures > max_temp))
+    
+    recovered = np.minimum(ends + 1, len(time_seconds) - 1)
+    durations = time_seconds[recovered] - time_seconds[starts]
+    return durations[durations >= min_duration_s]
+
+
+def calculate_daily_compliance_ns(
+    timestamps_ns: np.ndarray,
+    temperatures: np.ndarray,
+    min_temp: float = 2.0,
+    max_temp: float = 8.0
+) -> Dict[str, float]:
+    """
+    Array-native calculate_daily_compliance for int64 epoch-ns timestamps.
+    
+    Returns:
+        Dict with compliance metrics (same keys as calculate_daily_compliance)
+    """
+    if len(timestamps_ns) == 0 or len(temperatures) == 0:
+        return {
+            'overall_compliance_pct': 0.0,
+            'total_excursions': 0,
+            'total_excursion_duration_s': 0.0,
+            'mean_kinetic_temperature_C': np.nan
+        }
+    
+    durations = excursion_durations_ns(timestamps_ns, temperatures, min_temp, max_temp, min_duration_s=0.0)
+    total_duration_s = float(timestamps_ns[-1] - timestamps_ns[0]) / NS_PER_SECOND
+    total_excursion_time_s = float(durations.sum())
+    
+    if total_duration_s > 0:
+        compliance_pct = (total_duration_s - total_excursion_time_s) / total_duration_s * 100.0
+    else:
+        compliance_pct = 0.0
+    
+    return {
+        'overall_compliance_pct': compliance_pct,
+        'total_excursions': int(len(durations)),
+        'total_excursion_duration_s': total_excursion_time_s,
+        'mean_kinetic_temperature_C': calculate_mean_kinetic_temperature(timestamps_ns, np.asarray(temperatures, dtype=np.float64))
+    }
@@ -15,6 +15,9 @@ Example usage:
         max_temp_C=35.0,
         window_hours=24
     )
+
+validate_concrete_curing_ns() is the array-native variant for int64 epoch-ns
+timestamps used by shadow runs.
 """
 
 import numpy as np
@@ -22,6 +25,8 @@ import pandas as pd
 from typing import Dict, Any, List, Tuple
 from datetime import datetime, timedelta
 
+from validation.independent.arrays import NS_PER_SECOND
+
 
 def calculate_curing_compliance(
     timestamps: np.ndarray,
@@ -177,7 +182,7 @@ def _analyze_single_window(
     
     # Sort by timestamp
     window_sorted = window_data.sort_values('timestamp')
-    timestamps = window_sorted['timestamp'].values
+    timestamps = list(window_sorted['timestamp'])
     temperatures = window_sorted['temperature'].values
     
     # Calculate time-weighted compliance
@@ -284,7 +289,7 @@ def calculate_strength_gain_estimation(
     
     # Calculate maturity using temperature-time areas
     total_maturity = 0.0
-    timestamps_clean = df_clean['timestamp'].values
+    timestamps_clean = list(df_clean['timestamp'])
     temperatures_clean = df_clean['temperature'].values
     
     for i in range(len(timestamps_clean) - 1):
@@ -418,4 +423,259 @@ def validate_concrete_curing(
         'reasons': reasons,
         'errors': compliance_result.get('errors', []) + maturity_result.get('errors', []),
         'window_details': compliance_result.get('windows', [])
-    }
\ No newline at end of file
+    }
+
+
+def calculate_curing_compliance_ns(
+    timestamps_ns: np.ndarray,
+    temperatures: np.ndarray,
+    min_temp_C: float = 10.0,
+    max_temp_C: float = 35.0,
+    window_hours: float = 24.0,
+    min_compliance_pct: float = 95.0
+) -> Dict[str, Any]:
+    """
+    Array-native calculate_curing_compliance for int64 epoch-ns timestamps.
+    
+    Window membership is found with searchsorted and time-weighted compliance
+    with prefix sums, so the cost is O(n + windows) instead of a DataFrame
+    filter and a Python loop per window.
+    
+    Returns:
+        Dict with the same summary keys as calculate_curing_compliance; each
+        window entry carries start_ns/end_ns instead of pandas Timestamps
+    """
+    if len(timestamps_ns) != len(temperatures):
+        raise ValueError("Timestamps and temperatures must have same length")
+    
+    empty = {
+        'overall_pass': False,
+        'windows': [],
+        'total_windows': 0,
+        'compliant_windows': 0,
+        'failed_windows': 0,
+        'overall_compliance_pct': 0.0,
+        'errors': []
+    }
+    if len(timestamps_ns) == 0:
+        return {**empty, 'errors': ["No data provided"]}
+    
+    # Drop NaN temperatures and sort by time
+    temperatures = np.asarray(temperatures, dtype=np.float64)
+    valid = ~np.isnan(temperatures)
+    if not np.any(valid):
+        return {**empty, 'errors': ["All temperature values are NaN"]}
+    order = np.argsort(np.asarray(timestamps_ns, dtype=np.int64)[valid], kind='stable')
+    times = np.asarray(timestamps_ns, dtype=np.int64)[valid][order]
+    temps = temperatures[valid][order]
+    
+    # Prefix sums of interval length (total and in-range, by start-of-interval temperature)
+    in_range = (temps >= min_temp_C) & (temps <= max_temp_C)
+    interval_s = np.diff(times) / NS_PER_SECOND
+    total_prefix = np.concatenate(([0.0], np.cumsum(interval_s)))
+    in_range_prefix = np.concatenate(([0.0], np.cumsum(interval_s * in_range[:-1])))
+    count_prefix = np.concatenate(([0], np.cumsum(in_range)))
+    
+    window_ns = int(round(window_hours * 3600 * NS_PER_SECOND))
+    start_ns, end_ns = int(times[0]), int(times[-1])
+    
+    if end_ns - start_ns < window_ns:
+        # Single window covering entire dataset
+        window_starts = np.array([start_ns], dtype=np.int64)
+        window_ends = np.array([end_ns], dtype=np.int64)
+    else:
+        # Overlapping windows every window_hours / 2
+        step_ns = int(round(window_hours / 2 * 3600 * NS_PER_SECOND))
+        window_count = (end_ns - start_ns - window_ns) // step_ns + 1
+        window_starts = start_ns + np.arange(window_count, dtype=np.int64) * step_ns
+        window_ends = window_starts + window_ns
+    
+    lo = np.searchsorted(times, window_starts, side='left')
+    hi = np.searchsorted(times, window_ends, side='right')
+    measurements = hi - lo
+    
+    # Intervals between samples lo..hi-1 are lo..hi-2
+    last = np.maximum(hi - 1, lo)
+    total_s = total_prefix[last] - total_prefix[lo]
+    in_range_s = in_range_prefix[last] - in_range_prefix[lo]
+    compliance = np.divide(in_range_s * 100.0, total_s, out=np.zeros_like(total_s), where=total_s > 0)
+    compliance[measurements < 2] = 0.0
+    
+    windows = []
+    for window_id in np.flatnonzero(measurements > 0):
+        windows.append({
+            'window_id': int(window_id),
+            'start_ns': int(window_starts[window_id]),
+            'end_ns': int(window_ends[window_id]),
+            'compliance_pct': float(compliance[window_id]),
+            'compliant': bool(compliance[window_id] >= min_compliance_pct),
+            'total_measurements': int(measurements[window_id]),
+            'in_range_measurements': int(count_prefix[hi[window_id]] - count_prefix[lo[window_id]]),
+            'total_time_s': float(total_s[window_id]) if measurements[window_id] >= 2 else 0.0,
+            'in_range_time_s': float(in_range_s[window_id]) if measurements[window_id] >= 2 else 0.0
+        })
+    
+    total_windows = len(windows)
+    compliant_windows = sum(1 for w in windows if w['compliant'])
+    
+    if total_windows > 0:
+        overall_compliance_pct = sum(w['compliance_pct'] for w in windows) / total_windows
+        overall_pass = compliant_windows >= (total_windows * 0.8)  # 80% of windows must pass
+    else:
+        overall_compliance_pct = 0.0
+        overall_pass = False
+    
+    return {
+        'overall_pass': overall_pass,
+        'windows': windows,
+        'total_windows': total_windows,
+        'compliant_windows': compliant_windows,
+        'failed_windows': total_windows - compliant_windows,
+        'overall_compliance_pct': overall_compliance_pct,
+        'window_hours': window_hours,
+        'temp_range': f"[{min_temp_C}, {max_temp_C}]°C",
+        'min_compliance_pct': min_compliance_pct,
+        'errors': []
+    }
+
+
+def calculate_strength_gain_estimation_ns(
+    timestamps_ns: np.ndarray,
+    temperatures: np.ndarray,
+    placement_temp_C: float = 20.0,
+    maturity_factor: float = 13.65
+) -> Dict[str, Any]:
+    """
+    Array-native calculate_strength_gain_estimation for int64 epoch-ns timestamps.
+    
+    Returns:
+        Dict with maturity and estimated strength (same keys as the scalar version)
+    """
+    if len(timestamps_ns) != len(temperatures):
+        raise ValueError("Timestamps and temperatures must have same length")
+    
+    insufficient = {
+        'total_maturity_C_h': 0.0,
+        'estimated_strength_pct': 0.0,
+        'avg_temp_C': np.nan,
+        'duration_hours': 0.0
+    }
+    if len(timestamps_ns) < 2:
+        return {**insufficient, 'errors': ["Insufficient data for maturity calculation"]}
+    
+    temperatures = np.asarray(temperatures, dtype=np.float64)
+    valid = ~np.isnan(temperatures)
+    if np.count_nonzero(valid) < 2:
+        return {**insufficient, 'errors': ["All temperature values are NaN"]}
+    order = np.argsort(np.asarray(timestamps_ns, dtype=np.int64)[valid], kind='stable')
+    times = np.asarray(timestamps_ns, dtype=np.int64)[valid][order]
+    temps = temperatures[valid][order]
+    
+    # Datum temperature for Type I cement
+    datum_temp_C = -10.0
+    
+    interval_h = np.diff(times) / NS_PER_SECOND / 3600
+    avg_temp_C = (temps[:-1] + temps[1:]) / 2.0
+    contributes = avg_temp_C > datum_temp_C
+    total_maturity = float(np.sum((avg_temp_C[contributes] - datum_temp_C) * interval_h[contributes]))
+    
+    if total_maturity > 0:
+        estimated_strength_pct = (total_maturity / (total_maturity + maturity_factor)) * 100
+    else:
+        estimated_strength_pct = 0.0
+    
+    return {
+        'total_maturity_C_h': total_maturity,
+        'estimated_strength_pct': min(estimated_strength_pct, 100.0),
+        'avg_temp_C': float(temps.mean()),
+        'min_temp_C': float(temps.min()),
+        'max_temp_C': float(temps.max()),
+        'duration_hours': float(times[-1] - times[0]) / NS_PER_SECOND / 3600,
+        'datum_temp_C': datum_temp_C,
+        'maturity_factor': maturity_factor,
+        'errors': []
+    }
+
+
+def validate_concrete_curing_ns(
+    timestamps_ns: np.ndarray,
+    temperatures: np.ndarray,
+    min_temp_C: float = 10.0,
+    max_temp_C: float = 35.0,
+    window_hours: float = 24.0,
+    min_compliance_pct: float = 95.0,
+    required_strength_pct: float = 50.0,
+    curing_days: int = 7
+) -> Dict[str, Any]:
+    """
+    Array-native validate_concrete_curing for int64 epoch-ns timestamps.
+    
+    Returns:
+        Dict with complete curing validation results (same keys as
+        validate_concrete_curing)
+    """
+    compliance_result = calculate_curing_compliance_ns(
+        timestamps_ns, temperatures, min_temp_C, max_temp_C,
+        window_hours, min_compliance_pct
+    )
+    maturity_result = calculate_strength_gain_estimation_ns(timestamps_ns, temperatures)
+    
+    temperature_pass = compliance_result['overall_pass']
+    strength_pass = maturity_result['estimated_strength_pct'] >= required_strength_pct
+    
+    if len(timestamps_ns) >= 2:
+        total_duration_days = float(timestamps_ns[-1] - timestamps_ns[0]) / NS_PER_SECOND / (24 * 3600)
+        duration_pass = total_duration_days >= curing_days
+    else:
+        total_duration_days = 0.0
+        duration_pass = False
+    
+    overall_pass = temperature_pass and strength_pass and duration_pass
+    
+    reasons = []
+    if not temperature_pass:
+        failed_pct = (compliance_result['failed_windows'] / 
+                     max(1, compliance_result['total_windows']) * 100)
+        reasons.append(f"Temperature compliance failed: {failed_pct:.1f}% of windows failed")
+    
+    if not strength_pass:
+        reasons.append(
+            f"Insufficient strength development: {maturity_result['estimated_strength_pct']:.1f}% "
+            f"< required {required_strength_pct}%"
+        )
+    
+    if not duration_pass:
+        reasons.append(f"Insufficient curing duration: {total_duration_days:.1f} days < {curing_days} days")
+    
+    if overall_pass:
+        reasons.append(
+            f"Curing successful: {compliance_result['overall_compliance_pct']:.1f}% temp compliance, "
+            f"{maturity_result['estimated_strength_pct']:.1f}% strength in {total_duration_days:.1f} days"
+        )
+    
+    return {
+        'pass': overall_pass,
+        'temperature_pass': temperature_pass,
+        'strength_pass': strength_pass,
+        'duration_pass': duration_pass,
+        'compliance_pct': compliance_result['overall_compliance_pct'],
+        'estimated_strength_pct': maturity_result['estimated_strength_pct'],
+        'total_maturity_C_h': maturity_result['total_maturity_C_h'],
+        'curing_duration_days': total_duration_days,
+        'compliant_windows': compliance_result['compliant_windows'],
+        'total_windows': compliance_result['total_windows'],
+        'min_temp_C': maturity_result.get('min_temp_C', np.nan),
+        'max_temp_C': maturity_result.get('max_temp_C', np.nan),
+        'avg_temp_C': maturity_result.get('avg_temp_C', np.nan),
+        'requirements': {
+            'min_temp_C': min_temp_C,
+            'max_temp_C': max_temp_C,
+            'window_hours': window_hours,
+            'min_compliance_pct': min_compliance_pct,
+            'required_strength_pct': required_strength_pct,
+            'curing_days': curing_days
+        },
+        'reasons': reasons,
+        'errors': compliance_result.get('errors', []) + maturity_result.get('errors', []),
+        'window_details': compliance_result.get('windows', [])
+    }
@@ -11,6 +11,9 @@ Example usage:
         timestamps=df['timestamp'].values,
         temperatures=df['temperature'].values
     )
+
+validate_cooling_phases_ns() is the array-native variant for int64 epoch-ns
+timestamps used by shadow runs.
 """
 
 import numpy as np
@@ -18,6 +21,8 @@ import pandas as pd
 from typing import Dict, Any, Optional, List, Tuple
 from datetime import datetime
 
+from validation.independent.arrays import elapsed_seconds
+
 
 def fahrenheit_to_celsius(temp_f: float) -> float:
     """Convert Fahrenheit to Celsius."""
@@ -206,4 +211,101 @@ def calculate_cooling_rate(
     time_diff_hours = (end_time - start_time) / 3600
     temp_diff = start_temp_C - end_temp_C
     
-    return temp_diff / time_diff_hours
\ No newline at end of file
+    return temp_diff / time_diff_hours
+
+
+def linear_interpolate_crossing_time_ns(
+    timestamps_ns: np.ndarray,
+    temperatures: np.ndarray,
+    target_temp_C: float,
+    direction: str = 'cooling'
+) -> Optional[float]:
+    """
+    Array-native linear_interpolate_crossing_time for int64 epoch-ns timestamps.
+    
+    Returns:
+        Time in seconds from start when target is reached, or None if never reached
+    """
+    if len(timestamps_ns) != len(temperatures):
+        raise ValueError("Timestamps and temperatures must have same length")
+        
+    if len(timestamps_ns) < 2:
+        return None
+    
+    time_seconds = elapsed_seconds(timestamps_ns)
+    temperatures = np.asarray(temperatures, dtype=np.float64)
+    temp_current = temperatures[:-1]
+    temp_next = temperatures[1:]
+    
+    if direction == 'cooling':
+        crossings = (temp_current >= target_temp_C) & (target_temp_C >= temp_next)
+    else:  # heating
+        crossings = (temp_current <= target_temp_C) & (target_temp_C <= temp_next)
+    
+    if not np.any(crossings):
+        return None
+    
+    i = int(np.argmax(crossings))
+    if abs(temp_current[i] - temp_next[i]) < 1e-10:
+        return float(time_seconds[i])
+    
+    time_fraction = (target_temp_C - temp_current[i]) / (temp_next[i] - temp_current[i])
+    return float(time_seconds[i] + (time_seconds[i + 1] - time_seconds[i]) * time_fraction)
+
+
+def validate_cooling_phases_ns(
+    timestamps_ns: np.ndarray,
+    temperatures: np.ndarray
+) -> Dict[str, Any]:
+    """
+    Array-native validate_cooling_phases for int64 epoch-ns timestamps.
+    
+    Returns:
+        Dict with phase validation results (same keys as validate_cooling_phases)
+    """
+    temp_135f_c = fahrenheit_to_celsius(135.0)
+    temp_70f_c = fahrenheit_to_celsius(70.0)
+    temp_41f_c = fahrenheit_to_celsius(41.0)
+    
+    phase1_limit_seconds = 2.0 * 3600
+    phase2_limit_seconds = 6.0 * 3600
+    
+    result = {
+        'phase1_pass': False,
+        'phase2_pass': False,
+        'phase1_actual_time_s': None,
+        'phase2_actual_time_s': None,
+        'phase1_required_time_s': phase1_limit_seconds,
+        'phase2_required_time_s': phase2_limit_seconds,
+        'start_temp_C': None,
+        'end_temp_C': None,
+        'min_temp_C': None,
+        'max_temp_C': None,
+        'errors': []
+    }
+    
+    temperatures = np.asarray(temperatures, dtype=np.float64)
+    if len(temperatures) == 0:
+        result['errors'].append("No temperature data provided")
+        return result
+    
+    result['start_temp_C'] = float(temperatures[0])
+    result['end_temp_C'] = float(temperatures[-1])
+    result['min_temp_C'] = float(np.min(temperatures))
+    result['max_temp_C'] = float(np.max(temperatures))
+    
+    if temperatures[0] < temp_135f_c:
+        result['errors'].append(f"Starting temperature {temperatures[0]:.1f}°C is below 135°F (57.2°C)")
+        return result
+    
+    time_to_70f = linear_interpolate_crossing_time_ns(timestamps_ns, temperatures, temp_70f_c, 'cooling')
+    if time_to_70f is not None:
+        result['phase1_actual_time_s'] = time_to_70f
+        result['phase1_pass'] = time_to_70f <= phase1_limit_seconds
+    
+    time_to_41f = linear_interpolate_crossing_time_ns(timestamps_ns, temperatures, temp_41f_c, 'cooling')
+    if time_to_41f is not None:
+        result['phase2_actual_time_s'] = time_to_41f
+        result['phase2_pass'] = time_to_41f <= phase2_limit_seconds
+    
+    return result
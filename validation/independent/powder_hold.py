@@ -14,6 +14,10 @@ Example usage:
         hysteresis=2.0,
         continuous_only=True
     )
+
+The *_ns variants take int64 epoch-ns timestamps and are used by shadow runs:
+    hold_time = calculate_hold_time_ns(to_epoch_ns(df['timestamp']),
+                                       df['temperature'].to_numpy(), 180.0)
 """
 
 import numpy as np
@@ -21,6 +25,8 @@ from typing import List, Tuple, Optional
 from datetime import datetime
 import pandas as pd
 
+from validation.independent.arrays import NS_PER_SECOND, elapsed_seconds, hysteresis_mask, run_bounds
+
 
 def calculate_hold_time(
     timestamps: np.ndarray,
@@ -196,4 +202,85 @@ def calculate_time_to_threshold(
             else:
                 return timestamps[i] - timestamps[0]
                 
-    return -1.0  # Never reached threshold
\ No newline at end of file
+    return -1.0  # Never reached threshold
+
+
+def calculate_hold_time_ns(
+    timestamps_ns: np.ndarray,
+    temperatures: np.ndarray,
+    threshold: float,
+    hysteresis: float = 2.0,
+    continuous_only: bool = True
+) -> float:
+    """
+    Array-native calculate_hold_time for int64 epoch-ns timestamps.
+    
+    Args:
+        timestamps_ns: int64 nanoseconds since epoch
+        temperatures: Array of temperature values in Celsius
+        threshold: Temperature threshold in Celsius
+        hysteresis: Hysteresis value in Celsius (default 2.0)
+        continuous_only: If True, return longest continuous interval.
+                        If False, return cumulative time.
+                        
+    Returns:
+        Hold time in seconds
+    """
+    if len(timestamps_ns) != len(temperatures):
+        raise ValueError("Timestamps and temperatures must have same length")
+        
+    if len(timestamps_ns) < 2:
+        return 0.0
+    
+    time_seconds = elapsed_seconds(timestamps_ns)
+    starts, ends = run_bounds(hysteresis_mask(temperatures, threshold, hysteresis))
+    
+    if len(starts) == 0:
+        return 0.0
+    
+    durations = time_seconds[ends] - time_seconds[starts]
+    if continuous_only:
+        return float(durations.max())
+    return float(durations.sum())
+
+
+def calculate_ramp_rate_ns(timestamps_ns: np.ndarray, temperatures: np.ndarray) -> float:
+    """
+    Array-native calculate_ramp_rate for int64 epoch-ns timestamps.
+    
+    Returns:
+        Maximum central-difference ramp rate in °C/min
+    """
+    if len(timestamps_ns) < 3:
+        return 0.0
+    
+    time_seconds = elapsed_seconds(timestamps_ns)
+    temperatures = np.asarray(temperatures, dtype=np.float64)
+    
+    dt = time_seconds[2:] - time_seconds[:-2]
+    dtemp = temperatures[2:] - temperatures[:-2]
+    valid = dt > 0
+    
+    if not np.any(valid):
+        return 0.0
+    
+    return float(np.max(dtemp[valid] / dt[valid] * 60))
+
+
+def calculate_time_to_threshold_ns(
+    timestamps_ns: np.ndarray,
+    temperatures: np.ndarray,
+    threshold: float
+) -> float:
+    """
+    Array-native calculate_time_to_threshold for int64 epoch-ns timestamps.
+    
+    Returns:
+        Time to threshold in seconds, or -1 if never reached
+    """
+    reached = np.asarray(temperatures, dtype=np.float64) >= threshold
+    if not np.any(reached):
+        return -1.0
+    
+    first = int(np.argmax(reached))
+    return float(timestamps_ns[first] - timestamps_ns[0]) / NS_PER_SECOND